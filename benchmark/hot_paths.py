@@ -0,0 +1,141 @@
+#!/user/bin/env python3
+
+from itertools import count
+from os.path import isfile
+from biobesu.helper import synthetic
+from biobesu.helper.converters import GeneConverter
+from biobesu.helper.converters import PhenotypeConverter
+from biobesu.helper.generic import create_dir
+from biobesu.helper.readers import SeparatedValuesFileReader
+from biobesu.suite.hpo_generank.runner.lirical import __extract_fields_from_lirical_data
+from biobesu.suite.vibe_versions.helper.converters import merge_vibe_simple_output_files
+from benchmark.microbenchmark import benchmark
+from benchmark.microbenchmark import main
+
+
+class Fixtures:
+    """
+    Lazily generated synthetic input files, sized like production data (when scale is 1.0).
+    """
+
+    # Roughly the size of a full hp.obo release.
+    HPO_TERMS = 16000
+    GENE_ROWS = 60000
+    DISEASES = 8000
+    LIRICAL_ROWS = 10000
+    BENCHMARK_CASES = 20000
+    VIBE_OUTPUT_GENES = 200
+
+    def __init__(self, fixtures_dir, scale=1.0):
+        self.fixtures_dir = fixtures_dir
+        self.scale = scale
+        self.output_counter = count()
+
+    def size(self, size):
+        """
+        Scales a fixture size.
+
+        :param size: the production size
+        :type size: int
+        :return: the scaled size (at least 1)
+        :rtype: int
+        """
+
+        return max(1, int(size * self.scale))
+
+    def __path(self, file_name, generator):
+        """
+        Returns the path to a fixture file, generating it first if it does not exist yet.
+        """
+
+        file_path = self.fixtures_dir + file_name
+        if not isfile(file_path):
+            generator(file_path)
+        return file_path
+
+    def hpo_obo(self):
+        return self.__path('hp.obo', lambda path: synthetic.write_hpo_obo(path, self.size(self.HPO_TERMS)))
+
+    def gene_dir(self):
+        """
+        :return: directory containing the file as expected by :class:`GeneConverter`
+        :rtype: str
+        """
+
+        gene_dir = create_dir(self.fixtures_dir + 'genes/', exist_allowed=True)
+        if not isfile(gene_dir + GeneConverter.file_name):
+            synthetic.write_gene_symbols_file(gene_dir + GeneConverter.file_name, self.size(self.GENE_ROWS))
+        return gene_dir
+
+    def lirical_output(self):
+        return self.__path('lirical_output.tsv', lambda path: synthetic.write_lirical_output_file(
+            path, self.size(self.LIRICAL_ROWS), self.size(self.GENE_ROWS), self.size(self.DISEASES) * 2))
+
+    def benchmark_data(self):
+        return self.__path('benchmark_data.tsv', lambda path: synthetic.write_benchmark_file(
+            path, self.size(self.BENCHMARK_CASES), self.size(self.HPO_TERMS), self.size(self.GENE_ROWS)))
+
+    def vibe_output_dir(self):
+        vibe_dir = self.fixtures_dir + 'vibe_output/'
+        if not isfile(vibe_dir + '00001.tsv'):
+            create_dir(vibe_dir, exist_allowed=True)
+            for case in range(1, self.size(self.BENCHMARK_CASES) + 1):
+                synthetic.write_vibe_output_file(f'{vibe_dir}{case:05d}.tsv', self.size(self.GENE_ROWS),
+                                                 self.VIBE_OUTPUT_GENES, seed=case)
+        return vibe_dir
+
+    def new_output_file(self):
+        """
+        :return: a path to a file that does not exist yet
+        :rtype: str
+        """
+
+        return f'{self.fixtures_dir}output_{next(self.output_counter)}.tsv'
+
+
+@benchmark('phenotype_converter_parse')
+def phenotype_converter_parse(fixtures):
+    hpo_obo = fixtures.hpo_obo()
+    return lambda: PhenotypeConverter(hpo_obo)
+
+
+@benchmark('phenotype_converter_phenopackets', repeats=3)
+def phenotype_converter_phenopackets(fixtures):
+    converter = PhenotypeConverter(fixtures.hpo_obo())
+    cases = SeparatedValuesFileReader.key_value_reader(fixtures.benchmark_data(), 0, 2, values_separator=',')
+
+    def generate():
+        for case_id, hpo_ids in cases.items():
+            converter.id_to_phenopacket(case_id, hpo_ids)
+
+    return generate
+
+
+@benchmark('gene_converter_read')
+def gene_converter_read(fixtures):
+    gene_dir = fixtures.gene_dir()
+    return lambda: GeneConverter(gene_dir)
+
+
+@benchmark('separated_values_file_reader')
+def separated_values_file_reader(fixtures):
+    benchmark_data = fixtures.benchmark_data()
+    return lambda: SeparatedValuesFileReader.key_value_reader(benchmark_data, 0, 2, values_separator=',')
+
+
+@benchmark('extract_fields_from_lirical_data')
+def extract_fields_from_lirical_data(fixtures):
+    # Reads the file beforehand so that only the extraction is timed.
+    with open(fixtures.lirical_output()) as file_reader:
+        lines = file_reader.readlines()
+    return lambda: __extract_fields_from_lirical_data(lines)
+
+
+@benchmark('merge_vibe_simple_output_files', repeats=3)
+def merge_vibe_simple_output_files_benchmark(fixtures):
+    vibe_dir = fixtures.vibe_output_dir()
+    return lambda: merge_vibe_simple_output_files(vibe_dir, fixtures.new_output_file())
+
+
+if __name__ == '__main__':
+    main(Fixtures)
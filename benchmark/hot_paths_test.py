@@ -0,0 +1,48 @@
+#!/user/bin/env python3
+
+from json import dump
+from os import environ
+import pytest
+
+from benchmark import hot_paths
+from benchmark.microbenchmark import BENCHMARKS
+from benchmark.microbenchmark import DEFAULT_THRESHOLD
+from benchmark.microbenchmark import compare
+from benchmark.microbenchmark import read_results
+from benchmark.microbenchmark import results_document
+from benchmark.microbenchmark import run_benchmark
+
+# Benchmarks are slow, so they only run on request:
+# BIOBESU_BENCHMARK=1 pytest benchmark/
+pytestmark = pytest.mark.skipif(not environ.get('BIOBESU_BENCHMARK'),
+                                reason='set BIOBESU_BENCHMARK=1 to run the benchmarks')
+
+
+@pytest.fixture(scope='module')
+def fixtures(tmp_path_factory):
+    return hot_paths.Fixtures(str(tmp_path_factory.mktemp('fixtures')) + '/',
+                              float(environ.get('BIOBESU_BENCHMARK_SCALE', 1.0)))
+
+
+@pytest.fixture(scope='module')
+def results():
+    results = {}
+    yield results
+
+    # Stores results if requested.
+    if environ.get('BIOBESU_BENCHMARK_OUTPUT') and results:
+        with open(environ['BIOBESU_BENCHMARK_OUTPUT'], 'w') as file_writer:
+            dump(results_document(results), file_writer, indent='\t')
+
+
+@pytest.mark.parametrize('name', sorted(BENCHMARKS))
+def test_benchmark(name, fixtures, results):
+    results[name] = run_benchmark(name, fixtures)
+
+    # Compares against baseline if given.
+    if environ.get('BIOBESU_BENCHMARK_BASELINE'):
+        threshold = float(environ.get('BIOBESU_BENCHMARK_THRESHOLD', DEFAULT_THRESHOLD))
+        for compared_name, baseline_median, result_median, ratio, is_regression in \
+                compare({name: results[name]}, read_results(environ['BIOBESU_BENCHMARK_BASELINE']), threshold):
+            assert not is_regression, f'{name} is {ratio:.2f}x slower than the baseline ' \
+                                      f'({result_median:.4f}s vs {baseline_median:.4f}s)'
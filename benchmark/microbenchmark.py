@@ -0,0 +1,206 @@
+#!/user/bin/env python3
+
+from datetime import datetime
+from json import dump
+from json import load
+from platform import platform
+from platform import python_version
+from statistics import mean
+from statistics import median
+from tempfile import TemporaryDirectory
+from sys import exit
+from time import perf_counter
+from biobesu.helper.argument_parser import BiobesuParser
+
+# Registered benchmarks: {name: (setup function, repeats)}.
+BENCHMARKS = {}
+
+DEFAULT_THRESHOLD = 1.5
+
+
+def benchmark(name, repeats=5):
+    """
+    Decorator that registers a benchmark.
+
+    The decorated function receives a :class:`benchmark.hot_paths.Fixtures` instance and should return a function
+    without arguments that executes the code to be timed. Anything done before returning is not timed.
+
+    :param name: unique name of the benchmark (used as key in the results)
+    :type name: str
+    :param repeats: the number of timed executions
+    :type repeats: int
+    """
+
+    def register(setup):
+        if name in BENCHMARKS:
+            raise ValueError(f'benchmark {name} is already registered')
+        BENCHMARKS[name] = (setup, repeats)
+        return setup
+
+    return register
+
+
+def time_function(function, repeats, warmup=1):
+    """
+    Times a function multiple times.
+
+    :param function: the function to time
+    :param repeats: the number of timed executions
+    :type repeats: int
+    :param warmup: the number of untimed executions before timing
+    :type warmup: int
+    :return: the timings (in seconds)
+    :rtype: list[float]
+    """
+
+    for i in range(warmup):
+        function()
+
+    samples = []
+    for i in range(repeats):
+        time_start = perf_counter()
+        function()
+        samples.append(perf_counter() - time_start)
+
+    return samples
+
+
+def summarize(samples):
+    """
+    Summarizes timing samples.
+
+    :param samples: the timings (in seconds)
+    :type samples: list[float]
+    :return: summary of the timings
+    :rtype: dict
+    """
+
+    return {'repeats': len(samples), 'min': min(samples), 'median': median(samples), 'mean': mean(samples),
+            'samples': samples}
+
+
+def run_benchmark(name, fixtures, repeats=None):
+    """
+    Runs a single registered benchmark.
+
+    :param name: name of the benchmark
+    :type name: str
+    :param fixtures: the fixtures to be used by the benchmark
+    :param repeats: overrides the registered number of timed executions
+    :type repeats: int | None
+    :return: summary of the timings
+    :rtype: dict
+    """
+
+    setup, default_repeats = BENCHMARKS[name]
+    function = setup(fixtures)
+    return summarize(time_function(function, repeats if repeats is not None else default_repeats))
+
+
+def results_document(results):
+    """
+    Wraps benchmark results with information about the environment they were generated in.
+
+    :param results: the results per benchmark
+    :type results: dict[str,dict]
+    :return: the document to be stored as JSON
+    :rtype: dict
+    """
+
+    return {'created': datetime.utcnow().isoformat() + 'Z', 'python': python_version(), 'platform': platform(),
+            'results': results}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, thresholds=None):
+    """
+    Compares benchmark results against a baseline. Benchmarks are compared on their median and only benchmarks
+    present in both are compared.
+
+    :param results: the results per benchmark
+    :type results: dict[str,dict]
+    :param baseline: the baseline results per benchmark
+    :type baseline: dict[str,dict]
+    :param threshold: the maximum allowed ratio between result and baseline
+    :type threshold: float
+    :param thresholds: per-benchmark overrides of threshold
+    :type thresholds: dict[str,float] | None
+    :return: (name, baseline median, result median, ratio, regressed) per compared benchmark
+    :rtype: list[tuple[str,float,float,float,bool]]
+    """
+
+    thresholds = thresholds or {}
+    comparison = []
+    for name in sorted(results.keys() & baseline.keys()):
+        baseline_median = baseline[name]['median']
+        result_median = results[name]['median']
+        ratio = result_median / baseline_median
+        comparison.append((name, baseline_median, result_median, ratio, ratio > thresholds.get(name, threshold)))
+
+    return comparison
+
+
+def read_results(file_path):
+    """
+    Reads the results from a stored benchmark JSON file.
+
+    :param file_path: path to the JSON file
+    :type file_path: str
+    :return: the results per benchmark
+    :rtype: dict[str,dict]
+    """
+
+    with open(file_path) as file_reader:
+        return load(file_reader)['results']
+
+
+def __parse_threshold(value):
+    """
+    Parses a NAME=RATIO command line value.
+    """
+
+    name, ratio = value.split('=')
+    return name, float(ratio)
+
+
+def main(fixtures_class):
+    """
+    Command line entry point that runs the registered benchmarks.
+
+    :param fixtures_class: class that generates the fixtures used by the benchmarks
+    :type fixtures_class: type
+    """
+
+    parser = BiobesuParser(description='Runs the micro-benchmarks of the helper and converter hot paths.')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    parser.add_argument('--baseline', help='JSON file with results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'maximum allowed slowdown ratio compared to the baseline (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--benchmark_threshold', type=__parse_threshold, action='append', default=[],
+                        metavar='NAME=RATIO', help='maximum allowed slowdown ratio for a single benchmark')
+    parser.add_argument('--repeats', type=int, help='overrides the number of timed executions per benchmark')
+    parser.add_argument('--select', action='append', choices=sorted(BENCHMARKS),
+                        help='only run the selected benchmark(s)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='scales the fixture sizes (default: 1.0, which is production-sized)')
+    args = parser.parse_args()
+
+    results = {}
+    with TemporaryDirectory() as fixtures_dir:
+        fixtures = fixtures_class(fixtures_dir + '/', args.scale)
+        for name in args.select or sorted(BENCHMARKS):
+            results[name] = run_benchmark(name, fixtures, args.repeats)
+            print(f'{name}\tmedian: {results[name]["median"]:.4f}s\tmin: {results[name]["min"]:.4f}s')
+
+    if args.output is not None:
+        with open(args.output, 'w') as file_writer:
+            dump(results_document(results), file_writer, indent='\t')
+
+    if args.baseline is not None:
+        regressed = False
+        for name, baseline_median, result_median, ratio, is_regression in \
+                compare(results, read_results(args.baseline), args.threshold, dict(args.benchmark_threshold)):
+            flag = '\tREGRESSION' if is_regression else ''
+            print(f'{name}\tbaseline: {baseline_median:.4f}s\tcurrent: {result_median:.4f}s\tratio: {ratio:.2f}{flag}')
+            regressed = regressed or is_regression
+        if regressed:
+            exit(1)
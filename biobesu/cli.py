@@ -6,18 +6,23 @@ from biobesu.helper.argument_parser import BiobesuParser
 
 
 def main():
-    # Load available suites.
+    # Load available suites & utilities.
     suites = retrieve_entry_point('biobesu_suites')
+    utilities = retrieve_entry_point('biobesu_utilities')
 
     # Defines global command line.
     parser = BiobesuParser(formatter_class=RawTextHelpFormatter, add_help=False)
-    parser.add_argument('suite', help='the chosen benchmark suite:\n' + '\n'.join(suites))
+    parser.add_argument('suite', help='the chosen benchmark suite:\n' + '\n'.join(suites) +
+                                      '\n\nor utility:\n' + '\n'.join(utilities))
 
     # Processes command line.
     args, unknown_args = parser.parse_known_args()
 
-    # Run selected suite.
-    suites[args.suite](parser)
+    # Run selected suite/utility.
+    if args.suite in utilities:
+        utilities[args.suite](parser)
+    else:
+        suites[args.suite](parser)
 
 
 if __name__ == '__main__':
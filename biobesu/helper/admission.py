@@ -0,0 +1,157 @@
+#!/user/bin/env python3
+
+from os import cpu_count
+from os import getloadavg
+from time import monotonic
+
+
+def available_memory():
+    """
+    Retrieves the memory that is available for starting new processes (Linux only).
+
+    :return: the available memory in MB or None if it could not be determined
+    :rtype: float | None
+    """
+
+    try:
+        with open('/proc/meminfo') as file_reader:
+            for line in file_reader:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_memory(pid):
+    """
+    Retrieves the current resident memory of a process (Linux only).
+
+    :param pid: the process ID
+    :type pid: int
+    :return: the resident memory in MB (0 if it could not be determined)
+    :rtype: float
+    """
+
+    try:
+        with open(f'/proc/{pid}/status') as file_reader:
+            for line in file_reader:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0
+
+
+def usable_cpus():
+    """
+    :return: the number of CPUs this process is allowed to use
+    :rtype: int
+    """
+
+    try:
+        from os import sched_getaffinity
+        return len(sched_getaffinity(0))
+    except ImportError:
+        return cpu_count()
+
+
+class AdmissionController:
+    """
+    Decides whether another case can be started, based on the memory footprint per case and the available memory &
+    load of the machine. The footprint is either configured or learned from the peak memory of finished cases.
+    """
+
+    # Memory used by a JVM besides its heap (MB).
+    JVM_OVERHEAD = 256
+
+    # Factor with which the largest learned footprint is increased.
+    SAFETY_FACTOR = 1.1
+
+    # Seconds after which a started case is expected to be reflected in the load average.
+    LOAD_DELAY = 60
+
+    def __init__(self, case_memory=None, memory_reserve=1024, max_load=None):
+        """
+        :param case_memory: the configured heap size per case in MB (None to only use the learned footprint)
+        :type case_memory: int | None
+        :param memory_reserve: memory in MB that should always stay available for other processes
+        :type memory_reserve: int
+        :param max_load: no cases are started if the load average exceeds this (default: number of usable CPUs)
+        :type max_load: float | None
+        """
+
+        self.configured_footprint = case_memory + self.JVM_OVERHEAD if case_memory is not None else None
+        self.learned_footprint = None
+        self.memory_reserve = memory_reserve
+        self.max_load = max_load if max_load is not None else usable_cpus()
+        # Start times of running cases.
+        self.start_times = {}
+
+    @property
+    def footprint(self):
+        """
+        :return: the expected peak memory of a single case in MB (None if not yet known)
+        :rtype: float | None
+        """
+
+        footprints = [footprint for footprint in [self.configured_footprint, self.learned_footprint]
+                      if footprint is not None]
+        return max(footprints) if footprints else None
+
+    def admit(self, running_pids):
+        """
+        Decides whether a new case can be started.
+
+        :param running_pids: the process IDs of the cases that are currently running
+        :type running_pids: list[int]
+        :return: True if a new case can be started
+        :rtype: bool
+        """
+
+        # Always allows a single case so that progress is made.
+        if len(running_pids) == 0:
+            return True
+
+        # Without a known footprint, waits till the first case finished to learn it.
+        if self.footprint is None:
+            return False
+
+        # Memory already used by running cases will become available again once they finish, while the remainder of
+        # their footprint can still be claimed.
+        memory = available_memory()
+        if memory is not None:
+            budget = memory + sum(process_memory(pid) for pid in running_pids) - self.memory_reserve
+            if (len(running_pids) + 1) * self.footprint > budget:
+                return False
+
+        # Recently started cases are not yet (fully) reflected by the load average.
+        now = monotonic()
+        recently_started = sum(1 for start in self.start_times.values() if now - start < self.LOAD_DELAY)
+        if getloadavg()[0] + recently_started >= self.max_load:
+            return False
+
+        return True
+
+    def case_started(self, case):
+        """
+        :param case: the case that was launched
+        :type case: Case
+        """
+
+        self.start_times[case.case_id] = monotonic()
+
+    def case_finished(self, result):
+        """
+        Learns the footprint from a finished case.
+
+        :param result: the result of the case that finished
+        :type result: CaseResult
+        """
+
+        self.start_times.pop(result.case.case_id, None)
+
+        if result.peak_memory > 0:
+            footprint = result.peak_memory * self.SAFETY_FACTOR
+            if self.learned_footprint is None or footprint > self.learned_footprint:
+                self.learned_footprint = footprint
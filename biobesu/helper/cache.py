@@ -0,0 +1,336 @@
+#!/user/bin/env python3
+
+from fcntl import LOCK_EX
+from fcntl import flock
+from hashlib import sha256
+from json import dump
+from json import load
+from os import getpid
+from os import listdir
+from os import remove
+from os import replace
+from os import stat
+from os import utime
+from os.path import abspath
+from os.path import isdir
+from os.path import isfile
+from shutil import copyfile
+from biobesu.helper.execution import ExecutionListener
+from biobesu.helper.generic import create_dir
+from biobesu.helper.generic import file_hash
+from biobesu.helper.metrics import current_exporter
+
+# Used only for docstring
+from argparse import ArgumentParser
+from biobesu.helper.execution import Case
+from biobesu.helper.storage import OutputStore
+
+
+class ResultCache:
+    """
+    Persistent cache of tool output that can be shared between runs (and output directories). Entries are addressed by
+    a key derived from the normalized HPO set of a case & the hashes of the jar and data resources the tool used, so
+    that cases with identical input (also within a single benchmark) only need a single tool run.
+
+    Entries are evicted least recently used first once the cache exceeds its maximum size. Hit/miss statistics are
+    accumulated over all runs using the cache.
+    """
+
+    # Increased whenever the way keys are derived changes.
+    FORMAT_VERSION = '1'
+
+    ENTRIES_DIR = 'entries/'
+    FILE_HASHES_FILE = 'file_hashes.tsv'
+    STATISTICS_FILE = 'statistics.json'
+    LOCK_FILE = '.lock'
+    SUFFIX = '.tsv'
+
+    def __init__(self, directory, max_size=None):
+        """
+        :param directory: the directory containing the cache (created if it does not exist)
+        :type directory: str
+        :param max_size: the maximum size of all entries in MB (None for no maximum)
+        :type max_size: int | None
+        """
+
+        self.directory = create_dir(directory.rstrip('/') + '/', exist_allowed=True)
+        self.max_size = max_size
+        self.file_hashes = self.__read_file_hashes()
+
+        # Statistics of this run.
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+    def fingerprint(self, resources):
+        """
+        Identifies the tool & data used for running cases. File hashes are remembered (by path, size & modification
+        time), so that large resources are only hashed once.
+
+        :param resources: the jar & data files (a directory includes all of its non-hidden files)
+        :type resources: list[str]
+        :return: the fingerprint
+        :rtype: str
+        """
+
+        digest = sha256(f'format_version={self.FORMAT_VERSION}\n'.encode())
+        for resource in resources:
+            files = [resource]
+            if isdir(resource):
+                directory = resource.rstrip('/') + '/'
+                files = [directory + file_name for file_name in sorted(listdir(directory))
+                         if not file_name.startswith('.') and isfile(directory + file_name)]
+            for file_path in files:
+                digest.update(f'{self.__file_hash(file_path)}\n'.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(fingerprint, hpo_ids):
+        """
+        :param fingerprint: the fingerprint of the tool & data (see :func:`ResultCache.fingerprint`)
+        :type fingerprint: str
+        :param hpo_ids: the HPO IDs of a case (order & duplicates do not matter)
+        :type hpo_ids: list[str]
+        :return: the key of the cache entry for the case
+        :rtype: str
+        """
+
+        hpo_set = ','.join(sorted({hpo_id.strip() for hpo_id in hpo_ids}))
+        return sha256(f'{fingerprint}\n{hpo_set}\n'.encode()).hexdigest()
+
+    def contains(self, key):
+        return isfile(self.__path(key))
+
+    def add(self, key, file_path):
+        """
+        Stores the output of a case.
+
+        :param key: the key of the case
+        :type key: str
+        :param file_path: the output of the case
+        :type file_path: str
+        """
+
+        path = self.__path(key)
+        create_dir(path.rsplit('/', 1)[0], exist_allowed=True)
+        # Copies to a temporary file first so that simultaneous runs never see a partial entry.
+        copyfile(file_path, f'{path}.{getpid()}.tmp')
+        replace(f'{path}.{getpid()}.tmp', path)
+        self.stored += 1
+
+    def materialize(self, key, store, case_id):
+        """
+        Writes a cached output into an output store (as if the tool was run).
+
+        :param key: the key of the case
+        :type key: str
+        :param store: the store to write to
+        :type store: OutputStore
+        :param case_id: the id of the case within the store
+        :type case_id: str
+        :return: whether the entry was present in the cache
+        :rtype: bool
+        """
+
+        path = self.__path(key)
+        try:
+            staging_file = store.staging_file(case_id)
+            copyfile(path, staging_file)
+        except FileNotFoundError:
+            return False
+
+        # Marks the entry as recently used.
+        utime(path)
+        store.collect(case_id, staging_file)
+        return True
+
+    def partition(self, cases, keys, store):
+        """
+        Materializes the cases that are already cached & selects a single case to run per key that is not.
+
+        :param cases: the cases to run
+        :type cases: list[Case]
+        :param keys: the key per case id
+        :type keys: dict[str, str]
+        :param store: the store the output of the cases is written to
+        :type store: OutputStore
+        :return: the cases that need to be run & the cases with the same key as one of those
+        :rtype: tuple[list[Case], list[Case]]
+        """
+
+        to_run = []
+        duplicates = []
+        scheduled = set()
+        for case in cases:
+            key = keys[case.case_id]
+            if key in scheduled:
+                duplicates.append(case)
+            elif self.materialize(key, store, case.case_id):
+                self.hits += 1
+            else:
+                scheduled.add(key)
+                to_run.append(case)
+        self.misses += len(to_run)
+        return to_run, duplicates
+
+    def materialize_duplicates(self, duplicates, keys, store):
+        """
+        Materializes the cases whose key was run by another case (see :func:`ResultCache.partition`).
+
+        :return: the cases that could not be materialized as the run with the same key failed
+        :rtype: list[Case]
+        """
+
+        failed = []
+        for case in duplicates:
+            if self.materialize(keys[case.case_id], store, case.case_id):
+                self.hits += 1
+            else:
+                failed.append(case)
+        return failed
+
+    def finish(self):
+        """
+        Evicts entries if the cache is too large & adds the statistics of this run to the overall statistics (and
+        reports them to the metrics exporter, if any).
+
+        :return: the overall statistics
+        :rtype: dict[str, int]
+        """
+
+        with open(self.directory + self.LOCK_FILE, 'a') as lock:
+            flock(lock, LOCK_EX)
+            if self.max_size is not None:
+                self.__evict(self.max_size * 1024 * 1024)
+
+            statistics = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+            if isfile(self.directory + self.STATISTICS_FILE):
+                with open(self.directory + self.STATISTICS_FILE) as file_reader:
+                    statistics.update(load(file_reader))
+            for name, value in [('hits', self.hits), ('misses', self.misses), ('stored', self.stored),
+                                ('evicted', self.evicted)]:
+                statistics[name] += value
+            with open(self.directory + self.STATISTICS_FILE + '.tmp', 'w') as file_writer:
+                dump(statistics, file_writer, indent='\t')
+            replace(self.directory + self.STATISTICS_FILE + '.tmp', self.directory + self.STATISTICS_FILE)
+
+        if current_exporter() is not None:
+            current_exporter().cache_finished(self.hits, self.misses)
+        return statistics
+
+    def summary(self):
+        """
+        :return: a human-readable summary of the statistics of this run
+        :rtype: str
+        """
+
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total > 0 else 0
+        return f'Result cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), ' \
+               f'{self.stored} stored, {self.evicted} evicted'
+
+    def __path(self, key):
+        return f'{self.directory}{self.ENTRIES_DIR}{key[:2]}/{key}{self.SUFFIX}'
+
+    def __evict(self, max_bytes):
+        """
+        Removes the least recently used entries until the cache is no larger than max_bytes.
+        """
+
+        entries = []
+        entries_dir = self.directory + self.ENTRIES_DIR
+        if isdir(entries_dir):
+            for subdir in listdir(entries_dir):
+                for file_name in listdir(entries_dir + subdir):
+                    if file_name.endswith(self.SUFFIX):
+                        file_stat = stat(f'{entries_dir}{subdir}/{file_name}')
+                        entries.append((file_stat.st_mtime, file_stat.st_size, f'{entries_dir}{subdir}/{file_name}'))
+
+        size = sum(entry[1] for entry in entries)
+        for mtime, entry_size, path in sorted(entries):
+            if size <= max_bytes:
+                break
+            remove(path)
+            size -= entry_size
+            self.evicted += 1
+
+    def __file_hash(self, file_path):
+        """
+        :return: the hash of a file (only calculated if the file changed since it was last hashed)
+        :rtype: str
+        """
+
+        file_path = abspath(file_path)
+        file_stat = stat(file_path)
+        identity = (file_path, str(file_stat.st_size), str(file_stat.st_mtime_ns))
+        if identity not in self.file_hashes:
+            self.file_hashes[identity] = file_hash(file_path)
+            with open(self.directory + self.FILE_HASHES_FILE, 'a') as file_writer:
+                file_writer.write('\t'.join(identity + (self.file_hashes[identity],)) + '\n')
+        return self.file_hashes[identity]
+
+    def __read_file_hashes(self):
+        """
+        :return: the hash per file identity (path, size & modification time)
+        :rtype: dict[tuple[str, str, str], str]
+        """
+
+        file_hashes = {}
+        if isfile(self.directory + self.FILE_HASHES_FILE):
+            with open(self.directory + self.FILE_HASHES_FILE) as file_reader:
+                for line in file_reader:
+                    fields = line.rstrip('\n').split('\t')
+                    # Ignores a partially written last line.
+                    if len(fields) == 4 and len(fields[3]) == 64:
+                        file_hashes[tuple(fields[:3])] = fields[3]
+        return file_hashes
+
+
+class CacheWriter(ExecutionListener):
+    """
+    Adds the output of successfully finished cases to a cache. Should be notified before the output is moved (for
+    example, by an :class:`~biobesu.helper.storage.OutputCollector`).
+    """
+
+    def __init__(self, cache, keys):
+        """
+        :param cache: the cache to add the output to
+        :type cache: ResultCache
+        :param keys: the key per case id
+        :type keys: dict[str, str]
+        """
+
+        self.cache = cache
+        self.keys = keys
+
+    def case_finished(self, result):
+        output_file = result.case.output_file
+        if not result.failed and output_file is not None and isfile(output_file):
+            self.cache.add(self.keys[result.case.case_id], output_file)
+
+
+def add_cache_arguments(parser):
+    """
+    Adds the command line arguments of the result cache.
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    """
+
+    parser.add_argument('--cache_dir',
+                        help='directory of a result cache shared between runs (default: no cache). Cases with the same '
+                             'HPO set, jar & data are only run once and afterwards copied from the cache')
+    parser.add_argument('--cache_size', type=int,
+                        help='maximum size of the result cache in MB, least recently used results are removed first '
+                             '(default: no maximum)')
+
+
+def create_cache(args):
+    """
+    :param args: the parsed arguments (see :func:`add_cache_arguments`)
+    :return: the cache (None if no cache should be used)
+    :rtype: ResultCache | None
+    """
+
+    return ResultCache(args.cache_dir, args.cache_size) if args.cache_dir is not None else None
@@ -0,0 +1,225 @@
+#!/user/bin/env python3
+
+from argparse import RawTextHelpFormatter
+from os import getpid
+from threading import Thread
+from time import perf_counter
+from traceback import print_exc
+from biobesu.helper.admission import usable_cpus
+from biobesu.helper.argument_parser import BiobesuParser
+from biobesu.helper.generic import eprint
+from biobesu.helper.generic import retrieve_entry_point
+from biobesu.helper.pool import WorkerPool
+import yaml
+
+# Used only for docstring
+from typing import Callable
+
+# Runner arguments that can not be used within a campaign, with the reason.
+UNSUPPORTED_ARGUMENTS = {
+    'timing': 'all runners would pin their tool runs to the same CPUs',
+    'memory_limit': 'it is applied in the forked tool process, which is unsafe while other runners run in threads'
+}
+
+
+class CampaignRunner:
+    """
+    A runner of a campaign: a suite runner with its command line arguments & the number of worker slots each of its
+    cases occupies.
+    """
+
+    def __init__(self, name, suite, runner, arguments, weight=1):
+        """
+        :param name: the name of the runner within the campaign
+        :type name: str
+        :param suite: the suite (for example, hpo_generank)
+        :type suite: str
+        :param runner: the runner within the suite (for example, lirical)
+        :type runner: str
+        :param arguments: the command line arguments of the runner (without suite & runner)
+        :type arguments: list[str]
+        :param weight: the number of worker slots a case of the runner occupies
+        :type weight: int
+        """
+
+        self.name = name
+        self.suite = suite
+        self.runner = runner
+        self.arguments = arguments
+        self.weight = weight
+
+        # Set once the runner finished.
+        self.succeeded = None
+        self.wall_time = None
+
+
+class CampaignParser(BiobesuParser):
+    """
+    Parses a fixed command line (instead of `sys.argv`) & adds the campaign settings to the parsed arguments, so the
+    suites & runners can be used unchanged within a campaign.
+    """
+
+    def __init__(self, arguments, settings):
+        """
+        :param arguments: the command line (starting with the suite & runner)
+        :type arguments: list[str]
+        :param settings: attributes to set on the parsed arguments
+        :type settings: dict
+        """
+
+        super().__init__(formatter_class=RawTextHelpFormatter, add_help=False)
+        self.add_argument('suite', help='the chosen benchmark suite')
+        self.arguments = arguments
+        self.settings = settings
+
+    def parse_known_args(self, args=None, namespace=None):
+        namespace, unknown_args = super().parse_known_args(self.arguments if args is None else args, namespace)
+        for key, value in self.settings.items():
+            setattr(namespace, key, value)
+        return namespace, unknown_args
+
+
+def command_line(arguments):
+    """
+    Converts the arguments of a runner in a manifest to a command line:
+
+    - `key: value` becomes `--key value`
+    - `key: true` becomes `--key` (false & null are left out)
+    - `key: [a, b]` becomes `--key a b`
+    - `key: [[a, b], [c, d]]` becomes `--key a b --key c d` (for arguments that can be given multiple times)
+
+    :param arguments: the arguments
+    :type arguments: dict
+    :return: the command line
+    :rtype: list[str]
+    """
+
+    line = []
+    for key, value in arguments.items():
+        if value is None or value is False:
+            continue
+        if value is True:
+            line.append(f'--{key}')
+        elif isinstance(value, list) and all(isinstance(item, list) for item in value):
+            for item in value:
+                line.extend([f'--{key}'] + [str(element) for element in item])
+        elif isinstance(value, list):
+            line.extend([f'--{key}'] + [str(element) for element in value])
+        else:
+            line.extend([f'--{key}', str(value)])
+    return line
+
+
+def read_manifest(manifest_file):
+    """
+    Reads a campaign manifest (YAML):
+
+    .. code-block:: yaml
+
+        workers: 8            # worker slots shared by all runners (default: number of usable CPUs)
+        defaults:             # arguments for all runners (can be overridden per runner)
+          java: /path/to/java
+        runners:
+          - suite: hpo_generank
+            runner: lirical
+            weight: 2         # worker slots per case (default: 1)
+            args:
+              jar: /path/to/LIRICAL.jar
+              output: /path/to/output/lirical
+
+    :param manifest_file: path to the manifest
+    :type manifest_file: str
+    :return: the number of worker slots & the runners
+    :rtype: tuple[int, list[CampaignRunner]]
+    :raises ValueError: if the manifest is invalid or uses :data:`UNSUPPORTED_ARGUMENTS`
+    """
+
+    with open(manifest_file) as file_reader:
+        manifest = yaml.safe_load(file_reader)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('runners'), list) or not manifest['runners']:
+        raise ValueError(f'"{manifest_file}" should contain a list of runners')
+
+    workers = manifest.get('workers', usable_cpus())
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError('workers should be a positive number')
+    defaults = manifest.get('defaults') or {}
+
+    suites = retrieve_entry_point('biobesu_suites')
+    runners = []
+    for i, entry in enumerate(manifest['runners'], start=1):
+        if not isinstance(entry, dict) or 'suite' not in entry or 'runner' not in entry:
+            raise ValueError(f'runner {i} should have a suite & runner')
+        suite, runner = str(entry['suite']), str(entry['runner'])
+        if suite not in suites or runner not in retrieve_entry_point(f'biobesu_{suite}'):
+            raise ValueError(f'runner {i}: unknown suite runner "{suite} {runner}"')
+        weight = entry.get('weight', 1)
+        if not isinstance(weight, int) or not 1 <= weight <= workers:
+            raise ValueError(f'runner {i}: weight should be a number from 1 to the number of workers ({workers})')
+
+        name = str(entry.get('name', f'{suite} {runner}'))
+        if any(other.name == name for other in runners):
+            raise ValueError(f'runner {i}: name "{name}" is used multiple times (add a unique name)')
+        arguments = {**defaults, **(entry.get('args') or {})}
+        for key, reason in UNSUPPORTED_ARGUMENTS.items():
+            if arguments.get(key) not in (None, False):
+                raise ValueError(f'runner {i}: {key} can not be used within a campaign, as {reason}')
+        runners.append(CampaignRunner(name, suite, runner, command_line(arguments), weight))
+    return workers, runners
+
+
+def run_campaign(runners, workers):
+    """
+    Runs all runners simultaneously (each in a thread of its own), with the cases of all runners sharing a single pool
+    of worker slots. Each runner writes its usual output.
+
+    :param runners: the runners
+    :type runners: list[CampaignRunner]
+    :param workers: the number of worker slots
+    :type workers: int
+    """
+
+    pool = WorkerPool(workers)
+    suites = retrieve_entry_point('biobesu_suites')
+
+    threads = []
+    for i, runner in enumerate(runners, start=1):
+        # The runner ID distinguishes the runners within a trace (as they share the process ID).
+        settings = {'worker_pool': pool, 'pool_weight': runner.weight, 'runner_name': runner.name,
+                    'runner_id': getpid() * 1000 + i}
+        # Each runner may use all workers by default (the pool limits the total).
+        if '--max_workers' not in runner.arguments:
+            settings['max_workers'] = workers // runner.weight
+        parser = CampaignParser([runner.suite, runner.runner] + runner.arguments, settings)
+        threads.append(Thread(target=__run_runner, args=(runner, suites[runner.suite], parser), name=runner.name,
+                              daemon=True))
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def __run_runner(runner, suite_main, parser):
+    """
+    Runs a single runner of a campaign (within its own thread).
+
+    :param runner: the runner
+    :type runner: CampaignRunner
+    :param suite_main: the main function of the suite of the runner
+    :type suite_main: Callable
+    :param parser: the parser with the command line of the runner
+    :type parser: CampaignParser
+    """
+
+    time_start = perf_counter()
+    try:
+        suite_main(parser)
+        runner.succeeded = True
+    except SystemExit as e:
+        # Invalid arguments (the parser already printed the error).
+        runner.succeeded = e.code in (None, 0)
+    except Exception:
+        eprint(f'Runner "{runner.name}" failed:')
+        print_exc()
+        runner.succeeded = False
+    runner.wall_time = perf_counter() - time_start
@@ -3,7 +3,8 @@
 from datetime import datetime
 from biobesu.helper import validate
 from json import dumps
-import requests
+from biobesu.helper.downloaders import Resource
+from biobesu.helper.downloaders import fetch_resources
 from biobesu.helper.error import FileContentError
 
 
@@ -224,14 +225,23 @@ class GeneConverter(Converter):
         # Retrieves data.
         self.__read_file()
 
+    @classmethod
+    def resource(cls, gene_file_dir):
+        """
+        :param gene_file_dir: the directory the converter is used with
+        :type gene_file_dir: str
+        :return: the gene file as resource (so it can be fetched together with other resources)
+        :rtype: Resource
+        """
+
+        return Resource(cls.download_file, gene_file_dir + cls.file_name)
+
     def __download_info_file(self):
         """
         Downloads needed conversion file and writes it the the given directory.
         """
 
-        with requests.get(self.download_file, allow_redirects=True) as r:
-            with open(self.gene_file, 'x') as file_writer:
-                file_writer.write(r.content.decode('utf-8'))
+        fetch_resources([Resource(self.download_file, self.gene_file)], workers=1)
 
     def __read_file(self):
         """
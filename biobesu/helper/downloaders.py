@@ -2,7 +2,313 @@
 
 import requests
 import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from os import makedirs
 from os import remove
+from os import replace
+from os.path import basename
+from os.path import dirname
+from os.path import exists
+from os.path import join
+from sys import stderr
+from threading import BoundedSemaphore
+from threading import Event
+from threading import Lock
+from time import perf_counter
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+import yaml
+
+# Size of the parts in which a response is written to disk.
+CHUNK_SIZE = 1024 * 1024
+
+
+class Resource:
+    """
+    A file to download (& optionally extract) as part of setting up a suite or runner.
+    """
+
+    def __init__(self, url, output_file, extract=False):
+        """
+        :param url: URL of the file to download
+        :type url: str
+        :param output_file: path to write the file to (or the directory to extract the archive into)
+        :type output_file: str
+        :param extract: whether the file is an archive (.tar.gz) that should be extracted (the archive itself is not
+                        kept)
+        :type extract: bool
+        :raises ValueError: if the archive format is not supported
+        """
+
+        if extract and not urlsplit(url).path.endswith('.tar.gz'):
+            raise ValueError('Unsupported archive format.')
+        self.url = url
+        self.output_file = output_file
+        self.extract = extract
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+    @property
+    def completion_file(self):
+        """
+        :return: the file that is present once the resource was fetched completely: the output file itself, or a marker
+                 within the output directory for an extracted archive (the directory can already exist or be shared)
+        :rtype: str
+        """
+
+        if self.extract:
+            return join(self.output_file, '.fetched-' + basename(urlsplit(self.url).path))
+        return self.output_file
+
+
+class FetchProgress:
+    """
+    Tracks the aggregate progress & throughput of concurrent downloads & reports each finished resource.
+    """
+
+    # Minimum number of seconds between refreshes of the status line.
+    REFRESH_INTERVAL = 0.5
+
+    def __init__(self, total, stream=stderr):
+        """
+        :param total: the number of resources that will be fetched
+        :type total: int
+        :param stream: the stream to write the progress to
+        """
+
+        self.total = total
+        self.stream = stream
+        self.lock = Lock()
+        self.time_start = perf_counter()
+        self.last_refresh = 0.0
+        self.done = 0
+        self.skipped = 0
+        self.bytes = 0
+
+    @property
+    def throughput(self):
+        """
+        :return: the average number of bytes per second since the start
+        :rtype: float
+        """
+
+        elapsed = perf_counter() - self.time_start
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def received(self, size):
+        with self.lock:
+            self.bytes += size
+            # Only a terminal line is refreshed while downloading, to not flood redirected output.
+            if self.stream.isatty() and perf_counter() - self.last_refresh >= self.REFRESH_INTERVAL:
+                self.last_refresh = perf_counter()
+                self.stream.write(f'\r{self.status()}')
+                self.stream.flush()
+
+    def finished(self, resource, skipped=False):
+        with self.lock:
+            self.done += 1
+            if skipped:
+                self.skipped += 1
+            state = 'already present' if skipped else 'fetched'
+            self.stream.write(f'\r{self.status()} | {state}: {resource.output_file}\n')
+            self.stream.flush()
+
+    def status(self):
+        """
+        :return: a single line with the progress
+        :rtype: str
+        """
+
+        return f'fetched {self.done}/{self.total} | {self.bytes / 1e6:.1f} MB | {self.throughput / 1e6:.2f} MB/s'
+
+    def summary(self):
+        """
+        :return: the total amount of data & throughput of all downloads
+        :rtype: str
+        """
+
+        return f'Fetched {self.total - self.skipped} resource(s) ({self.skipped} already present): ' \
+               f'{self.bytes / 1e6:.1f} MB in {perf_counter() - self.time_start:.1f}s ' \
+               f'({self.throughput / 1e6:.2f} MB/s)'
+
+
+class ResourceFetcher:
+    """
+    Downloads resources concurrently on a thread pool. All downloads share a single session, so connections to a host
+    are reused, and at most `per_host` downloads run simultaneously per host. Each file is written next to its output
+    file first & only renamed to it once complete, so a resource that is present was fetched completely (& is skipped).
+    An archive is extracted into its (possibly existing) output directory, after which a marker is written to it (see
+    :attr:`Resource.completion_file`).
+    """
+
+    def __init__(self, workers=4, per_host=2, session=None):
+        """
+        :param workers: the maximum number of downloads running simultaneously
+        :type workers: int
+        :param per_host: the maximum number of downloads running simultaneously per host
+        :type per_host: int
+        :param session: the session to download with (default: a new session)
+        :type session: requests.Session | None
+        """
+
+        self.workers = workers
+        self.per_host = per_host
+        self.session = session if session is not None else requests.Session()
+        # Keeps as many connections per host open as may be used simultaneously.
+        adapter = HTTPAdapter(pool_maxsize=per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.host_limits = {}
+        self.lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.session.close()
+
+    def fetch(self, resources, stream=stderr):
+        """
+        :param resources: the resources to download
+        :type resources: list[Resource]
+        :param stream: the stream to write the progress to
+        :return: the progress (with the totals of all downloads)
+        :rtype: FetchProgress
+        :raises OSError: if a resource could not be downloaded (the other downloads that already started are finished,
+                         the ones that did not are cancelled)
+        :raises tarfile.TarError: if an archive could not be extracted
+        """
+
+        progress = FetchProgress(len(resources), stream)
+        failed = Event()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.__fetch_resource, resource, progress, failed) for resource in resources]
+            errors = []
+            for future in futures:
+                try:
+                    future.result()
+                except (OSError, tarfile.TarError) as e:
+                    errors.append(e)
+        if errors:
+            raise errors[0]
+        return progress
+
+    def __fetch_resource(self, resource, progress, failed):
+        """
+        Downloads a single resource (within a worker thread).
+
+        :param resource: the resource
+        :type resource: Resource
+        :param progress: the progress to report to
+        :type progress: FetchProgress
+        :param failed: set once any download failed (to not start the remaining ones)
+        :type failed: Event
+        """
+
+        if failed.is_set():
+            return
+        if exists(resource.completion_file):
+            progress.finished(resource, skipped=True)
+            return
+
+        output_file = resource.output_file.rstrip('/')
+        makedirs(dirname(output_file) or '.', exist_ok=True)
+        partial_file = output_file + '.part'
+        try:
+            with self.__host_limit(resource.host):
+                with self.session.get(resource.url, allow_redirects=True, stream=True) as r:
+                    r.raise_for_status()
+                    with open(partial_file, 'wb') as file_writer:
+                        for chunk in r.iter_content(CHUNK_SIZE):
+                            file_writer.write(chunk)
+                            progress.received(len(chunk))
+
+            if resource.extract:
+                # Only marked as complete once fully extracted (an interrupted extraction is redone the next time).
+                try:
+                    with tarfile.open(partial_file, 'r:gz') as archive:
+                        archive.extractall(path=output_file)
+                finally:
+                    remove(partial_file)
+                open(resource.completion_file, 'w').close()
+            else:
+                replace(partial_file, output_file)
+        except BaseException:
+            # Does not start the remaining downloads.
+            failed.set()
+            if exists(partial_file):
+                remove(partial_file)
+            raise
+        progress.finished(resource)
+
+    def __host_limit(self, host):
+        """
+        :param host: a host (& port)
+        :type host: str
+        :return: the semaphore limiting the simultaneous downloads from the host
+        :rtype: BoundedSemaphore
+        """
+
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = BoundedSemaphore(self.per_host)
+            return self.host_limits[host]
+
+
+def fetch_resources(resources, workers=4, per_host=2, stream=stderr):
+    """
+    Downloads resources concurrently (see :class:`ResourceFetcher`).
+
+    :param resources: the resources to download
+    :type resources: list[Resource]
+    :param workers: the maximum number of downloads running simultaneously
+    :type workers: int
+    :param per_host: the maximum number of downloads running simultaneously per host
+    :type per_host: int
+    :param stream: the stream to write the progress to
+    :return: the progress (with the totals of all downloads)
+    :rtype: FetchProgress
+    """
+
+    with ResourceFetcher(workers, per_host) as fetcher:
+        return fetcher.fetch(resources, stream)
+
+
+def read_resources(manifest_file):
+    """
+    Reads a list of resources (YAML):
+
+    .. code-block:: yaml
+
+        resources:
+          - url: http://purl.obolibrary.org/obo/hp.obo
+            output: /path/to/hp.obo
+          - url: https://example.org/vibe-5.0.0.hdt.tar.gz
+            output: /path/to/vibe_data/
+            extract: true     # extracts the archive into output (default: false)
+
+    :param manifest_file: path to the manifest
+    :type manifest_file: str
+    :return: the resources
+    :rtype: list[Resource]
+    """
+
+    with open(manifest_file) as file_reader:
+        manifest = yaml.safe_load(file_reader)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('resources'), list):
+        raise ValueError(f'"{manifest_file}" should contain a list of resources')
+
+    resources = []
+    for i, entry in enumerate(manifest['resources'], start=1):
+        if not isinstance(entry, dict) or 'url' not in entry or 'output' not in entry:
+            raise ValueError(f'resource {i} should have a url & output')
+        resources.append(Resource(str(entry['url']), str(entry['output']), bool(entry.get('extract', False))))
+    if len({resource.output_file.rstrip('/') for resource in resources}) != len(resources):
+        raise ValueError('each resource should have a different output')
+    return resources
 
 
 def bytes_file_downloader(file_url, download_path):
@@ -18,9 +324,9 @@ def bytes_file_downloader(file_url, download_path):
     """
     file_path = download_path + file_url.split('/')[-1]
 
-    with requests.get(file_url, allow_redirects=True) as r:
-        with open(file_path, 'xb') as file_writer:
-            file_writer.write(r.content)
+    if exists(file_path):
+        raise FileExistsError(f'File exists: {file_path}', file_path)
+    fetch_resources([Resource(file_url, file_path)], workers=1)
     return file_path
 
 
@@ -47,4 +353,3 @@ def archive_downloader(file_url, download_path):
         raise ValueError('Unsupported archive format.')
 
     remove(file_path)
-
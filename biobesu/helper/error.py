@@ -3,3 +3,26 @@
 class FileContentError(Exception):
     """ The content of a file is not coherent of what is expected """
     pass
+
+
+class BenchmarkInputError(FileContentError):
+    """ The benchmark input contains one or more problems """
+
+    # Maximum number of problems shown in the message.
+    max_shown = 25
+
+    def __init__(self, benchmark_file, problems):
+        """
+        :param benchmark_file: the benchmark file containing the problems
+        :type benchmark_file: str
+        :param problems: all problems found in the benchmark file
+        :type problems: list[str]
+        """
+
+        self.benchmark_file = benchmark_file
+        self.problems = problems
+        message = f'{len(problems)} problem(s) found in "{benchmark_file}":\n' + \
+                  '\n'.join(problems[:self.max_shown])
+        if len(problems) > self.max_shown:
+            message += f'\n... and {len(problems) - self.max_shown} more'
+        super().__init__(message)
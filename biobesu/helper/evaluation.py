@@ -0,0 +1,252 @@
+#!/user/bin/env python3
+
+from biobesu.helper.parallel import process_pool
+import numpy as np
+
+# Number of resamples/permutations generated at once (limits memory usage to chunk size * number of cases). Also used
+# by the other resampling helpers (see `sampling` & `perfdiff`).
+CHUNK_SIZE = 250
+
+
+def read_benchmark_genes(benchmark_file, gene_column=1):
+    """
+    :param benchmark_file: a benchmark file (id, gene & phenotypes columns with a header)
+    :type benchmark_file: str
+    :param gene_column: the column containing the gene that should be found
+    :type gene_column: int
+    :return: the expected gene per case id
+    :rtype: dict[str, str]
+    """
+
+    genes = {}
+    with open(benchmark_file) as file_reader:
+        next(file_reader)
+        for line in file_reader:
+            line = line.rstrip('\n').split('\t')
+            genes[line[0]] = line[gene_column]
+    return genes
+
+
+def read_results(result_file):
+    """
+    :param result_file: a merged result file (id & comma-separated ranked genes columns with a header)
+    :type result_file: str
+    :return: the ranked genes per case id
+    :rtype: dict[str, list[str]]
+    """
+
+    results = {}
+    with open(result_file) as file_reader:
+        next(file_reader)
+        for line in file_reader:
+            line = line.rstrip('\n').split('\t')
+            results[line[0]] = [gene for gene in line[1].split(',') if gene != ''] if len(line) > 1 else []
+    return results
+
+
+def ranks(expected_genes, results, case_ids):
+    """
+    :param expected_genes: the expected gene per case id
+    :type expected_genes: dict[str, str]
+    :param results: the ranked genes per case id
+    :type results: dict[str, list[str]]
+    :param case_ids: the cases to retrieve the rank for
+    :type case_ids: list[str]
+    :return: the (1-based) rank of the expected gene per case (inf if not found or the case has no result)
+    :rtype: np.ndarray
+    """
+
+    case_ranks = np.full(len(case_ids), np.inf)
+    for i, case_id in enumerate(case_ids):
+        try:
+            case_ranks[i] = results.get(case_id, []).index(expected_genes[case_id]) + 1
+        except ValueError:
+            pass
+    return case_ranks
+
+
+def metric_names(ks):
+    """
+    :param ks: the cut-offs for recall@k
+    :type ks: list[int]
+    :return: the names of the metrics as calculated by :func:`metrics`
+    :rtype: list[str]
+    """
+
+    return [f'recall@{k}' for k in ks] + ['mean_rank']
+
+
+def metrics(case_ranks, ks, weights=None):
+    """
+    Calculates recall@k for each k & the mean rank (of the cases for which the gene was found) for one or more
+    samples of cases.
+
+    :param case_ranks: the ranks, either of a single sample (1D) or of multiple samples (2D, a sample per row)
+    :type case_ranks: np.ndarray
+    :param ks: the cut-offs for recall@k
+    :type ks: list[int]
+    :param weights: the weight of each case (for example, for a stratified sample), in the shape of case_ranks (or of
+                    its last axis). None weighs all cases equally
+    :type weights: np.ndarray | None
+    :return: the metrics (as ordered by :func:`metric_names`), as last axis
+    :rtype: np.ndarray
+    """
+
+    found = np.isfinite(case_ranks)
+    if weights is None:
+        found_count = found.sum(axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_rank = np.where(found, case_ranks, 0).sum(axis=-1) / found_count
+        return np.stack([(case_ranks <= k).mean(axis=-1) for k in ks] + [mean_rank], axis=-1)
+
+    weights = np.broadcast_to(weights, case_ranks.shape)
+    total = weights.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_rank = (weights * np.where(found, case_ranks, 0)).sum(axis=-1) / (weights * found).sum(axis=-1)
+    return np.stack([(weights * (case_ranks <= k)).sum(axis=-1) / total for k in ks] + [mean_rank], axis=-1)
+
+
+def __bootstrap_chunk(case_ranks, ks, resamples, seed):
+    """
+    :return: the metrics for a chunk of bootstrap resamples (a row per resample)
+    :rtype: np.ndarray
+    """
+
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(case_ranks), size=(resamples, len(case_ranks)), dtype=np.int32)
+    return metrics(case_ranks[indices], ks)
+
+
+def __permutation_chunk(differences, permutations, seed):
+    """
+    :return: the mean difference for a chunk of random sign flips (a value per permutation & metric)
+    :rtype: np.ndarray
+    """
+
+    rng = np.random.default_rng(seed)
+    signs = rng.integers(0, 2, size=(permutations, differences.shape[0]), dtype=np.int8) * 2 - 1
+    return np.stack([(signs * differences[:, i]).mean(axis=1) for i in range(differences.shape[1])], axis=-1)
+
+
+def __chunked(function, arguments, total, seed, workers):
+    """
+    Runs a function for chunks of resamples, each with its own seed (so that the outcome does not depend on the
+    number of workers).
+
+    :return: the concatenated results
+    :rtype: np.ndarray
+    """
+
+    chunks = [min(CHUNK_SIZE, total - start) for start in range(0, total, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    if workers > 1 and len(chunks) > 1:
+        with process_pool(workers) as executor:
+            futures = [executor.submit(function, *arguments, size, chunk_seed)
+                       for size, chunk_seed in zip(chunks, seeds)]
+            return np.concatenate([future.result() for future in futures])
+    return np.concatenate([function(*arguments, size, chunk_seed) for size, chunk_seed in zip(chunks, seeds)])
+
+
+def sign_flip_means(differences, permutations=10000, seed=0, workers=1):
+    """
+    The null distribution of a paired sign-flip permutation test: the mean differences after randomly flipping the
+    sign of the per-case differences. Whether the test is one- or two-sided only depends on how the observed mean is
+    compared with these.
+
+    :param differences: the per-case differences (a row per case & a column per metric)
+    :type differences: np.ndarray
+    :param permutations: the number of random sign flips
+    :type permutations: int
+    :param seed: seed for the sign flips
+    :type seed: int
+    :param workers: the number of processes to use
+    :type workers: int
+    :return: the mean difference per permutation & metric
+    :rtype: np.ndarray
+    """
+
+    return __chunked(__permutation_chunk, (differences,), permutations, seed, workers)
+
+
+def bootstrap_metrics(case_ranks, ks, resamples=10000, confidence=0.95, seed=0, workers=1):
+    """
+    Calculates the metrics with percentile bootstrap confidence intervals.
+
+    :param case_ranks: the rank per case
+    :type case_ranks: np.ndarray
+    :param ks: the cut-offs for recall@k
+    :type ks: list[int]
+    :param resamples: the number of bootstrap resamples
+    :type resamples: int
+    :param confidence: the confidence level (0-1)
+    :type confidence: float
+    :param seed: seed for resampling
+    :type seed: int
+    :param workers: the number of processes to use
+    :type workers: int
+    :return: per metric (as ordered by :func:`metric_names`): estimate, lower bound & upper bound
+    :rtype: np.ndarray
+    """
+
+    estimates = metrics(case_ranks, ks)
+    resampled = __chunked(__bootstrap_chunk, (case_ranks, ks), resamples, seed, workers)
+    tail = (1 - confidence) / 2 * 100
+    # Resamples without any found case have no mean rank & are ignored for its interval.
+    with np.errstate(invalid='ignore'):
+        bounds = np.nanpercentile(resampled, [tail, 100 - tail], axis=0)
+    return np.column_stack([estimates, bounds[0], bounds[1]])
+
+
+def paired_permutation_test(case_ranks_a, case_ranks_b, ks, permutations=10000, seed=0, workers=1):
+    """
+    Tests per metric whether 2 tools differ, with a two-sided paired sign-flip permutation test over the same cases.
+    For recall@k, the per-case differences of whether the gene was found within the top k are used. For the mean
+    rank, only the cases for which both tools found the gene are used.
+
+    :param case_ranks_a: the rank per case of the first tool
+    :type case_ranks_a: np.ndarray
+    :param case_ranks_b: the rank per case of the second tool (same case order)
+    :type case_ranks_b: np.ndarray
+    :param ks: the cut-offs for recall@k
+    :type ks: list[int]
+    :param permutations: the number of random sign flips
+    :type permutations: int
+    :param seed: seed for the sign flips
+    :type seed: int
+    :param workers: the number of processes to use
+    :type workers: int
+    :return: per metric (as ordered by :func:`metric_names`): observed difference (a - b), p-value & number of cases
+    :rtype: list[tuple[float, float, int]]
+    """
+
+    results = []
+
+    # Recall@k (all cases).
+    differences = np.stack([(case_ranks_a <= k).astype(float) - (case_ranks_b <= k) for k in ks], axis=-1)
+    permuted = sign_flip_means(differences, permutations, seed, workers)
+    for i in range(len(ks)):
+        results.append(__p_value(differences[:, i], permuted[:, i]))
+
+    # Mean rank (cases found by both tools).
+    both_found = np.isfinite(case_ranks_a) & np.isfinite(case_ranks_b)
+    rank_differences = (case_ranks_a[both_found] - case_ranks_b[both_found]).reshape(-1, 1)
+    if len(rank_differences) == 0:
+        results.append((float('nan'), float('nan'), 0))
+    else:
+        permuted = sign_flip_means(rank_differences, permutations, seed, workers)
+        results.append(__p_value(rank_differences[:, 0], permuted[:, 0]))
+
+    return results
+
+
+def __p_value(differences, permuted_means):
+    """
+    :return: the observed mean difference, the two-sided p-value & the number of cases
+    :rtype: tuple[float, float, int]
+    """
+
+    observed = differences.mean()
+    # Small tolerance so that permutations identical to the observed value (up to rounding) are counted.
+    extreme = np.count_nonzero(np.abs(permuted_means) >= abs(observed) - 1e-12)
+    return float(observed), (extreme + 1) / (len(permuted_means) + 1), len(differences)
@@ -0,0 +1,542 @@
+#!/user/bin/env python3
+
+from collections import deque
+from os import WEXITSTATUS
+from os import WIFSIGNALED
+from os import WTERMSIG
+from os import wait4
+from os.path import isfile
+from queue import Empty
+from queue import Queue
+from shlex import split
+from subprocess import Popen
+from subprocess import STDOUT
+from threading import Thread
+from time import perf_counter
+from time import time
+from biobesu.helper import gc_log
+from biobesu.helper.admission import AdmissionController
+from biobesu.helper.generic import create_dir
+from biobesu.helper.metrics import DEFAULT_INTERVAL
+from biobesu.helper.metrics import current_exporter
+from biobesu.helper.trace import BEGIN
+from biobesu.helper.trace import END
+from biobesu.helper.trace import create_tracer
+
+# Used only for docstring
+from argparse import ArgumentParser
+from typing import Callable
+from biobesu.helper.gc_log import GcSummary
+from biobesu.helper.pool import WorkerPool
+from biobesu.helper.scratch import ScratchSpace
+from biobesu.helper.timing import CpuSetAllocator
+from biobesu.helper.timing import TimingMode
+from biobesu.helper.trace import Tracer
+
+
+class Case:
+    """
+    A single tool invocation (`java -jar <jar> <arguments>`) for a benchmark case.
+    """
+
+    def __init__(self, case_id, jar, arguments, output_file=None):
+        """
+        :param case_id: the identifier of the case (should be unique within a run)
+        :type case_id: str
+        :param jar: path to the jar file of the tool
+        :type jar: str
+        :param arguments: the tool arguments
+        :type arguments: str
+        :param output_file: the output file the tool is expected to create
+        :type output_file: str | None
+        """
+
+        self.case_id = case_id
+        self.jar = jar
+        self.arguments = arguments
+        self.output_file = output_file
+
+        # The process ID of the tool run (set by the executor when launched).
+        self.pid = None
+
+
+class CaseResult:
+    """
+    The outcome of a :class:`Case` execution.
+    """
+
+    def __init__(self, case, return_code, wall_time, log_file, cpu_time=0.0, peak_memory=0.0, cpu_set=None,
+                 problem=None, gc=None):
+        """
+        :param case: the executed case
+        :type case: Case
+        :param return_code: the return code of the process (negative if killed by a signal)
+        :type return_code: int
+        :param wall_time: the elapsed time in seconds
+        :type wall_time: float
+        :param log_file: the file containing the output of the process
+        :type log_file: str
+        :param cpu_time: the used CPU time (user + system) in seconds
+        :type cpu_time: float
+        :param peak_memory: the peak resident memory in MB
+        :type peak_memory: float
+        :param cpu_set: the CPUs the case was pinned to (None if not pinned)
+        :type cpu_set: tuple[int] | None
+        :param problem: why the output of the case is invalid, even though the process succeeded (None if valid)
+        :type problem: str | None
+        :param gc: the summary of the GC log of the case (None if not logged)
+        :type gc: GcSummary | None
+        """
+
+        self.case = case
+        self.return_code = return_code
+        self.wall_time = wall_time
+        self.log_file = log_file
+        self.cpu_time = cpu_time
+        self.peak_memory = peak_memory
+        self.cpu_set = cpu_set
+        self.problem = problem
+        self.gc = gc
+
+    @property
+    def failed(self):
+        return self.return_code != 0 or self.problem is not None
+
+
+class ExecutionListener:
+    """
+    Superclass for objects that want to be notified by a :class:`CaseExecutor`. All methods do nothing by default.
+    """
+
+    def case_started(self, case):
+        """
+        :param case: the case that was launched
+        :type case: Case
+        """
+        pass
+
+    def case_finished(self, result):
+        """
+        :param result: the result of the case that finished
+        :type result: CaseResult
+        """
+        pass
+
+    def run_finished(self):
+        pass
+
+
+class TimesWriter(ExecutionListener):
+    """
+    Writes the wall time of each finished case to an opened file.
+    """
+
+    def __init__(self, times_writer):
+        self.times_writer = times_writer
+
+    def case_finished(self, result):
+        self.times_writer.write(f'{result.case.case_id}\t{result.wall_time}\n')
+        self.times_writer.flush()
+
+
+class ResourcesWriter(ExecutionListener):
+    """
+    Writes the return code, wall time, CPU time, peak memory & GC summary (empty if not logged, see `--gc_logging`) of
+    each finished case to an opened file (see `biobesu perfdiff`).
+    """
+
+    HEADER = '\t'.join(['id', 'return_code', 'wall_time', 'cpu_time', 'peak_memory'] + gc_log.FIELDS) + '\n'
+
+    def __init__(self, resources_writer):
+        self.resources_writer = resources_writer
+
+    def case_finished(self, result):
+        # Invalid output counts as failed.
+        return_code = -1 if result.failed and result.return_code == 0 else result.return_code
+        gc = result.gc.values() if result.gc is not None else [''] * len(gc_log.FIELDS)
+        values = [result.case.case_id, return_code, result.wall_time, result.cpu_time, result.peak_memory] + gc
+        self.resources_writer.write('\t'.join(str(value) for value in values) + '\n')
+        self.resources_writer.flush()
+
+
+class TraceListener(ExecutionListener):
+    """
+    Traces the tool runs of an executor. Each running case occupies a worker slot (the lowest free one), so the
+    timeline shows a row per slot.
+    """
+
+    def __init__(self, tracer):
+        """
+        :param tracer: the tracer to write the events with
+        :type tracer: Tracer
+        """
+
+        self.tracer = tracer
+        self.time_created = time()
+        self.workers = {}
+
+    def case_started(self, case):
+        worker = next(worker for worker in range(1, len(self.workers) + 2) if worker not in self.workers.values())
+        self.workers[case.case_id] = worker
+        # Queued is the time from the start of the execution until the case was launched.
+        now = time()
+        self.tracer.event(BEGIN, case.case_id, 'case', worker=worker, case_id=case.case_id, pid=case.pid,
+                          args={'queued': round(now - self.time_created, 6)}, timestamp=now)
+
+    def case_finished(self, result):
+        worker = self.workers.pop(result.case.case_id)
+        args = {'return_code': result.return_code, 'cpu_time': round(result.cpu_time, 6),
+                'peak_memory': round(result.peak_memory, 1)}
+        if result.gc is not None:
+            args.update(gc_pause_time=round(result.gc.gc_pause_time, 6), gc_pauses=result.gc.gc_pauses)
+        self.tracer.event(END, result.case.case_id, 'case', worker=worker, case_id=result.case.case_id,
+                          pid=result.case.pid, args=args)
+
+
+class CaseExecutor:
+    """
+    Executes cases as separate processes. The output (stdout & stderr) of each case is written to its own log file so
+    that output of different cases is never interleaved.
+    """
+
+    # Maximum seconds between attempts to start pending cases (a finished case is handled as soon as it exits).
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, java, log_dir, max_workers=1, listeners=None, jvm_options=None, memory_limit=None,
+                 admission=None, cpu_sets=None, scratch=None, validator=None, pool=None, pool_weight=1,
+                 gc_logging=False):
+        """
+        :param java: the java executable
+        :type java: str
+        :param log_dir: directory to write the per-case log files to
+        :type log_dir: str
+        :param max_workers: the maximum number of cases to run simultaneously
+        :type max_workers: int
+        :param listeners: objects to notify about the progress
+        :type listeners: list[ExecutionListener] | None
+        :param jvm_options: options given to java before `-jar`
+        :type jvm_options: list[str] | None
+        :param memory_limit: the maximum address space per process in MB (None for no limit)
+        :type memory_limit: int | None
+        :param admission: decides whether additional cases can be started (besides max_workers)
+        :type admission: AdmissionController | None
+        :param cpu_sets: if given, each case is pinned to a CPU set of its own (limiting the number of simultaneous cases
+                         to the number of sets)
+        :type cpu_sets: CpuSetAllocator | None
+        :param scratch: if given, each case writes its temporary files to its own directory within the scratch space,
+                        which is removed once the case finished (and all listeners are notified)
+        :type scratch: ScratchSpace | None
+        :param validator: checks the output file of each successful case, returning why it is invalid (or None if it is
+                          valid). Cases with invalid output count as failed
+        :type validator: Callable[[str], str | None] | None
+        :param pool: if given, each case also needs pool_weight slots of this pool (shared with other executors)
+        :type pool: WorkerPool | None
+        :param pool_weight: the number of pool slots a case of this executor occupies
+        :type pool_weight: int
+        :param gc_logging: whether each case writes a GC & safepoint log (next to its log file), which is summarized in
+                           its result
+        :type gc_logging: bool
+        """
+
+        self.java = java
+        self.log_dir = log_dir
+        self.max_workers = max_workers
+        self.listeners = listeners or []
+        self.jvm_options = jvm_options or []
+        self.memory_limit = memory_limit
+        self.admission = admission
+        self.cpu_sets = cpu_sets
+        self.scratch = scratch
+        self.validator = validator
+        self.pool = pool
+        self.pool_weight = pool_weight
+        self.gc_logging = gc_logging
+
+    def command(self, case):
+        """
+        :param case: the case to generate the command for
+        :type case: Case
+        :return: the command to execute the case
+        :rtype: list[str]
+        """
+
+        scratch_options = self.scratch.jvm_options(case) if self.scratch is not None else []
+        gc_options = gc_log.jvm_options(self.gc_log_file(case)) if self.gc_logging else []
+        return [self.java] + self.jvm_options + scratch_options + gc_options + ['-jar', case.jar] + \
+            split(case.arguments)
+
+    def log_file(self, case):
+        return f'{self.log_dir}{case.case_id}.log'
+
+    def gc_log_file(self, case):
+        return f'{self.log_dir}{case.case_id}.gc.log'
+
+    def run(self, cases):
+        """
+        Executes the cases in the given order.
+
+        :param cases: the cases to execute
+        :type cases: list[Case]
+        :return: the results, in order of completion
+        :rtype: list[CaseResult]
+        """
+
+        pending = deque(cases)
+        running = {}
+        results = []
+        # The exit status, resource usage & end time of each finished process (see `__wait`).
+        exits = Queue()
+
+        try:
+            while pending or running:
+                while pending and len(running) < self.max_workers and self.__admit(running):
+                    self.__launch(pending.popleft(), running, exits)
+                self.__reap(running, results, exits)
+        finally:
+            # Only has running cases left when interrupted.
+            for case, process, time_start, log_writer, cpu_set in running.values():
+                process.kill()
+                process.wait()
+                log_writer.close()
+                if self.pool is not None:
+                    self.pool.release(self.pool_weight)
+            if self.pool is not None:
+                self.pool.withdraw(self)
+
+        for listener in self.listeners:
+            listener.run_finished()
+
+        return results
+
+    def __admit(self, running):
+        if (self.cpu_sets is not None and not self.cpu_sets.available()) or \
+                (self.admission is not None and not self.admission.admit(list(running))):
+            # Does not hold up other executors in the pool while this one can not start a case anyway.
+            if self.pool is not None:
+                self.pool.withdraw(self)
+            return False
+        return self.pool is None or self.pool.try_acquire(self, self.pool_weight)
+
+    def __preexec(self, cpu_set):
+        """
+        :param cpu_set: the CPUs to pin the process to (None to not pin it)
+        :type cpu_set: tuple[int] | None
+        :return: the function to execute in the child process before the tool is started (None if there is nothing to
+                 do, as such a function is unsafe while other threads are running, see `biobesu campaign`)
+        :rtype: Callable | None
+        """
+
+        if self.memory_limit is None and cpu_set is None:
+            return None
+
+        # Imported only when used, as these are not available on every platform (see `create_timing_mode`), and
+        # before forking, so the child does not need to import anything.
+        if self.memory_limit is not None:
+            from resource import RLIMIT_AS
+            from resource import setrlimit
+            limit = self.memory_limit * 1024 * 1024
+        if cpu_set is not None:
+            from os import sched_setaffinity
+
+        def preexec():
+            if self.memory_limit is not None:
+                setrlimit(RLIMIT_AS, (limit, limit))
+            if cpu_set is not None:
+                sched_setaffinity(0, cpu_set)
+
+        return preexec
+
+    def __launch(self, case, running, exits):
+        """
+        Starts a case without waiting for it to finish.
+        """
+
+        cpu_set = self.cpu_sets.acquire() if self.cpu_sets is not None else None
+        log_writer = open(self.log_file(case), 'w')
+        time_start = perf_counter()
+        process = Popen(self.command(case), stdout=log_writer, stderr=STDOUT, preexec_fn=self.__preexec(cpu_set))
+        running[process.pid] = (case, process, time_start, log_writer, cpu_set)
+        case.pid = process.pid
+        Thread(target=self.__wait, args=(process.pid, exits), daemon=True).start()
+
+        if self.admission is not None:
+            self.admission.case_started(case)
+        for listener in self.listeners:
+            listener.case_started(case)
+
+    @staticmethod
+    def __wait(pid, exits):
+        """
+        Waits (in its own thread) for a process to exit, so its end time does not depend on when it is collected.
+
+        :param pid: the process id
+        :type pid: int
+        :param exits: queue to put the process id, exit status, resource usage & end time on
+        :type exits: Queue
+        """
+
+        try:
+            pid_done, status, rusage = wait4(pid, 0)
+        except ChildProcessError:
+            # Already reaped while the execution was interrupted.
+            return
+        exits.put((pid, status, rusage, perf_counter()))
+
+    def __reap(self, running, results, exits):
+        """
+        Collects the cases that finished, waiting at most `POLL_INTERVAL` seconds for the first one.
+
+        :return: whether any case finished
+        :rtype: bool
+        """
+
+        finished = False
+
+        try:
+            finished_processes = [exits.get(timeout=self.POLL_INTERVAL)]
+        except Empty:
+            return finished
+        while not exits.empty():
+            finished_processes.append(exits.get_nowait())
+
+        for pid, status, rusage, time_end in finished_processes:
+            case, process, time_start, log_writer, cpu_set = running.pop(pid)
+            wall_time = time_end - time_start
+            log_writer.close()
+            if cpu_set is not None:
+                self.cpu_sets.release(cpu_set)
+            if self.pool is not None:
+                self.pool.release(self.pool_weight)
+
+            # Process is reaped through wait4, so its return code is set manually.
+            process.returncode = -WTERMSIG(status) if WIFSIGNALED(status) else WEXITSTATUS(status)
+            # ru_maxrss is in KB on Linux.
+            result = CaseResult(case, process.returncode, wall_time, self.log_file(case),
+                                cpu_time=rusage.ru_utime + rusage.ru_stime, peak_memory=rusage.ru_maxrss / 1024,
+                                cpu_set=cpu_set)
+            if self.gc_logging and isfile(self.gc_log_file(case)):
+                result.gc = gc_log.GcSummary.read(self.gc_log_file(case))
+            if result.return_code == 0 and self.validator is not None and case.output_file is not None:
+                result.problem = self.validator(case.output_file)
+                if result.problem is not None:
+                    with open(self.log_file(case), 'a') as log_writer:
+                        log_writer.write(f'\nInvalid output: {result.problem}\n')
+            results.append(result)
+            finished = True
+
+            if self.admission is not None:
+                self.admission.case_finished(result)
+            for listener in self.listeners:
+                listener.case_finished(result)
+            if self.scratch is not None:
+                self.scratch.release(case)
+
+        return finished
+
+
+def add_execution_arguments(parser):
+    """
+    Adds the command line arguments that define how cases are executed.
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    """
+
+    parser.add_argument('--java', default='java', help='java executable to use (default: java)')
+    parser.add_argument('--log_dir', help='directory to write per-case tool output to (default: <output>/logs/)')
+    parser.add_argument('--progress_file',
+                        help='file to keep machine-readable progress in (default: <output>/progress.json)')
+    parser.add_argument('--max_workers', type=int, default=1,
+                        help='maximum number of tool runs executed simultaneously (default: 1). The actual number is '
+                             'adjusted to the available memory and load')
+    parser.add_argument('--case_memory', type=int,
+                        help='heap size (-Xmx) per tool run in MB (default: JVM default). Without it, the memory '
+                             'footprint per run is learned from finished runs')
+    parser.add_argument('--memory_reserve', type=int, default=1024,
+                        help='memory in MB that is kept available for other processes (default: 1024)')
+    parser.add_argument('--max_load', type=float,
+                        help='no new tool runs are started above this load average (default: number of CPUs)')
+    parser.add_argument('--memory_limit', type=int,
+                        help='hard address space limit per tool run in MB (default: none). Should be well above '
+                             '--case_memory, as a JVM reserves more than its heap')
+    parser.add_argument('--metrics_file',
+                        help='.prom file to periodically write Prometheus metrics to, for example for the textfile '
+                             'collector of node_exporter (default: no metrics)')
+    parser.add_argument('--metrics_interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'seconds between writes of --metrics_file while tools run, also during long tool runs '
+                             f'(default: {DEFAULT_INTERVAL})')
+    parser.add_argument('--scratch_dir',
+                        help='directory (for example, on a local disk) in which each tool run gets a private directory '
+                             'for its output & temporary files (default: <output>/.scratch/). Output is only moved '
+                             'into the output directory once it is complete & valid')
+    parser.add_argument('--gc_logging', action='store_true',
+                        help='write a GC & safepoint log (JVM unified logging) per tool run next to its log file & add '
+                             'its summary (GC pause time & count, maximum heap used, allocation rate & safepoint time) '
+                             'to resources.tsv')
+    parser.add_argument('--trace',
+                        help='file to append structured trace events (JSON lines) to, which can be converted into a '
+                             'timeline with `biobesu trace` (default: no tracing)')
+
+
+def create_executor(args, output_dir, listeners=None, timing_mode=None, scratch=None, validator=None, tracer=None):
+    """
+    Creates a :class:`CaseExecutor` based on the arguments added through :func:`add_execution_arguments`.
+
+    :param args: the parsed arguments
+    :param output_dir: the output directory of the runner (used for defaults)
+    :type output_dir: str
+    :param listeners: objects to notify about the progress
+    :type listeners: list[ExecutionListener] | None
+    :param timing_mode: pins cases to CPU sets & fixes the JVM ergonomics if given
+    :type timing_mode: TimingMode | None
+    :param scratch: the scratch space for the temporary files of the cases (see :class:`CaseExecutor`)
+    :type scratch: ScratchSpace | None
+    :param validator: checks the output of successful cases (see :class:`CaseExecutor`)
+    :type validator: Callable[[str], str | None] | None
+    :param tracer: the tracer of the runner to add the cases to (default: a new tracer based on the arguments)
+    :type tracer: Tracer | None
+    :return: the executor
+    :rtype: CaseExecutor
+    """
+
+    log_dir = create_dir(args.log_dir.rstrip('/') + '/' if args.log_dir is not None else output_dir + 'logs/',
+                         exist_allowed=True)
+
+    jvm_options = []
+    cpu_sets = None
+    if timing_mode is not None:
+        jvm_options.extend(timing_mode.jvm_options())
+        cpu_sets = timing_mode.allocator
+    elif args.case_memory is not None:
+        jvm_options.append(f'-Xmx{args.case_memory}m')
+
+    if tracer is None:
+        tracer = create_tracer(args)
+    if tracer.enabled:
+        listeners = (listeners or []) + [TraceListener(tracer)]
+    if current_exporter() is not None:
+        listeners = (listeners or []) + [current_exporter()]
+
+    admission = None
+    if args.max_workers > 1:
+        heap = timing_mode.heap if timing_mode is not None else args.case_memory
+        admission = AdmissionController(heap, args.memory_reserve, args.max_load)
+
+    # Set by `biobesu campaign` for runners sharing a worker pool.
+    pool = getattr(args, 'worker_pool', None)
+    return CaseExecutor(args.java, log_dir, max_workers=args.max_workers, listeners=listeners,
+                        jvm_options=jvm_options, memory_limit=args.memory_limit, admission=admission,
+                        cpu_sets=cpu_sets, scratch=scratch, validator=validator, pool=pool,
+                        pool_weight=getattr(args, 'pool_weight', 1), gc_logging=args.gc_logging)
+
+
+def progress_file(args, output_dir):
+    """
+    :param args: the parsed arguments
+    :param output_dir: the output directory of the runner (used for defaults)
+    :type output_dir: str
+    :return: the path to the progress file
+    :rtype: str
+    """
+
+    return args.progress_file if args.progress_file is not None else output_dir + 'progress.json'
@@ -0,0 +1,165 @@
+#!/user/bin/env python3
+"""
+Stand-in for `java` that emulates LIRICAL & VIBE, so that the runners can be executed without the real tools.
+
+Usage: python3 -m biobesu.helper.fake_tools [fake tool options] [JVM options] -jar <jar> <tool arguments>
+
+The emulated tool is chosen based on the jar file name. JVM options are accepted and ignored, except for `-Xlog`
+options with a file: a synthetic (JDK 17 format) GC log is written to it.
+"""
+
+from argparse import ArgumentParser
+from random import Random
+from sys import argv
+from sys import exit
+from sys import stderr
+from time import process_time
+from time import sleep
+from zlib import crc32
+from biobesu.helper import synthetic
+
+
+def __parse_fake_arguments(arguments):
+    """
+    Parses the options that define the behaviour of the fake tools (any unknown options are seen as JVM options).
+
+    :param arguments: the command line arguments before `-jar`
+    :type arguments: list[str]
+    :return: the parsed arguments
+    """
+
+    parser = ArgumentParser(prog='fake_tools', allow_abbrev=False)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds to sleep per run')
+    parser.add_argument('--latency_jitter', type=float, default=0.0, help='maximum random seconds added to latency')
+    parser.add_argument('--cpu', type=float, default=0.0, help='CPU seconds to burn per run')
+    parser.add_argument('--memory', type=int, default=0, help='MB of memory to allocate per run')
+    parser.add_argument('--failure_rate', type=float, default=0.0, help='chance (0-1) that a run fails')
+    parser.add_argument('--seed', type=int, default=0, help='seed used for random behaviour')
+    parser.add_argument('--genes', type=int, default=1000, help='number of synthetic genes')
+    parser.add_argument('--diseases', type=int, default=1000, help='number of synthetic diseases')
+    parser.add_argument('--lirical_rows', type=int, default=100, help='number of ranked diseases per LIRICAL run')
+    parser.add_argument('--vibe_genes', type=int, default=100, help='number of suggested genes per VIBE run')
+    return parser.parse_known_args(arguments)[0]
+
+
+def __parse_lirical_arguments(arguments):
+    parser = ArgumentParser(prog='LIRICAL', allow_abbrev=False)
+    parser.add_argument('command', choices=['phenopacket'])
+    parser.add_argument('-p', '--phenopacket', required=True)
+    parser.add_argument('-o', '--outdir', required=True)
+    parser.add_argument('-x', '--prefix', required=True)
+    parser.add_argument('-d', '--data', required=True)
+    parser.add_argument('--tsv', action='store_true')
+    return parser.parse_args(arguments)
+
+
+def __parse_vibe_arguments(arguments):
+    parser = ArgumentParser(prog='VIBE', allow_abbrev=False)
+    parser.add_argument('-l', action='store_true')
+    parser.add_argument('-p', action='append', required=True)
+    parser.add_argument('-t', required=True)
+    parser.add_argument('-o', required=True)
+    parser.add_argument('-w', required=True)
+    return parser.parse_args(arguments)
+
+
+def __simulate_load(fake_args, rng):
+    """
+    Simulates the resource usage of a tool run.
+    """
+
+    if fake_args.memory > 0:
+        memory = bytearray(fake_args.memory * 1024 * 1024)
+        # Touches every page so that the memory is actually used.
+        memory[::4096] = b'\x01' * len(range(0, len(memory), 4096))
+
+    cpu_end = process_time() + fake_args.cpu
+    while process_time() < cpu_end:
+        pass
+
+    sleep(fake_args.latency + rng.uniform(0, fake_args.latency_jitter))
+
+
+def __write_gc_log(jvm_arguments, fake_args, rng):
+    """
+    Writes a synthetic GC log if the JVM options request one (see :func:`biobesu.helper.gc_log.jvm_options`).
+    """
+
+    for argument in jvm_arguments:
+        if argument.startswith('-Xlog:') and 'file=' in argument:
+            gc_log_file = argument.split('file=', 1)[1].split(':', 1)[0]
+            break
+    else:
+        return
+
+    # Young collections of the (simulated) allocated memory.
+    heap = max(fake_args.memory, 16)
+    uptime = 0.05
+    lines = ['[0.005s][info][gc] Using G1']
+    for collection in range(rng.randint(1, 5)):
+        uptime += rng.uniform(0.01, 0.1)
+        before = rng.randint(heap // 2, heap)
+        pause = rng.uniform(0.5, 5.0)
+        lines.append(f'[{uptime:.3f}s][info][gc] GC({collection}) Pause Young (Normal) (G1 Evacuation Pause) '
+                     f'{before}M->{before // 4}M({heap * 2}M) {pause:.3f}ms')
+        lines.append(f'[{uptime:.3f}s][info][safepoint] Safepoint "G1CollectForAllocation", Time since last: '
+                     f'{int(rng.uniform(1e6, 1e8))} ns, Reaching safepoint: 1000 ns, At safepoint: '
+                     f'{int(pause * 1e6)} ns, Total: {int(pause * 1e6) + 1000} ns')
+    with open(gc_log_file, 'w') as file_writer:
+        file_writer.write('\n'.join(lines) + '\n')
+
+
+def run(arguments):
+    """
+    Runs a fake tool.
+
+    :param arguments: the command line arguments (as would be given to `java`)
+    :type arguments: list[str]
+    :return: the exit code
+    :rtype: int
+    """
+
+    if '-version' in arguments and '-jar' not in arguments:
+        print('openjdk version "fake" (biobesu fake_tools)', file=stderr)
+        return 0
+
+    jar_index = arguments.index('-jar')
+    fake_args = __parse_fake_arguments(arguments[:jar_index])
+    jar = arguments[jar_index + 1].split('/')[-1]
+    tool_arguments = arguments[jar_index + 2:]
+
+    if 'lirical' in jar.lower():
+        tool_args = __parse_lirical_arguments(tool_arguments)
+        case = tool_args.prefix
+        output_file = tool_args.outdir.rstrip('/') + f'/{case}.tsv'
+    elif 'vibe' in jar.lower():
+        tool_args = __parse_vibe_arguments(tool_arguments)
+        output_file = tool_args.o
+        case = output_file.split('/')[-1]
+    else:
+        print(f'Error: no fake tool available for {jar}', file=stderr)
+        return 1
+
+    # Random behaviour is reproducible per case.
+    rng = Random(fake_args.seed * 1000003 + crc32(case.encode()))
+    print(f'Fake {jar} started for {case}')
+    __simulate_load(fake_args, rng)
+    # Separate random generator, so the output does not depend on whether a GC log is written.
+    __write_gc_log(arguments[:jar_index], fake_args, Random(crc32(case.encode())))
+
+    if rng.random() < fake_args.failure_rate:
+        print(f'Fake {jar} failed for {case}', file=stderr)
+        return 1
+
+    if 'lirical' in jar.lower():
+        synthetic.write_lirical_output_file(output_file, fake_args.lirical_rows, fake_args.genes, fake_args.diseases,
+                                            seed=rng.randrange(2 ** 32))
+    else:
+        synthetic.write_vibe_output_file(output_file, fake_args.genes, fake_args.vibe_genes,
+                                         seed=rng.randrange(2 ** 32))
+    print(f'Fake {jar} finished for {case}')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(run(argv[1:]))
@@ -0,0 +1,114 @@
+#!/user/bin/env python3
+"""
+Summarizes the JVM unified logging (`-Xlog:gc*,safepoint`) of a tool run: the total GC pause time & number of pauses,
+the maximum heap used, the allocation rate & the total time spent in safepoints. Both the JDK 11 & JDK 17+ formats
+are supported, for the G1, Parallel & Serial garbage collectors (for the Z garbage collector, only the pauses).
+"""
+
+from re import compile
+
+# The log decorations the summary depends on (uptime, level & tags, for example: "[0.012s][info][gc]").
+DECORATIONS = 'uptime,level,tags'
+
+# Columns (& order) of a summary.
+FIELDS = ['gc_pause_time', 'gc_pauses', 'max_heap_used', 'allocation_rate', 'safepoint_time']
+
+
+def jvm_options(gc_log_file):
+    """
+    :param gc_log_file: the file the JVM should write the log to (overwritten, without rotation)
+    :type gc_log_file: str
+    :return: the JVM options enabling the log
+    :rtype: list[str]
+    """
+
+    return [f'-Xlog:gc*,safepoint:file={gc_log_file}:{DECORATIONS}:filecount=0']
+
+
+class GcSummary:
+    """
+    The GC & safepoint behaviour of a single tool run.
+    """
+
+    # A log line: uptime, level (padded), tags (padded) & message.
+    LINE = compile(r'^\[([\d.]+)s\]\[\w+ *\]\[([\w,]+) *\] ?(.*)$')
+    # For example: "GC(0) Pause Young (Normal) (G1 Evacuation Pause) 24M->4M(256M) 3.456ms".
+    PAUSE = compile(r'GC\(\d+\) Pause .*?(?:(\d+)([KMG])->(\d+)([KMG])\(\d+[KMG]\) )?([\d.]+)ms$')
+    # JDK 17+: "Safepoint "...", Time since last: 1 ns, Reaching safepoint: 2 ns, At safepoint: 3 ns, Total: 5 ns".
+    SAFEPOINT = compile(r'Total: (\d+) ns$')
+    # JDK 11: "Total time for which application threads were stopped: 0.0012 seconds, Stopping threads took: ...".
+    SAFEPOINT_JDK11 = compile(r'Total time for which application threads were stopped: ([\d.]+) seconds')
+    UNITS = {'K': 1 / 1024, 'M': 1, 'G': 1024}
+
+    def __init__(self, gc_pause_time=0.0, gc_pauses=0, max_heap_used=0.0, allocation_rate=0.0, safepoint_time=0.0):
+        """
+        :param gc_pause_time: the total time of all GC pauses in seconds
+        :type gc_pause_time: float
+        :param gc_pauses: the number of GC pauses
+        :type gc_pauses: int
+        :param max_heap_used: the most heap used (before a collection) in MB
+        :type max_heap_used: float
+        :param allocation_rate: the MB allocated per second of uptime (till the last collection)
+        :type allocation_rate: float
+        :param safepoint_time: the total time the application threads were stopped for safepoints in seconds (which
+                               includes the GC pauses)
+        :type safepoint_time: float
+        """
+
+        self.gc_pause_time = gc_pause_time
+        self.gc_pauses = gc_pauses
+        self.max_heap_used = max_heap_used
+        self.allocation_rate = allocation_rate
+        self.safepoint_time = safepoint_time
+
+    def values(self):
+        """
+        :return: the values (ordered as :data:`FIELDS`)
+        :rtype: list[float]
+        """
+
+        return [getattr(self, field) for field in FIELDS]
+
+    @classmethod
+    def read(cls, gc_log_file):
+        """
+        :param gc_log_file: the log written with :func:`jvm_options`
+        :type gc_log_file: str
+        :return: the summary of the log
+        :rtype: GcSummary
+        """
+
+        summary = cls()
+        allocated = 0.0
+        heap_after = 0.0
+        last_collection = 0.0
+        with open(gc_log_file, errors='replace') as file_reader:
+            for line in file_reader:
+                match = cls.LINE.match(line.rstrip('\n'))
+                if match is None:
+                    continue
+                uptime, tags, message = float(match[1]), match[2], match[3]
+
+                if tags in ('gc', 'gc,phases'):
+                    pause = cls.PAUSE.search(message)
+                    if pause is not None:
+                        summary.gc_pauses += 1
+                        summary.gc_pause_time += float(pause[5]) / 1000
+                        if pause[1] is not None:
+                            before = int(pause[1]) * cls.UNITS[pause[2]]
+                            # Allocated since the previous collection.
+                            allocated += max(before - heap_after, 0.0)
+                            heap_after = int(pause[3]) * cls.UNITS[pause[4]]
+                            summary.max_heap_used = max(summary.max_heap_used, before)
+                            last_collection = uptime
+                elif tags == 'safepoint':
+                    safepoint = cls.SAFEPOINT.search(message)
+                    if safepoint is not None:
+                        summary.safepoint_time += int(safepoint[1]) / 1e9
+                    else:
+                        safepoint = cls.SAFEPOINT_JDK11.search(message)
+                        if safepoint is not None:
+                            summary.safepoint_time += float(safepoint[1])
+
+        summary.allocation_rate = allocated / last_collection if last_collection > 0 else 0.0
+        return summary
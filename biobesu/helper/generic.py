@@ -1,5 +1,6 @@
 #!/user/bin/env python3
 
+from hashlib import sha256
 from time import sleep
 from os import makedirs
 from sys import stderr
@@ -57,3 +58,18 @@ def eprint(*args, **kwargs):
     """
 
     print(*args, file=stderr, **kwargs)
+
+
+def file_hash(file_path):
+    """
+    :param file_path: the file to hash
+    :type file_path: str
+    :return: the SHA-256 hex digest of the file content
+    :rtype: str
+    """
+
+    digest = sha256()
+    with open(file_path, 'rb') as file_reader:
+        for block in iter(lambda: file_reader.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
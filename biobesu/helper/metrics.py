@@ -0,0 +1,260 @@
+#!/user/bin/env python3
+
+from os import replace
+from threading import Lock
+from threading import Thread
+from threading import local
+from time import sleep
+from time import time
+
+# Histogram buckets (upper bounds, +Inf is added automatically).
+TIME_BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600]
+MEMORY_BUCKETS = [2 ** power * 1024 * 1024 for power in range(6, 16)]  # 64 MB - 32 GB
+
+# Seconds between writes of the metrics file (besides when a run or stage finishes).
+DEFAULT_INTERVAL = 15
+
+# The exporter of the current runner (see :func:`start_metrics`). Per thread, as `biobesu campaign` runs each runner
+# in a thread of its own.
+__runner = local()
+
+
+def escape(value):
+    """
+    :param value: a label value
+    :type value: str
+    :return: the value escaped for the Prometheus text format
+    :rtype: str
+    """
+
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """
+    Cumulative histogram in the Prometheus sense (count of observations per upper bound, plus sum & count).
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        """
+        :return: the sample lines of the histogram
+        :rtype: list[str]
+        """
+
+        lines = [f'{name}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in zip(self.buckets, self.counts)]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class MetricsExporter:
+    """
+    Writes metrics of a runner in the Prometheus text format (for the textfile collector of node_exporter). The file
+    is replaced atomically every interval seconds while cases run (by a background thread, so that the last update
+    time shows the runner is alive also during long cases), at most every interval seconds while cases start &
+    finish and whenever a run or stage finishes.
+
+    Is notified by executors like an :class:`~biobesu.helper.execution.ExecutionListener` (it does not subclass it, as
+    the execution module uses this one).
+    """
+
+    def __init__(self, metrics_file, labels, interval=DEFAULT_INTERVAL):
+        """
+        :param metrics_file: the .prom file to write to
+        :type metrics_file: str
+        :param labels: the labels added to all metrics (for example, suite, runner & tool version)
+        :type labels: dict[str, str]
+        :param interval: the number of seconds between writes while cases run
+        :type interval: float
+        """
+
+        self.metrics_file = metrics_file
+        self.labels = ','.join(f'{key}="{escape(value)}"' for key, value in labels.items())
+        self.interval = interval
+        self.last_write = 0.0
+        # Guards the metrics, as they are also written by the background thread.
+        self.lock = Lock()
+
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.running = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.stages = {}
+        self.wall_time = Histogram(TIME_BUCKETS)
+        self.cpu_time = Histogram(TIME_BUCKETS)
+        self.peak_memory = Histogram(MEMORY_BUCKETS)
+
+        Thread(target=self.__write_periodically, daemon=True).start()
+
+    def case_started(self, case):
+        with self.lock:
+            self.started += 1
+            self.running += 1
+        self.__write_if_due()
+
+    def case_finished(self, result):
+        with self.lock:
+            self.running -= 1
+            if result.failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self.wall_time.observe(result.wall_time)
+            self.cpu_time.observe(result.cpu_time)
+            self.peak_memory.observe(result.peak_memory * 1024 * 1024)
+        self.__write_if_due()
+
+    def run_finished(self):
+        self.write()
+
+    def cases_skipped(self, count):
+        """
+        :param count: the number of cases that were not run (for example, because their output already exists)
+        :type count: int
+        """
+
+        self.skipped += count
+
+    def cache_finished(self, hits, misses):
+        """
+        :param hits: the number of cases copied from the result cache
+        :type hits: int
+        :param misses: the number of cases that had to be run
+        :type misses: int
+        """
+
+        self.cache_hits += hits
+        self.cache_misses += misses
+        self.write()
+
+    def stage_finished(self, name, duration):
+        """
+        :param name: the name of the stage
+        :type name: str
+        :param duration: the duration of the stage in seconds
+        :type duration: float
+        """
+
+        self.stages[name] = duration
+        self.write()
+
+    def lines(self):
+        """
+        :return: all metrics in the Prometheus text format
+        :rtype: list[str]
+        """
+
+        labels = self.labels
+        lines = []
+
+        def metric(name, metric_type, description, samples):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.extend(samples)
+
+        for name, value, description in [('started', self.started, 'Tool runs started.'),
+                                         ('completed', self.completed, 'Tool runs that finished successfully.'),
+                                         ('failed', self.failed, 'Tool runs that failed.'),
+                                         ('skipped', self.skipped, 'Cases skipped as their output already existed.')]:
+            metric(f'biobesu_cases_{name}_total', 'counter', description, [f'biobesu_cases_{name}_total{{{labels}}} '
+                                                                           f'{value}'])
+        metric('biobesu_cases_running', 'gauge', 'Tool runs currently running.',
+               [f'biobesu_cases_running{{{labels}}} {self.running}'])
+
+        metric('biobesu_case_wall_seconds', 'histogram', 'Wall time per tool run.',
+               self.wall_time.lines('biobesu_case_wall_seconds', labels))
+        metric('biobesu_case_cpu_seconds', 'histogram', 'CPU time (user + system) per tool run.',
+               self.cpu_time.lines('biobesu_case_cpu_seconds', labels))
+        metric('biobesu_case_peak_rss_bytes', 'histogram', 'Peak resident memory per tool run.',
+               self.peak_memory.lines('biobesu_case_peak_rss_bytes', labels))
+
+        metric('biobesu_cache_hits_total', 'counter', 'Cases copied from the result cache.',
+               [f'biobesu_cache_hits_total{{{labels}}} {self.cache_hits}'])
+        metric('biobesu_cache_misses_total', 'counter', 'Cases that were not in the result cache.',
+               [f'biobesu_cache_misses_total{{{labels}}} {self.cache_misses}'])
+        lookups = self.cache_hits + self.cache_misses
+        metric('biobesu_cache_hit_ratio', 'gauge', 'Fraction of cases copied from the result cache.',
+               [f'biobesu_cache_hit_ratio{{{labels}}} {self.cache_hits / lookups if lookups > 0 else 0}'])
+
+        metric('biobesu_stage_duration_seconds', 'gauge', 'Duration of the finished runner stages.',
+               [f'biobesu_stage_duration_seconds{{{labels},stage="{escape(name)}"}} {duration}'
+                for name, duration in self.stages.items()])
+        metric('biobesu_last_update_timestamp_seconds', 'gauge', 'Time the metrics were last written.',
+               [f'biobesu_last_update_timestamp_seconds{{{labels}}} {time()}'])
+        return lines
+
+    def write(self):
+        """
+        Replaces the metrics file atomically (so the collector never reads a partial file).
+        """
+
+        with self.lock:
+            with open(self.metrics_file + '.tmp', 'w') as file_writer:
+                file_writer.write('\n'.join(self.lines()) + '\n')
+            replace(self.metrics_file + '.tmp', self.metrics_file)
+            self.last_write = time()
+
+    def __write_if_due(self):
+        if time() - self.last_write >= self.interval:
+            self.write()
+
+    def __write_periodically(self):
+        """
+        Writes the metrics every interval seconds while cases run (executed in a background thread).
+        """
+
+        while True:
+            sleep(self.interval)
+            if self.running > 0:
+                self.__write_if_due()
+
+
+def start_metrics(args, suite, runner, tool_version):
+    """
+    Creates the metrics exporter of the current runner if requested through `--metrics_file`. The exporter is added
+    to all executors (see :func:`~biobesu.helper.execution.create_executor`) & is notified of finished stages.
+
+    :param args: the parsed arguments (see :func:`~biobesu.helper.execution.add_execution_arguments`)
+    :param suite: the name of the suite
+    :type suite: str
+    :param runner: the name of the runner
+    :type runner: str
+    :param tool_version: the version of the benchmarked tool
+    :type tool_version: str
+    :return: the exporter (None if no metrics should be written)
+    :rtype: MetricsExporter | None
+    """
+
+    __runner.exporter = None
+    if getattr(args, 'metrics_file', None) is not None:
+        __runner.exporter = MetricsExporter(args.metrics_file,
+                                            {'suite': suite, 'runner': runner, 'tool_version': tool_version},
+                                            args.metrics_interval)
+        __runner.exporter.write()
+    return __runner.exporter
+
+
+def current_exporter():
+    """
+    :return: the metrics exporter of the current runner (None if no metrics are written)
+    :rtype: MetricsExporter | None
+    """
+
+    return getattr(__runner, 'exporter', None)
@@ -0,0 +1,81 @@
+#!/user/bin/env python3
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_all_start_methods
+from multiprocessing import get_context
+
+# Used only for docstring
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+# Number of chunks per worker that are submitted ahead of the chunk whose result is awaited.
+CHUNKS_AHEAD = 2
+
+# Workers are never forked from this process, which can be running other threads (see `biobesu campaign`).
+START_METHOD = 'forkserver' if 'forkserver' in get_all_start_methods() else 'spawn'
+
+
+def process_pool(workers):
+    """
+    :param workers: the number of processes
+    :type workers: int
+    :return: a process pool that starts its workers with :data:`START_METHOD`
+    :rtype: ProcessPoolExecutor
+    """
+
+    return ProcessPoolExecutor(workers, mp_context=get_context(START_METHOD))
+
+
+def chunks(items, size):
+    """
+    Splits items into lists of at most size items (lazily, so a file can be chunked while it is read).
+
+    :param items: the items to split
+    :type items: Iterable
+    :param size: the maximum number of items per chunk
+    :type size: int
+    :return: the chunks, in order
+    :rtype: Iterator[list]
+    """
+
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(function, arguments, workers=1):
+    """
+    Calls a function for each set of arguments across a process pool, yielding the results in the order of the
+    arguments. Only a limited number of calls is submitted ahead of the result that is awaited, so memory use is bounded
+    by the number of workers instead of the number of calls (also if the arguments are a lazy iterator).
+
+    :param function: a module-level function (so it can be sent to worker processes)
+    :type function: Callable
+    :param arguments: the arguments per call (each a tuple)
+    :type arguments: Iterable[tuple]
+    :param workers: the number of processes to use (1 calls the function within this process)
+    :type workers: int
+    :return: the results, in order
+    :rtype: Iterator
+    """
+
+    if workers <= 1:
+        for call_arguments in arguments:
+            yield function(*call_arguments)
+        return
+
+    arguments = iter(arguments)
+    with process_pool(workers) as executor:
+        pending = deque(executor.submit(function, *call_arguments)
+                        for call_arguments in islice(arguments, workers * CHUNKS_AHEAD))
+        while pending:
+            result = pending.popleft().result()
+            for call_arguments in islice(arguments, 1):
+                pending.append(executor.submit(function, *call_arguments))
+            yield result
@@ -0,0 +1,287 @@
+#!/user/bin/env python3
+"""
+Detects performance regressions between 2 runs of a runner (for example, before & after upgrading a tool) per case &
+per stratum of cases (by HPO set size). A regression is a slowdown (or increase in resource usage) of more than a
+threshold that is significant after correcting for multiple testing:
+
+- per stratum: a one-sided paired sign-flip permutation test of the per-case log ratios (candidate / baseline) minus
+  log(1 + threshold)
+- per case (wall time only, if both runs have repeated timings, see `--repeats`): a one-sided two-sample permutation
+  test of the log wall times of the repetitions (the candidate ones divided by 1 + threshold)
+"""
+
+from itertools import combinations
+from math import comb
+from math import exp
+from os.path import isfile
+from biobesu.helper.evaluation import CHUNK_SIZE
+from biobesu.helper.evaluation import sign_flip_means
+from biobesu.helper.repeats import read_samples
+from biobesu.helper.runtime_model import read_times
+from biobesu.helper.sampling import SIZE_STRATA
+from biobesu.helper.sampling import size_stratum
+from biobesu.helper.stats import median
+import numpy as np
+
+# The GC metrics are only available for runs with `--gc_logging`.
+METRICS = ['wall_time', 'cpu_time', 'peak_memory', 'gc_pause_time', 'max_heap_used']
+CORRECTIONS = ['holm', 'bh']
+# Identifier of the stratum containing all cases.
+ALL_CASES = 'all'
+
+
+class RunMeasurements:
+    """
+    The measurements per case of a single run (output directory of a runner).
+    """
+
+    def __init__(self, values, samples):
+        """
+        :param values: per metric, the value per case id
+        :type values: dict[str, dict[str, float]]
+        :param samples: the wall times of the successful repetitions per case id (see `--repeats`)
+        :type samples: dict[str, list[float]]
+        """
+
+        self.values = values
+        self.samples = samples
+
+    @classmethod
+    def read(cls, run_dir):
+        """
+        Reads `resources.tsv` (successful runs only, the last one per case), or only the wall times from `times.tsv`
+        if the run has no resources file, & `timing_samples.tsv` if present. The wall time of a case with repetitions
+        is the median of its repetitions.
+
+        :param run_dir: the output directory of the run
+        :type run_dir: str
+        :return: the measurements
+        :rtype: RunMeasurements
+        :raises OSError: if the directory contains no times
+        """
+
+        values = {metric: {} for metric in METRICS}
+        if isfile(run_dir + 'resources.tsv'):
+            with open(run_dir + 'resources.tsv') as file_reader:
+                header = next(file_reader).rstrip('\n').split('\t')
+                for line in file_reader:
+                    fields = dict(zip(header, line.rstrip('\n').split('\t')))
+                    if len(fields) != len(header) or fields['return_code'] != '0':
+                        continue
+                    for metric in METRICS:
+                        # Left empty if not measured.
+                        if fields.get(metric, '') != '':
+                            values[metric][fields['id']] = float(fields[metric])
+        elif isfile(run_dir + 'times.tsv'):
+            values['wall_time'] = read_times([run_dir + 'times.tsv'])
+        else:
+            raise OSError(f'"{run_dir}" contains no resources.tsv or times.tsv')
+
+        samples = {case_id: times for case_id, (executed, times) in read_samples(run_dir + 'timing_samples.tsv').items()
+                   if times}
+        for case_id, times in samples.items():
+            values['wall_time'][case_id] = median(times)
+        return cls(values, samples)
+
+
+def holm(p_values):
+    """
+    :param p_values: the p-values of a family of tests
+    :type p_values: list[float]
+    :return: the Holm-Bonferroni adjusted p-values (same order)
+    :rtype: list[float]
+    """
+
+    adjusted = [0.0] * len(p_values)
+    running = 0.0
+    for rank, i in enumerate(sorted(range(len(p_values)), key=lambda j: p_values[j])):
+        running = max(running, min(1.0, (len(p_values) - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
+
+
+def benjamini_hochberg(p_values):
+    """
+    :param p_values: the p-values of a family of tests
+    :type p_values: list[float]
+    :return: the Benjamini-Hochberg adjusted p-values (same order)
+    :rtype: list[float]
+    """
+
+    adjusted = [0.0] * len(p_values)
+    running = 1.0
+    order = sorted(range(len(p_values)), key=lambda j: p_values[j])
+    for rank in range(len(order) - 1, -1, -1):
+        i = order[rank]
+        running = min(running, len(p_values) * p_values[i] / (rank + 1))
+        adjusted[i] = running
+    return adjusted
+
+
+def sign_flip_test(differences, permutations=10000, seed=0):
+    """
+    One-sided paired sign-flip permutation test of whether the mean difference is larger than 0.
+
+    :param differences: the paired differences
+    :type differences: np.ndarray
+    :param permutations: the number of random sign flips
+    :type permutations: int
+    :param seed: seed for the sign flips
+    :type seed: int
+    :return: the p-value
+    :rtype: float
+    """
+
+    permuted_means = sign_flip_means(differences.reshape(-1, 1), permutations, seed)[:, 0]
+    # Small tolerance so that permutations identical to the observed value (up to rounding) are counted.
+    extreme = np.count_nonzero(permuted_means >= differences.mean() - 1e-12)
+    return (extreme + 1) / (permutations + 1)
+
+
+def two_sample_tests(baselines, candidates, permutations=10000, seed=0):
+    """
+    One-sided two-sample permutation tests of whether the mean of the candidate values is larger than the mean of
+    the baseline values. Cases with the same sample sizes are tested together. If there are no more possible
+    divisions of the values than permutations, all divisions are used (an exact test).
+
+    :param baselines: per case, the baseline values
+    :type baselines: list[list[float]]
+    :param candidates: per case, the candidate values
+    :type candidates: list[list[float]]
+    :param permutations: the number of random divisions
+    :type permutations: int
+    :param seed: seed for the divisions
+    :type seed: int
+    :return: per case, the p-value
+    :rtype: list[float]
+    """
+
+    p_values = [1.0] * len(baselines)
+    groups = {}
+    for i, (baseline, candidate) in enumerate(zip(baselines, candidates)):
+        groups.setdefault((len(baseline), len(candidate)), []).append(i)
+
+    rng = np.random.default_rng(seed)
+    for (n_baseline, n_candidate), cases in groups.items():
+        n = n_baseline + n_candidate
+        # The positions of the candidate values in each division of the pooled values.
+        exact = comb(n, n_candidate) <= permutations
+        if exact:
+            divisions = np.array(list(combinations(range(n), n_candidate)))
+        else:
+            divisions = np.argsort(rng.random((permutations, n)), axis=1)[:, :n_candidate]
+
+        for start in range(0, len(cases), CHUNK_SIZE):
+            chunk = cases[start:start + CHUNK_SIZE]
+            pooled = np.array([list(candidates[i]) + list(baselines[i]) for i in chunk])
+            totals = pooled.sum(axis=1, keepdims=True)
+            candidate_sums = pooled[:, divisions].sum(axis=2)
+            statistics = candidate_sums / n_candidate - (totals - candidate_sums) / n_baseline
+            observed = pooled[:, :n_candidate].mean(axis=1) - pooled[:, n_candidate:].mean(axis=1)
+            extreme = np.count_nonzero(statistics >= observed[:, None] - 1e-12, axis=1)
+            chunk_p_values = extreme / len(divisions) if exact else (extreme + 1) / (len(divisions) + 1)
+            for i, p_value in zip(chunk, chunk_p_values):
+                p_values[i] = float(p_value)
+    return p_values
+
+
+def compare_runs(baseline, candidate, hpo_dict, threshold=0.1, alpha=0.05, correction='holm', permutations=10000,
+                 seed=0):
+    """
+    Compares 2 runs on the cases both measured successfully (see the module documentation).
+
+    :param baseline: the measurements of the baseline run
+    :type baseline: RunMeasurements
+    :param candidate: the measurements of the candidate run
+    :type candidate: RunMeasurements
+    :param hpo_dict: the HPO terms per benchmark case (for the strata)
+    :type hpo_dict: dict[str, list[str]]
+    :param threshold: the relative increase that is considered a regression (0.1 for 10%)
+    :type threshold: float
+    :param alpha: the significance level (after correction)
+    :type alpha: float
+    :param correction: the multiple testing correction (holm or bh), applied to the strata tests & case tests
+                       separately
+    :type correction: str
+    :param permutations: the number of permutations per test
+    :type permutations: int
+    :param seed: seed for the permutations
+    :type seed: int
+    :return: the stratum rows (stratum, metric, cases, ratio, p-value, adjusted p-value & whether it regressed) & the
+             case rows (id, stratum, baseline & candidate wall time, ratio, repetitions, p-value, adjusted p-value &
+             whether it regressed, p-values are None without repetitions)
+    :rtype: tuple[list[tuple], list[tuple]]
+    """
+
+    adjust = holm if correction == 'holm' else benjamini_hochberg
+    shift = np.log1p(threshold)
+    strata = [ALL_CASES] + [size_stratum(size) for size in SIZE_STRATA]
+
+    stratum_rows = []
+    for metric in METRICS:
+        # Only positive values (for example, the peak memory is 0 if it could not be measured).
+        case_ids = [case_id for case_id in hpo_dict
+                    if baseline.values[metric].get(case_id, 0) > 0 and candidate.values[metric].get(case_id, 0) > 0]
+        log_ratios = {case_id: np.log(candidate.values[metric][case_id] / baseline.values[metric][case_id])
+                      for case_id in case_ids}
+        for stratum in strata:
+            differences = np.array([log_ratio for case_id, log_ratio in log_ratios.items()
+                                    if stratum == ALL_CASES or size_stratum(len(hpo_dict[case_id])) == stratum])
+            if len(differences) == 0:
+                continue
+            p_value = sign_flip_test(differences - shift, permutations, seed)
+            stratum_rows.append([stratum, metric, len(differences), exp(differences.mean()), p_value])
+
+    case_rows = []
+    tested = []
+    for case_id in hpo_dict:
+        if case_id not in baseline.values['wall_time'] or case_id not in candidate.values['wall_time']:
+            continue
+        base_time = baseline.values['wall_time'][case_id]
+        candidate_time = candidate.values['wall_time'][case_id]
+        ratio = candidate_time / base_time if base_time > 0 else float('nan')
+        repetitions = min(len(baseline.samples.get(case_id, [])), len(candidate.samples.get(case_id, [])))
+        case_rows.append([case_id, size_stratum(len(hpo_dict[case_id])), base_time, candidate_time, ratio,
+                          repetitions, None])
+        if repetitions > 1:
+            tested.append(len(case_rows) - 1)
+
+    # Per case, the repetitions of both runs (the candidate ones minus the threshold).
+    case_p_values = two_sample_tests([np.log(baseline.samples[case_rows[i][0]]) for i in tested],
+                                     [np.log(candidate.samples[case_rows[i][0]]) - shift for i in tested],
+                                     permutations, seed)
+    for i, p_value in zip(tested, case_p_values):
+        case_rows[i][-1] = p_value
+
+    for rows, threshold_column in [(stratum_rows, 3), (case_rows, 4)]:
+        indices = [i for i, row in enumerate(rows) if row[-1] is not None]
+        for i, adjusted in zip(indices, adjust([rows[i][-1] for i in indices])):
+            rows[i].extend([adjusted, rows[i][threshold_column] > 1 + threshold and adjusted < alpha])
+        for i, row in enumerate(rows):
+            if row[-1] is None:
+                row.extend([None, False])
+
+    return [tuple(row) for row in stratum_rows], [tuple(row) for row in case_rows]
+
+
+def write_report(stratum_rows, case_rows, output_dir):
+    """
+    :param stratum_rows: the stratum rows (see :func:`compare_runs`)
+    :type stratum_rows: list[tuple]
+    :param case_rows: the case rows (see :func:`compare_runs`)
+    :type case_rows: list[tuple]
+    :param output_dir: directory to write `perfdiff_strata.tsv` & `perfdiff_cases.tsv` to
+    :type output_dir: str
+    """
+
+    def format_row(row):
+        return '\t'.join('' if value is None else str(value) for value in row) + '\n'
+
+    with open(output_dir + 'perfdiff_strata.tsv', 'x') as file_writer:
+        file_writer.write('stratum\tmetric\tcases\tratio\tp_value\tp_adjusted\tregressed\n')
+        file_writer.writelines(format_row(row) for row in stratum_rows)
+
+    with open(output_dir + 'perfdiff_cases.tsv', 'x') as file_writer:
+        file_writer.write('id\tstratum\tbaseline_wall_time\tcandidate_wall_time\tratio\trepetitions\tp_value\t'
+                          'p_adjusted\tregressed\n')
+        file_writer.writelines(format_row(row) for row in case_rows)
@@ -0,0 +1,63 @@
+#!/user/bin/env python3
+
+from threading import Lock
+
+
+class WorkerPool:
+    """
+    A number of worker slots shared by the executors of several runners running simultaneously (see `biobesu campaign`).
+    Each case of a runner occupies the weight of that runner in slots while it runs. Executors that could not start a
+    case are served in the order they first asked, so runners with a higher weight are not starved by runners with a
+    lower one.
+    """
+
+    def __init__(self, slots):
+        """
+        :param slots: the total number of worker slots
+        :type slots: int
+        """
+
+        self.slots = slots
+        self.used = 0
+        self.waiting = []
+        self.lock = Lock()
+
+    def try_acquire(self, owner, weight):
+        """
+        :param owner: the executor asking for slots
+        :param weight: the number of slots needed (limited to the total number of slots)
+        :type weight: int
+        :return: whether the slots were acquired (if not, the owner is queued till it either acquires or withdraws)
+        :rtype: bool
+        """
+
+        weight = min(weight, self.slots)
+        with self.lock:
+            # Only the first waiting executor (if any) may use freed slots.
+            if (not self.waiting or self.waiting[0] is owner) and self.used + weight <= self.slots:
+                self.used += weight
+                if self.waiting and self.waiting[0] is owner:
+                    self.waiting.pop(0)
+                return True
+            if not any(waiting is owner for waiting in self.waiting):
+                self.waiting.append(owner)
+            return False
+
+    def release(self, weight):
+        """
+        :param weight: the number of slots to release (as given to :func:`WorkerPool.try_acquire`)
+        :type weight: int
+        """
+
+        with self.lock:
+            self.used -= min(weight, self.slots)
+
+    def withdraw(self, owner):
+        """
+        Removes an owner that no longer needs slots from the queue.
+
+        :param owner: the executor
+        """
+
+        with self.lock:
+            self.waiting = [waiting for waiting in self.waiting if waiting is not owner]
@@ -0,0 +1,155 @@
+#!/user/bin/env python3
+
+from os.path import getsize
+from re import compile
+from biobesu.helper.error import BenchmarkInputError
+from biobesu.helper.parallel import process_pool
+
+# Expected benchmark header per gene column type (see the suite READMEs).
+GENE_SYMBOL = 'gene_symbol'
+GENE_ID = 'gene_id'
+HEADERS = {
+    GENE_SYMBOL: ['id', GENE_SYMBOL, 'hpo_ids'],
+    GENE_ID: ['id', GENE_ID, 'hpo_ids']
+}
+
+HPO_ID_PATTERN = compile(r'HP:\d{7}')
+GENE_ID_PATTERN = compile(r'\d+')
+
+# Files smaller than this are checked within the calling process.
+PARALLEL_MINIMUM_SIZE = 4 * 1024 * 1024
+
+
+def check_benchmark(benchmark_file, hpo_ids=None, gene_symbols=None, gene_ids=None, workers=1):
+    """
+    Checks a complete benchmark file for problems that would otherwise only surface while (or after) running the tools:
+    the header & number of columns, empty/unique case IDs, the format of the gene & HPO IDs and, if given, whether the
+    HPO IDs are present in the ontology and whether the genes can be resolved. Large files are checked in parallel.
+
+    :param benchmark_file: the benchmark file (id, gene_symbol/gene_id & hpo_ids columns with a header)
+    :type benchmark_file: str
+    :param hpo_ids: the HPO IDs present in the ontology (None skips this check)
+    :type hpo_ids: set[str] | None
+    :param gene_symbols: the gene symbols that can be resolved (None skips this check)
+    :type gene_symbols: set[str] | None
+    :param gene_ids: the gene IDs that can be resolved (None skips this check)
+    :type gene_ids: set[str] | None
+    :param workers: the number of processes to use
+    :type workers: int
+    :return: all problems found (ordered by line)
+    :rtype: list[str]
+    """
+
+    with open(benchmark_file, 'rb') as file_reader:
+        header = file_reader.readline().decode().rstrip('\r\n').split('\t')
+        data_start = file_reader.tell()
+
+    gene_type = next((gene_type for gene_type, expected in HEADERS.items() if header == expected), None)
+    if gene_type is None:
+        return [f'line 1: unexpected header "{chr(9).join(header)}", expected: ' +
+                ' or '.join(f'"{chr(9).join(expected)}"' for expected in HEADERS.values())]
+    valid_genes = gene_symbols if gene_type == GENE_SYMBOL else gene_ids
+
+    chunks = __chunks(benchmark_file, data_start, workers if getsize(benchmark_file) >= PARALLEL_MINIMUM_SIZE else 1)
+    arguments = (benchmark_file, gene_type, hpo_ids, valid_genes)
+    if len(chunks) > 1:
+        with process_pool(workers) as executor:
+            futures = [executor.submit(__check_chunk, *arguments, start, end) for start, end in chunks]
+            results = [future.result() for future in futures]
+    else:
+        results = [__check_chunk(*arguments, start, end) for start, end in chunks]
+
+    # Translates the line numbers within the chunks to those within the file (the header is line 1).
+    problems = []
+    first_line = {}
+    line_offset = 1
+    for line_count, chunk_problems, case_ids in results:
+        for line_number, problem in chunk_problems:
+            problems.append((line_offset + line_number, problem))
+        for line_number, case_id in case_ids:
+            if case_id in first_line:
+                problems.append((line_offset + line_number,
+                                 f'duplicate id "{case_id}" (first used on line {first_line[case_id]})'))
+            else:
+                first_line[case_id] = line_offset + line_number
+        line_offset += line_count
+
+    return [f'line {line_number}: {problem}' for line_number, problem in sorted(problems, key=lambda x: x[0])]
+
+
+def validate_benchmark(benchmark_file, hpo_ids=None, gene_symbols=None, gene_ids=None, workers=1):
+    """
+    Same as :func:`check_benchmark`, but raises a BenchmarkInputError containing all problems if any are found.
+    """
+
+    problems = check_benchmark(benchmark_file, hpo_ids, gene_symbols, gene_ids, workers)
+    if len(problems) > 0:
+        raise BenchmarkInputError(benchmark_file, problems)
+
+
+def __chunks(benchmark_file, data_start, count):
+    """
+    :return: the byte ranges (start, end) of the data divided over count chunks, split on line boundaries
+    :rtype: list[tuple[int, int]]
+    """
+
+    size = getsize(benchmark_file)
+    boundaries = [data_start]
+    with open(benchmark_file, 'rb') as file_reader:
+        for i in range(1, count):
+            file_reader.seek(max(data_start + (size - data_start) * i // count - 1, boundaries[-1]))
+            file_reader.readline()
+            if file_reader.tell() < size and file_reader.tell() > boundaries[-1]:
+                boundaries.append(file_reader.tell())
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def __check_chunk(benchmark_file, gene_type, hpo_ids, valid_genes, start, end):
+    """
+    Checks the lines within a byte range of the benchmark file.
+
+    :return: the number of lines, the problems (line number within the chunk (1-based) & problem) & the case IDs (line
+             number within the chunk & ID)
+    :rtype: tuple[int, list[tuple[int, str]], list[tuple[int, str]]]
+    """
+
+    problems = []
+    case_ids = []
+    line_number = 0
+    with open(benchmark_file, 'rb') as file_reader:
+        file_reader.seek(start)
+        while file_reader.tell() < end:
+            line = file_reader.readline().decode().rstrip('\r\n')
+            line_number += 1
+
+            columns = line.split('\t')
+            if len(columns) != 3:
+                problems.append((line_number, f'expected 3 columns but found {len(columns)}'))
+                continue
+            case_id, gene, phenotypes = columns
+
+            if case_id == '':
+                problems.append((line_number, 'empty id'))
+            elif '/' in case_id or case_id.startswith('.'):
+                problems.append((line_number, f'id "{case_id}" can not be used as file name'))
+            else:
+                case_ids.append((line_number, case_id))
+
+            if gene == '':
+                problems.append((line_number, f'empty {gene_type}'))
+            elif gene_type == GENE_ID and not GENE_ID_PATTERN.fullmatch(gene):
+                problems.append((line_number, f'invalid gene_id "{gene}"'))
+            elif valid_genes is not None and gene not in valid_genes:
+                problems.append((line_number, f'{gene_type} "{gene}" can not be resolved'))
+
+            if phenotypes == '':
+                problems.append((line_number, 'no HPO IDs'))
+                continue
+            for hpo_id in phenotypes.split(','):
+                if not HPO_ID_PATTERN.fullmatch(hpo_id):
+                    problems.append((line_number, f'invalid HPO ID "{hpo_id}"'))
+                elif hpo_ids is not None and hpo_id not in hpo_ids:
+                    problems.append((line_number, f'HPO ID "{hpo_id}" is not present in the ontology'))
+
+    return line_number, problems, case_ids
@@ -0,0 +1,133 @@
+#!/user/bin/env python3
+
+from datetime import datetime
+from datetime import timedelta
+from json import dump
+from os import replace
+from statistics import mean
+from sys import stderr
+from time import perf_counter
+from biobesu.helper.execution import ExecutionListener
+from biobesu.helper.stats import percentile
+
+
+class ProgressReporter(ExecutionListener):
+    """
+    Shows a live status line with the progress of a run and optionally stores this progress as JSON so that it can be
+    monitored remotely.
+    """
+
+    def __init__(self, total, progress_file=None, skipped=0, stream=stderr):
+        """
+        :param total: the number of cases that will be executed
+        :type total: int
+        :param progress_file: path of the JSON file to write the progress to (None for no file)
+        :type progress_file: str | None
+        :param skipped: the number of cases that were skipped (for example, because output already exists)
+        :type skipped: int
+        :param stream: the stream to write the status line to
+        """
+
+        self.total = total
+        self.progress_file = progress_file
+        self.skipped = skipped
+        self.stream = stream
+
+        self.started = datetime.utcnow()
+        self.time_start = perf_counter()
+        self.running = 0
+        self.done = 0
+        self.failed = 0
+        self.latencies = []
+        self.last_case = None
+
+        self.__update()
+
+    def case_started(self, case):
+        self.running += 1
+        # Only a terminal line is refreshed on start, to not flood redirected output.
+        self.__update(show=self.stream.isatty())
+
+    def case_finished(self, result):
+        self.running -= 1
+        self.done += 1
+        if result.failed:
+            self.failed += 1
+        self.latencies.append(result.wall_time)
+        self.last_case = result.case.case_id
+        self.__update()
+
+    def run_finished(self):
+        if self.stream.isatty():
+            self.stream.write('\n')
+            self.stream.flush()
+
+    def progress(self):
+        """
+        :return: the current progress
+        :rtype: dict
+        """
+
+        elapsed = perf_counter() - self.time_start
+        remaining = self.total - self.done
+        cases_per_minute = self.done / elapsed * 60 if self.done > 0 else None
+
+        return {
+            'started': self.started.isoformat() + 'Z',
+            'updated': datetime.utcnow().isoformat() + 'Z',
+            'elapsed_seconds': elapsed,
+            'total': self.total,
+            'done': self.done,
+            'failed': self.failed,
+            'running': self.running,
+            'remaining': remaining,
+            'skipped': self.skipped,
+            'cases_per_minute': cases_per_minute,
+            'mean_latency_seconds': mean(self.latencies) if self.latencies else None,
+            'p95_latency_seconds': percentile(self.latencies, 95),
+            'eta_seconds': remaining / cases_per_minute * 60 if cases_per_minute else None,
+            'last_case': self.last_case
+        }
+
+    def status_line(self, progress):
+        """
+        :param progress: the progress as returned by :func:`ProgressReporter.progress`
+        :type progress: dict
+        :return: human-readable progress
+        :rtype: str
+        """
+
+        def seconds(value):
+            return '-' if value is None else f'{value:.1f}s'
+
+        eta = '-' if progress['eta_seconds'] is None else str(timedelta(seconds=round(progress['eta_seconds'])))
+        speed = '-' if progress['cases_per_minute'] is None else f'{progress["cases_per_minute"]:.2f}'
+
+        return f'done {progress["done"]}/{progress["total"]} | failed {progress["failed"]} | ' \
+               f'running {progress["running"]} | remaining {progress["remaining"]} | {speed} cases/min | ' \
+               f'mean {seconds(progress["mean_latency_seconds"])} | p95 {seconds(progress["p95_latency_seconds"])} ' \
+               f'| ETA {eta}'
+
+    def __update(self, show=True):
+        """
+        Refreshes the status line and progress file.
+
+        :param show: whether the status line should be written
+        :type show: bool
+        """
+
+        progress = self.progress()
+
+        # Overwrites the line on a terminal, otherwise writes a new line (for example, when redirected to a file).
+        if show and self.stream.isatty():
+            self.stream.write(f'\r\033[K{self.status_line(progress)}')
+            self.stream.flush()
+        elif show:
+            self.stream.write(f'{self.status_line(progress)}\n')
+            self.stream.flush()
+
+        if self.progress_file is not None:
+            # Writes to a temporary file first so that readers never see a partially written file.
+            with open(self.progress_file + '.tmp', 'w') as file_writer:
+                dump(progress, file_writer, indent='\t')
+            replace(self.progress_file + '.tmp', self.progress_file)
@@ -0,0 +1,184 @@
+#!/user/bin/env python3
+
+from os import remove
+from os.path import isfile
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import ExecutionListener
+from biobesu.helper.stats import median
+from biobesu.helper.stats import summarize
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+SAMPLES_HEADER = 'id\trepetition\twarmup\treturn_code\ttime (in seconds)\n'
+SUMMARY_FIELDS = ['n', 'median', 'q1', 'q3', 'iqr', 'ci_lower', 'ci_upper']
+# Identifier of the summary row over all cases.
+OVERALL_ID = 'overall'
+
+
+def repetition_id(run_id, repetition, warmup):
+    """
+    :param run_id: the identifier of the benchmark case
+    :type run_id: str
+    :param repetition: the number of the repetition
+    :type repetition: int
+    :param warmup: whether it is a warm-up run
+    :type warmup: bool
+    :return: the identifier of a single repetition of a benchmark case
+    :rtype: str
+    """
+
+    return f'{run_id}.{"warmup" if warmup else "repeat"}{repetition}'
+
+
+class RepetitionCase(Case):
+    """
+    A single repetition of a benchmark case that is executed for timing only.
+    """
+
+    def __init__(self, run_id, repetition, warmup, jar, arguments, output_file=None):
+        """
+        :param run_id: the identifier of the benchmark case
+        :type run_id: str
+        :param repetition: the number of the repetition (starting at 1, warm-up runs are numbered separately)
+        :type repetition: int
+        :param warmup: whether this is a warm-up run (which is not used for the statistics)
+        :type warmup: bool
+        :param jar: path to the jar file of the tool
+        :type jar: str
+        :param arguments: the tool arguments
+        :type arguments: str
+        :param output_file: the output file the tool is expected to create
+        :type output_file: str | None
+        """
+
+        super().__init__(repetition_id(run_id, repetition, warmup), jar, arguments, output_file)
+        self.run_id = run_id
+        self.repetition = repetition
+        self.warmup = warmup
+
+
+class SampleWriter(ExecutionListener):
+    """
+    Writes the wall time of each finished :class:`RepetitionCase` to an opened samples file. As repetitions are only
+    used for timing, their tool output is removed afterwards.
+    """
+
+    def __init__(self, samples_writer):
+        self.samples_writer = samples_writer
+
+    def case_finished(self, result):
+        case = result.case
+        self.samples_writer.write(f'{case.run_id}\t{case.repetition}\t{case.warmup}\t{result.return_code}\t'
+                                  f'{result.wall_time}\n')
+        self.samples_writer.flush()
+
+        if case.output_file is not None and isfile(case.output_file):
+            remove(case.output_file)
+
+
+def add_repetition_arguments(parser):
+    """
+    Adds the command line arguments for repeated timing runs.
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    """
+
+    parser.add_argument('--repeats', type=int, default=0,
+                        help='number of timed repetitions per case, run after the benchmark itself (default: 0, '
+                             'which disables repeated timing)')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='number of untimed warm-up runs per case before the repetitions (default: 1)')
+
+
+def read_samples(samples_file):
+    """
+    Reads a samples file written by a :class:`SampleWriter`.
+
+    :param samples_file: the samples file
+    :type samples_file: str
+    :return: per case id, the number of timed repetitions that were executed (including failed ones) and the wall
+             times of the successful ones
+    :rtype: dict[str, tuple[int, list[float]]]
+    """
+
+    samples = {}
+    if not isfile(samples_file):
+        return samples
+
+    with open(samples_file) as file_reader:
+        next(file_reader)
+        for line in file_reader:
+            run_id, repetition, warmup, return_code, time = line.rstrip('\n').split('\t')
+            if warmup == 'True':
+                continue
+            executed, times = samples.get(run_id, (0, []))
+            if return_code == '0':
+                times.append(float(time))
+            samples[run_id] = (executed + 1, times)
+
+    return samples
+
+
+def repetition_cases(create_case, run_ids, repeats, warmup, samples):
+    """
+    Defines the runs needed to complete the repetitions of each case, divided into rounds that are executed one after
+    the other. A round contains at most one run per case, so the runs of a case never run simultaneously (& disturb
+    each other's timings) & its warm-up runs finish before its repetitions start, regardless of the number of workers.
+    Cases that already have enough repetitions in the samples are skipped, so an interrupted timing run can be resumed.
+
+    :param create_case: function that creates a :class:`RepetitionCase` given a run_id, repetition number & whether
+                        it is a warm-up run
+    :type create_case: function
+    :param run_ids: the benchmark cases
+    :type run_ids: list[str]
+    :param repeats: the number of timed repetitions per case
+    :type repeats: int
+    :param warmup: the number of warm-up runs before the repetitions of a case
+    :type warmup: int
+    :param samples: the samples as returned by :func:`read_samples`
+    :type samples: dict[str, tuple[int, list[float]]]
+    :return: the runs per round, in order of execution
+    :rtype: list[list[RepetitionCase]]
+    """
+
+    rounds = []
+    for run_id in run_ids:
+        executed = samples.get(run_id, (0, []))[0]
+        if executed >= repeats:
+            continue
+        runs = [create_case(run_id, i, True) for i in range(1, warmup + 1)] + \
+               [create_case(run_id, i, False) for i in range(executed + 1, repeats + 1)]
+        for i, case in enumerate(runs):
+            if i == len(rounds):
+                rounds.append([])
+            rounds[i].append(case)
+    return rounds
+
+
+def write_summary(samples, summary_file, seed=0):
+    """
+    Writes the median, interquartile range & bootstrap confidence interval (95%) of the median per case. The overall
+    row summarizes the medians of all cases.
+
+    :param samples: the samples as returned by :func:`read_samples`
+    :type samples: dict[str, tuple[int, list[float]]]
+    :param summary_file: the file to write the summary to
+    :type summary_file: str
+    :param seed: seed used for bootstrapping
+    :type seed: int
+    """
+
+    def format_row(row_id, summary):
+        values = ['' if summary[field] is None else str(summary[field]) for field in SUMMARY_FIELDS]
+        return '\t'.join([row_id] + values) + '\n'
+
+    case_medians = []
+    with open(summary_file, 'w') as file_writer:
+        file_writer.write('\t'.join(['id'] + SUMMARY_FIELDS) + '\n')
+        for run_id, (executed, times) in samples.items():
+            file_writer.write(format_row(run_id, summarize(times, seed=seed)))
+            if times:
+                case_medians.append(median(times))
+        file_writer.write(format_row(OVERALL_ID, summarize(case_medians, seed=seed)))
@@ -0,0 +1,239 @@
+#!/user/bin/env python3
+"""
+Predicts the runtime of the cases of a tool from earlier runs, so that the longest cases can be started first. Starting
+the longest cases first (longest processing time first scheduling) prevents a single long case from running alone at
+the end of a run, which minimizes the total wall time (makespan) when cases run in parallel.
+
+The runtime of a case is modelled as a linear function of the number of HPO terms & the mean specificity of its terms
+(-log of the fraction of benchmark cases that use the term), fitted with least squares on the times of earlier runs.
+"""
+
+from heapq import heapreplace
+from math import log
+from os.path import isfile
+from biobesu.helper.generic import eprint
+import numpy as np
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+SCHEDULES = ['longest_first', 'input']
+
+
+def term_specificity(hpo_dict):
+    """
+    :param hpo_dict: the HPO terms per benchmark case
+    :type hpo_dict: dict[str, list[str]]
+    :return: the specificity per term: -log(fraction of cases using the term)
+    :rtype: dict[str, float]
+    """
+
+    counts = {}
+    for hpo_ids in hpo_dict.values():
+        for hpo_id in set(hpo_ids):
+            counts[hpo_id] = counts.get(hpo_id, 0) + 1
+    return {hpo_id: -log(count / len(hpo_dict)) for hpo_id, count in counts.items()}
+
+
+def read_times(times_files):
+    """
+    Reads the wall times per case of earlier runs: `times.tsv` of a runner (id & time) or of `vibe_versions compare`
+    (id, version, position, return code & time, of which only successful runs are used).
+
+    :param times_files: the times files
+    :type times_files: list[str]
+    :return: the mean time per case id
+    :rtype: dict[str, float]
+    """
+
+    times = {}
+    for times_file in times_files:
+        with open(times_file) as file_reader:
+            next(file_reader)
+            for line in file_reader:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) == 5 and fields[3] != '0':
+                    continue
+                try:
+                    times.setdefault(fields[0], []).append(float(fields[-1]))
+                except ValueError:
+                    # Ignores an incomplete last line (for example, of an interrupted run).
+                    continue
+    return {case_id: sum(case_times) / len(case_times) for case_id, case_times in times.items()}
+
+
+class RuntimeModel:
+    """
+    Linear model of the runtime of a case (see the module documentation).
+    """
+
+    def __init__(self, coefficients, specificity, samples=0, r_squared=0.0):
+        """
+        :param coefficients: intercept, seconds per term & seconds per unit of mean specificity
+        :type coefficients: np.ndarray
+        :param specificity: the specificity per term (see :func:`term_specificity`)
+        :type specificity: dict[str, float]
+        :param samples: the number of cases the model was fitted on
+        :type samples: int
+        :param r_squared: the fraction of the variance of the times explained by the model
+        :type r_squared: float
+        """
+
+        self.coefficients = coefficients
+        self.specificity = specificity
+        self.samples = samples
+        self.r_squared = r_squared
+
+    def features(self, hpo_ids):
+        """
+        :param hpo_ids: the HPO terms of a case
+        :type hpo_ids: list[str]
+        :return: the features of the case (1 for the intercept, number of terms & mean specificity)
+        :rtype: list[float]
+        """
+
+        # Unknown terms are considered as specific as a term used by a single case.
+        unknown = max(self.specificity.values(), default=0.0)
+        specificity = [self.specificity.get(hpo_id, unknown) for hpo_id in hpo_ids]
+        return [1.0, len(hpo_ids), sum(specificity) / len(specificity) if specificity else 0.0]
+
+    def predict(self, hpo_ids):
+        """
+        :param hpo_ids: the HPO terms of a case
+        :type hpo_ids: list[str]
+        :return: the predicted runtime in seconds (never negative)
+        :rtype: float
+        """
+
+        return max(float(np.dot(self.coefficients, self.features(hpo_ids))), 0.0)
+
+    @classmethod
+    def fit(cls, hpo_dict, times):
+        """
+        :param hpo_dict: the HPO terms per benchmark case
+        :type hpo_dict: dict[str, list[str]]
+        :param times: the time per case id (cases that are not in hpo_dict are ignored)
+        :type times: dict[str, float]
+        :return: the fitted model (None if there are no times of benchmark cases)
+        :rtype: RuntimeModel | None
+        """
+
+        model = cls(np.zeros(3), term_specificity(hpo_dict))
+        case_ids = [case_id for case_id in times if case_id in hpo_dict]
+        if not case_ids:
+            return None
+
+        features = np.array([model.features(hpo_dict[case_id]) for case_id in case_ids])
+        observed = np.array([times[case_id] for case_id in case_ids])
+        model.coefficients = np.linalg.lstsq(features, observed, rcond=None)[0]
+        model.samples = len(case_ids)
+
+        residual = ((observed - features @ model.coefficients) ** 2).sum()
+        total = ((observed - observed.mean()) ** 2).sum()
+        model.r_squared = 1 - residual / total if total > 0 else 0.0
+        return model
+
+
+def makespan(durations, workers):
+    """
+    :param durations: the duration per case, in the order the cases are started
+    :type durations: list[float]
+    :param workers: the number of cases that run simultaneously
+    :type workers: int
+    :return: the total wall time when each case is started as soon as a worker is free
+    :rtype: float
+    """
+
+    finish_times = [0.0] * max(workers, 1)
+    for duration in durations:
+        # The worker that is free first (the list is kept as heap).
+        heapreplace(finish_times, finish_times[0] + duration)
+    return max(finish_times)
+
+
+def add_scheduling_arguments(parser):
+    """
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    """
+
+    parser.add_argument('--schedule', choices=SCHEDULES, default='longest_first',
+                        help='order in which cases are started: longest predicted runtime first (if earlier times are '
+                             'available) or input order (default: longest_first)')
+    parser.add_argument('--runtime_history', action='append', default=[],
+                        help='times.tsv of an earlier run of the same tool on (partly) the same benchmark cases, to '
+                             'learn the runtime model from. Can be given multiple times. The times.tsv in the output '
+                             'directory is always used')
+    parser.add_argument('--dry_run', action='store_true',
+                        help='only print the predicted wall time of the cases that still need to run with '
+                             '--max_workers & exit')
+
+
+class Scheduler:
+    """
+    Orders the cases of a runner by their predicted runtime (see :func:`add_scheduling_arguments`).
+    """
+
+    def __init__(self, args, hpo_dict, times_file):
+        """
+        :param args: the parsed arguments (see :func:`add_scheduling_arguments`)
+        :param hpo_dict: the HPO terms per benchmark case
+        :type hpo_dict: dict[str, list[str]]
+        :param times_file: the times file of the runner itself (used if it exists)
+        :type times_file: str
+        """
+
+        self.args = args
+        self.hpo_dict = hpo_dict
+        times_files = args.runtime_history + ([times_file] if isfile(times_file) else [])
+        self.model = RuntimeModel.fit(hpo_dict, read_times(times_files))
+
+    def predict(self, case_id):
+        """
+        :param case_id: a benchmark case id
+        :type case_id: str
+        :return: the predicted runtime (0 without model)
+        :rtype: float
+        """
+
+        return self.model.predict(self.hpo_dict[case_id]) if self.model is not None else 0.0
+
+    def order(self, items, case_id=None):
+        """
+        :param items: the items to order (for example, cases)
+        :type items: list
+        :param case_id: returns the benchmark case id of an item (default: the item is a case id)
+        :return: the items, longest predicted runtime first (stable, so input order without model or if
+                 `--schedule input`)
+        :rtype: list
+        """
+
+        if self.model is None or self.args.schedule != 'longest_first':
+            return list(items)
+        case_id = case_id if case_id is not None else (lambda item: item)
+        return sorted(items, key=lambda item: -self.predict(case_id(item)))
+
+    def dry_run(self, case_ids):
+        """
+        Prints the predicted wall time of the runs that still need to be done, in input order & in scheduled order.
+
+        :param case_ids: the benchmark case id per run that still needs to be done (in input order, a case id occurs
+                         multiple times if a case is run multiple times)
+        :type case_ids: list[str]
+        """
+
+        if self.model is None:
+            eprint('No times of earlier runs of these cases are available (see --runtime_history), so no prediction '
+                   'can be made.')
+            return
+
+        workers = self.args.max_workers
+        intercept, per_term, per_specificity = self.model.coefficients
+        print(f'Runtime model (fitted on {self.model.samples} case(s), R^2 {self.model.r_squared:.2f}): '
+              f'{intercept:.3f}s + {per_term:.3f}s per term + {per_specificity:.3f}s per unit of mean term '
+              f'specificity')
+        print(f'{len(case_ids)} run(s) to do, predicted total tool time '
+              f'{sum(self.predict(case_id) for case_id in case_ids):.1f}s')
+        for schedule, ordered in [('input', case_ids), (self.args.schedule, self.order(case_ids))]:
+            print(f'Predicted wall time on {workers} worker(s) ({schedule} order): '
+                  f'{makespan([self.predict(case_id) for case_id in ordered], workers):.1f}s')
@@ -0,0 +1,306 @@
+#!/user/bin/env python3
+"""
+Deterministic stratified samples of benchmark cases, for quick previews of a complete run. Cases are stratified by the
+size of their HPO set & the sample is spread over as many different genes as possible within each stratum. Each
+sampled case represents (cases in its stratum / sampled cases in its stratum) cases of the complete benchmark, which is
+used to estimate the metrics & runtime of the complete benchmark (with stratified bootstrap confidence intervals).
+"""
+
+from random import Random
+from time import perf_counter
+from biobesu.helper import evaluation
+from biobesu.helper.execution import ExecutionListener
+import numpy as np
+
+# Used only for docstring
+from argparse import ArgumentParser
+from typing import Callable
+
+# Lowest HPO set size per stratum.
+SIZE_STRATA = [1, 3, 5, 8, 13]
+
+
+def size_stratum(size):
+    """
+    :param size: the number of HPO terms of a case
+    :type size: int
+    :return: the stratum (for example, "3-4" or "13+")
+    :rtype: str
+    """
+
+    lower = max([bound for bound in SIZE_STRATA if bound <= size], default=SIZE_STRATA[0])
+    upper = [bound - 1 for bound in SIZE_STRATA if bound > size]
+    return f'{lower}-{upper[0]}' if upper else f'{lower}+'
+
+
+class CaseSample:
+    """
+    The sampled cases with their stratum & how many cases of the complete benchmark they represent.
+    """
+
+    def __init__(self, case_ids, strata, populations):
+        """
+        :param case_ids: the sampled case ids (in benchmark order)
+        :type case_ids: list[str]
+        :param strata: the stratum per sampled case id
+        :type strata: dict[str, str]
+        :param populations: the number of benchmark cases per stratum
+        :type populations: dict[str, int]
+        """
+
+        self.case_ids = case_ids
+        self.strata = strata
+        self.populations = populations
+        self.counts = {stratum: 0 for stratum in populations}
+        for stratum in strata.values():
+            self.counts[stratum] += 1
+
+    def weight(self, case_id):
+        """
+        :param case_id: a sampled case id
+        :type case_id: str
+        :return: the number of benchmark cases the case represents
+        :rtype: float
+        """
+
+        stratum = self.strata[case_id]
+        return self.populations[stratum] / self.counts[stratum]
+
+    def estimate(self, values, statistic, resamples=2000, confidence=0.95, seed=0):
+        """
+        Estimates a statistic of the complete benchmark from per-case values of the sampled cases, with a stratified
+        bootstrap confidence interval (the cases are resampled within their stratum). Within a stratum, cases without a
+        value represent the cases with a value. Strata without any value are left out.
+
+        :param values: the values per sampled case id
+        :type values: dict[str, float]
+        :param statistic: calculates the statistic (1D result) from the values & weights (either 1D, or 2D with a
+                          resample per row)
+        :type statistic: Callable[[np.ndarray, np.ndarray], np.ndarray]
+        :param resamples: the number of bootstrap resamples
+        :type resamples: int
+        :param confidence: the confidence level (0-1)
+        :type confidence: float
+        :param seed: seed for resampling
+        :type seed: int
+        :return: per element of the statistic: estimate, lower bound & upper bound
+        :rtype: np.ndarray
+        """
+
+        groups = {}
+        for case_id in self.case_ids:
+            if case_id in values:
+                groups.setdefault(self.strata[case_id], []).append(values[case_id])
+        # Positions are ordered by stratum, so the weight of a position is the same in each resample.
+        weights = np.concatenate([np.full(len(group), self.populations[stratum] / len(group))
+                                  for stratum, group in groups.items()])
+        observed = np.concatenate([np.array(group, dtype=float) for group in groups.values()])
+
+        rng = np.random.default_rng(seed)
+        resampled = []
+        for start in range(0, resamples, evaluation.CHUNK_SIZE):
+            size = min(evaluation.CHUNK_SIZE, resamples - start)
+            indices = []
+            offset = 0
+            for group in groups.values():
+                indices.append(rng.integers(offset, offset + len(group), size=(size, len(group))))
+                offset += len(group)
+            resampled.append(statistic(observed[np.concatenate(indices, axis=1)], weights))
+
+        tail = (1 - confidence) / 2 * 100
+        with np.errstate(invalid='ignore'):
+            bounds = np.nanpercentile(np.concatenate(resampled), [tail, 100 - tail], axis=0)
+        return np.column_stack([statistic(observed, weights), bounds[0], bounds[1]])
+
+
+def draw_sample(hpo_dict, size, seed=0, genes=None):
+    """
+    Draws a deterministic sample stratified by HPO set size (proportional allocation, with at least 1 case per stratum
+    if the sample is large enough). Within a stratum, genes are picked in turn (in random order), so that the sample
+    covers as many different genes as possible.
+
+    :param hpo_dict: the HPO terms per benchmark case (in benchmark order)
+    :type hpo_dict: dict[str, list[str]]
+    :param size: the number of cases to sample
+    :type size: int
+    :param seed: seed for sampling
+    :type seed: int
+    :param genes: the gene per benchmark case (None to not spread the sample over genes)
+    :type genes: dict[str, str] | None
+    :return: the sample
+    :rtype: CaseSample
+    """
+
+    rng = Random(seed)
+    strata = {}
+    for case_id, hpo_ids in hpo_dict.items():
+        strata.setdefault(size_stratum(len(hpo_ids)), []).append(case_id)
+    populations = {stratum: len(case_ids) for stratum, case_ids in strata.items()}
+    allocation = __allocate(populations, min(size, len(hpo_dict)))
+
+    sampled = {}
+    for stratum, case_ids in sorted(strata.items()):
+        by_gene = {}
+        for case_id in case_ids:
+            by_gene.setdefault(genes.get(case_id, case_id) if genes is not None else case_id, []).append(case_id)
+        gene_order = sorted(by_gene)
+        rng.shuffle(gene_order)
+        for gene in gene_order:
+            rng.shuffle(by_gene[gene])
+
+        # Takes a case of each gene in turn.
+        picked = []
+        while len(picked) < allocation[stratum]:
+            for gene in gene_order:
+                if by_gene[gene] and len(picked) < allocation[stratum]:
+                    picked.append(by_gene[gene].pop())
+        for case_id in picked:
+            sampled[case_id] = stratum
+
+    return CaseSample([case_id for case_id in hpo_dict if case_id in sampled], sampled, populations)
+
+
+def __allocate(populations, size):
+    """
+    :param populations: the number of cases per stratum
+    :type populations: dict[str, int]
+    :param size: the total number of cases to sample
+    :type size: int
+    :return: the number of cases to sample per stratum (proportional, largest remainders first)
+    :rtype: dict[str, int]
+    """
+
+    total = sum(populations.values())
+    shares = {stratum: population * size / total for stratum, population in populations.items()}
+    allocation = {stratum: int(share) for stratum, share in shares.items()}
+    # Each stratum gets a case first if possible, then the largest remainders.
+    if size >= len(populations):
+        for stratum in allocation:
+            allocation[stratum] = max(allocation[stratum], 1)
+    for stratum in sorted(shares, key=lambda key: (allocation[key] - shares[key], key)):
+        if sum(allocation.values()) >= size:
+            break
+        if allocation[stratum] < populations[stratum]:
+            allocation[stratum] += 1
+    # Takes back cases from the largest strata if the minimum of 1 case per stratum exceeded the size.
+    while sum(allocation.values()) > size:
+        largest = max([key for key in allocation if allocation[key] > 1],
+                      key=lambda key: (allocation[key] - shares[key], key))
+        allocation[largest] -= 1
+    return allocation
+
+
+def add_sampling_arguments(parser, seed=True):
+    """
+    Adds the arguments for running a stratified sample of the benchmark (see :func:`draw_sample`).
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :param seed: whether to add `--seed` (runners that already have it use it for sampling as well)
+    :type seed: bool
+    """
+
+    parser.add_argument('--sample', type=int,
+                        help='only run a stratified sample of this many cases (stratified by HPO set size & spread '
+                             'over genes) & estimate the metrics & runtime of the complete benchmark (default: all '
+                             'cases)')
+    if seed:
+        parser.add_argument('--seed', type=int, default=0, help='seed used for --sample (default: 0)')
+
+
+class CaseTimes(ExecutionListener):
+    """
+    Collects the wall time per sampled case & the time from the first start till the last finish.
+    """
+
+    def __init__(self, case_key=None):
+        """
+        :param case_key: the benchmark case id of an executed case (default: its case id)
+        :type case_key: Callable[[str], str] | None
+        """
+
+        self.case_key = case_key if case_key is not None else (lambda case_id: case_id)
+        self.times = {}
+        self.first_start = None
+        self.last_finish = None
+
+    @property
+    def window(self):
+        return self.last_finish - self.first_start if self.first_start is not None else 0.0
+
+    def case_started(self, case):
+        if self.first_start is None:
+            self.first_start = perf_counter()
+
+    def case_finished(self, result):
+        self.last_finish = perf_counter()
+        if not result.failed:
+            key = self.case_key(result.case.case_id)
+            self.times[key] = self.times.get(key, 0.0) + result.wall_time
+
+
+def write_sample(sample, output_file):
+    """
+    :param sample: the sample
+    :type sample: CaseSample
+    :param output_file: the file to write the sampled cases, their stratum & weight to
+    :type output_file: str
+    """
+
+    # Overwritten, as a resumed run draws the same sample.
+    with open(output_file, 'w') as file_writer:
+        file_writer.write('id\tstratum\tweight\n')
+        for case_id in sample.case_ids:
+            file_writer.write(f'{case_id}\t{sample.strata[case_id]}\t{sample.weight(case_id)}\n')
+
+
+def write_report(sample, benchmark_file, results, output_file, times=None, gene_column=1, ks=(1, 5, 10, 50),
+                 seed=0):
+    """
+    Writes (& prints) the estimated metrics of each result & the estimated runtime of the complete benchmark, with
+    95% confidence intervals.
+
+    :param sample: the sample that was run
+    :type sample: CaseSample
+    :param benchmark_file: the benchmark file (for the gene that should be found)
+    :type benchmark_file: str
+    :param results: the merged result file per label (see :func:`~biobesu.helper.evaluation.read_results`)
+    :type results: dict[str, str]
+    :param output_file: the file to write the report to
+    :type output_file: str
+    :param times: the wall times of the sampled cases (None to not estimate the runtime)
+    :type times: CaseTimes | None
+    :param gene_column: the column in the benchmark file with the gene that should be found
+    :type gene_column: int
+    :param ks: the cut-offs for recall@k
+    :type ks: tuple[int]
+    :param seed: seed for resampling
+    :type seed: int
+    """
+
+    ks = list(ks)
+    expected_genes = evaluation.read_benchmark_genes(benchmark_file, gene_column)
+    rows = []
+    for label, result_file in results.items():
+        case_ranks = evaluation.ranks(expected_genes, evaluation.read_results(result_file), sample.case_ids)
+        estimates = sample.estimate(dict(zip(sample.case_ids, case_ranks)),
+                                    lambda values, weights: evaluation.metrics(values, ks, weights), seed=seed)
+        rows.extend((label, name, *estimate) for name, estimate in zip(evaluation.metric_names(ks), estimates))
+
+    if times is not None and times.times:
+        # Total tool time of the complete benchmark & the wall time when run as efficiently as the sample.
+        case_seconds = sample.estimate(times.times, lambda values, weights: (values * weights).sum(axis=-1)[..., None],
+                                       seed=seed)[0]
+        sampled_seconds = sum(times.times.values())
+        rows.append(('runtime', 'case_seconds', *case_seconds))
+        rows.append(('runtime', 'wall_seconds', *(case_seconds * times.window / sampled_seconds)))
+
+    with open(output_file, 'x') as file_writer:
+        file_writer.write('result\tmetric\testimate\tci_lower\tci_upper\n')
+        for label, name, estimate, lower, upper in rows:
+            file_writer.write(f'{label}\t{name}\t{estimate}\t{lower}\t{upper}\n')
+
+    print(f'\nEstimates for all {sum(sample.populations.values())} cases from a sample of {len(sample.case_ids)} '
+          f'(95% confidence interval):')
+    for label, name, estimate, lower, upper in rows:
+        print(f'{label}\t{name}\t{estimate:.4f} [{lower:.4f}, {upper:.4f}]')
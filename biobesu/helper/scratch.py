@@ -0,0 +1,150 @@
+#!/user/bin/env python3
+
+from os import getpid
+from os import kill
+from os import listdir
+from os import remove
+from os import rmdir
+from os.path import dirname
+from os.path import isfile
+from shutil import rmtree
+from socket import gethostname
+from tempfile import mkdtemp
+from biobesu.helper.generic import create_dir
+
+
+class ScratchSpace:
+    """
+    Private scratch directories in which tool runs write their output (see :func:`OutputStore.use_scratch`) & temporary
+    files (through `-Djava.io.tmpdir`), so that only validated & complete output is moved into the output directory.
+    Should be used as context manager: the scratch directories are removed on exit. Scratch directories left behind by
+    killed runners on the same host are removed on entry.
+    """
+
+    PREFIX = 'biobesu_scratch_'
+
+    def __init__(self, scratch_dir, remove_empty=False):
+        """
+        :param scratch_dir: the directory to create the scratch space in (a directory of its own is created within)
+        :type scratch_dir: str
+        :param remove_empty: whether to remove scratch_dir on exit if nothing else is left in it
+        :type remove_empty: bool
+        """
+
+        self.scratch_dir = create_dir(scratch_dir.rstrip('/') + '/', exist_allowed=True)
+        self.remove_empty = remove_empty
+        self.directory = None
+        self.areas = []
+
+    def __enter__(self):
+        self.remove_stale()
+        self.directory = mkdtemp(prefix=f'{self.PREFIX}{gethostname()}_{getpid()}_', dir=self.scratch_dir) + '/'
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    def area(self):
+        """
+        :return: a new directory within the scratch space (for example, for the output of a single store)
+        :rtype: str
+        """
+
+        area = create_dir(f'{self.directory}{len(self.areas)}/')
+        self.areas.append(area)
+        return area
+
+    def case_dir(self, case):
+        """
+        :param case: a case
+        :type case: ~biobesu.helper.execution.Case
+        :return: the private directory of the case (created if it does not exist)
+        :rtype: str
+        """
+
+        return create_dir(f'{self.directory}cases/{case.case_id}/', exist_allowed=True)
+
+    def jvm_options(self, case):
+        """
+        :param case: a case
+        :type case: ~biobesu.helper.execution.Case
+        :return: the JVM options that let the case write its temporary files to its private directory
+        :rtype: list[str]
+        """
+
+        return [f'-Djava.io.tmpdir={self.case_dir(case)}']
+
+    def release(self, case):
+        """
+        Removes the private directory of a finished case. Output the case wrote within the scratch space that was not
+        moved into the output directory (for example, because it is invalid) is removed as well.
+
+        :param case: a case
+        :type case: ~biobesu.helper.execution.Case
+        """
+
+        rmtree(f'{self.directory}cases/{case.case_id}/', ignore_errors=True)
+        if case.output_file is not None and case.output_file.startswith(self.directory):
+            if isfile(case.output_file):
+                remove(case.output_file)
+            # Removes the directory of the output if it is a directory of its own (see OutputStore.staging_file).
+            output_dir = dirname(case.output_file) + '/'
+            if output_dir not in self.areas:
+                rmtree(output_dir, ignore_errors=True)
+
+    def cleanup(self):
+        """
+        Removes the complete scratch space.
+        """
+
+        if self.directory is not None:
+            rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+        if self.remove_empty:
+            try:
+                rmdir(self.scratch_dir)
+            except OSError:
+                # Still in use by another runner (or removed already).
+                pass
+
+    def remove_stale(self):
+        """
+        Removes the scratch spaces of runners on this host that are no longer running.
+        """
+
+        prefix = f'{self.PREFIX}{gethostname()}_'
+        for name in listdir(self.scratch_dir):
+            pid = name[len(prefix):].split('_')[0]
+            if name.startswith(prefix) and pid.isdigit() and not self.__is_running(int(pid)):
+                rmtree(self.scratch_dir + name, ignore_errors=True)
+
+    @staticmethod
+    def __is_running(pid):
+        """
+        :param pid: a process ID
+        :type pid: int
+        :return: whether a process with the ID is running
+        :rtype: bool
+        """
+
+        try:
+            kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+
+def create_scratch(args, output_dir):
+    """
+    :param args: the parsed arguments (see :func:`~biobesu.helper.execution.add_execution_arguments`)
+    :param output_dir: the output directory of the runner (used for defaults)
+    :type output_dir: str
+    :return: the scratch space (within `--scratch_dir` or by default `<output>/.scratch/`)
+    :rtype: ScratchSpace
+    """
+
+    if args.scratch_dir is not None:
+        return ScratchSpace(args.scratch_dir)
+    return ScratchSpace(output_dir + '.scratch/', remove_empty=True)
@@ -0,0 +1,219 @@
+#!/user/bin/env python3
+"""
+Read-only string lookup tables in shared memory, so that worker processes can use the converter tables without
+parsing the sources again or holding a copy of their own.
+
+A table is stored as a single shared memory block:
+
+- header: the number of entries
+- key offsets & value offsets (count + 1 unsigned 64-bit integers each)
+- keys blob: the UTF-8 encoded keys, sorted bytewise
+- values blob: the UTF-8 encoded values, in the order of the keys
+
+Lookups use a binary search over the keys. Pickling a table (for example, when it is passed to a process pool) only
+transfers the name of the shared memory block, so workers attach in constant time without copying any data.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+from struct import calcsize
+from struct import pack_into
+from struct import unpack_from
+
+# Used only for docstring
+from biobesu.helper.converters import Converter
+
+HEADER_FORMAT = '<Q'
+HEADER_SIZE = calcsize(HEADER_FORMAT)
+OFFSET_SIZE = calcsize('<Q')
+
+
+class SharedTable:
+    """
+    Read-only mapping from strings to strings in shared memory. Supports the dict operations used by
+    :func:`~biobesu.helper.converters.Converter.key_to_value` (a missing key raises a KeyError).
+    """
+
+    def __init__(self, shared_memory, owner):
+        """
+        Use :func:`SharedTable.create` or :func:`SharedTable.attach` instead.
+
+        :param shared_memory: the shared memory block containing the table
+        :type shared_memory: SharedMemory
+        :param owner: whether this process created the block (and is responsible for removing it)
+        :type owner: bool
+        """
+
+        self.shared_memory = shared_memory
+        self.owner = owner
+
+        # No other views on the buffer are kept, as these would prevent closing the shared memory.
+        self.buffer = shared_memory.buf
+        self.count = unpack_from(HEADER_FORMAT, self.buffer, 0)[0]
+        self.key_offsets_start = HEADER_SIZE
+        self.value_offsets_start = self.key_offsets_start + (self.count + 1) * OFFSET_SIZE
+        self.keys_start = self.value_offsets_start + (self.count + 1) * OFFSET_SIZE
+        self.values_start = self.keys_start + unpack_from('<Q', self.buffer,
+                                                          self.key_offsets_start + self.count * OFFSET_SIZE)[0]
+
+    @classmethod
+    def create(cls, mapping):
+        """
+        Copies a mapping into a new shared memory block.
+
+        :param mapping: the mapping to share
+        :type mapping: dict[str, str]
+        :return: the table (owned by the calling process)
+        :rtype: SharedTable
+        """
+
+        entries = sorted((key.encode(), value.encode()) for key, value in mapping.items())
+        keys_size = sum(len(key) for key, value in entries)
+        values_size = sum(len(value) for key, value in entries)
+        size = HEADER_SIZE + 2 * (len(entries) + 1) * OFFSET_SIZE + keys_size + values_size
+
+        # A shared memory block can not be empty.
+        shared_memory = SharedMemory(create=True, size=max(size, 1))
+        buffer = shared_memory.buf
+        pack_into(HEADER_FORMAT, buffer, 0, len(entries))
+
+        key_offsets_start = HEADER_SIZE
+        value_offsets_start = key_offsets_start + (len(entries) + 1) * OFFSET_SIZE
+        keys_position = value_offsets_start + (len(entries) + 1) * OFFSET_SIZE
+        values_position = keys_position + keys_size
+
+        key_offset = 0
+        value_offset = 0
+        for i, (key, value) in enumerate(entries):
+            pack_into('<Q', buffer, key_offsets_start + i * OFFSET_SIZE, key_offset)
+            pack_into('<Q', buffer, value_offsets_start + i * OFFSET_SIZE, value_offset)
+            buffer[keys_position + key_offset:keys_position + key_offset + len(key)] = key
+            buffer[values_position + value_offset:values_position + value_offset + len(value)] = value
+            key_offset += len(key)
+            value_offset += len(value)
+        pack_into('<Q', buffer, key_offsets_start + len(entries) * OFFSET_SIZE, key_offset)
+        pack_into('<Q', buffer, value_offsets_start + len(entries) * OFFSET_SIZE, value_offset)
+
+        return cls(shared_memory, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attaches to a table created by another process.
+
+        :param name: the name of the shared memory block
+        :type name: str
+        :return: the table
+        :rtype: SharedTable
+        """
+
+        try:
+            # Only the creator should remove the block, so it is not tracked by this process (Python 3.13+).
+            shared_memory = SharedMemory(name=name, track=False)
+        except TypeError:
+            # Older versions always track the block. Worker processes share the resource tracker of the process that
+            # started them, so for them this does not change when the block is removed.
+            shared_memory = SharedMemory(name=name)
+        return cls(shared_memory, owner=False)
+
+    @property
+    def name(self):
+        return self.shared_memory.name
+
+    def __reduce__(self):
+        # Pickles by name so that unpickling attaches to the same block.
+        return SharedTable.attach, (self.name,)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.__find(key) is not None
+
+    def __getitem__(self, key):
+        index = self.__find(key)
+        if index is None:
+            raise KeyError(key)
+        return self.__value(index)
+
+    def get(self, key, default=None):
+        index = self.__find(key)
+        return default if index is None else self.__value(index)
+
+    def keys(self):
+        return [self.__key(i).decode() for i in range(self.count)]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self):
+        return [(self.__key(i).decode(), self.__value(i)) for i in range(self.count)]
+
+    def close(self):
+        """
+        Detaches from the shared memory (and removes the block if this process created it).
+        """
+
+        self.buffer = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+    def __key(self, index):
+        start, end = unpack_from('<QQ', self.buffer, self.key_offsets_start + index * OFFSET_SIZE)
+        return bytes(self.buffer[self.keys_start + start:self.keys_start + end])
+
+    def __value(self, index):
+        start, end = unpack_from('<QQ', self.buffer, self.value_offsets_start + index * OFFSET_SIZE)
+        return bytes(self.buffer[self.values_start + start:self.values_start + end]).decode()
+
+    def __find(self, key):
+        """
+        :param key: the key to search for
+        :type key: str
+        :return: the index of the key (None if not present)
+        :rtype: int | None
+        """
+
+        if type(key) is not str:
+            return None
+
+        encoded = key.encode()
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__key(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.__key(low) == encoded:
+            return low
+        return None
+
+
+def share_converter(converter):
+    """
+    Replaces the lookup dicts of a converter (and dicts of such dicts) with :class:`SharedTable` instances, after
+    which the converter can be passed to worker processes without copying its tables.
+
+    :param converter: the converter (for example, a PhenotypeConverter or GeneConverter)
+    :type converter: Converter
+    :return: the created tables (which should be closed by the caller once the workers are done)
+    :rtype: list[SharedTable]
+    """
+
+    def is_lookup(value):
+        return type(value) is dict and all(type(key) is str and type(item) is str for key, item in value.items())
+
+    tables = []
+    for attribute, value in list(vars(converter).items()):
+        if is_lookup(value):
+            tables.append(SharedTable.create(value))
+            setattr(converter, attribute, tables[-1])
+        elif type(value) is dict and len(value) > 0 and all(is_lookup(item) for item in value.values()):
+            shared = {}
+            for key, item in value.items():
+                tables.append(SharedTable.create(item))
+                shared[key] = tables[-1]
+            setattr(converter, attribute, shared)
+    return tables
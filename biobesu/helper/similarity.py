@@ -0,0 +1,306 @@
+#!/user/bin/env python3
+"""
+Phenotype-set similarity between benchmark cases, using Resnik similarity with the best-match average (BMA):
+
+- the information content (IC) of a term is -log(fraction of annotated diseases with the term or a descendant)
+- the similarity of 2 terms is the IC of their most informative common ancestor (MICA)
+- the similarity of 2 cases is the average of, for both cases, the mean over their terms of the best match in the
+  other case
+
+The MICA of all pairs of terms used by the cases is precomputed as a matrix, after which the similarity of all pairs of
+cases is computed in blocks with NumPy.
+"""
+
+from math import log
+import numpy as np
+
+# Maximum number of elements of the intermediate arrays (limits memory usage to about 4 bytes per element).
+BLOCK_ELEMENTS = 2 ** 24
+
+
+def read_ontology(hpo_obo):
+    """
+    :param hpo_obo: path to the hp.obo file
+    :type hpo_obo: str
+    :return: the parents (is_a) per term & the primary id per alternative id (obsolete terms are left out)
+    :rtype: tuple[dict[str, list[str]], dict[str, str]]
+    """
+
+    parents = {}
+    primary_ids = {}
+
+    def add_term(stanza):
+        if 'id' in stanza and 'is_obsolete' not in stanza:
+            parents[stanza['id'][0]] = stanza.get('is_a', [])
+            for alt_id in stanza.get('alt_id', []):
+                primary_ids[alt_id] = stanza['id'][0]
+
+    stanza = None
+    with open(hpo_obo) as file_reader:
+        for line in file_reader:
+            line = line.strip()
+            if line.startswith('['):
+                if stanza is not None:
+                    add_term(stanza)
+                # Only [Term] stanzas are used (not [Typedef]).
+                stanza = {} if line == '[Term]' else None
+            elif stanza is not None and ': ' in line:
+                tag, value = line.split(': ', 1)
+                # Removes trailing comments (for example, "is_a: HP:0000001 ! All").
+                stanza.setdefault(tag, []).append(value.split(' !')[0].strip())
+    if stanza is not None:
+        add_term(stanza)
+
+    for term in parents:
+        primary_ids[term] = term
+    return parents, primary_ids
+
+
+def read_annotations(hpoa_file, primary_ids):
+    """
+    :param hpoa_file: path to the phenotype.hpoa file
+    :type hpoa_file: str
+    :param primary_ids: the primary id per (alternative) term id (see :func:`read_ontology`)
+    :type primary_ids: dict[str, str]
+    :return: the terms per disease (negated annotations & terms not in the ontology are left out)
+    :rtype: dict[str, set[str]]
+    """
+
+    annotations = {}
+    with open(hpoa_file) as file_reader:
+        for line in file_reader:
+            if line.startswith('#') or line.startswith('database_id\t'):
+                continue
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 4 or fields[2] == 'NOT' or fields[3] not in primary_ids:
+                continue
+            annotations.setdefault(fields[0], set()).add(primary_ids[fields[3]])
+    return annotations
+
+
+def ancestor_closure(parents):
+    """
+    :param parents: the parents per term (see :func:`read_ontology`)
+    :type parents: dict[str, list[str]]
+    :return: the ancestors per term (including the term itself)
+    :rtype: dict[str, frozenset[str]]
+    """
+
+    closure = {}
+    for term in parents:
+        # Iterative depth-first traversal, so deep ontologies do not exceed the recursion limit.
+        stack = [term]
+        while stack:
+            current = stack[-1]
+            if current in closure:
+                stack.pop()
+                continue
+            unvisited = [parent for parent in parents[current] if parent in parents and parent not in closure]
+            if unvisited:
+                stack.extend(unvisited)
+                continue
+            stack.pop()
+            ancestors = {current}
+            for parent in parents[current]:
+                if parent in parents:
+                    ancestors.update(closure[parent])
+            closure[current] = frozenset(ancestors)
+    return closure
+
+
+def information_content(ancestors, annotations):
+    """
+    :param ancestors: the ancestors per term (see :func:`ancestor_closure`)
+    :type ancestors: dict[str, frozenset[str]]
+    :param annotations: the terms per disease (see :func:`read_annotations`)
+    :type annotations: dict[str, set[str]]
+    :return: the IC per term (terms without annotations are counted as annotated to a single disease)
+    :rtype: dict[str, float]
+    """
+
+    counts = dict.fromkeys(ancestors, 0)
+    for terms in annotations.values():
+        annotated = set()
+        for term in terms:
+            annotated.update(ancestors[term])
+        for term in annotated:
+            counts[term] += 1
+
+    total = max(len(annotations), 1)
+    return {term: -log(max(count, 1) / total) for term, count in counts.items()}
+
+
+def mica_matrix(terms, parents, ancestors, ic):
+    """
+    The common ancestors of a term & another term are the term itself (if it is an ancestor of the other term) and
+    the common ancestors of its parents with the other term. So the MICA row of a term is its own IC for the terms it
+    is an ancestor of & otherwise the maximum of the rows of its parents. Rows are calculated from the root down & are
+    only kept until all children of a term are done.
+
+    :param terms: the terms to include
+    :type terms: list[str]
+    :param parents: the parents per term (see :func:`read_ontology`)
+    :type parents: dict[str, list[str]]
+    :param ancestors: the ancestors per term (see :func:`ancestor_closure`)
+    :type ancestors: dict[str, frozenset[str]]
+    :param ic: the IC per term (see :func:`information_content`)
+    :type ic: dict[str, float]
+    :return: the IC of the most informative common ancestor of each pair of terms (in the order of terms)
+    :rtype: np.ndarray
+    """
+
+    index = {term: i for i, term in enumerate(terms)}
+    descendants = {}
+    for i, term in enumerate(terms):
+        for ancestor in ancestors[term]:
+            descendants.setdefault(ancestor, []).append(i)
+
+    remaining_children = dict.fromkeys(descendants, 0)
+    for term in descendants:
+        for parent in parents[term]:
+            if parent in remaining_children:
+                remaining_children[parent] += 1
+
+    mica = np.zeros((len(terms), len(terms)), dtype=np.float32)
+    rows = {}
+    # A parent always has fewer ancestors than its children.
+    for term in sorted(descendants, key=lambda ancestor: len(ancestors[ancestor])):
+        row = mica[index[term]] if term in index else np.zeros(len(terms), dtype=np.float32)
+        for parent in parents[term]:
+            if parent in rows:
+                np.maximum(row, rows[parent], out=row)
+                remaining_children[parent] -= 1
+                if remaining_children[parent] == 0:
+                    del rows[parent]
+        row[descendants[term]] = ic[term]
+        if remaining_children[term] > 0:
+            rows[term] = row
+    return mica
+
+
+def resnik_bma(case_terms, mica, output=None):
+    """
+    Calculates the Resnik best-match average similarity of all pairs of cases.
+
+    :param case_terms: per case, the indices of its terms within the MICA matrix
+    :type case_terms: list[list[int]]
+    :param mica: the MICA matrix (see :func:`mica_matrix`)
+    :type mica: np.ndarray
+    :param output: a (memory-mapped) cases x cases float32 array to write to (None creates one in memory)
+    :type output: np.ndarray | None
+    :return: the similarity matrix
+    :rtype: np.ndarray
+    """
+
+    cases = len(case_terms)
+    terms = len(mica)
+    similarity = np.zeros((cases, cases), dtype=np.float32) if output is None else output
+
+    # An additional term with IC 0 is used to pad cases to the same number of terms.
+    padded_mica = np.zeros((terms + 1, terms + 1), dtype=np.float32)
+    padded_mica[:terms, :terms] = mica
+    lengths = np.array([len(indices) for indices in case_terms])
+    # Cases are processed ordered by their number of terms, so each block is only padded to its own longest case.
+    order = np.argsort(lengths, kind='stable')
+
+    def padded(block):
+        width = max(int(lengths[block].max()), 1)
+        indices = np.full((len(block), width), terms)
+        for row, case in enumerate(block):
+            indices[row, :lengths[case]] = case_terms[case]
+        return indices
+
+    # Step 1: for each case j & term t, the best match of t in case j. Step 2: for each case i, the mean of these best
+    # matches over the terms of i. This gives the (asymmetric) average best match of case i in case j.
+    column_block = max(BLOCK_ELEMENTS // ((terms + 1) * max(int(lengths.max(initial=1)), 1)), 1)
+    for start in range(0, cases, column_block):
+        columns = order[start:start + column_block]
+        best_matches = padded_mica[:, padded(columns)].max(axis=2).T
+
+        row_block = max(BLOCK_ELEMENTS // (len(columns) * max(int(lengths.max(initial=1)), 1)), 1)
+        for row_start in range(0, cases, row_block):
+            rows = order[row_start:row_start + row_block]
+            means = best_matches[:, padded(rows)].sum(axis=2) / np.maximum(lengths[rows], 1)
+            similarity[np.ix_(rows, columns)] = means.T
+
+    # The best-match average is the mean of both directions.
+    block = max(int(BLOCK_ELEMENTS ** 0.5), 1)
+    for start in range(0, cases, block):
+        for other_start in range(start, cases, block):
+            rows = slice(start, start + block)
+            columns = slice(other_start, other_start + block)
+            average = (similarity[rows, columns] + similarity[columns, rows].T) / 2
+            similarity[rows, columns] = average
+            similarity[columns, rows] = average.T
+    return similarity
+
+
+def normalized_rows(similarity, start, end):
+    """
+    :param similarity: the similarity matrix (see :func:`resnik_bma`)
+    :type similarity: np.ndarray
+    :param start: the first row
+    :type start: int
+    :param end: the row after the last row
+    :type end: int
+    :return: the rows normalized by the self-similarity of both cases (1 for cases with identical terms), with the
+             similarity of cases with themselves set to -inf
+    :rtype: np.ndarray
+    """
+
+    self_similarity = np.sqrt(np.diagonal(similarity).astype(np.float64))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rows = similarity[start:end] / np.outer(self_similarity[start:end], self_similarity)
+    rows = np.nan_to_num(rows, nan=0.0, posinf=0.0)
+    rows[np.arange(end - start), np.arange(start, end)] = -np.inf
+    return rows
+
+
+def nearest_neighbours(similarity):
+    """
+    :param similarity: the similarity matrix (see :func:`resnik_bma`)
+    :type similarity: np.ndarray
+    :return: per case the index of the most similar other case, its normalized similarity (see
+             :func:`normalized_rows`) & the mean normalized similarity to all other cases
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+
+    cases = len(similarity)
+    nearest = np.zeros(cases, dtype=np.int64)
+    nearest_similarity = np.zeros(cases)
+    mean_similarity = np.zeros(cases)
+
+    block = max(BLOCK_ELEMENTS // max(cases, 1), 1)
+    for start in range(0, cases, block):
+        end = min(start + block, cases)
+        rows = normalized_rows(similarity, start, end)
+        nearest[start:end] = rows.argmax(axis=1)
+        nearest_similarity[start:end] = rows.max(axis=1)
+        rows[np.isinf(rows)] = 0.0
+        mean_similarity[start:end] = rows.sum(axis=1) / max(cases - 1, 1)
+
+    if cases == 1:
+        nearest_similarity[:] = 0.0
+    return nearest, nearest_similarity, mean_similarity
+
+
+def near_duplicates(similarity, threshold):
+    """
+    :param similarity: the similarity matrix (see :func:`resnik_bma`)
+    :type similarity: np.ndarray
+    :param threshold: the minimum normalized similarity (see :func:`normalized_rows`)
+    :type threshold: float
+    :return: the pairs of case indices (first index lowest) with their normalized similarity, most similar first
+    :rtype: list[tuple[int, int, float]]
+    """
+
+    cases = len(similarity)
+    pairs = []
+    block = max(BLOCK_ELEMENTS // max(cases, 1), 1)
+    for start in range(0, cases, block):
+        end = min(start + block, cases)
+        rows = normalized_rows(similarity, start, end)
+        for row, column in zip(*np.nonzero(rows >= threshold)):
+            if start + row < column:
+                pairs.append((int(start + row), int(column), float(rows[row, column])))
+    return sorted(pairs, key=lambda pair: (-pair[2], pair[0], pair[1]))
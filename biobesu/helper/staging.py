@@ -0,0 +1,217 @@
+#!/user/bin/env python3
+
+from hashlib import sha256
+from os import link
+from os import listdir
+from os import stat
+from os.path import basename
+from os.path import isdir
+from shutil import copystat
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from biobesu.helper.generic import create_dir
+
+try:
+    from os import POSIX_FADV_SEQUENTIAL
+    from os import posix_fadvise
+except ImportError:
+    # Not available on every platform (such as macOS), where files are read without advice.
+    posix_fadvise = None
+
+# Used only for docstring
+from argparse import ArgumentParser
+from typing import BinaryIO
+
+STAGE_METHODS = ['copy', 'link']
+
+# Size of the blocks in which files are copied & read.
+BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def advise_sequential(file_reader):
+    """
+    Advises the kernel that an opened file is read sequentially (if supported), so it reads ahead more aggressively.
+
+    :param file_reader: the opened file
+    :type file_reader: BinaryIO
+    """
+
+    if posix_fadvise is not None:
+        posix_fadvise(file_reader.fileno(), 0, 0, POSIX_FADV_SEQUENTIAL)
+
+
+def read_file(file_path, digest=None):
+    """
+    Reads a file sequentially (which loads it into the page cache).
+
+    :param file_path: the file to read
+    :type file_path: str
+    :param digest: if given, updated with the file content
+    :type digest: sha256 | None
+    :return: the number of bytes read
+    :rtype: int
+    """
+
+    size = 0
+    buffer = bytearray(BLOCK_SIZE)
+    with open(file_path, 'rb', buffering=0) as file_reader:
+        advise_sequential(file_reader)
+        while True:
+            read = file_reader.readinto(buffer)
+            if read == 0:
+                return size
+            if digest is not None:
+                digest.update(memoryview(buffer)[:read])
+            size += read
+
+
+class ResourceStager:
+    """
+    Stages the (large) resources used by every tool run to a local scratch location (for example, a local disk or
+    tmpfs instead of NFS). Each staged file is verified against the checksum of the original & read once afterwards so
+    that it is present in the page cache before the first tool run. Should be used as context manager: the staged
+    copies are removed on exit.
+    """
+
+    def __init__(self, stage_dir, method='copy'):
+        """
+        :param stage_dir: the scratch directory to stage the resources in (a directory of its own is created within)
+        :type stage_dir: str
+        :param method: 'copy' to copy the resources or 'link' to hardlink them (falls back to copying if the scratch
+                       directory is on another file system)
+        :type method: str
+        """
+
+        self.stage_dir = create_dir(stage_dir.rstrip('/') + '/', exist_allowed=True)
+        self.method = method
+        self.directory = None
+        self.groups = 0
+        self.staged_files = 0
+        self.staged_bytes = 0
+        self.staging_time = 0.0
+
+    def __enter__(self):
+        self.directory = mkdtemp(prefix='biobesu_', dir=self.stage_dir) + '/'
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    def stage(self, resources):
+        """
+        Stages files and/or directories together (so files that should be next to each other stay that way).
+
+        :param resources: the files and/or directories to stage (should have different names)
+        :type resources: list[str]
+        :return: the paths of the staged resources (in the same order, directories with trailing '/')
+        :rtype: list[str]
+        """
+
+        time_start = perf_counter()
+        group_dir = create_dir(f'{self.directory}{self.groups}/')
+        self.groups += 1
+
+        staged = []
+        for resource in resources:
+            if isdir(resource):
+                staged.append(self.__stage_dir(resource.rstrip('/') + '/',
+                                               create_dir(group_dir + basename(resource.rstrip('/')) + '/')))
+            else:
+                staged.append(self.__stage_file(resource, group_dir + basename(resource)))
+
+        self.staging_time += perf_counter() - time_start
+        return staged
+
+    def summary(self):
+        """
+        :return: a human-readable summary of the staged resources
+        :rtype: str
+        """
+
+        return f'Staged {self.staged_files} file(s) ({self.staged_bytes / 1024 / 1024:.1f} MB) to {self.directory} ' \
+               f'in {self.staging_time:.1f}s'
+
+    def cleanup(self):
+        """
+        Removes all staged resources.
+        """
+
+        if self.directory is not None:
+            rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def __stage_dir(self, source_dir, target_dir):
+        for file_name in sorted(listdir(source_dir)):
+            if isdir(source_dir + file_name):
+                self.__stage_dir(source_dir + file_name + '/', create_dir(target_dir + file_name + '/'))
+            else:
+                self.__stage_file(source_dir + file_name, target_dir + file_name)
+        return target_dir
+
+    def __stage_file(self, source, target):
+        """
+        Stages a single file, verifies it & loads it into the page cache.
+
+        :return: the staged file
+        :rtype: str
+        """
+
+        if self.method == 'link':
+            try:
+                link(source, target)
+                # A hardlink is the same file, so it only needs to be loaded into the page cache.
+                self.staged_bytes += read_file(target)
+                self.staged_files += 1
+                return target
+            except OSError:
+                pass
+
+        # Calculates the checksum of the original while copying, so it is only read once.
+        source_digest = sha256()
+        buffer = bytearray(BLOCK_SIZE)
+        with open(source, 'rb', buffering=0) as file_reader, open(target, 'xb') as file_writer:
+            advise_sequential(file_reader)
+            while True:
+                read = file_reader.readinto(buffer)
+                if read == 0:
+                    break
+                source_digest.update(memoryview(buffer)[:read])
+                file_writer.write(memoryview(buffer)[:read])
+        copystat(source, target)
+
+        # Reading the copy for verification also loads it into the page cache.
+        target_digest = sha256()
+        read_file(target, target_digest)
+        if target_digest.digest() != source_digest.digest() or stat(target).st_size != stat(source).st_size:
+            raise OSError(f'staged copy of "{basename(source)}" does not match the original')
+
+        self.staged_bytes += stat(target).st_size
+        self.staged_files += 1
+        return target
+
+
+def add_staging_arguments(parser):
+    """
+    Adds the command line arguments for staging resources to local scratch.
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    """
+
+    parser.add_argument('--stage_dir',
+                        help='local scratch directory (for example, on a local disk or tmpfs) to stage the tool data '
+                             'to before running (default: the data is used from its original location). The staged '
+                             'data is verified, loaded into the page cache & removed afterwards')
+    parser.add_argument('--stage_method', choices=STAGE_METHODS, default='copy',
+                        help='whether the data is copied or hardlinked to --stage_dir (default: copy)')
+
+
+def create_stager(args):
+    """
+    :param args: the parsed arguments (see :func:`add_staging_arguments`)
+    :return: the stager (None if resources should not be staged)
+    :rtype: ResourceStager | None
+    """
+
+    return ResourceStager(args.stage_dir, args.stage_method) if args.stage_dir is not None else None
@@ -0,0 +1,94 @@
+#!/user/bin/env python3
+
+from random import Random
+
+
+def percentile(values, percentage):
+    """
+    Calculates a percentile through linear interpolation.
+
+    :param values: the values (does not need to be sorted)
+    :type values: list[float]
+    :param percentage: the percentile to calculate (0-100)
+    :type percentage: float
+    :return: the percentile or None if values is empty
+    :rtype: float | None
+    """
+
+    if len(values) == 0:
+        return None
+
+    values = sorted(values)
+    position = (len(values) - 1) * percentage / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def median(values):
+    """
+    :param values: the values (does not need to be sorted)
+    :type values: list[float]
+    :return: the median or None if values is empty
+    :rtype: float | None
+    """
+
+    return percentile(values, 50)
+
+
+def bootstrap_ci(values, statistic=median, confidence=0.95, resamples=2000, seed=0):
+    """
+    Calculates a percentile bootstrap confidence interval.
+
+    :param values: the sample
+    :type values: list[float]
+    :param statistic: function calculating the statistic of a sample
+    :type statistic: function
+    :param confidence: the confidence level (0-1)
+    :type confidence: float
+    :param resamples: the number of bootstrap resamples
+    :type resamples: int
+    :param seed: seed for resampling, so that the interval is reproducible
+    :type seed: int
+    :return: the lower & upper bound (both None if values is empty)
+    :rtype: tuple[float | None, float | None]
+    """
+
+    if len(values) == 0:
+        return None, None
+
+    rng = Random(seed)
+    estimates = [statistic(rng.choices(values, k=len(values))) for i in range(resamples)]
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+def summarize(values, confidence=0.95, resamples=2000, seed=0):
+    """
+    Summarizes a sample by its median, interquartile range & a bootstrap confidence interval of the median.
+
+    :param values: the sample
+    :type values: list[float]
+    :param confidence: the confidence level (0-1) of the interval
+    :type confidence: float
+    :param resamples: the number of bootstrap resamples
+    :type resamples: int
+    :param seed: seed for resampling
+    :type seed: int
+    :return: n, median, q1, q3, iqr, ci_lower & ci_upper (None if not available)
+    :rtype: dict
+    """
+
+    q1 = percentile(values, 25)
+    q3 = percentile(values, 75)
+    ci_lower, ci_upper = bootstrap_ci(values, median, confidence, resamples, seed)
+
+    return {
+        'n': len(values),
+        'median': median(values),
+        'q1': q1,
+        'q3': q3,
+        'iqr': q3 - q1 if values else None,
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper
+    }
@@ -0,0 +1,380 @@
+#!/user/bin/env python3
+
+from errno import EXDEV
+from gzip import compress
+from gzip import decompress
+from gzip import open as gzip_open
+from io import StringIO
+from os import listdir
+from os import remove
+from os import replace
+from os.path import basename
+from os.path import getsize
+from os.path import isdir
+from os.path import isfile
+from shutil import copyfile
+from shutil import copyfileobj
+from biobesu.helper.execution import ExecutionListener
+from biobesu.helper.generic import create_dir
+
+# Used only for docstring
+from argparse import ArgumentParser
+from typing import TextIO
+from biobesu.helper.scratch import ScratchSpace
+
+STORAGE_TYPES = ['plain', 'gzip', 'archive']
+
+
+def output_id(file_name, suffix):
+    """
+    :param file_name: a (path to a) per-case output file
+    :type file_name: str
+    :param suffix: the suffix of the file (only the last extension is removed if the file has another suffix)
+    :type suffix: str
+    :return: the case id the file belongs to (which can contain dots)
+    :rtype: str
+    """
+
+    file_name = basename(file_name)
+    if file_name.endswith(suffix):
+        return file_name[:-len(suffix)]
+    return file_name.rsplit('.', 1)[0]
+
+
+def publish(source, target):
+    """
+    Moves a file into place atomically: the target either does not exist or is complete. Across file systems, the file
+    is copied next to the target first.
+
+    :param source: the file to move
+    :type source: str
+    :param target: the path to move the file to
+    :type target: str
+    """
+
+    try:
+        replace(source, target)
+    except OSError as e:
+        if e.errno != EXDEV:
+            raise
+        copyfile(source, target + '.tmp')
+        replace(target + '.tmp', target)
+        remove(source)
+
+
+class OutputStore:
+    """
+    Storage of per-case tool output in a directory. Tools write their output to :func:`OutputStore.staging_file`,
+    after which :func:`OutputStore.collect` moves it into the store. Readers only use :func:`OutputStore.ids` &
+    :func:`OutputStore.open`, so they work with any storage type.
+    """
+
+    SUFFIX = '.tsv'
+
+    def __init__(self, directory):
+        """
+        :param directory: the directory containing the stored output (with trailing '/')
+        :type directory: str
+        """
+
+        self.directory = directory
+        self.scratch_area = None
+
+    def use_scratch(self, scratch):
+        """
+        Lets tools write their output to a private directory per case within a scratch space (instead of within the
+        store), from which :func:`OutputStore.collect` moves it into the store.
+
+        :param scratch: the scratch space (should be entered)
+        :type scratch: ScratchSpace
+        """
+
+        self.scratch_area = scratch.area()
+
+    def ids(self):
+        """
+        :return: the ids of all stored cases, sorted
+        :rtype: list[str]
+        """
+
+        raise NotImplementedError
+
+    def contains(self, case_id):
+        raise NotImplementedError
+
+    def open(self, case_id):
+        """
+        :param case_id: the id of a stored case
+        :type case_id: str
+        :return: the opened output of the case (in text mode)
+        :rtype: TextIO
+        """
+
+        raise NotImplementedError
+
+    def staging_file(self, case_id):
+        """
+        :param case_id: the id of a case
+        :type case_id: str
+        :return: the path a tool should write the output of the case to
+        :rtype: str
+        """
+
+        if self.scratch_area is not None:
+            return f'{create_dir(f"{self.scratch_area}{case_id}/", exist_allowed=True)}{case_id}{self.SUFFIX}'
+        return f'{self.staging_dir()}{case_id}{self.SUFFIX}'
+
+    def staged(self, file_path):
+        """
+        :param file_path: a file
+        :type file_path: str
+        :return: whether the file was written to a staging location of this store (see :func:`OutputStore.staging_file`)
+        :rtype: bool
+        """
+
+        return file_path.startswith(self.staging_location()) or \
+            (self.scratch_area is not None and file_path.startswith(self.scratch_area))
+
+    def staging_location(self):
+        """
+        :return: the path of :func:`OutputStore.staging_dir` (without creating it)
+        :rtype: str
+        """
+
+        return self.directory + '.incoming/'
+
+    def staging_dir(self):
+        """
+        :return: the directory in which a tool should write its output to (for tools that only accept a directory)
+        :rtype: str
+        """
+
+        return create_dir(self.staging_location(), exist_allowed=True)
+
+    def collect(self, case_id, file_path):
+        """
+        Moves a file written to :func:`OutputStore.staging_file` into the store.
+
+        :param case_id: the id of the case the file belongs to
+        :type case_id: str
+        :param file_path: the written file
+        :type file_path: str
+        """
+
+        raise NotImplementedError
+
+
+class PlainOutputStore(OutputStore):
+    """
+    Stores each output as uncompressed file (without a scratch space, the tool writes directly into the store).
+    """
+
+    def ids(self):
+        return sorted(self.__files())
+
+    def contains(self, case_id):
+        return isfile(self.directory + case_id + self.SUFFIX)
+
+    def open(self, case_id):
+        # Output written by a tool could have a different extension.
+        if isfile(self.directory + case_id + self.SUFFIX):
+            return open(self.directory + case_id + self.SUFFIX)
+        return open(self.directory + self.__files()[case_id])
+
+    def staging_file(self, case_id):
+        if self.scratch_area is not None:
+            return super().staging_file(case_id)
+        return self.directory + case_id + self.SUFFIX
+
+    def staging_location(self):
+        return self.directory
+
+    def collect(self, case_id, file_path):
+        target = self.directory + case_id + self.SUFFIX
+        if file_path != target:
+            publish(file_path, target)
+
+    def __files(self):
+        """
+        :return: the file name per case id (hidden files such as .DS_Store are ignored)
+        :rtype: dict[str, str]
+        """
+
+        return {output_id(file_name, self.SUFFIX): file_name for file_name in listdir(self.directory)
+                if not file_name.startswith('.') and not file_name.endswith('.tmp') and
+                isfile(self.directory + file_name)}
+
+
+class GzipOutputStore(OutputStore):
+    """
+    Stores each output as gzip-compressed file.
+    """
+
+    def ids(self):
+        return sorted(output_id(file_name, self.SUFFIX + '.gz') for file_name in listdir(self.directory)
+                      if file_name.endswith(self.SUFFIX + '.gz'))
+
+    def contains(self, case_id):
+        return isfile(self.__path(case_id))
+
+    def open(self, case_id):
+        return gzip_open(self.__path(case_id), 'rt')
+
+    def collect(self, case_id, file_path):
+        # Writes to a temporary file first so that an interrupted run never leaves a partial file behind.
+        with open(file_path, 'rb') as file_reader, gzip_open(self.__path(case_id) + '.tmp', 'wb') as file_writer:
+            copyfileobj(file_reader, file_writer)
+        replace(self.__path(case_id) + '.tmp', self.__path(case_id))
+        remove(file_path)
+
+    def __path(self, case_id):
+        return f'{self.directory}{case_id}{self.SUFFIX}.gz'
+
+
+class ArchiveOutputStore(OutputStore):
+    """
+    Stores all output in a single file of concatenated gzip members, together with an index (id, offset & length per
+    member). Outputs are only appended. An output only becomes part of the store once its index line is written, so
+    an interrupted append is ignored.
+    """
+
+    ARCHIVE_FILE = 'outputs.archive'
+    INDEX_FILE = 'outputs.index'
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.archive_file = directory + self.ARCHIVE_FILE
+        self.index_file = directory + self.INDEX_FILE
+        self.index = self.__read_index()
+        self.__truncate_index()
+
+    def ids(self):
+        return sorted(self.index)
+
+    def contains(self, case_id):
+        return case_id in self.index
+
+    def open(self, case_id):
+        offset, length = self.index[case_id]
+        with open(self.archive_file, 'rb') as file_reader:
+            file_reader.seek(offset)
+            return StringIO(decompress(file_reader.read(length)).decode())
+
+    def collect(self, case_id, file_path):
+        with open(file_path, 'rb') as file_reader:
+            member = compress(file_reader.read())
+
+        with open(self.archive_file, 'ab') as archive_writer:
+            offset = archive_writer.tell()
+            archive_writer.write(member)
+        with open(self.index_file, 'a') as index_writer:
+            index_writer.write(f'{case_id}\t{offset}\t{len(member)}\n')
+
+        self.index[case_id] = (offset, len(member))
+        remove(file_path)
+
+    def __truncate_index(self):
+        """
+        Removes a partially written last line from the index, so that the next index line is not appended to it.
+        """
+
+        if not isfile(self.index_file):
+            return
+        with open(self.index_file, 'r+b') as index_file:
+            content = index_file.read()
+            if content and not content.endswith(b'\n'):
+                index_file.truncate(content.rfind(b'\n') + 1)
+
+    def __read_index(self):
+        """
+        :return: the offset & length per case id (for ids stored multiple times, the last one)
+        :rtype: dict[str, tuple[int, int]]
+        """
+
+        index = {}
+        if not isfile(self.index_file):
+            return index
+
+        archive_size = getsize(self.archive_file) if isfile(self.archive_file) else 0
+        with open(self.index_file) as file_reader:
+            for line in file_reader:
+                fields = line.rstrip('\n').split('\t')
+                # Ignores a partially written last line or entries whose data is missing.
+                if len(fields) != 3 or not fields[1].isdigit() or not fields[2].isdigit():
+                    continue
+                offset, length = int(fields[1]), int(fields[2])
+                if offset + length <= archive_size:
+                    index[fields[0]] = (offset, length)
+        return index
+
+
+def create_output_store(directory, storage='plain'):
+    """
+    :param directory: the directory to store the output in (created if it does not exist)
+    :type directory: str
+    :param storage: the storage type (see `STORAGE_TYPES`)
+    :type storage: str
+    :return: the output store
+    :rtype: OutputStore
+    """
+
+    directory = create_dir(directory, exist_allowed=True)
+    if storage == 'gzip':
+        return GzipOutputStore(directory)
+    if storage == 'archive':
+        return ArchiveOutputStore(directory)
+    return PlainOutputStore(directory)
+
+
+def open_output_store(directory):
+    """
+    Opens existing output, detecting the storage type from the directory content.
+
+    :param directory: the directory containing the output
+    :type directory: str
+    :return: the output store
+    :rtype: OutputStore
+    """
+
+    directory = directory.rstrip('/') + '/'
+    if not isdir(directory):
+        raise OSError(f'"{directory}" is not a directory')
+
+    if isfile(directory + ArchiveOutputStore.INDEX_FILE):
+        return ArchiveOutputStore(directory)
+    if any(file_name.endswith(OutputStore.SUFFIX + '.gz') for file_name in listdir(directory)):
+        return GzipOutputStore(directory)
+    return PlainOutputStore(directory)
+
+
+class OutputCollector(ExecutionListener):
+    """
+    Moves the output of successfully finished cases into a store.
+    """
+
+    def __init__(self, store):
+        """
+        :param store: the store to move the output to
+        :type store: OutputStore
+        """
+
+        self.store = store
+
+    def case_finished(self, result):
+        output_file = result.case.output_file
+        if not result.failed and output_file is not None and isfile(output_file) and \
+                self.store.staged(output_file):
+            self.store.collect(result.case.case_id, output_file)
+
+
+def add_storage_arguments(parser):
+    """
+    Adds the command line argument defining how per-case tool output is stored.
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    """
+
+    parser.add_argument('--output_storage', choices=STORAGE_TYPES, default='plain',
+                        help='how per-case tool output is stored: a file per case (plain), a gzip-compressed file per '
+                             'case (gzip) or a single indexed archive (archive) (default: plain)')
@@ -0,0 +1,325 @@
+#!/user/bin/env python3
+
+import gzip
+from random import Random
+
+# Used only for docstring
+from typing import TextIO
+
+
+def hpo_id(number):
+    """
+    Generates the HPO ID belonging to a synthetic term number.
+
+    :param number: the term number (1 is the root term)
+    :type number: int
+    :return: the HPO ID
+    :rtype: str
+    """
+
+    return f'HP:{number:07d}'
+
+
+def gene_symbol(gene_id):
+    """
+    Generates the gene symbol belonging to a synthetic gene ID.
+
+    :param gene_id: the gene ID
+    :type gene_id: int | str
+    :return: the gene symbol
+    :rtype: str
+    """
+
+    return f'GENE{gene_id}'
+
+
+def gene_aliases(gene_id):
+    """
+    Generates the aliases belonging to a synthetic gene ID.
+
+    :param gene_id: the gene ID
+    :type gene_id: int | str
+    :return: the gene aliases
+    :rtype: list[str]
+    """
+
+    return [f'{gene_symbol(gene_id)}A', f'{gene_symbol(gene_id)}B']
+
+
+def omim_number(disease):
+    """
+    Generates the OMIM number belonging to a synthetic disease.
+
+    :param disease: the disease number (0-based)
+    :type disease: int
+    :return: the OMIM number
+    :rtype: str
+    """
+
+    return str(100000 + disease)
+
+
+def disease_gene_id(disease, genes):
+    """
+    Retrieves the gene ID that is associated with a synthetic disease.
+
+    :param disease: the disease number (0-based)
+    :type disease: int
+    :param genes: the total number of genes
+    :type genes: int
+    :return: the gene ID
+    :rtype: int
+    """
+
+    return disease % genes + 1
+
+
+def hpo_parents(number, seed=0):
+    """
+    Retrieves the parents of a synthetic HPO term. Parents always have a lower number than their child, so that the
+    terms form a directed acyclic graph with term 1 as root.
+
+    :param number: the term number
+    :type number: int
+    :param seed: seed used for generating the hierarchy
+    :type seed: int
+    :return: the parent term numbers (empty for the root term)
+    :rtype: list[int]
+    """
+
+    if number == 1:
+        return []
+
+    rng = Random(seed * 1000003 + number)
+    # Prefers recent terms as parent so that the hierarchy has a realistic depth.
+    parents = [max(1, number - 1 - int(rng.expovariate(1 / 25)))]
+    if number > 3 and rng.random() < 0.1:
+        second_parent = rng.randint(1, number - 1)
+        if second_parent not in parents:
+            parents.append(second_parent)
+
+    return parents
+
+
+def random_hpo_set(rng, terms):
+    """
+    Draws a set of HPO IDs, sized similar to real benchmark cases.
+
+    :param rng: the random generator to use
+    :type rng: Random
+    :param terms: the total number of terms (root term is never drawn)
+    :type terms: int
+    :return: the drawn HPO IDs
+    :rtype: list[str]
+    """
+
+    size = min(terms - 1, 1 + int(rng.lognormvariate(1.2, 0.7)))
+    return [hpo_id(number) for number in rng.sample(range(2, terms + 1), size)]
+
+
+def write_hpo_obo(file_path, terms, seed=0, version='2021-06-08'):
+    """
+    Writes a synthetic hpo.obo file.
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param terms: the number of terms to write
+    :type terms: int
+    :param seed: seed used for generating the hierarchy
+    :type seed: int
+    :param version: the release version to be used in the header
+    :type version: str
+    """
+
+    with open(file_path, 'w') as file_writer:
+        file_writer.write(f'format-version: 1.2\ndata-version: releases/{version}\nontology: hp\n\n')
+
+        for number in range(1, terms + 1):
+            file_writer.write(f'[Term]\nid: {hpo_id(number)}\nname: Synthetic phenotype {number}\n'
+                              f'def: "A synthetic phenotype." [HPO:biobesu]\n'
+                              f'synonym: "Synthetic feature {number}" EXACT []\n'
+                              f'xref: UMLS:C{number:07d}\n')
+            for parent in hpo_parents(number, seed):
+                file_writer.write(f'is_a: {hpo_id(parent)} ! Synthetic phenotype {parent}\n')
+            file_writer.write('\n')
+
+
+def write_gene_symbols_file(file_path, genes):
+    """
+    Writes a synthetic gene file in the format as downloaded by :class:`biobesu.helper.converters.GeneConverter`.
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param genes: the number of genes to write
+    :type genes: int
+    """
+
+    with open(file_path, 'w') as file_writer:
+        file_writer.write('NCBI Gene ID\tApproved symbol\n')
+        for gene_id in range(1, genes + 1):
+            file_writer.write(f'{gene_id}\t{gene_symbol(gene_id)}\n')
+
+
+def write_gene_info_file(file_path, genes):
+    """
+    Writes a synthetic gzipped "Homo_sapiens_gene_info" file as supplied with LIRICAL.
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param genes: the number of genes to write
+    :type genes: int
+    """
+
+    with gzip.open(file_path, 'wt') as file_writer:
+        file_writer.write('#tax_id\tGeneID\tSymbol\tLocusTag\tSynonyms\tdbXrefs\tchromosome\tmap_location\tdescription'
+                          '\ttype_of_gene\tSymbol_from_nomenclature_authority\tFull_name_from_nomenclature_authority'
+                          '\tNomenclature_status\tOther_designations\tModification_date\tFeature_type\n')
+        for gene_id in range(1, genes + 1):
+            symbol = gene_symbol(gene_id)
+            file_writer.write(f'9606\t{gene_id}\t{symbol}\t-\t{"|".join(gene_aliases(gene_id))}\tHGNC:HGNC:{gene_id}\t1'
+                              f'\t1p1\tsynthetic gene {gene_id}\tprotein-coding\t{symbol}\tsynthetic gene {gene_id}\tO'
+                              f'\t-\t20210601\t-\n')
+
+
+def write_mim2gene_medgen_file(file_path, diseases, genes):
+    """
+    Writes a synthetic "mim2gene_medgen" file as supplied with LIRICAL. Part of the diseases has no gene.
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param diseases: the number of diseases to write
+    :type diseases: int
+    :param genes: the total number of genes
+    :type genes: int
+    """
+
+    with open(file_path, 'w') as file_writer:
+        file_writer.write('#MIM number\tGeneID\ttype\tSource\tMedGenCUI\tComment\n')
+        for disease in range(diseases):
+            gene_id = '-' if disease % 13 == 0 else disease_gene_id(disease, genes)
+            file_writer.write(f'{omim_number(disease)}\t{gene_id}\tphenotype\t GeneMap\tC{disease:07d}\t-\n')
+
+
+def write_phenotype_hpoa_file(file_path, diseases, terms, seed=0):
+    """
+    Writes a synthetic "phenotype.hpoa" annotation file.
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param diseases: the number of diseases to annotate
+    :type diseases: int
+    :param terms: the number of HPO terms to draw annotations from
+    :type terms: int
+    :param seed: seed used for drawing the annotations
+    :type seed: int
+    """
+
+    rng = Random(seed)
+
+    with open(file_path, 'w') as file_writer:
+        file_writer.write('#description: synthetic HPO annotations\n#date: 2021-06-08\n'
+                          '#DatabaseID\tDiseaseName\tQualifier\tHPO_ID\tReference\tEvidence\tOnset\tFrequency\tSex'
+                          '\tModifier\tAspect\tBiocuration\n')
+        for disease in range(diseases):
+            omim = f'OMIM:{omim_number(disease)}'
+            for hpo in random_hpo_set(rng, terms):
+                file_writer.write(f'{omim}\tSYNTHETIC DISEASE {disease}\t\t{hpo}\t{omim}\tTAS\t\t\t\t\tP'
+                                  f'\tHPO:biobesu[2021-06-08]\n')
+
+
+def write_benchmark_file(file_path, cases, terms, genes, seed=0, gene_column='gene_symbol'):
+    """
+    Writes a synthetic benchmark file.
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param cases: the number of cases to write
+    :type cases: int
+    :param terms: the number of HPO terms to draw phenotypes from
+    :type terms: int
+    :param genes: the number of genes to draw the causal gene from
+    :type genes: int
+    :param seed: seed used for drawing the cases
+    :type seed: int
+    :param gene_column: "gene_symbol" (hpo_generank format) or "gene_id" (vibe_versions format)
+    :type gene_column: str
+    """
+
+    rng = Random(seed)
+
+    with open(file_path, 'w') as file_writer:
+        file_writer.write(f'id\t{gene_column}\thpo_ids\n')
+        for case in range(1, cases + 1):
+            gene_id = rng.randint(1, genes)
+            gene = gene_symbol(gene_id) if gene_column == 'gene_symbol' else str(gene_id)
+            file_writer.write(f'{case:05d}\t{gene}\t{",".join(random_hpo_set(rng, terms))}\n')
+
+
+def write_lirical_output(file_writer, rows, genes, diseases, seed=0):
+    """
+    Writes synthetic LIRICAL tsv output (as generated with the `--tsv` flag).
+
+    :param file_writer: the opened file to write to
+    :type file_writer: TextIO
+    :param rows: the number of ranked diseases to write
+    :type rows: int
+    :param genes: the total number of genes
+    :type genes: int
+    :param diseases: the total number of diseases to draw from
+    :type diseases: int
+    :param seed: seed used for drawing the diseases
+    :type seed: int
+    """
+
+    rng = Random(seed)
+
+    file_writer.write('! LIRICAL TSV Output (synthetic)\n! Sample: synthetic\n')
+    file_writer.write('rank\tdiseaseName\tdiseaseCurie\tpretestprob\tposttestprob\tcompositeLR\tentrezGeneId'
+                      '\tvariants\n')
+    for rank, disease in enumerate(rng.sample(range(diseases), min(rows, diseases)), start=1):
+        # Part of the disease names lack a gene alias, similar to real output.
+        if disease % 7 == 0:
+            disease_name = f'Synthetic syndrome {disease}'
+        else:
+            disease_name = f'SYNTHETIC DISEASE {disease}; {gene_aliases(disease_gene_id(disease, genes))[0]}'
+        file_writer.write(f'{rank}\t{disease_name}\tOMIM:{omim_number(disease)}\t1/7987\t0,00%\t0,5\tn/a\tn/a\n')
+
+
+def write_lirical_output_file(file_path, rows, genes, diseases, seed=0):
+    """
+    Wrapper for :func:`write_lirical_output` that writes to a file path.
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param rows: the number of ranked diseases to write
+    :type rows: int
+    :param genes: the total number of genes
+    :type genes: int
+    :param diseases: the total number of diseases to draw from
+    :type diseases: int
+    :param seed: seed used for drawing the diseases
+    :type seed: int
+    """
+
+    with open(file_path, 'w') as file_writer:
+        write_lirical_output(file_writer, rows, genes, diseases, seed)
+
+
+def write_vibe_output_file(file_path, genes, length, seed=0):
+    """
+    Writes a synthetic VIBE simple output file (a single line of comma-separated gene IDs).
+
+    :param file_path: path of the file to write
+    :type file_path: str
+    :param genes: the total number of genes
+    :type genes: int
+    :param length: the number of suggested genes
+    :type length: int
+    :param seed: seed used for drawing the genes
+    :type seed: int
+    """
+
+    rng = Random(seed)
+
+    with open(file_path, 'w') as file_writer:
+        file_writer.write(','.join(str(gene_id) for gene_id in rng.sample(range(1, genes + 1), min(length, genes))))
@@ -0,0 +1,263 @@
+#!/user/bin/env python3
+
+from datetime import datetime
+from json import dump
+from os import getloadavg
+from os import replace
+from platform import platform
+from platform import python_version
+from subprocess import DEVNULL
+from subprocess import PIPE
+from subprocess import SubprocessError
+from subprocess import run
+from biobesu.helper.admission import usable_cpus
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def parse_cpu_list(cpu_list):
+    """
+    Parses a CPU list as used by taskset/cgroups (for example: "0-3,8,10-11").
+
+    :param cpu_list: the CPU list
+    :type cpu_list: str
+    :return: the CPUs, sorted
+    :rtype: list[int]
+    """
+
+    cpus = set()
+    for part in cpu_list.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def available_cpus():
+    """
+    :return: the CPUs this process is allowed to run on, sorted
+    :rtype: list[int]
+    """
+
+    try:
+        from os import sched_getaffinity
+        return sorted(sched_getaffinity(0))
+    except ImportError:
+        return list(range(usable_cpus()))
+
+
+class CpuSetAllocator:
+    """
+    Divides CPUs into disjoint sets of equal size & hands out each set to a single case at a time, so that
+    simultaneously running cases never compete for the same CPU.
+    """
+
+    def __init__(self, cpus, cpus_per_case):
+        """
+        :param cpus: the CPUs that can be used
+        :type cpus: list[int]
+        :param cpus_per_case: the number of CPUs per set
+        :type cpus_per_case: int
+        """
+
+        if cpus_per_case < 1 or len(cpus) < cpus_per_case:
+            raise ValueError(f'{len(cpus)} CPU(s) can not be divided into sets of {cpus_per_case} CPU(s)')
+
+        # Any remaining CPUs (that do not fill a complete set) are left for other processes.
+        self.cpu_sets = [tuple(cpus[i:i + cpus_per_case])
+                         for i in range(0, len(cpus) - cpus_per_case + 1, cpus_per_case)]
+        self.free = list(self.cpu_sets)
+
+    def available(self):
+        return len(self.free) > 0
+
+    def acquire(self):
+        """
+        :return: a free CPU set (None if all are in use)
+        :rtype: tuple[int] | None
+        """
+
+        return self.free.pop(0) if self.free else None
+
+    def release(self, cpu_set):
+        """
+        :param cpu_set: a CPU set retrieved through :func:`CpuSetAllocator.acquire`
+        :type cpu_set: tuple[int]
+        """
+
+        self.free.append(cpu_set)
+        # Keeps handing out sets in a predictable order.
+        self.free.sort(key=self.cpu_sets.index)
+
+
+class TimingMode:
+    """
+    Settings that make timings of tool runs reproducible: each case is pinned to its own CPU set and the JVM gets
+    fixed ergonomics (processor count, heap size & garbage collector) instead of deriving them from the machine.
+    """
+
+    DEFAULT_HEAP = 2048
+    DEFAULT_GC = 'SerialGC'
+
+    def __init__(self, cpus_per_case=1, heap=DEFAULT_HEAP, gc=DEFAULT_GC, cpus=None):
+        """
+        :param cpus_per_case: the number of CPUs each case is pinned to
+        :type cpus_per_case: int
+        :param heap: the heap size (both initial & maximum) in MB
+        :type heap: int
+        :param gc: the garbage collector to use (as in `-XX:+Use<gc>`)
+        :type gc: str
+        :param cpus: the CPUs to divide over the cases (default: all CPUs this process may use)
+        :type cpus: list[int] | None
+        """
+
+        self.cpus_per_case = cpus_per_case
+        self.heap = heap
+        self.gc = gc
+        self.allocator = CpuSetAllocator(cpus if cpus is not None else available_cpus(), cpus_per_case)
+
+    def jvm_options(self):
+        """
+        :return: the JVM options that fix the ergonomics of the JVM
+        :rtype: list[str]
+        """
+
+        return [f'-XX:ActiveProcessorCount={self.cpus_per_case}', f'-Xms{self.heap}m', f'-Xmx{self.heap}m',
+                f'-XX:+Use{self.gc}']
+
+    def configuration(self, java, max_workers):
+        """
+        :param java: the java executable
+        :type java: str
+        :param max_workers: the maximum number of simultaneously running cases
+        :type max_workers: int
+        :return: a description of the effective configuration & the machine it is used on
+        :rtype: dict
+        """
+
+        return {
+            'created': datetime.utcnow().isoformat() + 'Z',
+            'java': java,
+            'java_version': java_version(java),
+            'jvm_options': self.jvm_options(),
+            'cpus_per_case': self.cpus_per_case,
+            'cpu_sets': [list(cpu_set) for cpu_set in self.allocator.cpu_sets],
+            'max_workers': min(max_workers, len(self.allocator.cpu_sets)),
+            'platform': platform(),
+            'python_version': python_version(),
+            'cpu_model': cpu_model(),
+            'cpu_governor': cpu_governor(),
+            'load_average': list(getloadavg())
+        }
+
+
+def java_version(java):
+    """
+    :param java: the java executable
+    :type java: str
+    :return: the output of `java -version` (None if it could not be retrieved)
+    :rtype: str | None
+    """
+
+    try:
+        # Java writes its version to stderr.
+        return run([java, '-version'], stdout=DEVNULL, stderr=PIPE, timeout=60,
+                   universal_newlines=True).stderr.strip()
+    except (OSError, SubprocessError):
+        return None
+
+
+def cpu_model():
+    """
+    :return: the CPU model name (Linux only, None if it could not be determined)
+    :rtype: str | None
+    """
+
+    try:
+        with open('/proc/cpuinfo') as file_reader:
+            for line in file_reader:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return None
+
+
+def cpu_governor():
+    """
+    :return: the CPU frequency scaling governor (Linux only, None if it could not be determined)
+    :rtype: str | None
+    """
+
+    try:
+        with open('/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor') as file_reader:
+            return file_reader.read().strip()
+    except OSError:
+        return None
+
+
+def add_timing_arguments(parser):
+    """
+    Adds the command line arguments for the timing fidelity mode.
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    """
+
+    parser.add_argument('--timing', action='store_true',
+                        help='pin each tool run to dedicated CPUs & use fixed JVM ergonomics for reproducible timings')
+    parser.add_argument('--cpus_per_case', type=int, default=1,
+                        help='number of CPUs each tool run is pinned to in timing mode (default: 1)')
+    parser.add_argument('--timing_cpus', type=parse_cpu_list,
+                        help='CPUs used in timing mode, for example "2-7" (default: all available CPUs)')
+    parser.add_argument('--timing_gc', default=TimingMode.DEFAULT_GC,
+                        help=f'garbage collector used in timing mode (default: {TimingMode.DEFAULT_GC})')
+
+
+def create_timing_mode(args):
+    """
+    Creates a :class:`TimingMode` based on the arguments added through :func:`add_timing_arguments`. The heap size
+    is taken from `--case_memory` if given.
+
+    :param args: the parsed arguments
+    :return: the timing mode (None if not enabled)
+    :rtype: TimingMode | None
+    :raises OSError: if the timing mode is not supported on this platform (pinning requires `sched_setaffinity`)
+    """
+
+    if not args.timing:
+        return None
+
+    try:
+        from os import sched_setaffinity
+    except ImportError:
+        raise OSError('--timing is not supported on this platform: pinning tool runs to CPUs requires '
+                      'sched_setaffinity (Linux)')
+
+    heap = args.case_memory if args.case_memory is not None else TimingMode.DEFAULT_HEAP
+    try:
+        return TimingMode(args.cpus_per_case, heap, args.timing_gc, args.timing_cpus)
+    except ValueError as e:
+        raise OSError(e)
+
+
+def write_timing_configuration(timing_mode, java, max_workers, output_file):
+    """
+    Stores the effective configuration of the timing mode as JSON.
+
+    :param timing_mode: the timing mode
+    :type timing_mode: TimingMode
+    :param java: the java executable
+    :type java: str
+    :param max_workers: the maximum number of simultaneously running cases
+    :type max_workers: int
+    :param output_file: the file to write to
+    :type output_file: str
+    """
+
+    with open(output_file + '.tmp', 'w') as file_writer:
+        dump(timing_mode.configuration(java, max_workers), file_writer, indent='\t')
+    replace(output_file + '.tmp', output_file)
@@ -0,0 +1,239 @@
+#!/user/bin/env python3
+
+from contextlib import contextmanager
+from json import dumps
+from json import loads
+from os import getpid
+from sys import argv
+from time import perf_counter
+from time import time
+from biobesu.helper.metrics import current_exporter
+from biobesu.helper.stats import percentile
+
+BEGIN = 'B'
+END = 'E'
+PROCESS = 'process'
+
+# Worker 0 is used for the stages of the runner itself, tool runs use workers 1 and up.
+MAIN_WORKER = 0
+
+# Idle gaps on a worker shorter than this (in seconds) are not reported separately.
+IDLE_GAP_THRESHOLD = 1.0
+
+
+class Tracer:
+    """
+    Writes trace events as JSON lines. Events are appended with a single write each, so multiple runners can trace to
+    the same file (for example, for a complete benchmark campaign). Each event has:
+
+    - time: seconds since the epoch
+    - phase: B (begin), E (end) or process (identifies the runner)
+    - name: what happened (a stage name or case id)
+    - category: 'stage' or 'case'
+    - process: the process ID of the runner (within `biobesu campaign`, an ID per runner)
+    - worker: the worker slot (0 for the stages of the runner itself)
+    - case_id & pid: the case & the process ID of the tool run (for cases only)
+    - args: additional information
+    """
+
+    def __init__(self, trace_file=None, name=None, process=None):
+        """
+        :param trace_file: the file to append the events to (None writes no events)
+        :type trace_file: str | None
+        :param name: the name of the runner (default: the suite & runner from the command line)
+        :type name: str | None
+        :param process: the ID identifying the runner (default: the process ID)
+        :type process: int | None
+        """
+
+        self.trace_file = trace_file
+        self.process = getpid() if process is None else process
+        if trace_file is not None:
+            self.event(PROCESS, name or ' '.join(argv[1:3]) or 'biobesu', 'process')
+
+    @property
+    def enabled(self):
+        return self.trace_file is not None
+
+    def event(self, phase, name, category, worker=MAIN_WORKER, case_id=None, pid=None, args=None, timestamp=None):
+        """
+        Writes a single event.
+        """
+
+        if self.trace_file is None:
+            return
+
+        event = {'time': time() if timestamp is None else timestamp, 'phase': phase, 'name': name,
+                 'category': category, 'process': self.process, 'worker': worker}
+        if case_id is not None:
+            event['case_id'] = case_id
+        if pid is not None:
+            event['pid'] = pid
+        if args:
+            event['args'] = args
+        with open(self.trace_file, 'a') as file_writer:
+            file_writer.write(dumps(event) + '\n')
+
+    @contextmanager
+    def span(self, name, **args):
+        """
+        Traces a stage of a runner (begin & end event around the with-block). The duration is also reported to the
+        metrics exporter (if any).
+
+        :param name: the name of the stage
+        :type name: str
+        """
+
+        self.event(BEGIN, name, 'stage', args=args)
+        time_start = perf_counter()
+        try:
+            yield
+        finally:
+            self.event(END, name, 'stage')
+            if current_exporter() is not None:
+                current_exporter().stage_finished(name, perf_counter() - time_start)
+
+
+def create_tracer(args):
+    """
+    :param args: the parsed arguments (see :func:`~biobesu.helper.execution.add_execution_arguments`)
+    :return: the tracer (which writes no events if tracing is disabled)
+    :rtype: Tracer
+    """
+
+    # The runner name & ID are set by `biobesu campaign`, which runs several runners within a single process.
+    return Tracer(getattr(args, 'trace', None), getattr(args, 'runner_name', None), getattr(args, 'runner_id', None))
+
+
+def read_events(trace_file):
+    """
+    :param trace_file: a file written by a :class:`Tracer`
+    :type trace_file: str
+    :return: the events, ordered by time
+    :rtype: list[dict]
+    """
+
+    events = []
+    with open(trace_file) as file_reader:
+        for line in file_reader:
+            # Ignores a partially written last line (from an interrupted runner).
+            if line.endswith('\n'):
+                events.append(loads(line))
+    return sorted(events, key=lambda event: event['time'])
+
+
+def to_chrome_trace(events):
+    """
+    Converts events to the Chrome trace event format (which can be opened in Perfetto or chrome://tracing). Each runner
+    becomes a process & each worker slot a thread.
+
+    :param events: the events (see :func:`read_events`)
+    :type events: list[dict]
+    :return: the Chrome trace (to be serialized as JSON)
+    :rtype: dict
+    """
+
+    trace_events = []
+    workers = set()
+    processes = set()
+    for event in events:
+        if event['phase'] == PROCESS:
+            if event['process'] in processes:
+                continue
+            processes.add(event['process'])
+            trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': event['process'], 'tid': MAIN_WORKER,
+                                 'args': {'name': f'{event["name"]} ({event["process"]})'}})
+            continue
+
+        args = dict(event.get('args', {}))
+        if 'pid' in event:
+            args['pid'] = event['pid']
+        trace_events.append({'name': event['name'], 'cat': event['category'], 'ph': event['phase'],
+                             'ts': round(event['time'] * 1000000), 'pid': event['process'], 'tid': event['worker'],
+                             'args': args})
+        workers.add((event['process'], event['worker']))
+
+    for process, worker in sorted(workers):
+        trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': process, 'tid': worker,
+                             'args': {'name': 'main' if worker == MAIN_WORKER else f'worker {worker}'}})
+        trace_events.append({'name': 'thread_sort_index', 'ph': 'M', 'pid': process, 'tid': worker,
+                             'args': {'sort_index': worker}})
+
+    return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+
+def spans(events):
+    """
+    Pairs the begin & end events.
+
+    :param events: the events (see :func:`read_events`)
+    :type events: list[dict]
+    :return: per span: process, worker, category, name, begin & end time, and the begin event args (spans without end
+             event, for example from an interrupted runner, are left out)
+    :rtype: list[tuple[int, int, str, str, float, float, dict]]
+    """
+
+    open_spans = {}
+    paired = []
+    for event in events:
+        key = (event['process'], event['worker'], event['category'], event['name'])
+        if event['phase'] == BEGIN:
+            open_spans.setdefault(key, []).append(event)
+        elif event['phase'] == END and open_spans.get(key):
+            begin = open_spans[key].pop()
+            paired.append(key + (begin['time'], event['time'], begin.get('args', {})))
+    return sorted(paired, key=lambda span: span[4])
+
+
+def summarize(events):
+    """
+    Summarizes per runner how long each stage took & how well the worker slots were used while tools were run.
+
+    :param events: the events (see :func:`read_events`)
+    :type events: list[dict]
+    :return: per runner process: its name, the stage durations & the case statistics
+    :rtype: list[dict]
+    """
+
+    names = {event['process']: event['name'] for event in events if event['phase'] == PROCESS}
+    paired = spans(events)
+
+    summaries = []
+    for process in sorted({span[0] for span in paired}):
+        process_spans = [span for span in paired if span[0] == process]
+        stages = [(name, end - begin) for p, worker, category, name, begin, end, args in process_spans
+                  if category == 'stage']
+        cases = [span for span in process_spans if span[2] == 'case']
+
+        summary = {'process': process, 'name': names.get(process, str(process)), 'stages': stages, 'cases': len(cases)}
+        if cases:
+            window_start = min(span[4] for span in cases)
+            window_end = max(span[5] for span in cases)
+            window = window_end - window_start
+            workers = sorted({span[1] for span in cases})
+
+            idle_gaps = []
+            busy = 0.0
+            for worker in workers:
+                worker_cases = sorted((span[4], span[5]) for span in cases if span[1] == worker)
+                busy += sum(end - begin for begin, end in worker_cases)
+                # Gaps between consecutive cases & after the last case until all workers are done.
+                ends = [end for begin, end in worker_cases]
+                begins = [begin for begin, end in worker_cases[1:]] + [window_end]
+                idle_gaps.extend(begin - end for end, begin in zip(ends, begins) if begin - end > 0)
+
+            queued = [span[6].get('queued', 0.0) for span in cases]
+            summary.update({
+                'workers': len(workers),
+                'window': window,
+                'busy': busy,
+                'utilization': busy / (window * len(workers)) if window > 0 else 1.0,
+                'idle': sum(idle_gaps),
+                'idle_gaps': len([gap for gap in idle_gaps if gap >= IDLE_GAP_THRESHOLD]),
+                'longest_idle_gap': max(idle_gaps, default=0.0),
+                'median_case': percentile([span[5] - span[4] for span in cases], 50),
+                'median_queued': percentile(queued, 50),
+                'p95_queued': percentile(queued, 95)
+            })
+        summaries.append(summary)
+    return summaries
@@ -0,0 +1,249 @@
+#!/user/bin/env python3
+
+from os import replace
+from os.path import isfile
+from biobesu.helper.converters import Converter
+from biobesu.helper.converters import GeneConverter
+from biobesu.helper.error import FileContentError
+from biobesu.helper.generic import file_hash
+import gzip
+
+
+class GeneResolutionIndex(Converter):
+    """
+    Resolves gene aliases, OMIM IDs & NCBI gene IDs to gene symbols with a single lookup per token. The index is
+    compiled from the LIRICAL supplied "Homo_sapiens_gene_info.gz" & "mim2gene_medgen" files and the HGNC
+    "gene_ids_symbols.tsv" file (see :class:`~biobesu.helper.converters.GeneConverter`), and records which route was
+    used for each token:
+
+    - alias: alias -> symbol through "Homo_sapiens_gene_info.gz"
+    - omim: OMIM -> gene ID through "mim2gene_medgen" -> symbol through HGNC
+    - gene_id: gene ID -> symbol through HGNC
+
+    As the index is stored together with hashes of its sources, a stored index can be reused (also on other hosts) as
+    long as the sources did not change.
+    """
+
+    ALIAS = 'alias'
+    OMIM = 'omim'
+    GENE_ID = 'gene_id'
+
+    ROUTES = {
+        ALIAS: 'gene_info',
+        OMIM: 'mim2gene_medgen>hgnc',
+        GENE_ID: 'hgnc'
+    }
+
+    # Expected file name (within the runner data directory).
+    file_name = 'gene_resolution_index.tsv'
+
+    # Increased whenever the index format or the way it is compiled changes.
+    FORMAT_VERSION = '1'
+
+    def __init__(self, entries, sources):
+        """
+        :param entries: per namespace, per token the gene ID (can be '') & gene symbol (can be '')
+        :type entries: dict[str, dict[str, tuple[str, str]]]
+        :param sources: the hashes of the sources (and format version) the index was compiled from
+        :type sources: dict[str, str]
+        """
+
+        self.entries = entries
+        self.sources = sources
+
+        # Defines dictionaries for fast retrieval.
+        self.symbol_by_key = {namespace: {token: symbol for token, (gene_id, symbol) in tokens.items() if symbol != ''}
+                              for namespace, tokens in entries.items()}
+        self.gene_id_by_key = {namespace: {token: gene_id for token, (gene_id, symbol) in tokens.items()
+                                           if gene_id != ''}
+                               for namespace, tokens in entries.items()}
+
+    @classmethod
+    def sources_of(cls, gene_info_file, mim2gene_medgen_file, gene_ids_file):
+        """
+        :return: the hashes of the given sources (and format version) that identify an index
+        :rtype: dict[str, str]
+        """
+
+        return {
+            'format_version': cls.FORMAT_VERSION,
+            'gene_info': file_hash(gene_info_file),
+            'mim2gene_medgen': file_hash(mim2gene_medgen_file),
+            'gene_ids_symbols': file_hash(gene_ids_file)
+        }
+
+    @classmethod
+    def build(cls, gene_info_file, mim2gene_medgen_file, gene_ids_file):
+        """
+        Compiles an index from its sources.
+
+        :param gene_info_file: path to "Homo_sapiens_gene_info.gz"
+        :type gene_info_file: str
+        :param mim2gene_medgen_file: path to "mim2gene_medgen"
+        :type mim2gene_medgen_file: str
+        :param gene_ids_file: path to "gene_ids_symbols.tsv"
+        :type gene_ids_file: str
+        :return: the compiled index
+        :rtype: GeneResolutionIndex
+        """
+
+        # Gene ID -> symbol (HGNC).
+        hgnc_symbols = {}
+        hgnc_symbols_seen = {}
+        with open(gene_ids_file) as file_reader:
+            header = next(file_reader).rstrip()
+            if header != GeneConverter.expected_file_header:
+                raise FileContentError(f'Unexpected gene info file header.\nExpected: '
+                                       f'{GeneConverter.expected_file_header}\nActual: {header}')
+            for line in file_reader:
+                line = line.rstrip().split('\t')
+                if len(line) == 2 and line[0] != '':
+                    if line[1] in hgnc_symbols_seen:
+                        raise FileContentError(f'The symbol {line[1]} was already assigned to '
+                                               f'{hgnc_symbols_seen[line[1]]}')
+                    hgnc_symbols_seen[line[1]] = line[0]
+                    hgnc_symbols[line[0]] = line[1]
+
+        # Alias -> gene ID & symbol (gene info).
+        aliases = {}
+        with gzip.open(gene_info_file, 'rt') as file_reader:
+            for line in file_reader:
+                line = line.rstrip('\n').split('\t')
+                # Skips the header.
+                if line[0].startswith('#') or line[1] == 'GeneID':
+                    continue
+                for alias in line[4].split('|'):
+                    if alias != '-':
+                        aliases[alias] = (line[1], line[2])
+
+        # OMIM -> gene ID (mim2gene) -> symbol (HGNC).
+        omims = {}
+        with open(mim2gene_medgen_file) as file_reader:
+            for line in file_reader:
+                line = line.rstrip('\n').split('\t')
+                if not line[0].startswith('#') and line[1] != '-':
+                    omims[line[0]] = (line[1], hgnc_symbols.get(line[1], ''))
+
+        entries = {
+            cls.ALIAS: aliases,
+            cls.OMIM: omims,
+            cls.GENE_ID: {gene_id: (gene_id, symbol) for gene_id, symbol in hgnc_symbols.items()}
+        }
+        return cls(entries, cls.sources_of(gene_info_file, mim2gene_medgen_file, gene_ids_file))
+
+    def write(self, index_file):
+        """
+        Stores the index.
+
+        :param index_file: the file to write to
+        :type index_file: str
+        """
+
+        # Writes to a temporary file first so that an interrupted write never leaves a partial index behind.
+        with open(index_file + '.tmp', 'w') as file_writer:
+            for key, value in self.sources.items():
+                file_writer.write(f'#{key}={value}\n')
+            file_writer.write('namespace\ttoken\tgene_id\tgene_symbol\troute\n')
+            for namespace, tokens in self.entries.items():
+                for token, (gene_id, symbol) in tokens.items():
+                    file_writer.write(f'{namespace}\t{token}\t{gene_id}\t{symbol}\t{self.ROUTES[namespace]}\n')
+        replace(index_file + '.tmp', index_file)
+
+    @classmethod
+    def read(cls, index_file):
+        """
+        Reads a stored index.
+
+        :param index_file: the stored index
+        :type index_file: str
+        :return: the index
+        :rtype: GeneResolutionIndex
+        """
+
+        sources = {}
+        entries = {namespace: {} for namespace in cls.ROUTES}
+        with open(index_file) as file_reader:
+            for line in file_reader:
+                if line.startswith('#'):
+                    key, value = line[1:].rstrip('\n').split('=', 1)
+                    sources[key] = value
+                elif not line.startswith('namespace\t'):
+                    namespace, token, gene_id, symbol, route = line.rstrip('\n').split('\t')
+                    entries[namespace][token] = (gene_id, symbol)
+        return cls(entries, sources)
+
+    @classmethod
+    def load(cls, runner_data, lirical_data):
+        """
+        Retrieves the index from the runner data directory if it is up-to-date with the sources, otherwise compiles
+        (and stores) it.
+
+        :param runner_data: directory containing/storing the runner data (such as the index & the HGNC gene file)
+        :type runner_data: str
+        :param lirical_data: directory containing the LIRICAL data
+        :type lirical_data: str
+        :return: the index
+        :rtype: GeneResolutionIndex
+        """
+
+        index_file = runner_data + cls.file_name
+        gene_info_file = lirical_data + 'Homo_sapiens_gene_info.gz'
+        mim2gene_medgen_file = lirical_data + 'mim2gene_medgen'
+        gene_ids_file = runner_data + GeneConverter.file_name
+
+        # Downloads the HGNC file if needed.
+        if not isfile(gene_ids_file):
+            GeneConverter(runner_data)
+
+        if isfile(index_file):
+            index = cls.read(index_file)
+            if index.sources == cls.sources_of(gene_info_file, mim2gene_medgen_file, gene_ids_file):
+                return index
+
+        index = cls.build(gene_info_file, mim2gene_medgen_file, gene_ids_file)
+        index.write(index_file)
+        return index
+
+    def to_symbol(self, keys, namespace, include_na=False):
+        """
+        Convert a (list of) alias(es)/OMIM(s)/gene ID(s) to its/their gene symbol(s).
+
+        :param keys: (list of) token(s) to convert
+        :type keys: str | list[str]
+        :param namespace: the type of the tokens (ALIAS, OMIM or GENE_ID)
+        :type namespace: str
+        :param include_na: replace IDs with no match with "NA" in the returned output
+        :type include_na: bool
+        :return: the converted keys
+        :rtype: str | None | tuple[list[str],set[str]]
+        """
+
+        return self.key_to_value(keys, self.symbol_by_key[namespace], include_na)
+
+    def to_gene_id(self, keys, namespace, include_na=False):
+        """
+        Convert a (list of) alias(es)/OMIM(s) to its/their gene ID(s).
+
+        :param keys: (list of) token(s) to convert
+        :type keys: str | list[str]
+        :param namespace: the type of the tokens (ALIAS, OMIM or GENE_ID)
+        :type namespace: str
+        :param include_na: replace IDs with no match with "NA" in the returned output
+        :type include_na: bool
+        :return: the converted keys
+        :rtype: str | None | tuple[list[str],set[str]]
+        """
+
+        return self.key_to_value(keys, self.gene_id_by_key[namespace], include_na)
+
+    def route(self, key, namespace):
+        """
+        :param key: the token
+        :type key: str
+        :param namespace: the type of the token (ALIAS, OMIM or GENE_ID)
+        :type namespace: str
+        :return: the route through which the token resolves to a gene symbol (None if it does not)
+        :rtype: str | None
+        """
+
+        return self.ROUTES[namespace] if key in self.symbol_by_key[namespace] else None
@@ -0,0 +1,49 @@
+#!/user/bin/env python3
+
+from biobesu.helper import validate
+from biobesu.suite.hpo_generank.helper.resolution import GeneResolutionIndex
+from biobesu.helper.argument_parser import BiobesuParser
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def main(parser):
+    args = __parse_command_line(parser)
+
+    # Compiles the index (or reuses it if it is up-to-date).
+    index = GeneResolutionIndex.load(args.runner_data, args.lirical_data)
+    for namespace, route in GeneResolutionIndex.ROUTES.items():
+        print(f'{namespace}: {len(index.symbol_by_key[namespace])} resolvable tokens (route: {route})')
+    print(f'Index stored as: {args.runner_data}{GeneResolutionIndex.file_name}')
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments
+    :rtype:
+    """
+
+    # Adds runner-specific command line.
+    parser.add_argument('--lirical_data', required=True, help='directory containing data needed by lirical')
+    parser.add_argument('--runner_data', required=True, help='directory that can used to store needed data')
+
+    # Processes command line.
+    try:
+        args = parser.parse_args()
+        args.lirical_data = validate.directory(args.lirical_data, writable=False)
+        validate.file(args.lirical_data + 'Homo_sapiens_gene_info.gz')
+        validate.file(args.lirical_data + 'mim2gene_medgen')
+        args.runner_data = validate.directory(args.runner_data)
+    except OSError as e:
+        parser.error(e)
+
+    return args
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
@@ -1,13 +1,47 @@
 #!/user/bin/env python3
 
-from subprocess import call
-from os import listdir
+from contextlib import nullcontext
+from functools import partial
+from os.path import dirname
+from os.path import isfile
 from re import search
+from biobesu.helper import preflight
 from biobesu.helper import validate
+from biobesu.helper.admission import usable_cpus
+from biobesu.helper.cache import CacheWriter
+from biobesu.helper.cache import add_cache_arguments
+from biobesu.helper.cache import create_cache
+from biobesu.helper.error import FileContentError
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import ResourcesWriter
+from biobesu.helper.execution import TimesWriter
+from biobesu.helper.execution import add_execution_arguments
+from biobesu.helper.execution import create_executor
+from biobesu.helper.execution import progress_file
 from biobesu.helper.generic import create_dir
 from biobesu.helper.generic import eprint
-from biobesu.suite.hpo_generank.helper.converters import LiricalGeneAliasConverter
-from biobesu.suite.hpo_generank.helper.converters import LiricalOmimConverter
+from biobesu.helper.metrics import start_metrics
+from biobesu.helper.parallel import chunks
+from biobesu.helper.parallel import ordered_map
+from biobesu.helper.progress import ProgressReporter
+from biobesu.helper.readers import SeparatedValuesFileReader
+from biobesu.helper.runtime_model import Scheduler
+from biobesu.helper.runtime_model import add_scheduling_arguments
+from biobesu.helper.sampling import CaseTimes
+from biobesu.helper.sampling import add_sampling_arguments
+from biobesu.helper.sampling import draw_sample
+from biobesu.helper.sampling import write_report
+from biobesu.helper.sampling import write_sample
+from biobesu.helper.scratch import create_scratch
+from biobesu.helper.shared_tables import share_converter
+from biobesu.helper.staging import add_staging_arguments
+from biobesu.helper.staging import create_stager
+from biobesu.helper.storage import OutputCollector
+from biobesu.helper.storage import add_storage_arguments
+from biobesu.helper.storage import create_output_store
+from biobesu.helper.storage import open_output_store
+from biobesu.helper.trace import create_tracer
+from biobesu.suite.hpo_generank.helper.resolution import GeneResolutionIndex
 from biobesu.helper.converters import GeneConverter
 from biobesu.helper.converters import PhenotypeConverter
 from biobesu.helper.argument_parser import BiobesuParser
@@ -15,19 +49,62 @@ from biobesu.helper.argument_parser import BiobesuParser
 # Used only for docstring
 from argparse import ArgumentParser
 from typing import TextIO
+from biobesu.helper.storage import OutputStore
+from biobesu.helper.trace import Tracer
+
+# Number of cases per extraction task & number of lines per conversion task (see `--postprocessing_workers`).
+EXTRACTION_CHUNK_SIZE = 100
+CONVERSION_CHUNK_SIZE = 1000
+
+# The sampled cases & the estimates for the complete benchmark (see `--sample`).
+SAMPLE_FILE = 'sample_cases.tsv'
+SAMPLE_REPORT_FILE = 'sample_report.tsv'
+
+# The wall time per case (also used to predict the runtime of later runs, see `--schedule`).
+TIMES_FILE = 'times.tsv'
+# The return code & resource usage per case (see `biobesu perfdiff`).
+RESOURCES_FILE = 'resources.tsv'
+
+# The LIRICAL output stores opened within the current (worker) process, per directory.
+__stores = {}
 
 
 def main(parser):
     args = __parse_command_line(parser)
+    # LIRICAL does not include its version in the jar name, so the jar name is used instead.
+    start_metrics(args, 'hpo_generank', 'lirical', args.jar.split('/')[-1])
+    tracer = create_tracer(args)
     try:
+        # Only runs a stratified sample of the cases if requested.
+        hpo_dict = SeparatedValuesFileReader.key_value_reader(args.input, 0, 2, values_separator=',')
+        sample = None
+        case_times = CaseTimes()
+        if args.sample is not None:
+            sample = draw_sample(hpo_dict, args.sample, args.seed,
+                                 SeparatedValuesFileReader.key_value_reader(args.input, 0, 1))
+            write_sample(sample, args.output + SAMPLE_FILE)
+        # Predicts the runtime per case from earlier runs (to start the longest cases first).
+        scheduler = Scheduler(args, hpo_dict, args.output + TIMES_FILE)
+        if args.dry_run:
+            scheduler.dry_run(sample.case_ids if sample is not None else list(hpo_dict))
+            return
         # Generate phenopackets.
-        phenopackets_dir = __generate_phenopacket_files(args)
+        with tracer.span('generate phenopackets'):
+            phenopackets_dir = __generate_phenopacket_files(args, set(sample.case_ids) if sample is not None else None)
         # Run lirical.
-        lirical_output_dir = __run_lirical(args, phenopackets_dir)
+        with tracer.span('run lirical'):
+            lirical_output_store = __run_lirical(args, phenopackets_dir, hpo_dict,
+                                                 sample.case_ids if sample is not None else list(hpo_dict),
+                                                 case_times, scheduler, tracer)
         # Extract relevant fields from lirical output.
-        lirical_gene_alias_file, lirical_omims_file = __extract_from_lirical_output(args, lirical_output_dir)
+        with tracer.span('extract lirical output'):
+            lirical_gene_alias_file, lirical_omims_file = __extract_from_lirical_output(args, lirical_output_store)
         # Convert output to genes.
-        __convert_lirical_extractions(args, lirical_gene_alias_file, lirical_omims_file)
+        with tracer.span('convert lirical output'):
+            results = __convert_lirical_extractions(args, lirical_gene_alias_file, lirical_omims_file)
+        # Estimates the metrics (of both routes) & runtime of the complete benchmark.
+        if sample is not None:
+            write_report(sample, args.input, results, args.output + SAMPLE_REPORT_FILE, case_times, seed=args.seed)
     except FileExistsError as e:
         print(f'\nAn output file/directory already exists: {e.filename}\nExiting...')
 
@@ -49,6 +126,15 @@ def __parse_command_line(parser):
     parser.add_argument('--output', required=True, help='directory to write output to')
     parser.add_argument('--lirical_data', required=True, help='directory containing data needed by lirical')
     parser.add_argument('--runner_data', required=True, help='directory that can used to store needed data')
+    add_execution_arguments(parser)
+    add_storage_arguments(parser)
+    add_cache_arguments(parser)
+    add_staging_arguments(parser)
+    add_sampling_arguments(parser)
+    add_scheduling_arguments(parser)
+    parser.add_argument('--postprocessing_workers', type=int, default=usable_cpus(),
+                        help='number of processes used to extract & convert the LIRICAL output (default: number of '
+                             'CPUs)')
 
     # Processes command line.
     try:
@@ -63,17 +149,27 @@ def __parse_command_line(parser):
         validate.file(args.lirical_data + 'hp.obo')
         validate.file(args.lirical_data + 'mim2gene_medgen')
         validate.file(args.lirical_data + 'phenotype.hpoa')
-    except OSError as e:
+        args.runner_data = validate.directory(args.runner_data)
+        if args.sample is not None and args.sample < 1:
+            raise OSError('--sample should be at least 1')
+
+        # Checks the complete benchmark input before any tool is started.
+        preflight.validate_benchmark(args.input, hpo_ids=set(PhenotypeConverter(args.hpo).names_by_id),
+                                     gene_symbols=set(GeneConverter(args.runner_data).id_by_symbol),
+                                     workers=usable_cpus())
+    except (OSError, FileContentError) as e:
         parser.error(e)
 
     return args
 
 
-def __generate_phenopacket_files(args):
+def __generate_phenopacket_files(args, case_ids=None):
     """
     Generates the phenopacket files from the benchmark data.
 
     :param args: the parsed arguments
+    :param case_ids: the cases to generate phenopacket files for (None for all cases)
+    :type case_ids: set[str] | None
     :return: the directory containing the phenopacket files
     :rtype: str
     """
@@ -89,6 +185,8 @@ def __generate_phenopacket_files(args):
 
         # Splits the columns.
         line = line.rstrip().split('\t')
+        if case_ids is not None and line[0] not in case_ids:
+            continue
 
         # Retrieve converted data.
         output_string = converter.id_to_phenopacket(line[0], line[2].split(','))
@@ -100,36 +198,146 @@ def __generate_phenopacket_files(args):
     return phenopackets_dir
 
 
-def __run_lirical(args, phenopackets_dir):
+def __run_lirical(args, phenopackets_dir, hpo_dict, case_ids, case_times, scheduler, tracer):
     """
-    Runs lirical for each phenopacket file.
+    Runs lirical for each phenopacket file (longest predicted runtime first).
 
     :param args: the parsed arguments
     :param phenopackets_dir: the directory containing the phenopacket files
     :param phenopackets_dir: str
-    :return: the directory containing the LIRICAL output
-    :rtype: str
+    :param hpo_dict: the HPO terms per benchmark case
+    :type hpo_dict: dict[str, list[str]]
+    :param case_ids: the benchmark cases to run (see `--sample`)
+    :type case_ids: list[str]
+    :param case_times: collects the wall time of the runs
+    :type case_times: CaseTimes
+    :param scheduler: orders the cases
+    :type scheduler: Scheduler
+    :param tracer: the tracer of the runner
+    :type tracer: Tracer
+    :return: the store containing the LIRICAL output
+    :rtype: OutputStore
     """
 
-    lirical_output_dir = create_dir(args.output + 'lirical_output/')
+    lirical_output_store = create_output_store(create_dir(args.output + 'lirical_output/'), args.output_storage)
+
+    with create_stager(args) or nullcontext() as stager, create_scratch(args, args.output) as scratch:
+        # Stages the jar & LIRICAL data to local scratch if requested.
+        jar, lirical_data = args.jar, args.lirical_data
+        if stager is not None:
+            with tracer.span('stage resources'):
+                jar, lirical_data = stager.stage([args.jar, args.lirical_data])
+            print(stager.summary())
+
+        # Each case writes its output to a private scratch directory, from which valid output is moved into the store.
+        lirical_output_store.use_scratch(scratch)
+
+        # Run tool for each input file.
+        cases = scheduler.order(__lirical_cases(case_ids, phenopackets_dir, lirical_output_store, jar, lirical_data),
+                                lambda case: case.case_id)
+
+        # Copies cached output & only runs a single case per HPO set.
+        cache = create_cache(args)
+        cache_listeners = []
+        if cache is not None:
+            fingerprint = cache.fingerprint([args.jar, args.hpo, args.lirical_data])
+            cache_keys = {case.case_id: cache.key(fingerprint, hpo_dict[case.case_id]) for case in cases}
+            cases, duplicates = cache.partition(cases, cache_keys, lirical_output_store)
+            cache_listeners.append(CacheWriter(cache, cache_keys))
+
+        times_add_header = not isfile(args.output + TIMES_FILE)
+        resources_add_header = not isfile(args.output + RESOURCES_FILE)
+        with open(args.output + TIMES_FILE, 'a') as times_writer, \
+                open(args.output + RESOURCES_FILE, 'a') as resources_writer:
+            if times_add_header:
+                times_writer.write('id\ttime (in seconds)\n')
+            if resources_add_header:
+                resources_writer.write(ResourcesWriter.HEADER)
+            progress = ProgressReporter(len(cases), progress_file(args, args.output))
+            create_executor(args, args.output,
+                            [TimesWriter(times_writer), ResourcesWriter(resources_writer)] + cache_listeners +
+                            [OutputCollector(lirical_output_store), progress, case_times],
+                            scratch=scratch, validator=__validate_lirical_output, tracer=tracer).run(cases)
+
+        if cache is not None:
+            failed = cache.materialize_duplicates(duplicates, cache_keys, lirical_output_store)
+            if failed:
+                eprint(f'No output for these cases, as the run of a case with the same HPO set failed: '
+                       f'{[case.case_id for case in failed]}\n')
+            cache.finish()
+            print(cache.summary())
+
+    return lirical_output_store
+
+
+def __validate_lirical_output(output_file):
+    """
+    Checks whether LIRICAL wrote a complete TSV file: a header (after the "!" comment lines) and rows with as many
+    columns as the header, ending with a newline.
 
-    # Run tool for each input file.
-    for file in listdir(phenopackets_dir):
-        file_path = phenopackets_dir + file
-        file_id = file.rstrip('.json').split('/')[-1]
-        call(f'java -jar {args.jar} phenopacket -p {file_path} -o {lirical_output_dir} -x {file_id} '
-             f'-d {args.lirical_data} --tsv', shell=True)
+    :param output_file: the file LIRICAL wrote to
+    :type output_file: str
+    :return: why the output is invalid (None if valid)
+    :rtype: str | None
+    """
 
-    return lirical_output_dir
+    if not isfile(output_file):
+        return 'no output file was written'
+
+    columns = None
+    last_line = ''
+    with open(output_file) as file_reader:
+        for line_number, line in enumerate(file_reader, start=1):
+            last_line = line
+            if line.startswith('!'):
+                continue
+            if columns is None:
+                if not line.startswith('rank\t'):
+                    return f'expected a header starting with "rank" on line {line_number}'
+                columns = line.count('\t')
+            elif line.count('\t') != columns:
+                return f'expected {columns + 1} columns on line {line_number}'
+    if columns is None:
+        return 'no header found'
+    if not last_line.endswith('\n'):
+        return 'incomplete last line'
+    return None
+
+
+def __lirical_cases(case_ids, phenopackets_dir, store, jar, lirical_data):
+    """
+    :param case_ids: the benchmark cases
+    :type case_ids: list[str]
+    :param phenopackets_dir: the directory containing the phenopacket file (`<case_id>.json`) of each case
+    :type phenopackets_dir: str
+    :param store: the store the output is written to
+    :type store: OutputStore
+    :param jar: the LIRICAL jar
+    :type jar: str
+    :param lirical_data: the LIRICAL data directory
+    :type lirical_data: str
+    :return: a LIRICAL run per case (identified by the benchmark id)
+    :rtype: list[Case]
+    """
+
+    cases = []
+    for case_id in case_ids:
+        staging_file = store.staging_file(case_id)
+        cases.append(Case(case_id, jar, f'phenopacket -p {phenopackets_dir}{case_id}.json -o {dirname(staging_file)} '
+                                        f'-x {case_id} -d {lirical_data} --tsv',
+                          staging_file))
+    return cases
 
 
-def __extract_from_lirical_output(args, lirical_output_dir):
+def __extract_from_lirical_output(args, lirical_output_store):
     """
-    Extracts the relevant information from the LIRICAL output.
+    Extracts the relevant information from the LIRICAL output. Cases are extracted in chunks across processes, but are
+    written in the (sorted) order of the store. The OMIMs of results without a gene alias are written per case to a
+    separate file, as the gene alias list of such a case is shorter than its OMIM list.
 
     :param args: the parsed arguments
-    :param lirical_output_dir: the directory containing the LIRICAL output
-    :type lirical_output_dir: str
+    :param lirical_output_store: the store containing the LIRICAL output
+    :type lirical_output_store: OutputStore
     :return: 2 file paths, one to the gene alias file and one to the omim file
     :rtype: tuple[str,str]
     """
@@ -137,30 +345,58 @@ def __extract_from_lirical_output(args, lirical_output_dir):
     extract_dir = create_dir(args.output + 'lirical_extraction/')
     lirical_gene_alias_file = extract_dir + 'lirical_gene_alias.tsv'
     lirical_omims_file = extract_dir + 'lirical_omim.tsv'
+    missing_gene_alias_file = extract_dir + 'lirical_missing_gene_alias.tsv'
+    cases_missing_gene_alias = 0
 
-    # Gene alias file writer.
-    with open(lirical_gene_alias_file, 'x') as alias_writer:  # Requires creating a new file.
+    # Requires creating new files.
+    with open(lirical_gene_alias_file, 'x') as alias_writer, open(lirical_omims_file, 'x') as omim_writer, \
+            open(missing_gene_alias_file, 'x') as missing_writer:
         alias_writer.write('id\tgene_aliases')
+        omim_writer.write('id\tomims')
+        missing_writer.write('id\tomims\n')
+
+        # Process output per chunk of cases.
+        chunk_arguments = ((lirical_output_store.directory, case_ids)
+                           for case_ids in chunks(lirical_output_store.ids(), EXTRACTION_CHUNK_SIZE))
+        for extracted_cases in ordered_map(__extract_chunk, chunk_arguments, args.postprocessing_workers):
+            for id_value, genes, omims, omims_without_gene in extracted_cases:
+                # Generate ID column & write genes column.
+                alias_writer.write(f'\n{id_value}\t' + ','.join(genes))
+                omim_writer.write(f'\n{id_value}\t' + ','.join(omims))
+
+                if len(omims_without_gene) > 0:
+                    missing_writer.write(f'{id_value}\t' + ','.join(omims_without_gene) + '\n')
+                    cases_missing_gene_alias += 1
+
+    print(f'{cases_missing_gene_alias} case(s) with results without a gene alias (see "{missing_gene_alias_file}")')
+    return lirical_gene_alias_file, lirical_omims_file
 
-        # Omim file writer.
-        with open(lirical_omims_file, 'x') as omim_writer:  # Requires creating a new file.
-            omim_writer.write('id\tomims')
 
-            # Process input files.
-            for file in listdir(lirical_output_dir):
-                # Generate ID column.
-                id_value = file.rstrip('.tsv').split('/')[-1]
-                id_column = f'\n{id_value}\t'
-                alias_writer.write(id_column)
-                omim_writer.write(id_column)
+def __extract_chunk(store_directory, case_ids):
+    """
+    Extracts the gene aliases & omim codes of a chunk of cases (within a worker process).
+
+    :param store_directory: the directory of the store containing the LIRICAL output
+    :type store_directory: str
+    :param case_ids: the ids of the cases to extract
+    :type case_ids: list[str]
+    :return: per case: the id, gene aliases, omim codes & omim codes of the results without a gene alias
+    :rtype: list[tuple[str,list[str],list[str],list[str]]]
+    """
 
-                # Create/write genes column.
-                with open(lirical_output_dir + file) as input_file:
-                    genes, omims = __extract_fields_from_lirical_data(input_file)
-                    alias_writer.write(','.join(genes))
-                    omim_writer.write(','.join(omims))
+    # Opens the store once per process (for an archive, this reads its index).
+    if store_directory not in __stores:
+        __stores[store_directory] = open_output_store(store_directory)
+    store = __stores[store_directory]
 
-    return lirical_gene_alias_file, lirical_omims_file
+    extracted_cases = []
+    for id_value in case_ids:
+        with store.open(id_value) as input_file:
+            results = __extract_results_from_lirical_data(input_file)
+        extracted_cases.append((id_value, [gene for gene, omim in results if gene is not None],
+                                [omim for gene, omim in results],
+                                [omim for gene, omim in results if gene is None]))
+    return extracted_cases
 
 
 def __extract_fields_from_lirical_data(file_data):
@@ -173,11 +409,24 @@ def __extract_fields_from_lirical_data(file_data):
     :rtype: tuple[list[str],list[str]]
     """
 
-    genes = []
-    omims = []
+    results = __extract_results_from_lirical_data(file_data)
+    return [gene for gene, omim in results if gene is not None], [omim for gene, omim in results]
+
+
+def __extract_results_from_lirical_data(file_data):
+    """
+    Extracts the gene alias & omim code per result from an opened file.
+
+    :param file_data: the opened file (or list of strings representing the file)
+    :type file_data: TextIO | list[str]
+    :return: per result the gene alias (None if the disease name contains no gene alias) & omim code
+    :rtype: list[tuple[str|None,str]]
+    """
+
+    results = []
     header = True
 
-    # Goes through all files (test cases).
+    # Goes through all results.
     for line in file_data:
         # Skip lirical lines.
         if line.startswith('!'):
@@ -189,11 +438,9 @@ def __extract_fields_from_lirical_data(file_data):
             continue
 
         gene_alias = search(r'\t[\w, ]+; ([\w]+)', line)
-        if gene_alias is not None:
-            genes.append(gene_alias[1])
-        omims.append(line.split('\t')[2].split(':')[1])
+        results.append((None if gene_alias is None else gene_alias[1], line.split('\t')[2].split(':')[1]))
 
-    return genes, omims
+    return results
 
 
 def __convert_lirical_extractions(args, lirical_gene_alias_file, lirical_omims_file):
@@ -205,73 +452,115 @@ def __convert_lirical_extractions(args, lirical_gene_alias_file, lirical_omims_f
     :type lirical_gene_alias_file: str
     :param lirical_omims_file: the path to the file containing the extracted gene aliases
     :type lirical_omims_file: str
+    :return: the converted output (gene symbols) per route
+    :rtype: dict[str, str]
     """
 
     conversion_dir = create_dir(args.output + 'lirical_conversion/')
     converted_gene_alias_file = conversion_dir + 'lirical_gene_alias_converted.tsv'
-    converted_omim_intermediate = conversion_dir + 'lirical_omim_gene_id.tsv'
+    converted_omim_gene_id_file = conversion_dir + 'lirical_omim_gene_id.tsv'
     converted_omim_file = conversion_dir + 'lirical_omim_converted.tsv'
     final_header = 'id\tgene_symbol\n'
+    workers = args.postprocessing_workers
 
-    # Route 1 to gene symbols.
-    print('Retrieve genes through gene aliases...')
-    missing = __convert_lirical_output_digest(LiricalGeneAliasConverter(args.lirical_data + 'Homo_sapiens_gene_info.gz')
-                                              .alias_to_gene_symbol, lirical_gene_alias_file, converted_gene_alias_file,
-                                              final_header)
-    eprint(f'Failed to convert these gene aliases to gene symbols: {missing}\n')
+    # Single index for all routes (compiled once & reused while its sources do not change).
+    index = GeneResolutionIndex.load(args.runner_data, args.lirical_data)
+    # Workers use the lookup tables through shared memory instead of receiving a copy.
+    tables = share_converter(index) if workers > 1 else []
 
-    # Route 2 to gene symbols.
-    print('Retrieve genes through OMIM...')
-    missing = __convert_lirical_output_digest(LiricalOmimConverter(args.lirical_data + 'mim2gene_medgen')
-                                              .omim_to_gene_id, lirical_omims_file, converted_omim_intermediate,
-                                              'id\tgene_id\n')
-    eprint(f'Failed to convert these OMIMs to gene IDs: {missing}\n')
-
-    missing = __convert_lirical_output_digest(GeneConverter(args.runner_data).id_to_symbol, converted_omim_intermediate,
-                                              converted_omim_file, final_header)
-    eprint(f'Failed to convert these gene IDs to gene symbols: {missing}\n')
-
-
-def __convert_lirical_output_digest(convert_method, input_file, output_file, output_file_header):
+    try:
+        # Route 1 to gene symbols.
+        print('Retrieve genes through gene aliases...')
+        missing, = __convert_lirical_output_digest(
+            [(index.symbol_by_key[GeneResolutionIndex.ALIAS], converted_gene_alias_file, final_header)],
+            lirical_gene_alias_file, workers)
+        eprint(f'Failed to convert these gene aliases to gene symbols: {missing}\n')
+
+        # Route 2 to gene symbols, directly through the index (the gene IDs are written in the same pass, for
+        # reference).
+        print('Retrieve genes through OMIM...')
+        missing, missing_gene_ids = __convert_lirical_output_digest(
+            [(index.symbol_by_key[GeneResolutionIndex.OMIM], converted_omim_file, final_header),
+             (index.gene_id_by_key[GeneResolutionIndex.OMIM], converted_omim_gene_id_file, 'id\tgene_id\n')],
+            lirical_omims_file, workers)
+        eprint(f'Failed to convert these OMIMs to gene IDs: {missing_gene_ids}\n')
+        eprint(f'Failed to convert these OMIMs to gene symbols: {missing}\n')
+    finally:
+        for table in tables:
+            table.close()
+
+    return {'lirical_gene_alias': converted_gene_alias_file, 'lirical_omim': converted_omim_file}
+
+
+def __convert_lirical_output_digest(conversions, input_file, workers=1):
     """
-    Converts the input using the specified converter.
+    Converts the input using each of the specified conversion dicts in a single pass. Lines are converted in chunks
+    across processes, but are written in the order of the input.
 
-    :param convert_method: the method (which should be from a subclass of Converter that implements a wrapper for
-                           `Converter.key_to_value()`) to be used for conversion
-    :type convert_method:
+    :param conversions: per output, the dict (or shared table) to be used for conversion, file path to where the
+                        output should be written to & the header line to be used for the file
+    :type conversions: list[tuple[dict[str,str],str,str]]
     :param input_file: path to the file that should be converted
     :type input_file: str
-    :param output_file: file path to where the output should be written to
-    :type output_file: str
-    :param output_file_header: the header line to be used for the file
-    :type output_file_header: str
-    :return: the values that could not be converted
-    :rtype: set[str]
+    :param workers: the number of processes to use
+    :type workers: int
+    :return: per output, the values that could not be converted
+    :rtype: list[set[str]]
     """
 
-    # Set for collecting aliases without a symbol.
-    all_missing = set()
+    conversion_dicts = [conversion_dict for conversion_dict, output_file, output_file_header in conversions]
+    # Sets for collecting values without a conversion.
+    all_missing = [set() for _ in conversions]
 
-    with open(output_file, 'x') as file_writer:  # Requires creating a new file.
-        # Write header.
-        file_writer.write(output_file_header)
+    file_writers = []
+    try:
+        for conversion_dict, output_file, output_file_header in conversions:
+            file_writers.append(open(output_file, 'x'))  # Requires creating a new file.
+            # Write header.
+            file_writers[-1].write(output_file_header)
 
         # Process input file.
         with open(input_file) as file_reader:
-            for i, line in enumerate(file_reader):
-                # Skip header.
-                if i == 0:
-                    continue
-
-                # Process line.
-                line = line.rstrip().split('\t')
-                converted, missing = convert_method(line[1].split(','), include_na=False)
+            # Skip header.
+            next(file_reader, None)
 
+            chunk_arguments = ((conversion_dicts, lines) for lines in chunks(file_reader, CONVERSION_CHUNK_SIZE))
+            for results in ordered_map(__convert_chunk, chunk_arguments, workers):
                 # Digest results.
-                file_writer.write(line[0] + '\t' + ','.join(converted) + '\n')
-                all_missing.update(missing)
+                for file_writer, output_missing, (converted_lines, missing) in zip(file_writers, all_missing,
+                                                                                   results):
+                    file_writer.writelines(converted_lines)
+                    output_missing.update(missing)
+    finally:
+        for file_writer in file_writers:
+            file_writer.close()
+
+    return all_missing
+
 
-    return missing
+def __convert_chunk(conversion_dicts, lines):
+    """
+    Converts a chunk of lines (within a worker process).
+
+    :param conversion_dicts: the dicts (or shared tables) to be used for conversion
+    :type conversion_dicts: list[dict[str,str]]
+    :param lines: the lines to convert (id & comma-separated values)
+    :type lines: list[str]
+    :return: per conversion dict, the converted lines & the values that could not be converted
+    :rtype: list[tuple[list[str],set[str]]]
+    """
+
+    results = [([], set()) for _ in conversion_dicts]
+    for line in lines:
+        line = line.rstrip().split('\t')
+        # A case without any values has no second column after stripping.
+        keys = line[1].split(',') if len(line) > 1 else []
+        for conversion_dict, (converted_lines, all_missing) in zip(conversion_dicts, results):
+            converted, missing = GeneResolutionIndex.key_to_value(keys, conversion_dict, include_na=False)
+            converted_lines.append(line[0] + '\t' + ','.join(converted) + '\n')
+            all_missing.update(missing)
+
+    return results
 
 
 if __name__ == '__main__':
@@ -1,6 +1,6 @@
 #!/user/bin/env python3
 
-from os import listdir
+from biobesu.helper.storage import open_output_store
 
 
 def convert_list_to_arguments_with_same_key(argument_list, argument_key):
@@ -22,15 +22,21 @@ def convert_list_to_arguments_with_same_key(argument_list, argument_key):
 
 
 def merge_vibe_simple_output_files(vibe_dir, out_file):
+    """
+    Merges the per-case VIBE output into a single file. The per-case output
+    can be stored in any of the formats supported by
+    :func:`~biobesu.helper.storage.open_output_store`.
+    :param str vibe_dir: the directory containing the VIBE output
+    :param str out_file: the file to write to (should not exist yet)
+    """
+    store = open_output_store(vibe_dir)
+
     # Requires creating a new file.
     with open(out_file, 'x') as file_writer:
         # Write header.
         file_writer.write("id\tsuggested_genes\n")
-        for vibe_out_file in listdir(vibe_dir):
-            # Ignore hidden files such as .DS_Store.
-            if not vibe_out_file.startswith('.'):
-                with open(vibe_dir + vibe_out_file) as file_reader:
-                    file_name = vibe_out_file.split('.')[0]
-                    # File should contain single comma separated line.
-                    genes = file_reader.readline()
-                    file_writer.write(f'{file_name}\t{genes}\n')
+        for case_id in store.ids():
+            with store.open(case_id) as file_reader:
+                # File should contain single comma separated line.
+                genes = file_reader.readline()
+                file_writer.write(f'{case_id}\t{genes}\n')
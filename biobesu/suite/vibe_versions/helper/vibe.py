@@ -0,0 +1,74 @@
+#!/user/bin/env python3
+
+from os.path import isfile
+from biobesu.helper.execution import Case
+from biobesu.suite.vibe_versions.helper.converters import \
+    convert_list_to_arguments_with_same_key
+
+
+def vibe_arguments(hpo_list, hdt, hpo, output_file):
+    """
+    Defines the arguments of a single VIBE run.
+
+    :param hpo_list: a list with all HPO
+    :type hpo_list: list[str]
+    :param hdt: path to the HDT file
+    :type hdt: str
+    :param hpo: path to the hpo.owl file
+    :type hpo: str
+    :param output_file: the file VIBE should write to
+    :type output_file: str
+    :return: the VIBE arguments
+    :rtype: str
+    """
+    hpo_arguments = convert_list_to_arguments_with_same_key(hpo_list, '-p')
+
+    return f'-l {hpo_arguments} ' \
+           f'-t {hdt} ' \
+           f'-o {output_file} ' \
+           f'-w {hpo}'
+
+
+def vibe_case(case_id, jar, hdt, hpo, hpo_list, output_file):
+    """
+    Defines a single VIBE run.
+
+    :param case_id: the identifier of the run
+    :type case_id: str
+    :param jar: path to the VIBE jar
+    :type jar: str
+    :param hdt: path to the HDT file
+    :type hdt: str
+    :param hpo: path to the hpo.owl file
+    :type hpo: str
+    :param hpo_list: a list with all HPO
+    :type hpo_list: list[str]
+    :param output_file: the file VIBE should write to
+    :type output_file: str
+    :return: the VIBE run
+    :rtype: Case
+    """
+    return Case(case_id, jar, vibe_arguments(hpo_list, hdt, hpo, output_file),
+                output_file)
+
+
+def validate_vibe_output(output_file):
+    """
+    Checks whether a VIBE run wrote complete output: a single line of
+    comma-separated genes (which can be empty if no genes were found).
+
+    :param output_file: the file VIBE wrote to
+    :type output_file: str
+    :return: why the output is invalid (None if valid)
+    :rtype: str | None
+    """
+    if not isfile(output_file):
+        return 'no output file was written'
+
+    with open(output_file) as file_reader:
+        lines = file_reader.read().rstrip('\n').split('\n')
+    if len(lines) > 1:
+        return f'expected a single line, found {len(lines)}'
+    if lines[0] != '' and any(gene.strip() == '' for gene in lines[0].split(',')):
+        return 'empty gene in comma-separated list'
+    return None
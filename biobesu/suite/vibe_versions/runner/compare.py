@@ -0,0 +1,344 @@
+#!/user/bin/env python3
+from contextlib import nullcontext
+from os.path import isfile
+from random import Random
+from biobesu.helper import preflight
+from biobesu.helper import validate
+from biobesu.helper.admission import usable_cpus
+from biobesu.helper.error import FileContentError
+from biobesu.helper.execution import ExecutionListener
+from biobesu.helper.execution import add_execution_arguments
+from biobesu.helper.execution import create_executor
+from biobesu.helper.execution import progress_file
+from biobesu.helper.metrics import start_metrics
+from biobesu.helper.progress import ProgressReporter
+from biobesu.helper.readers import SeparatedValuesFileReader
+from biobesu.helper.runtime_model import Scheduler
+from biobesu.helper.runtime_model import add_scheduling_arguments
+from biobesu.helper.sampling import CaseTimes
+from biobesu.helper.sampling import add_sampling_arguments
+from biobesu.helper.sampling import draw_sample
+from biobesu.helper.sampling import write_report
+from biobesu.helper.sampling import write_sample
+from biobesu.helper.scratch import create_scratch
+from biobesu.helper.stats import bootstrap_ci
+from biobesu.helper.stats import median
+from biobesu.helper.staging import add_staging_arguments
+from biobesu.helper.staging import create_stager
+from biobesu.helper.storage import OutputCollector
+from biobesu.helper.storage import add_storage_arguments
+from biobesu.helper.storage import create_output_store
+from biobesu.helper.trace import create_tracer
+from biobesu.helper.timing import add_timing_arguments
+from biobesu.helper.timing import create_timing_mode
+from biobesu.helper.timing import write_timing_configuration
+from biobesu.suite.vibe_versions.helper.converters import \
+    merge_vibe_simple_output_files
+from biobesu.suite.vibe_versions.helper.vibe import vibe_case
+from biobesu.suite.vibe_versions.helper.vibe import validate_vibe_output
+from biobesu.helper.argument_parser import BiobesuParser
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+class ComparisonTimesWriter(ExecutionListener):
+    """
+    Writes the wall time of each finished run together with the version & the
+    position of that version within the runs of the case.
+    """
+
+    def __init__(self, times_writer, versions):
+        """
+        :param times_writer: the opened times file
+        :param versions: per case_id of a run, the version label, benchmark
+                         case id & position
+        :type versions: dict[str, tuple[str, str, int]]
+        """
+        self.times_writer = times_writer
+        self.versions = versions
+
+    def case_finished(self, result):
+        label, run_id, position = self.versions[result.case.case_id]
+        self.times_writer.write(f'{run_id}\t{label}\t{position}\t'
+                                f'{result.return_code}\t{result.wall_time}\n')
+        self.times_writer.flush()
+
+
+class VibeComparisonRunner:
+    OUTPUT_SUBDIR = 'compare/'
+    HPO_FILENAME = '.owl'  # Given owl file does not matter as it is not used.
+    TIMES_HEADER = 'id\tversion\tposition\treturn_code\ttime (in seconds)\n'
+    SAMPLE_FILE = 'sample_cases.tsv'
+    SAMPLE_REPORT_FILE = 'sample_report.tsv'
+
+    def __init__(self, parser):
+        # Parse command line.
+        self.__parse_command_line(parser)
+        self.metrics = start_metrics(self.args, 'vibe_versions', 'compare',
+                                     ','.join(label for label, jar, hdt
+                                              in self.args.version))
+
+        # Defines arguments based on parser.
+        self.vibe_output_stores = {label: create_output_store(f'{self.args.output}{label}/vibe_output/',
+                                                             self.args.output_storage)
+                                   for label, jar, hdt in self.args.version}
+        self.times_output_file = f'{self.args.output}times.tsv'
+        self.timing_config_file = f'{self.args.output}timing_config.json'
+        self.comparison_file = f'{self.args.output}comparison.tsv'
+        self.comparison_summary_file = f'{self.args.output}comparison_summary.tsv'
+
+    def run(self):
+        """
+        Execute the runner.
+        """
+        self.tracer = create_tracer(self.args)
+        try:
+            # Generates dict from input file once for all versions: {id:[hpo, hpo]}.
+            hpo_dict = SeparatedValuesFileReader. \
+                key_value_reader(self.args.input, 0, 2, values_separator=',')
+
+            # Learns the runtime per case from earlier runs (on all cases).
+            self.scheduler = Scheduler(self.args, hpo_dict,
+                                       self.times_output_file)
+
+            # Only runs a stratified sample of the cases if requested.
+            self.sample = None
+            if self.args.sample is not None:
+                genes = SeparatedValuesFileReader. \
+                    key_value_reader(self.args.input, 0, 1)
+                self.sample = draw_sample(hpo_dict, self.args.sample,
+                                          self.args.seed, genes)
+                write_sample(self.sample,
+                             f'{self.args.output}{self.SAMPLE_FILE}')
+                hpo_dict = {case_id: hpo_dict[case_id]
+                            for case_id in self.sample.case_ids}
+
+            # Only predicts the wall time of the runs if requested.
+            if self.args.dry_run:
+                self.scheduler.dry_run(
+                    [key for key in hpo_dict.keys()
+                     for store in self.vibe_output_stores.values()
+                     if not store.contains(key)])
+                return
+
+            with create_stager(self.args) or nullcontext() as stager, \
+                    create_scratch(self.args, self.args.output) as scratch:
+                # Stages the jar & HDT (+ index) of each version to local
+                # scratch if requested.
+                self.resources = {label: (jar, hdt)
+                                  for label, jar, hdt in self.args.version}
+                if stager is not None:
+                    with self.tracer.span('stage resources'):
+                        for label, jar, hdt in self.args.version:
+                            self.resources[label] = tuple(stager.stage(
+                                [jar, hdt, hdt + '.index.v1-1'])[:2])
+                    print(stager.summary())
+
+                # Each run writes to a private scratch directory, from
+                # which valid output is moved into the store of its version.
+                self.scratch = scratch
+                for vibe_output_store in self.vibe_output_stores.values():
+                    vibe_output_store.use_scratch(scratch)
+
+                # Run all vibe versions.
+                with self.tracer.span('run vibe versions'):
+                    self.__run_benchmark(hpo_dict)
+
+            # Compares the timings of the versions.
+            with self.tracer.span('compare timings'):
+                self.__write_comparison()
+
+            # Convert vibe output for visualization.
+            with self.tracer.span('merge vibe output'):
+                for label, vibe_output_store in self.vibe_output_stores.items():
+                    merge_vibe_simple_output_files(vibe_output_store.directory,
+                                                   f'{self.args.output}'
+                                                   f'vibe_{label}.tsv')
+
+            # Estimates the metrics of each version & the runtime of the
+            # complete comparison.
+            if self.sample is not None:
+                write_report(self.sample, self.args.input,
+                             {f'vibe_{label}':
+                              f'{self.args.output}vibe_{label}.tsv'
+                              for label in self.vibe_output_stores},
+                             f'{self.args.output}{self.SAMPLE_REPORT_FILE}',
+                             self.case_times, seed=self.args.seed)
+        except FileExistsError as e:
+            print(f'\nAn output file/directory already exists: '
+                  f'{e.filename}\nExiting...')
+
+    def __parse_command_line(self, parser):
+        """
+        Parsers the command line
+
+        :param parser: the argument parser
+        :type parser: ArgumentParser
+        """
+
+        # Adds runner-specific command line & parses it.
+        parser.add_argument('-i', '--input', required=True,
+                            help='input tsv benchmark file')
+        parser.add_argument('-o', '--output', required=True,
+                            help='directory to create subdir with output in')
+        parser.add_argument('-v', '--version', required=True, nargs=3, action='append',
+                            metavar=('LABEL', 'JAR', 'HDT'),
+                            help='a VIBE version to compare (label, path to VIBE jar & path to HDT file), should be '
+                                 'given at least twice. The first version is the baseline of the comparison')
+        parser.add_argument('-p', '--hpo', required=True,
+                            help='hpo.owl file')  # Not used but required.
+        parser.add_argument('--seed', type=int, default=0,
+                            help='seed for the random order of the versions per case & for --sample (default: 0)')
+        add_execution_arguments(parser)
+        add_timing_arguments(parser)
+        add_storage_arguments(parser)
+        add_staging_arguments(parser)
+        add_sampling_arguments(parser, seed=False)
+        add_scheduling_arguments(parser)
+
+        # Processes command line.
+        try:
+            self.args = parser.parse_args()
+
+            # Validation.
+            validate.file(self.args.input, '.tsv')
+            # Checks the complete benchmark input before any tool is started.
+            preflight.validate_benchmark(self.args.input, workers=usable_cpus())
+            self.args.output = validate.directory(self.args.output,
+                                                  create_if_not_exist=True) + \
+                               self.OUTPUT_SUBDIR
+            labels = [label for label, jar, hdt in self.args.version]
+            if len(labels) < 2:
+                raise OSError('at least 2 versions are needed for a comparison')
+            if len(set(labels)) != len(labels):
+                raise OSError('version labels must be unique')
+            for label, jar, hdt in self.args.version:
+                if '/' in label or label.startswith('.'):
+                    raise OSError(f'"{label}" can not be used as version label')
+                validate.file(jar, '.jar')
+                validate.file(hdt, '.hdt')
+                validate.file(hdt + '.index.v1-1')
+            validate.file(self.args.hpo, self.HPO_FILENAME)
+            if self.args.sample is not None and self.args.sample < 1:
+                raise OSError('--sample should be at least 1')
+            self.timing_mode = create_timing_mode(self.args)
+        except (OSError, FileContentError) as e:
+            parser.error(e)
+
+    def __run_benchmark(self, hpo_dict):
+        """
+        Runs each VIBE version for each benchmark case. The runs of a case are
+        executed one after the other in a random order, so that changes in
+        system load affect all versions equally. Therefore, the runs are divided
+        into rounds that contain at most one run per case (so the versions of a
+        case never run simultaneously, regardless of --max_workers). Within a
+        round, the cases with the longest predicted runtime are run first.
+
+        :param hpo_dict: the HPO terms per benchmark case
+        :type hpo_dict: dict[str, list[str]]
+        """
+        rng = Random(self.args.seed)
+
+        # Collects the VIBE runs for all HPO input sets & versions, the i-th
+        # remaining run of each case is part of round i.
+        rounds = []
+        versions = {}
+        skipped = 0
+        for key in hpo_dict.keys():
+            # Shuffles for all cases, so the order does not depend on which
+            # runs are skipped.
+            order = list(self.args.version)
+            rng.shuffle(order)
+            runs = 0
+            for position, (label, jar, hdt) in enumerate(order, start=1):
+                jar, hdt = self.resources[label]
+                store = self.vibe_output_stores[label]
+                if store.contains(key):
+                    print(f'Output for {label} {key} already exits. '
+                          f'Skipping...')
+                    skipped += 1
+                else:
+                    case = vibe_case(f'{label}.{key}', jar, hdt,
+                                     self.args.hpo, hpo_dict.get(key),
+                                     store.staging_file(key))
+                    if runs == len(rounds):
+                        rounds.append([])
+                    rounds[runs].append(case)
+                    runs += 1
+                    versions[case.case_id] = (label, key, position)
+        rounds = [self.scheduler.order(
+            cases, lambda case: versions[case.case_id][1]) for cases in rounds]
+
+        # Stores the configuration the timings are measured with.
+        if self.timing_mode is not None:
+            write_timing_configuration(self.timing_mode, self.args.java, self.args.max_workers,
+                                       self.timing_config_file)
+
+        # Prepares times file.
+        time_file_add_header = not isfile(self.times_output_file)
+
+        # Opens times file.
+        with open(self.times_output_file, 'a') as times_writer:
+            # Adds header if file did not already exist.
+            if time_file_add_header:
+                times_writer.write(self.TIMES_HEADER)
+            # Executes the VIBE runs.
+            progress = ProgressReporter(sum(len(cases) for cases in rounds),
+                                        progress_file(self.args, self.args.output), skipped=skipped)
+            if self.metrics is not None:
+                self.metrics.cases_skipped(skipped)
+            collectors = [OutputCollector(store) for store in self.vibe_output_stores.values()]
+            # The time of a case is the total of its runs of all versions.
+            self.case_times = CaseTimes(lambda case_id: versions[case_id][1])
+            executor = create_executor(self.args, self.args.output,
+                                       [ComparisonTimesWriter(times_writer, versions)] + collectors +
+                                       [progress, self.case_times],
+                                       self.timing_mode, scratch=self.scratch,
+                                       validator=validate_vibe_output,
+                                       tracer=self.tracer)
+            for cases in rounds:
+                executor.run(cases)
+
+    def __write_comparison(self):
+        """
+        Writes the timings of each version next to the baseline (the first version) per case & summarizes the
+        ratios (version / baseline) of the cases for which all versions succeeded.
+        """
+        labels = [label for label, jar, hdt in self.args.version]
+
+        # Collects the last successful time per case & version.
+        times = {}
+        with open(self.times_output_file) as file_reader:
+            next(file_reader)
+            for line in file_reader:
+                run_id, label, position, return_code, time = line.rstrip('\n').split('\t')
+                if return_code == '0' and label in labels:
+                    times.setdefault(run_id, {})[label] = float(time)
+
+        paired = {run_id: case_times for run_id, case_times in times.items() if len(case_times) == len(labels)}
+
+        with open(self.comparison_file, 'w') as file_writer:
+            file_writer.write('\t'.join(['id'] + labels) + '\n')
+            for run_id, case_times in paired.items():
+                file_writer.write('\t'.join([run_id] + [str(case_times[label]) for label in labels]) + '\n')
+
+        baseline = labels[0]
+        with open(self.comparison_summary_file, 'w') as file_writer:
+            file_writer.write('version\tbaseline\tpaired_cases\tmedian_ratio\tci_lower\tci_upper\tfaster_cases\n')
+            for label in labels[1:]:
+                ratios = [case_times[label] / case_times[baseline] for case_times in paired.values()]
+                ci_lower, ci_upper = bootstrap_ci(ratios, seed=self.args.seed)
+                faster = sum(1 for case_times in paired.values() if case_times[label] < case_times[baseline])
+                values = [median(ratios), ci_lower, ci_upper]
+                file_writer.write(f'{label}\t{baseline}\t{len(ratios)}\t' +
+                                  '\t'.join('' if value is None else str(value) for value in values) +
+                                  f'\t{faster}\n')
+
+
+def main(parser):
+    VibeComparisonRunner(parser).run()
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
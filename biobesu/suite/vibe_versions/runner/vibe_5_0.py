@@ -1,14 +1,53 @@
 #!/user/bin/env python3
+from contextlib import nullcontext
 from os.path import isfile
-from subprocess import call
-from time import perf_counter
+from biobesu.helper import preflight
 from biobesu.helper import validate
+from biobesu.helper.admission import usable_cpus
+from biobesu.helper.cache import CacheWriter
+from biobesu.helper.cache import add_cache_arguments
+from biobesu.helper.cache import create_cache
+from biobesu.helper.error import FileContentError
+from biobesu.helper.execution import ResourcesWriter
+from biobesu.helper.execution import TimesWriter
+from biobesu.helper.execution import add_execution_arguments
+from biobesu.helper.execution import create_executor
+from biobesu.helper.execution import progress_file
 from biobesu.helper.generic import create_dir
+from biobesu.helper.generic import eprint
+from biobesu.helper.metrics import start_metrics
+from biobesu.helper.progress import ProgressReporter
+from biobesu.helper.repeats import RepetitionCase
+from biobesu.helper.repeats import SAMPLES_HEADER
+from biobesu.helper.repeats import SampleWriter
+from biobesu.helper.repeats import add_repetition_arguments
+from biobesu.helper.repeats import read_samples
+from biobesu.helper.repeats import repetition_cases
+from biobesu.helper.repeats import repetition_id
+from biobesu.helper.repeats import write_summary
+from biobesu.helper.storage import OutputCollector
+from biobesu.helper.storage import add_storage_arguments
+from biobesu.helper.staging import add_staging_arguments
+from biobesu.helper.staging import create_stager
+from biobesu.helper.storage import create_output_store
+from biobesu.helper.trace import create_tracer
+from biobesu.helper.timing import add_timing_arguments
+from biobesu.helper.timing import create_timing_mode
+from biobesu.helper.timing import write_timing_configuration
 from biobesu.helper.readers import SeparatedValuesFileReader
-from biobesu.suite.vibe_versions.helper.converters import \
-    convert_list_to_arguments_with_same_key
+from biobesu.helper.runtime_model import Scheduler
+from biobesu.helper.runtime_model import add_scheduling_arguments
+from biobesu.helper.sampling import CaseTimes
+from biobesu.helper.sampling import add_sampling_arguments
+from biobesu.helper.sampling import draw_sample
+from biobesu.helper.sampling import write_report
+from biobesu.helper.sampling import write_sample
+from biobesu.helper.scratch import create_scratch
 from biobesu.suite.vibe_versions.helper.converters import \
     merge_vibe_simple_output_files
+from biobesu.suite.vibe_versions.helper.vibe import vibe_arguments
+from biobesu.suite.vibe_versions.helper.vibe import vibe_case
+from biobesu.suite.vibe_versions.helper.vibe import validate_vibe_output
 from biobesu.helper.argument_parser import BiobesuParser
 
 # Used only for docstring
@@ -21,28 +60,99 @@ class VibeRunner5_0:
     HPO_FILENAME = '.owl'  # Given owl file does not matter as it is not used.
     OUTPUT_SUBDIR = '5.0/'
     FINAL_OUTPUT_FILE = 'vibe_5.0.3.tsv'
+    TOOL_VERSION = '5.0.3'
+    SAMPLE_FILE = 'sample_cases.tsv'
+    SAMPLE_REPORT_FILE = 'sample_report.tsv'
 
     def __init__(self, parser):
         # Parse command line.
         self.__parse_command_line(parser)
+        self.metrics = start_metrics(self.args, 'vibe_versions',
+                                     self.OUTPUT_SUBDIR.rstrip('/'),
+                                     self.TOOL_VERSION)
 
         # Defines arguments based on parser.
-        self.vibe_output_dir = create_dir(self.args.output + 'vibe_output/',
-                                          exist_allowed=True)
+        self.vibe_output_dir = self.args.output + 'vibe_output/'
+        self.vibe_output_store = create_output_store(self.vibe_output_dir,
+                                                     self.args.output_storage)
         self.times_output_file = f'{self.args.output}times.tsv'
+        self.resources_output_file = f'{self.args.output}resources.tsv'
+        self.timing_config_file = f'{self.args.output}timing_config.json'
+        self.timing_samples_file = f'{self.args.output}timing_samples.tsv'
+        self.timing_summary_file = f'{self.args.output}timing_summary.tsv'
 
     def run(self):
         """
         Execute the runner.
         """
+        self.tracer = create_tracer(self.args)
         try:
-            # Run vibe.
-            self.__run_benchmark()
+            # Generates dict from input file: {id:[hpo, hpo]}.
+            hpo_dict = SeparatedValuesFileReader. \
+                key_value_reader(self.args.input, 0, 2, values_separator=',')
+
+            # Learns the runtime per case from earlier runs (on all cases).
+            self.scheduler = Scheduler(self.args, hpo_dict,
+                                       self.times_output_file)
+
+            # Only runs a stratified sample of the cases if requested.
+            self.sample = None
+            self.case_times = CaseTimes()
+            if self.args.sample is not None:
+                genes = SeparatedValuesFileReader. \
+                    key_value_reader(self.args.input, 0, 1)
+                self.sample = draw_sample(hpo_dict, self.args.sample,
+                                          self.args.seed, genes)
+                write_sample(self.sample,
+                             f'{self.args.output}{self.SAMPLE_FILE}')
+                hpo_dict = {case_id: hpo_dict[case_id]
+                            for case_id in self.sample.case_ids}
+
+            # Only predicts the wall time of the runs if requested.
+            if self.args.dry_run:
+                self.scheduler.dry_run(
+                    [key for key in hpo_dict.keys()
+                     if not self.vibe_output_store.contains(key)])
+                return
+
+            with create_stager(self.args) or nullcontext() as stager, \
+                    create_scratch(self.args, self.args.output) as scratch:
+                # Stages the jar & HDT (+ index) to local scratch if requested.
+                self.jar, self.hdt = self.args.jar, self.args.hdt
+                if stager is not None:
+                    with self.tracer.span('stage resources'):
+                        self.jar, self.hdt, hdt_index = stager.stage(
+                            [self.args.jar, self.args.hdt,
+                             self.args.hdt + '.index.v1-1'])
+                    print(stager.summary())
+
+                # Each run writes to a private scratch directory, from
+                # which valid output is moved into the store.
+                self.scratch = scratch
+                self.vibe_output_store.use_scratch(scratch)
+
+                # Run vibe.
+                with self.tracer.span('run vibe'):
+                    self.__run_benchmark(hpo_dict)
+
+                # Repeats runs for timing statistics (separate from the output).
+                if self.args.repeats > 0:
+                    with self.tracer.span('run repetitions'):
+                        self.__run_repetitions(hpo_dict)
 
             # Convert vibe output for visualization.
-            merge_vibe_simple_output_files(self.vibe_output_dir,
-                                           f'{self.args.output}'
-                                           f'{self.FINAL_OUTPUT_FILE}')
+            with self.tracer.span('merge vibe output'):
+                merge_vibe_simple_output_files(self.vibe_output_dir,
+                                               f'{self.args.output}'
+                                               f'{self.FINAL_OUTPUT_FILE}')
+
+            # Estimates the metrics & runtime of the complete benchmark.
+            if self.sample is not None:
+                write_report(self.sample, self.args.input,
+                             {f'vibe_{self.TOOL_VERSION}':
+                              f'{self.args.output}{self.FINAL_OUTPUT_FILE}'},
+                             f'{self.args.output}{self.SAMPLE_REPORT_FILE}',
+                             self.case_times, seed=self.args.seed)
         except FileExistsError as e:
             print(f'\nAn output file/directory already exists: '
                   f'{e.filename}\nExiting...')
@@ -66,6 +176,14 @@ class VibeRunner5_0:
                             help='path to HDT file')
         parser.add_argument('-p', '--hpo', required=True,
                             help='hpo.owl file')  # Not used but required.
+        add_execution_arguments(parser)
+        add_timing_arguments(parser)
+        add_repetition_arguments(parser)
+        add_storage_arguments(parser)
+        add_cache_arguments(parser)
+        add_staging_arguments(parser)
+        add_sampling_arguments(parser)
+        add_scheduling_arguments(parser)
 
         # Processes command line.
         try:
@@ -73,6 +191,8 @@ class VibeRunner5_0:
 
             # Validation.
             validate.file(self.args.input, '.tsv')
+            # Checks the complete benchmark input before any tool is started.
+            preflight.validate_benchmark(self.args.input, workers=usable_cpus())
             self.args.output = validate.directory(self.args.output,
                                                   create_if_not_exist=True) + \
                                self.OUTPUT_SUBDIR
@@ -81,58 +201,131 @@ class VibeRunner5_0:
             validate.file(self.args.hdt + '.index.v1-1',
                           self.HDT_FILENAME + '.index.v1-1')
             validate.file(self.args.hpo, self.HPO_FILENAME)
-        except OSError as e:
+            if self.args.sample is not None and self.args.sample < 1:
+                raise OSError('--sample should be at least 1')
+            self.timing_mode = create_timing_mode(self.args)
+        except (OSError, FileContentError) as e:
             parser.error(e)
 
-    def __run_benchmark(self):
+    def __run_benchmark(self, hpo_dict):
         """
-        Runs VIBE for each benchmark case.
+        Runs VIBE for each benchmark case (longest predicted runtime first).
+
+        :param hpo_dict: the HPO terms per benchmark case
+        :type hpo_dict: dict[str, list[str]]
         """
-        # Generates dict from input file: {id:[hpo, hpo]}.
-        hpo_dict = SeparatedValuesFileReader. \
-            key_value_reader(self.args.input, 0, 2, values_separator=',')
+        # Collects the VIBE runs for all HPO input sets.
+        cases = []
+        for key in hpo_dict.keys():
+            if self.vibe_output_store.contains(key):
+                print(f'Output for {key} already exits. Skipping...')
+            else:
+                cases.append(vibe_case(key, self.jar, self.hdt,
+                                       self.args.hpo, hpo_dict.get(key),
+                                       self.vibe_output_store.staging_file(
+                                           key)))
+        cases = self.scheduler.order(cases, lambda case: case.case_id)
+        if self.metrics is not None:
+            self.metrics.cases_skipped(len(hpo_dict) - len(cases))
 
-        # Prepares times file.
+        # Copies cached output & only runs a single case per HPO set.
+        cache = create_cache(self.args)
+        cache_listeners = []
+        if cache is not None:
+            fingerprint = cache.fingerprint([self.args.jar, self.args.hdt,
+                                             self.args.hdt + '.index.v1-1'])
+            cache_keys = {case.case_id: cache.key(fingerprint,
+                                                  hpo_dict.get(case.case_id))
+                          for case in cases}
+            cases, duplicates = cache.partition(cases, cache_keys,
+                                                self.vibe_output_store)
+            cache_listeners.append(CacheWriter(cache, cache_keys))
+
+        # Stores the configuration the timings are measured with.
+        if self.timing_mode is not None:
+            write_timing_configuration(self.timing_mode, self.args.java, self.args.max_workers,
+                                       self.timing_config_file)
+
+        # Prepares times & resources file.
         time_file_add_header = False
         if not isfile(self.times_output_file):
             time_file_add_header = True
+        resources_file_add_header = not isfile(self.resources_output_file)
 
-        # Opens times file.
-        with open(self.times_output_file, 'a') as times_writer:
+        # Opens times & resources file.
+        with open(self.times_output_file, 'a') as times_writer, \
+                open(self.resources_output_file, 'a') as resources_writer:
             # Adds header if file did not already exist.
             if time_file_add_header:
                 times_writer.write('id\ttime (in seconds)\n')
-            # Processes all HPO input sets.
-            for key in hpo_dict.keys():
-                print(f'Running VIBE: {key}')
-                self.__run_vibe(times_writer, key, hpo_dict.get(key))
+            if resources_file_add_header:
+                resources_writer.write(ResourcesWriter.HEADER)
+            # Executes the VIBE runs.
+            progress = ProgressReporter(len(cases), progress_file(self.args, self.args.output),
+                                        skipped=len(hpo_dict) - len(cases))
+            collector = OutputCollector(self.vibe_output_store)
+            create_executor(self.args, self.args.output,
+                            [TimesWriter(times_writer),
+                             ResourcesWriter(resources_writer)] +
+                            cache_listeners +
+                            [collector, progress, self.case_times],
+                            self.timing_mode, scratch=self.scratch,
+                            validator=validate_vibe_output,
+                            tracer=self.tracer).run(cases)
+
+        if cache is not None:
+            failed = cache.materialize_duplicates(duplicates, cache_keys,
+                                                  self.vibe_output_store)
+            if failed:
+                eprint(f'No output for these cases, as the run of a case '
+                       f'with the same HPO set failed: '
+                       f'{[case.case_id for case in failed]}\n')
+            cache.finish()
+            print(cache.summary())
 
-    def __run_vibe(self, times_writer, run_id, hpo_list):
+    def __run_repetitions(self, hpo_dict):
         """
-        Executes a single VIBE run.
+        Runs VIBE repeatedly for each benchmark case (after warm-up runs) & summarizes the timings. The output of
+        these runs is not kept.
 
-        :param run_id: the identifier of the run
-        :type run_id: str
-        :param hpo_list: a list with all HPO
+        :param hpo_dict: the HPO terms per benchmark case
+        :type hpo_dict: dict[str, list[str]]
         """
-        output_file = f'{self.vibe_output_dir}{run_id}.tsv'
-        if isfile(output_file):
-            print(f'{output_file} already exits. Skipping...')
-            return
+        repetition_dir = create_dir(self.args.output + 'timing_output/',
+                                    exist_allowed=True)
 
-        hpo_arguments = convert_list_to_arguments_with_same_key(hpo_list, '-p')
+        def create_case(run_id, repetition, warmup):
+            output_file = f'{repetition_dir}' \
+                          f'{repetition_id(run_id, repetition, warmup)}.tsv'
+            return RepetitionCase(run_id, repetition, warmup, self.jar,
+                                  vibe_arguments(hpo_dict.get(run_id),
+                                                 self.hdt, self.args.hpo,
+                                                 output_file),
+                                  output_file)
 
-        time_start = perf_counter()
+        # Only runs the repetitions that are missing.
+        samples = read_samples(self.timing_samples_file)
+        rounds = repetition_cases(create_case, list(hpo_dict.keys()),
+                                  self.args.repeats, self.args.warmup, samples)
 
-        call(f'java -jar {self.args.jar} -l '
-             f'{hpo_arguments} '
-             f'-t {self.args.hdt} '
-             f'-o {output_file} '
-             f'-w {self.args.hpo}',
-             shell=True)
+        samples_add_header = not isfile(self.timing_samples_file)
+        with open(self.timing_samples_file, 'a') as samples_writer:
+            if samples_add_header:
+                samples_writer.write(SAMPLES_HEADER)
+            progress = ProgressReporter(sum(len(cases) for cases in rounds),
+                                        progress_file(self.args,
+                                                      self.args.output))
+            executor = create_executor(self.args, self.args.output,
+                                       [SampleWriter(samples_writer),
+                                        progress],
+                                       self.timing_mode, scratch=self.scratch,
+                                       tracer=self.tracer)
+            # Each round runs a case at most once (see repetition_cases).
+            for cases in rounds:
+                executor.run(cases)
 
-        time_elapsed = perf_counter() - time_start
-        times_writer.write(f'{run_id}\t{time_elapsed}\n')
+        write_summary(read_samples(self.timing_samples_file),
+                      self.timing_summary_file)
 
 
 def main(parser):
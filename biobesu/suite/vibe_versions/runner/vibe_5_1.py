@@ -9,6 +9,7 @@ class VibeRunner5_1(VibeRunner5_0):
     HDT_FILENAME = 'vibe-5.1.0.hdt'
     OUTPUT_SUBDIR = '5.1/'
     FINAL_OUTPUT_FILE = 'vibe_5.1.0.tsv'
+    TOOL_VERSION = '5.1.5'
 
 
 def main(parser):
@@ -0,0 +1,70 @@
+#!/user/bin/env python3
+
+from sys import exit
+from time import perf_counter
+from yaml import YAMLError
+from biobesu.helper import campaign
+from biobesu.helper import validate
+from biobesu.helper.argument_parser import BiobesuParser
+
+# Used only for docstring
+from argparse import ArgumentParser
+from biobesu.helper.campaign import CampaignRunner
+
+
+def main(parser):
+    args, workers, runners = __parse_command_line(parser)
+
+    print(f'Running {len(runners)} runner(s) on {workers} shared worker slot(s)')
+    time_start = perf_counter()
+    campaign.run_campaign(runners, workers)
+    __print_summary(runners, perf_counter() - time_start)
+    if not all(runner.succeeded for runner in runners):
+        exit(1)
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments, the number of worker slots & the runners of the manifest
+    :rtype: tuple
+    """
+
+    parser.add_argument('manifest', help='YAML file declaring the suites, runners & their arguments (see README)')
+    parser.add_argument('--workers', type=int,
+                        help='number of worker slots shared by all runners (overrides the manifest, default: number '
+                             'of usable CPUs)')
+
+    try:
+        args = parser.parse_args()
+        validate.file(args.manifest)
+        workers, runners = campaign.read_manifest(args.manifest)
+        if args.workers is not None:
+            if args.workers < max(runner.weight for runner in runners):
+                raise ValueError('--workers should be at least the highest runner weight')
+            workers = args.workers
+    except (OSError, ValueError, YAMLError) as e:
+        parser.error(e)
+
+    return args, workers, runners
+
+
+def __print_summary(runners, wall_time):
+    """
+    :param runners: the finished runners
+    :type runners: list[CampaignRunner]
+    :param wall_time: the wall time of the complete campaign in seconds
+    :type wall_time: float
+    """
+
+    print(f'\nCampaign finished in {wall_time:.1f}s')
+    for runner in runners:
+        status = 'done' if runner.succeeded else 'FAILED'
+        print(f'  {runner.name}: {status} in {runner.wall_time:.1f}s')
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
@@ -0,0 +1,108 @@
+#!/user/bin/env python3
+
+from itertools import combinations
+from biobesu.helper import evaluation
+from biobesu.helper import validate
+from biobesu.helper.admission import usable_cpus
+from biobesu.helper.argument_parser import BiobesuParser
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def main(parser):
+    args = __parse_command_line(parser)
+    try:
+        __evaluate(args)
+    except FileExistsError as e:
+        print(f'\nAn output file/directory already exists: {e.filename}\nExiting...')
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments
+    :rtype:
+    """
+
+    parser.add_argument('--input', required=True, help='benchmark file the results were generated with')
+    parser.add_argument('--result', required=True, action='append', metavar='LABEL=FILE',
+                        help='a merged result file (id & comma-separated ranked genes), for example: '
+                             'vibe_5.0=vibe_5.0.3.tsv. Can be given multiple times to compare tools')
+    parser.add_argument('--output', required=True, help='directory to write the evaluation to')
+    parser.add_argument('--gene_column', type=int, default=1,
+                        help='column (0-based) in the benchmark file with the gene that should be found (default: 1)')
+    parser.add_argument('--k', default='1,5,10,50', help='cut-offs for recall@k (default: 1,5,10,50)')
+    parser.add_argument('--resamples', type=int, default=10000, help='number of bootstrap resamples (default: 10000)')
+    parser.add_argument('--permutations', type=int, default=10000,
+                        help='number of permutations for the paired tests (default: 10000)')
+    parser.add_argument('--confidence', type=float, default=0.95, help='confidence level (default: 0.95)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for resampling (default: 0)')
+    parser.add_argument('--workers', type=int, default=usable_cpus(),
+                        help='number of processes to use (default: number of CPUs)')
+
+    try:
+        args = parser.parse_args()
+        validate.file(args.input)
+        args.output = validate.directory(args.output, create_if_not_exist=True)
+        args.k = [int(k) for k in args.k.split(',')]
+
+        results = {}
+        for result in args.result:
+            if '=' not in result:
+                raise ValueError(f'--result should be formatted as LABEL=FILE: {result}')
+            label, result_file = result.split('=', 1)
+            if label in results:
+                raise ValueError(f'result labels must be unique: {label}')
+            validate.file(result_file)
+            results[label] = result_file
+        args.result = results
+    except (OSError, ValueError) as e:
+        parser.error(e)
+
+    return args
+
+
+def __evaluate(args):
+    """
+    Calculates the metrics (with confidence intervals) per tool and tests the differences between each pair of
+    tools.
+
+    :param args: the parsed arguments
+    """
+
+    expected_genes = evaluation.read_benchmark_genes(args.input, args.gene_column)
+    case_ids = list(expected_genes)
+    results = {label: evaluation.read_results(result_file) for label, result_file in args.result.items()}
+    names = evaluation.metric_names(args.k)
+
+    # Cases without results count as not found, so that all tools are evaluated on the same cases.
+    case_ranks = {label: evaluation.ranks(expected_genes, tool_results, case_ids)
+                  for label, tool_results in results.items()}
+
+    print('Calculating confidence intervals...')
+    with open(args.output + 'evaluation_metrics.tsv', 'x') as file_writer:
+        file_writer.write('tool\tmetric\testimate\tci_lower\tci_upper\tcases\n')
+        for label, tool_ranks in case_ranks.items():
+            estimates = evaluation.bootstrap_metrics(tool_ranks, args.k, args.resamples, args.confidence, args.seed,
+                                                     args.workers)
+            for name, (estimate, lower, upper) in zip(names, estimates):
+                file_writer.write(f'{label}\t{name}\t{estimate}\t{lower}\t{upper}\t{len(case_ids)}\n')
+                print(f'{label}\t{name}\t{estimate:.4f} [{lower:.4f}, {upper:.4f}]')
+
+    print('Testing differences between tools...')
+    with open(args.output + 'evaluation_paired_tests.tsv', 'x') as file_writer:
+        file_writer.write('tool_a\ttool_b\tmetric\tdifference\tp_value\tcases\n')
+        for label_a, label_b in combinations(case_ranks, 2):
+            tests = evaluation.paired_permutation_test(case_ranks[label_a], case_ranks[label_b], args.k,
+                                                       args.permutations, args.seed, args.workers)
+            for name, (difference, p_value, cases) in zip(names, tests):
+                file_writer.write(f'{label_a}\t{label_b}\t{name}\t{difference}\t{p_value}\t{cases}\n')
+                print(f'{label_a} - {label_b}\t{name}\t{difference:.4f} (p={p_value:.4g}, n={cases})')
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
@@ -0,0 +1,67 @@
+#!/user/bin/env python3
+
+from sys import exit
+from tarfile import TarError
+from yaml import YAMLError
+from biobesu.helper import downloaders
+from biobesu.helper import validate
+from biobesu.helper.argument_parser import BiobesuParser
+from biobesu.helper.converters import GeneConverter
+from biobesu.helper.generic import eprint
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def main(parser):
+    args, resources = __parse_command_line(parser)
+
+    print(f'Fetching {len(resources)} resource(s) with {args.workers} worker(s) ({args.per_host} per host)')
+    try:
+        progress = downloaders.fetch_resources(resources, args.workers, args.per_host)
+    except (OSError, TarError) as e:
+        eprint(f'\nFetching failed: {e}\nExiting...')
+        exit(1)
+    print(progress.summary())
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments & the resources to fetch
+    :rtype: tuple
+    """
+
+    parser.add_argument('manifest', nargs='?',
+                        help='YAML file declaring the resources to fetch (see README)')
+    parser.add_argument('--runner_data',
+                        help='also fetch the gene file used by the runners into this directory (see --runner_data of '
+                             'the runners)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='maximum number of simultaneous downloads (default: 4)')
+    parser.add_argument('--per_host', type=int, default=2,
+                        help='maximum number of simultaneous downloads per host (default: 2)')
+
+    try:
+        args = parser.parse_args()
+        resources = []
+        if args.manifest is not None:
+            validate.file(args.manifest)
+            resources = downloaders.read_resources(args.manifest)
+        if args.runner_data is not None:
+            resources.append(GeneConverter.resource(validate.directory(args.runner_data, create_if_not_exist=True)))
+        if not resources:
+            raise ValueError('nothing to fetch: give a manifest and/or --runner_data')
+        if args.workers < 1 or args.per_host < 1:
+            raise ValueError('--workers & --per_host should be at least 1')
+    except (OSError, ValueError, YAMLError) as e:
+        parser.error(e)
+
+    return args, resources
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
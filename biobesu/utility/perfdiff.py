@@ -0,0 +1,109 @@
+#!/user/bin/env python3
+
+from sys import exit
+from biobesu.helper import perfdiff
+from biobesu.helper import validate
+from biobesu.helper.argument_parser import BiobesuParser
+from biobesu.helper.readers import SeparatedValuesFileReader
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+# Maximum number of regressed cases that are printed (all are written to perfdiff_cases.tsv).
+PRINTED_CASES = 20
+
+
+def main(parser):
+    args = __parse_command_line(parser)
+    try:
+        regressions = __compare(args)
+    except FileExistsError as e:
+        print(f'\nAn output file/directory already exists: {e.filename}\nExiting...')
+        exit(2)
+    # Usable as gate: fails if the candidate regressed.
+    if regressions > 0:
+        exit(1)
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments
+    :rtype:
+    """
+
+    parser.add_argument('baseline', help='output directory of the baseline run (for example, <output>/5.0/)')
+    parser.add_argument('candidate', help='output directory of the candidate run')
+    parser.add_argument('--input', required=True, help='benchmark file both runs were generated with')
+    parser.add_argument('--output', required=True, help='directory to write the comparison to')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative increase considered a regression (default: 0.1, so 10%% slower)')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='significance level after multiple testing correction (default: 0.05)')
+    parser.add_argument('--correction', choices=perfdiff.CORRECTIONS, default='holm',
+                        help='multiple testing correction: holm (family-wise error rate) or bh (Benjamini-Hochberg '
+                             'false discovery rate) (default: holm)')
+    parser.add_argument('--permutations', type=int, default=10000,
+                        help='number of permutations per test (default: 10000)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the permutations (default: 0)')
+
+    try:
+        args = parser.parse_args()
+        args.baseline = validate.directory(args.baseline, writable=False)
+        args.candidate = validate.directory(args.candidate, writable=False)
+        validate.file(args.input, '.tsv')
+        args.output = validate.directory(args.output, create_if_not_exist=True)
+        if args.threshold < 0:
+            raise ValueError('--threshold should not be negative')
+        if not 0 < args.alpha < 1:
+            raise ValueError('--alpha should be between 0 & 1')
+        args.baseline_measurements = perfdiff.RunMeasurements.read(args.baseline)
+        args.candidate_measurements = perfdiff.RunMeasurements.read(args.candidate)
+    except (OSError, ValueError) as e:
+        parser.error(e)
+
+    return args
+
+
+def __compare(args):
+    """
+    Compares the runs, writes & prints the regressions.
+
+    :param args: the parsed arguments
+    :return: the number of regressed strata & cases
+    :rtype: int
+    """
+
+    hpo_dict = SeparatedValuesFileReader.key_value_reader(args.input, 0, 2, values_separator=',')
+    stratum_rows, case_rows = perfdiff.compare_runs(args.baseline_measurements, args.candidate_measurements, hpo_dict,
+                                                    args.threshold, args.alpha, args.correction, args.permutations,
+                                                    args.seed)
+    perfdiff.write_report(stratum_rows, case_rows, args.output)
+
+    print(f'Candidate / baseline per stratum (regression: more than {args.threshold:.0%} higher & adjusted p < '
+          f'{args.alpha}):')
+    for stratum, metric, cases, ratio, p_value, p_adjusted, regressed in stratum_rows:
+        flag = '\tREGRESSED' if regressed else ''
+        print(f'{stratum}\t{metric}\t{ratio:.3f} (p={p_adjusted:.4g}, n={cases}){flag}')
+
+    regressed_cases = [row for row in case_rows if row[-1]]
+    tested = sum(1 for row in case_rows if row[6] is not None)
+    print(f'{len(regressed_cases)} of {tested} case(s) with repeated timings regressed (see perfdiff_cases.tsv)')
+    for case_id, stratum, base_time, candidate_time, ratio, repetitions, p_value, p_adjusted, regressed \
+            in regressed_cases[:PRINTED_CASES]:
+        print(f'{case_id}\t{stratum}\t{base_time:.3f}s -> {candidate_time:.3f}s ({ratio:.3f}, p={p_adjusted:.4g})')
+    untested = sum(1 for row in case_rows if row[6] is None and row[4] > 1 + args.threshold)
+    if untested > 0:
+        print(f'{untested} case(s) without repeated timings (see --repeats) are more than {args.threshold:.0%} '
+              f'slower, but can not be tested')
+
+    regressions = sum(1 for row in stratum_rows if row[-1]) + len(regressed_cases)
+    print('REGRESSION' if regressions > 0 else 'No regression')
+    return regressions
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
@@ -0,0 +1,127 @@
+#!/user/bin/env python3
+
+from errno import EEXIST
+from os.path import exists
+from time import perf_counter
+from biobesu.helper import similarity
+from biobesu.helper import validate
+from biobesu.helper.argument_parser import BiobesuParser
+from biobesu.helper.generic import eprint
+import numpy as np
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def main(parser):
+    args = __parse_command_line(parser)
+    try:
+        __calculate_similarity(args)
+    except FileExistsError as e:
+        print(f'\nAn output file/directory already exists: {e.filename}\nExiting...')
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments
+    :rtype:
+    """
+
+    parser.add_argument('--input', required=True, help='input tsv benchmark file')
+    parser.add_argument('--hpo', required=True, help='hpo.obo file')
+    parser.add_argument('--hpoa', required=True,
+                        help='phenotype.hpoa file with the disease annotations used for the information content')
+    parser.add_argument('--output', required=True, help='directory to write the similarity to')
+    parser.add_argument('--threshold', type=float, default=0.9,
+                        help='minimum normalized similarity for a pair of cases to be reported as near-duplicates '
+                             '(default: 0.9)')
+    parser.add_argument('--strata', type=int, default=4,
+                        help='number of strata the cases are divided in by the similarity to their nearest case '
+                             '(default: 4)')
+
+    try:
+        args = parser.parse_args()
+        validate.file(args.input, '.tsv')
+        validate.file(args.hpo, '.obo')
+        validate.file(args.hpoa)
+        args.output = validate.directory(args.output, create_if_not_exist=True)
+        if args.strata < 1:
+            raise ValueError('--strata should be at least 1')
+    except (OSError, ValueError) as e:
+        parser.error(e)
+
+    return args
+
+
+def __calculate_similarity(args):
+    """
+    Calculates the similarity of all pairs of cases & writes the matrix, the per-case summary & the near-duplicates.
+
+    :param args: the parsed arguments
+    """
+
+    matrix_file = args.output + 'similarity_matrix.npy'
+    cases_file = args.output + 'similarity_cases.tsv'
+    duplicates_file = args.output + 'similarity_near_duplicates.tsv'
+    for file_path in [matrix_file, cases_file, duplicates_file]:
+        if exists(file_path):
+            raise FileExistsError(EEXIST, 'File exists', file_path)
+
+    time_start = perf_counter()
+    parents, primary_ids = similarity.read_ontology(args.hpo)
+    ancestors = similarity.ancestor_closure(parents)
+    ic = similarity.information_content(ancestors, similarity.read_annotations(args.hpoa, primary_ids))
+
+    # Reads the cases (alternative IDs are replaced by their primary ID).
+    case_ids = []
+    case_hpo_ids = []
+    unknown = set()
+    with open(args.input) as file_reader:
+        next(file_reader)
+        for line in file_reader:
+            line = line.rstrip('\n').split('\t')
+            case_ids.append(line[0])
+            hpo_ids = [hpo_id.strip() for hpo_id in line[2].split(',')] if len(line) > 2 else []
+            unknown.update(hpo_id for hpo_id in hpo_ids if hpo_id not in primary_ids)
+            case_hpo_ids.append(sorted({primary_ids[hpo_id] for hpo_id in hpo_ids if hpo_id in primary_ids}))
+    if len(unknown) > 0:
+        eprint(f'Ignored HPO IDs that are not in the ontology: {unknown}\n')
+
+    terms = sorted({hpo_id for hpo_ids in case_hpo_ids for hpo_id in hpo_ids})
+    term_index = {term: i for i, term in enumerate(terms)}
+    mica = similarity.mica_matrix(terms, parents, ancestors, ic)
+    print(f'Information content & MICA matrix of {len(terms)} terms in {perf_counter() - time_start:.1f}s')
+
+    time_start = perf_counter()
+    matrix = np.lib.format.open_memmap(matrix_file, mode='w+', dtype=np.float32, shape=(len(case_ids), len(case_ids)))
+    similarity.resnik_bma([[term_index[hpo_id] for hpo_id in hpo_ids] for hpo_ids in case_hpo_ids], mica, matrix)
+    print(f'Similarity of {len(case_ids)} cases in {perf_counter() - time_start:.1f}s')
+
+    nearest, nearest_similarity, mean_similarity = similarity.nearest_neighbours(matrix)
+    # Strata by quantiles of the similarity to the nearest case (1: least similar).
+    edges = np.quantile(nearest_similarity, np.arange(1, args.strata) / args.strata) if len(case_ids) > 0 else []
+    strata = np.searchsorted(edges, nearest_similarity, side='right') + 1
+
+    with open(cases_file, 'x') as file_writer:
+        file_writer.write('id\tterms\tinformation_content\tnearest_case\tnearest_similarity\tmean_similarity\t'
+                          'stratum\n')
+        for i, case_id in enumerate(case_ids):
+            file_writer.write(f'{case_id}\t{len(case_hpo_ids[i])}\t{matrix[i, i]}\t{case_ids[nearest[i]]}\t'
+                              f'{nearest_similarity[i]}\t{mean_similarity[i]}\t{strata[i]}\n')
+
+    duplicates = similarity.near_duplicates(matrix, args.threshold)
+    with open(duplicates_file, 'x') as file_writer:
+        file_writer.write('id_a\tid_b\tsimilarity\n')
+        for i, j, pair_similarity in duplicates:
+            file_writer.write(f'{case_ids[i]}\t{case_ids[j]}\t{pair_similarity}\n')
+    print(f'{len(duplicates)} pair(s) of near-duplicate cases (normalized similarity >= {args.threshold})')
+
+    matrix.flush()
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
@@ -0,0 +1,139 @@
+#!/user/bin/env python3
+
+from os import chmod
+from os.path import abspath
+from os.path import dirname
+from sys import executable
+from biobesu.helper import synthetic
+from biobesu.helper import validate
+from biobesu.helper.argument_parser import BiobesuParser
+from biobesu.helper.converters import GeneConverter
+from biobesu.helper.generic import create_dir
+from biobesu.suite.vibe_versions.runner.vibe_5_0 import VibeRunner5_0
+from biobesu.suite.vibe_versions.runner.vibe_5_1 import VibeRunner5_1
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def main(parser):
+    args = __parse_command_line(parser)
+    try:
+        __generate_workload(args)
+    except FileExistsError as e:
+        print(f'\nAn output file/directory already exists: {e.filename}\nExiting...')
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments
+    :rtype:
+    """
+
+    parser.add_argument('--output', required=True, help='directory to write the synthetic workload to')
+    parser.add_argument('--cases', type=int, default=100, help='number of benchmark cases (default: 100)')
+    parser.add_argument('--terms', type=int, default=2000, help='number of HPO terms (default: 2000)')
+    parser.add_argument('--genes', type=int, default=5000, help='number of genes (default: 5000)')
+    parser.add_argument('--diseases', type=int, default=3000, help='number of OMIM diseases (default: 3000)')
+    parser.add_argument('--seed', type=int, default=0, help='seed used for generating the data (default: 0)')
+
+    # Fake tool behaviour.
+    parser.add_argument('--latency', type=float, default=1.0,
+                        help='seconds a fake tool run takes (default: 1.0)')
+    parser.add_argument('--latency_jitter', type=float, default=0.5,
+                        help='maximum random seconds added to the latency (default: 0.5)')
+    parser.add_argument('--cpu', type=float, default=0.0,
+                        help='CPU seconds a fake tool run burns (default: 0.0)')
+    parser.add_argument('--memory', type=int, default=0,
+                        help='MB of memory a fake tool run allocates (default: 0)')
+    parser.add_argument('--failure_rate', type=float, default=0.0,
+                        help='chance (0-1) that a fake tool run fails (default: 0.0)')
+    parser.add_argument('--lirical_rows', type=int, default=500,
+                        help='number of ranked diseases per fake LIRICAL run (default: 500)')
+    parser.add_argument('--vibe_genes', type=int, default=200,
+                        help='number of suggested genes per fake VIBE run (default: 200)')
+
+    try:
+        args = parser.parse_args()
+        args.output = validate.directory(args.output, create_if_not_exist=True)
+        if not 0 <= args.failure_rate <= 1:
+            raise ValueError('--failure_rate must be between 0 and 1')
+    except (OSError, ValueError) as e:
+        parser.error(e)
+
+    return args
+
+
+def __generate_workload(args):
+    """
+    Generates the synthetic input data, fake tool files and a `java` stand-in.
+
+    :param args: the parsed arguments
+    """
+
+    output = args.output
+
+    # General input data.
+    print('Generating benchmark data...')
+    synthetic.write_hpo_obo(output + 'hp.obo', args.terms, args.seed)
+    open(output + 'hp.owl', 'x').close()
+    synthetic.write_benchmark_file(output + 'benchmark_hpo_generank.tsv', args.cases, args.terms, args.genes,
+                                   args.seed)
+    synthetic.write_benchmark_file(output + 'benchmark_vibe_versions.tsv', args.cases, args.terms, args.genes,
+                                   args.seed, gene_column='gene_id')
+    runner_data = create_dir(output + 'runner_data/')
+    synthetic.write_gene_symbols_file(runner_data + GeneConverter.file_name, args.genes)
+
+    # LIRICAL files.
+    print('Generating LIRICAL data...')
+    lirical_data = create_dir(output + 'lirical/data/')
+    open(output + 'lirical/LIRICAL.jar', 'x').close()
+    synthetic.write_gene_info_file(lirical_data + 'Homo_sapiens_gene_info.gz', args.genes)
+    synthetic.write_hpo_obo(lirical_data + 'hp.obo', args.terms, args.seed)
+    synthetic.write_mim2gene_medgen_file(lirical_data + 'mim2gene_medgen', args.diseases, args.genes)
+    synthetic.write_phenotype_hpoa_file(lirical_data + 'phenotype.hpoa', args.diseases, args.terms, args.seed)
+
+    # VIBE files (only names need to match, as the fake tool does not read them).
+    vibe_dir = create_dir(output + 'vibe/')
+    for runner in [VibeRunner5_0, VibeRunner5_1]:
+        for file_name in [runner.JAR_FILENAME, runner.HDT_FILENAME, runner.HDT_FILENAME + '.index.v1-1']:
+            open(vibe_dir + file_name, 'x').close()
+
+    # Java stand-in.
+    bin_dir = create_dir(output + 'bin/')
+    __write_java_stand_in(bin_dir + 'java', args)
+
+    print(f'\nSynthetic workload written to: {output}\nUse "--java {bin_dir}java" with the runners to use the fake '
+          f'tools.')
+
+
+def __write_java_stand_in(file_path, args):
+    """
+    Writes an executable script that can be used instead of `java` and runs the fake tools.
+
+    :param file_path: path of the script to write
+    :type file_path: str
+    :param args: the parsed arguments
+    """
+
+    # Makes biobesu importable, even if it is not installed.
+    package_root = dirname(dirname(dirname(abspath(__file__))))
+
+    with open(file_path, 'x') as file_writer:
+        file_writer.write(f'#!/bin/sh\n'
+                          f'export PYTHONPATH="{package_root}${{PYTHONPATH:+:$PYTHONPATH}}"\n'
+                          f'exec "{executable}" '
+                          f'-m biobesu.helper.fake_tools --latency {args.latency} '
+                          f'--latency_jitter {args.latency_jitter} --cpu {args.cpu} --memory {args.memory} '
+                          f'--failure_rate {args.failure_rate} --seed {args.seed} --genes {args.genes} '
+                          f'--diseases {args.diseases} --lirical_rows {args.lirical_rows} '
+                          f'--vibe_genes {args.vibe_genes} "$@"\n')
+    chmod(file_path, 0o755)
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
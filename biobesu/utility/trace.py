@@ -0,0 +1,71 @@
+#!/user/bin/env python3
+
+from json import dump
+from biobesu.helper import trace
+from biobesu.helper import validate
+from biobesu.helper.argument_parser import BiobesuParser
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def main(parser):
+    args = __parse_command_line(parser)
+    try:
+        events = trace.read_events(args.input)
+        with open(args.output, 'x') as file_writer:
+            dump(trace.to_chrome_trace(events), file_writer)
+        __print_summary(trace.summarize(events))
+    except FileExistsError as e:
+        print(f'\nAn output file/directory already exists: {e.filename}\nExiting...')
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments
+    :rtype:
+    """
+
+    parser.add_argument('--input', required=True, help='trace file written by a runner (through --trace)')
+    parser.add_argument('--output', required=True,
+                        help='file to write the Chrome trace (JSON) to, which can be opened in Perfetto '
+                             '(https://ui.perfetto.dev) or chrome://tracing')
+
+    try:
+        args = parser.parse_args()
+        validate.file(args.input)
+    except OSError as e:
+        parser.error(e)
+
+    return args
+
+
+def __print_summary(summaries):
+    """
+    Prints per runner the stage durations & the worker utilization.
+
+    :param summaries: the summaries (see :func:`~biobesu.helper.trace.summarize`)
+    :type summaries: list[dict]
+    """
+
+    for summary in summaries:
+        print(f'{summary["name"]} (process {summary["process"]})')
+        for name, duration in summary['stages']:
+            print(f'  stage {name}: {duration:.2f}s')
+        if summary['cases'] > 0:
+            print(f'  {summary["cases"]} tool runs on {summary["workers"]} worker(s) within {summary["window"]:.2f}s, '
+                  f'median {summary["median_case"]:.2f}s')
+            print(f'  utilization {summary["utilization"] * 100:.1f}% (busy {summary["busy"]:.2f}s, '
+                  f'idle {summary["idle"]:.2f}s)')
+            print(f'  idle gaps >= {trace.IDLE_GAP_THRESHOLD}s: {summary["idle_gaps"]}, '
+                  f'longest {summary["longest_idle_gap"]:.2f}s')
+            print(f'  queued before start: median {summary["median_queued"]:.2f}s, '
+                  f'p95 {summary["p95_queued"]:.2f}s')
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
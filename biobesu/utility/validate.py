@@ -0,0 +1,65 @@
+#!/user/bin/env python3
+
+from sys import exit
+from biobesu.helper import preflight
+from biobesu.helper import validate
+from biobesu.helper.admission import usable_cpus
+from biobesu.helper.argument_parser import BiobesuParser
+from biobesu.helper.converters import GeneConverter
+from biobesu.helper.converters import PhenotypeConverter
+
+# Used only for docstring
+from argparse import ArgumentParser
+
+
+def main(parser):
+    args = __parse_command_line(parser)
+
+    hpo_ids = None if args.hpo is None else set(PhenotypeConverter(args.hpo).names_by_id)
+    gene_symbols = None
+    gene_ids = None
+    if args.runner_data is not None:
+        gene_converter = GeneConverter(args.runner_data)
+        gene_symbols = set(gene_converter.id_by_symbol)
+        gene_ids = set(gene_converter.symbol_by_id)
+
+    problems = preflight.check_benchmark(args.input, hpo_ids, gene_symbols, gene_ids, args.workers)
+    for problem in problems:
+        print(problem)
+    print(f'{len(problems)} problem(s) found in "{args.input}"')
+    if len(problems) > 0:
+        exit(1)
+
+
+def __parse_command_line(parser):
+    """
+    Parsers the command line
+
+    :param parser: the argument parser
+    :type parser: ArgumentParser
+    :return: the parsed arguments
+    :rtype:
+    """
+
+    parser.add_argument('--input', required=True, help='input tsv benchmark file')
+    parser.add_argument('--hpo', help='hpo.obo file to check the HPO IDs against (default: only checks their format)')
+    parser.add_argument('--runner_data', help='directory containing/storing the gene file to check whether the genes '
+                                              'can be resolved (default: only checks their format)')
+    parser.add_argument('--workers', type=int, default=usable_cpus(),
+                        help='number of processes to use (default: number of CPUs)')
+
+    try:
+        args = parser.parse_args()
+        validate.file(args.input, '.tsv')
+        if args.hpo is not None:
+            validate.file(args.hpo, '.obo')
+        if args.runner_data is not None:
+            args.runner_data = validate.directory(args.runner_data)
+    except OSError as e:
+        parser.error(e)
+
+    return args
+
+
+if __name__ == '__main__':
+    main(BiobesuParser())
@@ -20,6 +20,8 @@ setup(
     # download_url = '',
     python_requires='>=3.8',
     install_requires=[
+        'numpy',
+        'pyyaml',
         'requests'
     ],
     extras_require={
@@ -35,12 +37,24 @@ setup(
             'hpo_generank = biobesu.suite.hpo_generank.cli:main',
             'vibe_versions = biobesu.suite.vibe_versions.cli:main'
         ],
+        'biobesu_utilities': [
+            'synthetic = biobesu.utility.synthetic:main',
+            'evaluate = biobesu.utility.evaluate:main',
+            'validate = biobesu.utility.validate:main',
+            'trace = biobesu.utility.trace:main',
+            'similarity = biobesu.utility.similarity:main',
+            'campaign = biobesu.utility.campaign:main',
+            'fetch = biobesu.utility.fetch:main',
+            'perfdiff = biobesu.utility.perfdiff:main'
+        ],
         'biobesu_hpo_generank': [
-            'lirical = biobesu.suite.hpo_generank.runner.lirical:main'
+            'lirical = biobesu.suite.hpo_generank.runner.lirical:main',
+            'gene_index = biobesu.suite.hpo_generank.runner.gene_index:main'
         ],
         'biobesu_vibe_versions': [
             '5.0 = biobesu.suite.vibe_versions.runner.vibe_5_0:main',
-            '5.1 = biobesu.suite.vibe_versions.runner.vibe_5_1:main'
+            '5.1 = biobesu.suite.vibe_versions.runner.vibe_5_1:main',
+            'compare = biobesu.suite.vibe_versions.runner.compare:main'
         ],
     },
     classifiers=[
@@ -0,0 +1,30 @@
+#!/user/bin/env python3
+
+from biobesu.helper.admission import AdmissionController
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import CaseResult
+
+
+def test_admits_single_case_without_footprint():
+    admission = AdmissionController(max_load=1000)
+
+    assert admission.admit([]) is True
+    assert admission.admit([1]) is False
+
+
+def test_learns_footprint_from_finished_cases():
+    admission = AdmissionController(max_load=1000)
+    case = Case('01', 'tool.jar', '')
+
+    admission.case_started(case)
+    admission.case_finished(CaseResult(case, 0, 1.0, '01.log', peak_memory=100))
+    admission.case_finished(CaseResult(case, 0, 1.0, '01.log', peak_memory=50))
+
+    assert round(admission.footprint, 6) == 110
+    assert admission.start_times == {}
+
+
+def test_configured_footprint_includes_jvm_overhead():
+    admission = AdmissionController(case_memory=512, max_load=1000)
+
+    assert admission.footprint == 512 + AdmissionController.JVM_OVERHEAD
@@ -0,0 +1,60 @@
+#!/user/bin/env python3
+
+from os import utime
+from biobesu.helper.cache import ResultCache
+from biobesu.helper.execution import Case
+from biobesu.helper.storage import create_output_store
+
+
+def test_key_normalizes_hpo_set():
+    assert ResultCache.key('fp', ['HP:2', 'HP:1', 'HP:2']) == ResultCache.key('fp', ['HP:1', 'HP:2'])
+    assert ResultCache.key('fp', ['HP:1']) != ResultCache.key('other', ['HP:1'])
+
+
+def test_fingerprint_changes_with_resources(tmp_path):
+    jar = tmp_path / 'tool.jar'
+    jar.write_text('version 1')
+    cache = ResultCache(str(tmp_path / 'cache'))
+
+    fingerprint = cache.fingerprint([str(jar)])
+    assert ResultCache(str(tmp_path / 'cache')).fingerprint([str(jar)]) == fingerprint
+
+    jar.write_text('version 2')
+    assert cache.fingerprint([str(jar)]) != fingerprint
+
+
+def test_partition_and_materialize(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    store = create_output_store(str(tmp_path / 'output') + '/', 'gzip')
+    cases = [Case(case_id, 'tool.jar', '', store.staging_file(case_id)) for case_id in ['1', '2', '3']]
+    keys = {'1': 'a' * 64, '2': 'b' * 64, '3': 'b' * 64}
+    source = tmp_path / 'source.tsv'
+    source.write_text('gene\n')
+    cache.add('a' * 64, str(source))
+
+    to_run, duplicates = cache.partition(cases, keys, store)
+
+    assert [case.case_id for case in to_run] == ['2']
+    assert [case.case_id for case in duplicates] == ['3']
+    assert store.ids() == ['1']
+
+    # Output of the case that was run is added, after which its duplicate can be materialized.
+    cache.add('b' * 64, str(source))
+    assert cache.materialize_duplicates(duplicates, keys, store) == []
+    assert store.ids() == ['1', '3']
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_finish_evicts_least_recently_used_and_accumulates_statistics(tmp_path):
+    source = tmp_path / 'source.tsv'
+    source.write_text('x' * 600 * 1024)
+    cache = ResultCache(str(tmp_path / 'cache'), max_size=1)
+    for i, key in enumerate(['a' * 64, 'b' * 64]):
+        cache.add(key, str(source))
+        utime(f'{cache.directory}entries/{key[:2]}/{key}.tsv', (i, i))
+
+    statistics = cache.finish()
+
+    assert not cache.contains('a' * 64) and cache.contains('b' * 64)
+    assert statistics == {'hits': 0, 'misses': 0, 'stored': 2, 'evicted': 1}
+    assert ResultCache(str(tmp_path / 'cache')).finish()['stored'] == 2
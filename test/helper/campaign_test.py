@@ -0,0 +1,63 @@
+#!/user/bin/env python3
+
+import pytest
+from biobesu.helper import campaign
+
+MANIFEST = '''workers: 4
+defaults:
+  java: /opt/java
+runners:
+  - suite: hpo_generank
+    runner: lirical
+    weight: 2
+    args:
+      jar: LIRICAL.jar
+      output: out/lirical
+  - suite: vibe_versions
+    runner: compare
+    args:
+      java: /usr/bin/java
+      version: [[5.0, a.jar, a.hdt], [5.1, b.jar, b.hdt]]
+      dry_run: true
+      cache_dir: null
+'''
+
+
+def test_read_manifest(tmp_path):
+    (tmp_path / 'manifest.yaml').write_text(MANIFEST)
+
+    workers, runners = campaign.read_manifest(str(tmp_path / 'manifest.yaml'))
+
+    assert workers == 4
+    assert [(runner.name, runner.weight) for runner in runners] == [('hpo_generank lirical', 2),
+                                                                     ('vibe_versions compare', 1)]
+    assert runners[0].arguments == ['--java', '/opt/java', '--jar', 'LIRICAL.jar', '--output', 'out/lirical']
+    assert runners[1].arguments == ['--java', '/usr/bin/java', '--version', '5.0', 'a.jar', 'a.hdt',
+                                    '--version', '5.1', 'b.jar', 'b.hdt', '--dry_run']
+
+
+@pytest.mark.parametrize('manifest,message', [
+    ('runners: []', 'should contain a list of runners'),
+    ('runners:\n  - suite: vibe_versions\n    runner: "9.9"', 'unknown suite runner "vibe_versions 9.9"'),
+    ('workers: 2\nrunners:\n  - suite: hpo_generank\n    runner: lirical\n    weight: 3', 'weight should be'),
+    ('runners:\n  - suite: vibe_versions\n    runner: "5.0"\n  - suite: vibe_versions\n    runner: "5.0"',
+     'is used multiple times'),
+    ('defaults:\n  timing: true\nrunners:\n  - suite: vibe_versions\n    runner: "5.0"',
+     'timing can not be used within a campaign'),
+    ('runners:\n  - suite: hpo_generank\n    runner: lirical\n    args:\n      memory_limit: 4096',
+     'runner 1: memory_limit can not be used'),
+])
+def test_read_manifest_errors(tmp_path, manifest, message):
+    (tmp_path / 'manifest.yaml').write_text(manifest)
+
+    with pytest.raises(ValueError, match=message):
+        campaign.read_manifest(str(tmp_path / 'manifest.yaml'))
+
+
+def test_campaign_parser_adds_settings():
+    parser = campaign.CampaignParser(['vibe_versions', '--max_workers', '2'], {'pool_weight': 3})
+    parser.add_argument('--max_workers', type=int)
+
+    args = parser.parse_args()
+
+    assert (args.suite, args.max_workers, args.pool_weight) == ('vibe_versions', 2, 3)
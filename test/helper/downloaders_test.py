@@ -0,0 +1,162 @@
+#!/user/bin/env python3
+
+import io
+import tarfile
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Lock
+from threading import Thread
+from time import sleep
+import pytest
+from biobesu.helper import downloaders
+
+
+class StandInHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the files of a directory slowly (so downloads overlap) & tracks the highest number of simultaneous requests.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    lock = Lock()
+    active = 0
+    max_active = 0
+    connections = set()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+            cls.connections.add(self.client_address)
+        try:
+            sleep(0.1)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    served_dir = tmp_path / 'served'
+    served_dir.mkdir()
+    StandInHandler.max_active = 0
+    StandInHandler.connections = set()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), lambda *args: StandInHandler(*args, directory=str(served_dir)))
+    httpd.daemon_threads = True
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    yield served_dir, f'http://127.0.0.1:{httpd.server_address[1]}/'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_resources(tmp_path, server):
+    served_dir, url = server
+    for i in range(6):
+        (served_dir / f'file_{i}.tsv').write_bytes(f'file {i}\n'.encode() * 1000)
+    resources = [downloaders.Resource(f'{url}file_{i}.tsv', str(tmp_path / 'out' / f'file_{i}.tsv'))
+                 for i in range(6)]
+
+    progress = downloaders.fetch_resources(resources, workers=4, per_host=2, stream=io.StringIO())
+
+    for i in range(6):
+        assert (tmp_path / 'out' / f'file_{i}.tsv').read_bytes() == (served_dir / f'file_{i}.tsv').read_bytes()
+    assert progress.done == 6
+    assert progress.bytes == 6 * 7000
+    # Concurrent, but limited per host.
+    assert StandInHandler.max_active == 2
+    # Connections are reused by the shared session.
+    assert len(StandInHandler.connections) <= 2
+    assert 'Fetched 6 resource(s) (0 already present)' in progress.summary()
+
+
+def test_fetch_resources_skips_present(tmp_path, server):
+    served_dir, url = server
+    (served_dir / 'hp.obo').write_text('new')
+    (tmp_path / 'hp.obo').write_text('present')
+
+    progress = downloaders.fetch_resources([downloaders.Resource(f'{url}hp.obo', str(tmp_path / 'hp.obo'))],
+                                           stream=io.StringIO())
+
+    assert (tmp_path / 'hp.obo').read_text() == 'present'
+    assert progress.skipped == 1
+
+
+def test_fetch_resources_extracts_archive(tmp_path, server):
+    served_dir, url = server
+    with tarfile.open(served_dir / 'data.tar.gz', 'w:gz') as archive:
+        content = b'hdt'
+        info = tarfile.TarInfo('vibe.hdt')
+        info.size = len(content)
+        archive.addfile(info, io.BytesIO(content))
+
+    downloaders.fetch_resources([downloaders.Resource(f'{url}data.tar.gz', str(tmp_path / 'vibe') + '/', True)],
+                                stream=io.StringIO())
+
+    assert (tmp_path / 'vibe' / 'vibe.hdt').read_bytes() == b'hdt'
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['served', 'vibe']
+
+
+def test_fetch_resources_extracts_into_existing_dir(tmp_path, server):
+    served_dir, url = server
+    with tarfile.open(served_dir / 'data.tar.gz', 'w:gz') as archive:
+        content = b'hdt'
+        info = tarfile.TarInfo('vibe.hdt')
+        info.size = len(content)
+        archive.addfile(info, io.BytesIO(content))
+    (tmp_path / 'vibe').mkdir()
+    (tmp_path / 'vibe' / 'other.txt').write_text('present')
+    resource = downloaders.Resource(f'{url}data.tar.gz', str(tmp_path / 'vibe') + '/', True)
+
+    progress = downloaders.fetch_resources([resource], stream=io.StringIO())
+    # Only skipped once fully extracted.
+    progress_again = downloaders.fetch_resources([resource], stream=io.StringIO())
+
+    assert (tmp_path / 'vibe' / 'vibe.hdt').read_bytes() == b'hdt'
+    assert sorted(path.name for path in (tmp_path / 'vibe').iterdir()) == ['.fetched-data.tar.gz', 'other.txt',
+                                                                           'vibe.hdt']
+    assert (progress.skipped, progress_again.skipped) == (0, 1)
+
+
+def test_fetch_resources_failure_leaves_no_output(tmp_path, server):
+    served_dir, url = server
+    (served_dir / 'present.tsv').write_text('data')
+    resources = [downloaders.Resource(f'{url}missing.tsv', str(tmp_path / 'missing.tsv')),
+                 downloaders.Resource(f'{url}present.tsv', str(tmp_path / 'present.tsv'))]
+
+    with pytest.raises(OSError):
+        downloaders.fetch_resources(resources, workers=1, stream=io.StringIO())
+    # The failed download is not left behind & the remaining downloads are not started.
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['served']
+
+
+def test_unsupported_archive():
+    with pytest.raises(ValueError):
+        downloaders.Resource('http://localhost/data.zip', 'data/', extract=True)
+
+
+def test_read_resources(tmp_path):
+    (tmp_path / 'resources.yaml').write_text('resources:\n'
+                                             '  - url: http://localhost/hp.obo\n'
+                                             '    output: data/hp.obo\n'
+                                             '  - url: http://localhost/vibe.tar.gz\n'
+                                             '    output: data/vibe/\n'
+                                             '    extract: true\n')
+
+    resources = downloaders.read_resources(str(tmp_path / 'resources.yaml'))
+
+    assert [(resource.url, resource.output_file, resource.extract) for resource in resources] == \
+           [('http://localhost/hp.obo', 'data/hp.obo', False), ('http://localhost/vibe.tar.gz', 'data/vibe/', True)]
+    assert resources[0].host == 'localhost'
+
+
+def test_read_resources_duplicate_output(tmp_path):
+    (tmp_path / 'resources.yaml').write_text('resources:\n'
+                                             '  - {url: http://localhost/a, output: data/a}\n'
+                                             '  - {url: http://localhost/b, output: data/a}\n')
+
+    with pytest.raises(ValueError):
+        downloaders.read_resources(str(tmp_path / 'resources.yaml'))
@@ -0,0 +1,49 @@
+#!/user/bin/env python3
+
+from biobesu.helper.evaluation import bootstrap_metrics
+from biobesu.helper.evaluation import metric_names
+from biobesu.helper.evaluation import metrics
+from biobesu.helper.evaluation import paired_permutation_test
+from biobesu.helper.evaluation import ranks
+import numpy as np
+
+
+def test_ranks():
+    expected_genes = {'1': 'A', '2': 'B', '3': 'C'}
+    results = {'1': ['X', 'A'], '2': ['Y']}
+
+    actual_output = ranks(expected_genes, results, ['1', '2', '3'])
+
+    assert actual_output.tolist() == [2, np.inf, np.inf]
+
+
+def test_metrics():
+    case_ranks = np.array([1, 3, 10, np.inf])
+
+    actual_output = metrics(case_ranks, [1, 5])
+
+    assert metric_names([1, 5]) == ['recall@1', 'recall@5', 'mean_rank']
+    assert actual_output.tolist() == [0.25, 0.5, 14 / 3]
+
+
+def test_bootstrap_metrics_contains_estimate_and_is_independent_of_workers():
+    case_ranks = np.random.default_rng(1).integers(1, 20, size=200).astype(float)
+    case_ranks[::4] = np.inf
+
+    actual_output = bootstrap_metrics(case_ranks, [1, 10], resamples=600, seed=2)
+
+    for estimate, lower, upper in actual_output:
+        assert lower <= estimate <= upper
+    assert np.array_equal(actual_output, bootstrap_metrics(case_ranks, [1, 10], resamples=600, seed=2, workers=2))
+
+
+def test_paired_permutation_test():
+    case_ranks = np.arange(1, 101, dtype=float)
+    better_ranks = np.maximum(case_ranks - 20, 1)
+
+    identical = paired_permutation_test(case_ranks, case_ranks, [10], permutations=500)
+    different = paired_permutation_test(case_ranks, better_ranks, [10], permutations=500)
+
+    assert [(difference, p_value) for difference, p_value, cases in identical] == [(0, 1), (0, 1)]
+    assert different[0][0] < 0 and different[0][1] < 0.01
+    assert different[1][0] > 0 and different[1][1] < 0.01 and different[1][2] == 100
@@ -0,0 +1,61 @@
+#!/user/bin/env python3
+
+from io import StringIO
+from os import chmod
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import CaseExecutor
+from biobesu.helper.progress import ProgressReporter
+
+# Stand-in for java: prints its arguments & fails if the jar is named "fail.jar".
+JAVA_STAND_IN = """#!/bin/sh
+echo "stdout $@"
+echo "stderr $@" >&2
+[ "$2" != "fail.jar" ]
+"""
+
+
+def create_java_stand_in(tmp_path):
+    java = str(tmp_path / 'java')
+    with open(java, 'w') as file_writer:
+        file_writer.write(JAVA_STAND_IN)
+    chmod(java, 0o755)
+    return java
+
+
+def test_executor_writes_log_per_case(tmp_path):
+    executor = CaseExecutor(create_java_stand_in(tmp_path), str(tmp_path) + '/', max_workers=2)
+
+    results = executor.run([Case('01', 'tool.jar', '-p HP:0000001'), Case('02', 'fail.jar', '-p HP:0000002'),
+                            Case('03', 'tool.jar', '-p HP:0000003')])
+
+    assert {result.case.case_id: result.return_code for result in results} == {'01': 0, '02': 1, '03': 0}
+    with open(tmp_path / '02.log') as file_reader:
+        assert file_reader.read() == 'stdout -jar fail.jar -p HP:0000002\nstderr -jar fail.jar -p HP:0000002\n'
+
+
+def test_progress_reporter_counts(tmp_path):
+    stream = StringIO()
+    progress = ProgressReporter(3, skipped=1, stream=stream)
+    executor = CaseExecutor(create_java_stand_in(tmp_path), str(tmp_path) + '/', listeners=[progress])
+
+    executor.run([Case('01', 'tool.jar', ''), Case('02', 'fail.jar', ''), Case('03', 'tool.jar', '')])
+    actual_output = progress.progress()
+
+    assert (actual_output['done'], actual_output['failed'], actual_output['remaining'], actual_output['skipped'],
+            actual_output['running'], actual_output['last_case']) == (3, 1, 0, 1, 0, '03')
+    # Initial line + a line per finished case.
+    assert len(stream.getvalue().splitlines()) == 4
+
+
+
+def test_executor_wall_time_is_taken_at_exit(tmp_path):
+    java = str(tmp_path / 'sleep')
+    with open(java, 'w') as file_writer:
+        file_writer.write('#!/bin/sh\nsleep 0.05\n')
+    chmod(java, 0o755)
+    executor = CaseExecutor(java, str(tmp_path) + '/', max_workers=2)
+
+    results = executor.run([Case(f'{i:02}', 'tool.jar', '') for i in range(4)])
+
+    # Not rounded up to the interval at which pending cases are started.
+    assert all(0.05 <= result.wall_time < 0.09 for result in results), [result.wall_time for result in results]
@@ -0,0 +1,50 @@
+#!/user/bin/env python3
+
+from biobesu.helper import fake_tools
+from biobesu.helper import gc_log
+
+
+def test_fake_vibe_writes_output(tmp_path):
+    output_file = str(tmp_path / '01.tsv')
+
+    exit_code = fake_tools.run(['--genes', '50', '--vibe_genes', '10', '-Xmx1g', '-jar',
+                                '/path/to/vibe-with-dependencies-5.0.3.jar', '-l', '-p', 'HP:0000001', '-p',
+                                'HP:0000002', '-t', 'vibe.hdt', '-o', output_file, '-w', 'hp.owl'])
+
+    with open(output_file) as file_reader:
+        genes = file_reader.readline().split(',')
+    assert exit_code == 0
+    assert len(genes) == 10
+    assert all(1 <= int(gene) <= 50 for gene in genes)
+
+
+def test_fake_lirical_writes_output(tmp_path):
+    exit_code = fake_tools.run(['--lirical_rows', '20', '-jar', 'LIRICAL.jar', 'phenopacket', '-p', '01.json',
+                                '-o', str(tmp_path), '-x', '01', '-d', 'data', '--tsv'])
+
+    with open(tmp_path / '01.tsv') as file_reader:
+        lines = file_reader.readlines()
+    assert exit_code == 0
+    # 2 LIRICAL lines + header + rows.
+    assert len(lines) == 23
+
+
+def test_fake_tool_failure(tmp_path):
+    exit_code = fake_tools.run(['--failure_rate', '1', '-jar', 'LIRICAL.jar', 'phenopacket', '-p', '01.json',
+                                '-o', str(tmp_path), '-x', '01', '-d', 'data', '--tsv'])
+
+    assert exit_code == 1
+    assert not (tmp_path / '01.tsv').exists()
+
+
+def test_fake_tool_writes_gc_log(tmp_path):
+    gc_log_file = str(tmp_path / '01.gc.log')
+
+    exit_code = fake_tools.run(gc_log.jvm_options(gc_log_file) + ['-jar', 'LIRICAL.jar', 'phenopacket', '-p',
+                                                                  '01.json', '-o', str(tmp_path), '-x', '01', '-d',
+                                                                  'data', '--tsv'])
+
+    summary = gc_log.GcSummary.read(gc_log_file)
+    assert exit_code == 0
+    assert summary.gc_pauses > 0
+    assert 0 < summary.gc_pause_time < summary.safepoint_time
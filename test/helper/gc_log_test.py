@@ -0,0 +1,63 @@
+#!/user/bin/env python3
+
+import pytest
+from biobesu.helper import gc_log
+
+JDK17_G1 = '''[0.004s][info][gc] Using G1
+[0.010s][info][gc,init] Heap Max Capacity: 1G
+[0.500s][info][gc,start    ] GC(0) Pause Young (Normal) (G1 Evacuation Pause)
+[0.503s][info][gc,heap     ] GC(0) Eden regions: 24->0(20)
+[0.503s][info][gc          ] GC(0) Pause Young (Normal) (G1 Evacuation Pause) 24M->4M(256M) 3.000ms
+[0.503s][info][safepoint   ] Safepoint "G1CollectForAllocation", Time since last: 490000000 ns, Reaching safepoint: 100000 ns, At safepoint: 3000000 ns, Total: 3100000 ns
+[1.000s][info][gc          ] GC(1) Pause Young (Normal) (G1 Evacuation Pause) 1G->24M(1G) 7.000ms
+[1.200s][info][gc          ] GC(2) Pause Remark 30M->30M(1G) 1.000ms
+[1.300s][info][safepoint   ] Safepoint "Cleanup", Time since last: 1000 ns, Reaching safepoint: 1000 ns, At safepoint: 1000 ns, Total: 2000 ns
+'''
+
+JDK11 = '''[0.200s][info][gc] GC(0) Pause Young (Allocation Failure) 512K->128K(1024K) 0.500ms
+[0.201s][info][safepoint] Total time for which application threads were stopped: 0.0010000 seconds, Stopping threads took: 0.0000100 seconds
+'''
+
+ZGC = '''[1.000s][info][gc,phases] GC(0) Pause Mark Start 0.020ms
+[1.001s][info][gc,phases] GC(0) Pause Mark End 0.030ms
+[1.002s][info][gc] GC(0) Garbage Collection (Warmup) 80M(8%)->20M(2%)
+'''
+
+
+def read(tmp_path, log):
+    (tmp_path / 'case.gc.log').write_text(log)
+    return gc_log.GcSummary.read(str(tmp_path / 'case.gc.log'))
+
+
+def test_read_jdk17_g1(tmp_path):
+    summary = read(tmp_path, JDK17_G1)
+
+    assert summary.gc_pauses == 3
+    assert summary.gc_pause_time == pytest.approx(0.011)
+    assert summary.max_heap_used == 1024
+    # 24 + (1024 - 4) + (30 - 24) MB allocated till the last collection.
+    assert summary.allocation_rate == pytest.approx(1050 / 1.2)
+    assert summary.safepoint_time == pytest.approx(0.003102)
+    assert summary.values() == [summary.gc_pause_time, 3, 1024, summary.allocation_rate, summary.safepoint_time]
+
+
+def test_read_jdk11(tmp_path):
+    summary = read(tmp_path, JDK11)
+
+    assert summary.gc_pauses == 1
+    assert summary.max_heap_used == pytest.approx(0.5)
+    assert summary.safepoint_time == pytest.approx(0.001)
+
+
+def test_read_zgc(tmp_path):
+    summary = read(tmp_path, ZGC)
+
+    # Only the pauses (the heap sizes are not part of the pause lines).
+    assert summary.gc_pauses == 2
+    assert summary.gc_pause_time == pytest.approx(0.00005)
+    assert summary.max_heap_used == 0 and summary.allocation_rate == 0
+
+
+def test_jvm_options():
+    assert gc_log.jvm_options('/logs/01.gc.log') == [
+        '-Xlog:gc*,safepoint:file=/logs/01.gc.log:uptime,level,tags:filecount=0']
@@ -0,0 +1,75 @@
+#!/user/bin/env python3
+
+from argparse import Namespace
+from time import sleep
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import CaseResult
+from biobesu.helper.metrics import Histogram
+from biobesu.helper.metrics import MetricsExporter
+from biobesu.helper.metrics import current_exporter
+from biobesu.helper.metrics import escape
+from biobesu.helper.metrics import start_metrics
+
+
+def test_histogram_is_cumulative():
+    histogram = Histogram([1, 5])
+    for value in [0.5, 2, 10]:
+        histogram.observe(value)
+
+    assert histogram.lines('x', 'a="b"') == ['x_bucket{a="b",le="1"} 1', 'x_bucket{a="b",le="5"} 2',
+                                             'x_bucket{a="b",le="+Inf"} 3', 'x_sum{a="b"} 12.5',
+                                             'x_count{a="b"} 3']
+
+
+def test_escape():
+    assert escape('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+def test_exporter_writes_counters(tmp_path):
+    metrics_file = str(tmp_path / 'biobesu.prom')
+    exporter = MetricsExporter(metrics_file, {'suite': 'vibe_versions', 'runner': '5.0'}, interval=3600)
+    cases = [Case('1', 'tool.jar', ''), Case('2', 'tool.jar', '')]
+
+    for case in cases:
+        exporter.case_started(case)
+    exporter.case_finished(CaseResult(cases[0], 0, 1.5, '', cpu_time=1.0, peak_memory=100))
+    exporter.case_finished(CaseResult(cases[1], 1, 0.5, ''))
+    exporter.cases_skipped(3)
+    exporter.cache_finished(1, 3)
+    exporter.stage_finished('run vibe', 2.0)
+    exporter.run_finished()
+
+    lines = open(metrics_file).read().splitlines()
+    labels = 'suite="vibe_versions",runner="5.0"'
+    for expected in [f'biobesu_cases_started_total{{{labels}}} 2', f'biobesu_cases_completed_total{{{labels}}} 1',
+                     f'biobesu_cases_failed_total{{{labels}}} 1', f'biobesu_cases_skipped_total{{{labels}}} 3',
+                     f'biobesu_cases_running{{{labels}}} 0', f'biobesu_case_wall_seconds_count{{{labels}}} 2',
+                     f'biobesu_cache_hit_ratio{{{labels}}} 0.25',
+                     f'biobesu_stage_duration_seconds{{{labels},stage="run vibe"}} 2.0',
+                     '# TYPE biobesu_case_peak_rss_bytes histogram']:
+        assert expected in lines
+    assert not (tmp_path / 'biobesu.prom.tmp').exists()
+
+
+def test_exporter_writes_while_cases_run(tmp_path):
+    metrics_file = tmp_path / 'biobesu.prom'
+    exporter = MetricsExporter(str(metrics_file), {'suite': 'vibe_versions'}, interval=0.05)
+
+    exporter.case_started(Case('1', 'tool.jar', ''))
+    metrics_file.unlink()
+    # Written again without any case starting or finishing.
+    sleep(0.3)
+
+    assert 'biobesu_cases_running{suite="vibe_versions"} 1' in metrics_file.read_text().splitlines()
+
+
+def test_start_metrics(tmp_path):
+    assert start_metrics(Namespace(metrics_file=None), 'suite', 'runner', '1.0') is None
+    assert current_exporter() is None
+
+    exporter = start_metrics(Namespace(metrics_file=str(tmp_path / 'biobesu.prom'), metrics_interval=15),
+                             'suite', 'runner', '1.0')
+    assert current_exporter() is exporter
+    assert (tmp_path / 'biobesu.prom').exists()
+
+    start_metrics(Namespace(metrics_file=None), 'suite', 'runner', '1.0')
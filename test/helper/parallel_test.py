@@ -0,0 +1,39 @@
+#!/user/bin/env python3
+
+from os import getpid
+from time import sleep
+from biobesu.helper.parallel import chunks
+from biobesu.helper.parallel import ordered_map
+
+
+def slow_square(value):
+    # Earlier values take longer, so later results finish first.
+    sleep((10 - value) * 0.01)
+    return value * value, getpid()
+
+
+def test_chunks():
+    assert list(chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunks([], 3)) == []
+
+
+def test_chunks_is_lazy():
+    def items():
+        yield 1
+        raise AssertionError('read beyond the first chunk')
+
+    assert next(chunks(items(), 1)) == [1]
+
+
+def test_ordered_map_within_process():
+    results = list(ordered_map(slow_square, ((value,) for value in range(5))))
+
+    assert [square for square, pid in results] == [0, 1, 4, 9, 16]
+    assert {pid for square, pid in results} == {getpid()}
+
+
+def test_ordered_map_preserves_order_across_workers():
+    results = list(ordered_map(slow_square, ((value,) for value in range(10)), workers=3))
+
+    assert [square for square, pid in results] == [value * value for value in range(10)]
+    assert getpid() not in {pid for square, pid in results}
@@ -0,0 +1,108 @@
+#!/user/bin/env python3
+
+import numpy as np
+import pytest
+from biobesu.helper import perfdiff
+
+
+def test_holm():
+    assert perfdiff.holm([0.01, 0.04, 0.03, 0.5]) == pytest.approx([0.04, 0.09, 0.09, 0.5])
+
+
+def test_benjamini_hochberg():
+    assert perfdiff.benjamini_hochberg([0.01, 0.04, 0.03, 0.5]) == pytest.approx([0.04, 0.04 * 4 / 3, 0.04 * 4 / 3,
+                                                                                   0.5])
+
+
+def test_sign_flip_test():
+    assert perfdiff.sign_flip_test(np.full(20, 0.5), 2000) < 0.01
+    assert perfdiff.sign_flip_test(np.full(20, -0.5), 2000) == 1
+    # Deterministic for a seed.
+    differences = np.linspace(-1, 2, 20)
+    assert perfdiff.sign_flip_test(differences, 2000, seed=1) == perfdiff.sign_flip_test(differences, 2000, seed=1)
+
+
+def test_two_sample_tests():
+    p_values = perfdiff.two_sample_tests([[1, 2, 3], [1, 2, 3], [1, 2]], [[4, 5, 6], [1, 2, 3], [3, 4]])
+
+    # Exact: the observed division is the most extreme of the 20 (or 6) possible ones.
+    assert p_values[0] == pytest.approx(1 / 20)
+    assert p_values[1] > 0.5
+    assert p_values[2] == pytest.approx(1 / 6)
+
+
+def test_two_sample_tests_random():
+    # More possible divisions (184756) than permutations.
+    p_values = perfdiff.two_sample_tests([list(range(10))], [list(range(10, 20))], permutations=1000)
+
+    assert p_values[0] == pytest.approx(1 / 1001)
+
+
+def write_run(run_dir, resources, samples=None):
+    run_dir.mkdir()
+    (run_dir / 'resources.tsv').write_text('id\treturn_code\twall_time\tcpu_time\tpeak_memory\n' + ''.join(
+        f'{case_id}\t{return_code}\t{wall_time}\t{wall_time / 2}\t100\n'
+        for case_id, return_code, wall_time in resources))
+    if samples is not None:
+        (run_dir / 'timing_samples.tsv').write_text('id\trepetition\twarmup\treturn_code\ttime (in seconds)\n' + ''.join(
+            f'{case_id}\t{i}\tFalse\t0\t{time}\n' for case_id, times in samples.items()
+            for i, time in enumerate(times, start=1)))
+    return str(run_dir) + '/'
+
+
+def test_read(tmp_path):
+    run_dir = write_run(tmp_path / 'run', [('1', 0, 2.0), ('2', 1, 5.0), ('1', 0, 3.0)], {'3': [1.0, 4.0, 2.0]})
+
+    measurements = perfdiff.RunMeasurements.read(run_dir)
+
+    # Failed runs are left out & the last run of a case is used (or the median of its repetitions).
+    assert measurements.values['wall_time'] == {'1': 3.0, '3': 2.0}
+    assert measurements.values['cpu_time'] == {'1': 1.5}
+    assert measurements.samples == {'3': [1.0, 4.0, 2.0]}
+
+
+def test_read_gc_columns(tmp_path):
+    (tmp_path / 'resources.tsv').write_text(
+        'id\treturn_code\twall_time\tcpu_time\tpeak_memory\tgc_pause_time\tgc_pauses\tmax_heap_used\t'
+        'allocation_rate\tsafepoint_time\n1\t0\t2.0\t1.0\t100\t0.5\t3\t256\t10\t0.6\n'
+        '2\t0\t3.0\t1.0\t100\t\t\t\t\t\n')
+
+    measurements = perfdiff.RunMeasurements.read(str(tmp_path) + '/')
+
+    # Cases without a GC log have no GC values.
+    assert measurements.values['wall_time'] == {'1': 2.0, '2': 3.0}
+    assert measurements.values['gc_pause_time'] == {'1': 0.5}
+    assert measurements.values['max_heap_used'] == {'1': 256.0}
+
+
+def test_read_times_only(tmp_path):
+    (tmp_path / 'times.tsv').write_text('id\ttime (in seconds)\n1\t2.0\n')
+
+    assert perfdiff.RunMeasurements.read(str(tmp_path) + '/').values['wall_time'] == {'1': 2.0}
+    with pytest.raises(OSError):
+        perfdiff.RunMeasurements.read(str(tmp_path / 'missing') + '/')
+
+
+def test_compare_runs(tmp_path):
+    # Cases 00-19 have 1 term & cases 20-39 have 6 terms, of which only the latter are 50% slower.
+    hpo_dict = {f'{i:02}': ['HP:0000001'] * (1 if i < 20 else 6) for i in range(40)}
+    baseline = perfdiff.RunMeasurements.read(write_run(
+        tmp_path / 'baseline', [(case_id, 0, 1.0 + i / 100) for i, case_id in enumerate(hpo_dict)],
+        {'20': [1.0, 1.1, 0.9, 1.0, 1.05, 0.95], '00': [1.0, 1.1, 0.9, 1.0, 1.05, 0.95]}))
+    candidate = perfdiff.RunMeasurements.read(write_run(
+        tmp_path / 'candidate', [(case_id, 0, (1.0 + i / 100) * (1.5 if i >= 20 else 1)) for i, case_id
+                                 in enumerate(hpo_dict)],
+        {'20': [1.5, 1.6, 1.4, 1.5, 1.55, 1.45], '00': [1.0, 1.1, 0.9, 1.0, 1.05, 0.95]}))
+
+    stratum_rows, case_rows = perfdiff.compare_runs(baseline, candidate, hpo_dict, threshold=0.1, permutations=2000)
+
+    regressed = {(stratum, metric) for stratum, metric, cases, ratio, p_value, p_adjusted, flag in stratum_rows if flag}
+    assert regressed == {('all', 'wall_time'), ('5-7', 'wall_time'), ('all', 'cpu_time'), ('5-7', 'cpu_time')}
+    rows = {row[0]: row for row in case_rows}
+    assert rows['20'][5:] == (6, pytest.approx(1 / 924), pytest.approx(2 / 924), True)
+    assert rows['00'][-1] is False
+    # Without repetitions, cases are not tested.
+    assert rows['39'][4] == pytest.approx(1.5) and rows['39'][6:] == (None, None, False)
+
+    perfdiff.write_report(stratum_rows, case_rows, str(tmp_path) + '/')
+    assert (tmp_path / 'perfdiff_cases.tsv').read_text().count('\n') == 41
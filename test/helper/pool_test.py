@@ -0,0 +1,30 @@
+#!/user/bin/env python3
+
+from biobesu.helper.pool import WorkerPool
+
+
+def test_pool_serves_waiting_executors_in_order():
+    pool = WorkerPool(3)
+    light, heavy = object(), object()
+
+    assert pool.try_acquire(light, 1) and pool.try_acquire(light, 1)
+    # The heavy executor does not fit & waits, so the light one can not take the freed slot first.
+    assert not pool.try_acquire(heavy, 2)
+    pool.release(1)
+    assert not pool.try_acquire(light, 1)
+    assert pool.try_acquire(heavy, 2)
+    assert (pool.used, pool.waiting) == (3, [light])
+
+
+def test_pool_withdraw():
+    pool = WorkerPool(2)
+    first, second = object(), object()
+
+    assert pool.try_acquire(first, 2)
+    assert not pool.try_acquire(second, 1)
+    pool.withdraw(second)
+    pool.release(2)
+
+    # Weights above the number of slots are limited to it.
+    assert pool.try_acquire(first, 5)
+    assert (pool.used, pool.waiting) == (2, [])
@@ -0,0 +1,61 @@
+#!/user/bin/env python3
+
+from biobesu.helper import preflight
+from biobesu.helper.error import BenchmarkInputError
+import pytest
+
+
+def write_benchmark(tmp_path, lines, header='id\tgene_symbol\thpo_ids'):
+    benchmark_file = tmp_path / 'benchmark.tsv'
+    benchmark_file.write_text('\n'.join([header] + lines) + '\n')
+    return str(benchmark_file)
+
+
+def test_check_benchmark_reports_all_problems(tmp_path):
+    benchmark_file = write_benchmark(tmp_path, [
+        '1\tA1BG\tHP:0000001,HP:0000002',
+        '2\tUNKNOWN\tHP:0000001,HP:9999999',
+        '1\tA1BG\tHP:1',
+        '3\tA1BG',
+        '\tA1BG\t'
+    ])
+
+    actual_output = preflight.check_benchmark(benchmark_file, hpo_ids={'HP:0000001', 'HP:0000002'},
+                                              gene_symbols={'A1BG'})
+
+    assert actual_output == ['line 3: gene_symbol "UNKNOWN" can not be resolved',
+                             'line 3: HPO ID "HP:9999999" is not present in the ontology',
+                             'line 4: invalid HPO ID "HP:1"',
+                             'line 4: duplicate id "1" (first used on line 2)',
+                             'line 5: expected 3 columns but found 2',
+                             'line 6: empty id',
+                             'line 6: no HPO IDs']
+
+
+def test_check_benchmark_header(tmp_path):
+    benchmark_file = write_benchmark(tmp_path, ['1\t1\tHP:0000001', '2\tA1BG\tHP:0000001'],
+                                     header='id\tgene_id\thpo_ids')
+
+    assert preflight.check_benchmark(benchmark_file) == ['line 3: invalid gene_id "A1BG"']
+    assert preflight.check_benchmark(write_benchmark(tmp_path, [], header='id\tgene'))[0].startswith(
+        'line 1: unexpected header')
+
+
+def test_check_benchmark_parallel_equals_sequential(tmp_path, monkeypatch):
+    lines = [f'{i % 150}\tA1BG\tHP:{i:07d}' for i in range(200)]
+    benchmark_file = write_benchmark(tmp_path, lines)
+    expected_output = preflight.check_benchmark(benchmark_file, hpo_ids={f'HP:{i:07d}' for i in range(180)})
+
+    monkeypatch.setattr(preflight, 'PARALLEL_MINIMUM_SIZE', 0)
+    actual_output = preflight.check_benchmark(benchmark_file, hpo_ids={f'HP:{i:07d}' for i in range(180)}, workers=3)
+
+    assert actual_output == expected_output
+    assert len(actual_output) == 70
+
+
+def test_validate_benchmark(tmp_path):
+    benchmark_file = write_benchmark(tmp_path, ['1\tA1BG\tHP:0000001', '1\tA1BG\tHP:0000001'])
+
+    with pytest.raises(BenchmarkInputError) as e:
+        preflight.validate_benchmark(benchmark_file)
+    assert e.value.problems == ['line 3: duplicate id "1" (first used on line 2)']
@@ -0,0 +1,46 @@
+#!/user/bin/env python3
+
+from biobesu.helper.repeats import RepetitionCase
+from biobesu.helper.repeats import SAMPLES_HEADER
+from biobesu.helper.repeats import read_samples
+from biobesu.helper.repeats import repetition_cases
+from biobesu.helper.repeats import write_summary
+
+
+def create_case(run_id, repetition, warmup):
+    return RepetitionCase(run_id, repetition, warmup, 'tool.jar', '')
+
+
+def test_read_samples_ignores_warmup(tmp_path):
+    samples_file = str(tmp_path / 'samples.tsv')
+    with open(samples_file, 'w') as file_writer:
+        file_writer.write(SAMPLES_HEADER + '01\t1\tTrue\t0\t9.0\n01\t1\tFalse\t0\t1.0\n01\t2\tFalse\t1\t2.0\n')
+
+    assert read_samples(samples_file) == {'01': (2, [1.0])}
+
+
+def test_repetition_cases_resumes():
+    rounds = repetition_cases(create_case, ['01', '02'], 3, 1, {'01': (3, [1.0, 1.0, 1.0]), '02': (1, [1.0])})
+
+    assert [[case.case_id for case in cases] for cases in rounds] == [['02.warmup1'], ['02.repeat2'], ['02.repeat3']]
+
+
+def test_repetition_cases_runs_case_once_per_round():
+    rounds = repetition_cases(create_case, ['01', '02'], 2, 1, {'02': (1, [1.0])})
+
+    # The warm-up of a case is in an earlier round than its repetitions.
+    assert [[case.case_id for case in cases] for cases in rounds] == [['01.warmup1', '02.warmup1'],
+                                                                      ['01.repeat1', '02.repeat2'], ['01.repeat2']]
+
+
+def test_write_summary(tmp_path):
+    summary_file = str(tmp_path / 'summary.tsv')
+
+    write_summary({'01': (3, [1.0, 2.0, 3.0]), '02': (1, [])}, summary_file)
+
+    with open(summary_file) as file_reader:
+        lines = [line.rstrip('\n').split('\t') for line in file_reader]
+    assert lines[0] == ['id', 'n', 'median', 'q1', 'q3', 'iqr', 'ci_lower', 'ci_upper']
+    assert lines[1][:6] == ['01', '3', '2.0', '1.5', '2.5', '1.0']
+    assert lines[2] == ['02', '0', '', '', '', '', '', '']
+    assert lines[3][:3] == ['overall', '1', '2.0']
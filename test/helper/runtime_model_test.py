@@ -0,0 +1,95 @@
+#!/user/bin/env python3
+
+from argparse import Namespace
+from math import log
+import pytest
+from biobesu.helper import runtime_model
+
+
+def create_benchmark():
+    # Case i has i + 1 terms, of which the first is used by all cases & the others only by this case.
+    return {f'{i:02}': ['HP:0000001'] + [f'HP:{i:02}{term:05}' for term in range(i)] for i in range(10)}
+
+
+def test_term_specificity():
+    specificity = runtime_model.term_specificity({'1': ['A', 'B'], '2': ['A'], '3': ['A', 'C'], '4': ['C']})
+
+    assert specificity == {'A': pytest.approx(-log(3 / 4)), 'B': pytest.approx(log(4)), 'C': pytest.approx(log(2))}
+
+
+def test_read_times(tmp_path):
+    runner_times = tmp_path / 'times.tsv'
+    runner_times.write_text('id\ttime (in seconds)\n1\t2.0\n2\t4.0\n1\t4.0\n2\t')
+    compare_times = tmp_path / 'compare_times.tsv'
+    compare_times.write_text('id\tversion\tposition\treturn_code\ttime (in seconds)\n'
+                             '3\ta\t1\t0\t1.0\n3\tb\t2\t0\t3.0\n4\ta\t1\t1\t9.0\n')
+
+    # The incomplete last line & failed compare runs are ignored.
+    assert runtime_model.read_times([str(runner_times), str(compare_times)]) == {'1': 3.0, '2': 4.0, '3': 2.0}
+
+
+def test_fit_and_predict():
+    hpo_dict = create_benchmark()
+    times = {case_id: 0.5 + 2 * len(hpo_ids) for case_id, hpo_ids in hpo_dict.items() if case_id != '09'}
+
+    model = runtime_model.RuntimeModel.fit(hpo_dict, times)
+
+    assert model.samples == 9
+    assert model.r_squared == pytest.approx(1)
+    # Also predicts cases without a time.
+    assert model.predict(hpo_dict['09']) == pytest.approx(20.5)
+    # Never negative.
+    model.coefficients[:] = [-10, 0, 0]
+    assert model.predict(hpo_dict['09']) == 0
+
+
+def test_fit_without_times():
+    assert runtime_model.RuntimeModel.fit(create_benchmark(), {'unknown': 1.0}) is None
+
+
+def test_makespan():
+    assert runtime_model.makespan([1, 1, 1, 3], 2) == 4
+    # Longest first.
+    assert runtime_model.makespan([3, 1, 1, 1], 2) == 3
+    assert runtime_model.makespan([3, 1, 1, 1], 1) == 6
+    assert runtime_model.makespan([], 4) == 0
+
+
+def write_history(tmp_path, hpo_dict):
+    times_file = tmp_path / 'times.tsv'
+    times_file.write_text('id\ttime (in seconds)\n' +
+                          ''.join(f'{case_id}\t{len(hpo_ids)}\n' for case_id, hpo_ids in hpo_dict.items()))
+    return str(times_file)
+
+
+@pytest.mark.parametrize('schedule,expected', [('longest_first', ['09', '08', '07']), ('input', ['00', '01', '02'])])
+def test_scheduler_order(tmp_path, schedule, expected):
+    hpo_dict = create_benchmark()
+    args = Namespace(schedule=schedule, runtime_history=[write_history(tmp_path, hpo_dict)], max_workers=2)
+
+    scheduler = runtime_model.Scheduler(args, hpo_dict, str(tmp_path / 'missing.tsv'))
+
+    assert scheduler.order(list(hpo_dict))[:3] == expected
+    # Items with a case id (stable for items of the same case).
+    items = [(case_id, run) for case_id in hpo_dict for run in range(2)]
+    assert scheduler.order(items, lambda item: item[0])[:2] == [(expected[0], 0), (expected[0], 1)]
+
+
+def test_scheduler_uses_own_times(tmp_path):
+    hpo_dict = create_benchmark()
+    args = Namespace(schedule='longest_first', runtime_history=[], max_workers=2)
+
+    assert runtime_model.Scheduler(args, hpo_dict, str(tmp_path / 'missing.tsv')).model is None
+    assert runtime_model.Scheduler(args, hpo_dict, write_history(tmp_path, hpo_dict)).model.samples == 10
+
+
+def test_dry_run(tmp_path, capsys):
+    hpo_dict = create_benchmark()
+    args = Namespace(schedule='longest_first', runtime_history=[], max_workers=2)
+
+    # Case 02 is run twice (2, 3, 3 & 4 seconds).
+    runtime_model.Scheduler(args, hpo_dict, write_history(tmp_path, hpo_dict)).dry_run(['01', '02', '02', '03'])
+    output = capsys.readouterr().out
+    assert '4 run(s) to do, predicted total tool time 12.0s' in output
+    assert 'Predicted wall time on 2 worker(s) (input order): 7.0s' in output
+    assert 'Predicted wall time on 2 worker(s) (longest_first order): 6.0s' in output
@@ -0,0 +1,68 @@
+#!/user/bin/env python3
+
+import pytest
+import numpy as np
+from biobesu.helper import evaluation
+from biobesu.helper import sampling
+
+
+def create_benchmark():
+    # 60 cases with 1-2 terms (genes A-C), 30 cases with 5-7 terms (genes D-F) & 10 cases with 13+ terms (gene G).
+    hpo_dict = {}
+    genes = {}
+    for i in range(100):
+        size = 1 if i < 60 else 6 if i < 90 else 14
+        hpo_dict[f'{i:03}'] = [f'HP:{term:07}' for term in range(size)]
+        genes[f'{i:03}'] = 'ABC'[i % 3] if i < 60 else 'DEF'[i % 3] if i < 90 else 'G'
+    return hpo_dict, genes
+
+
+def test_size_stratum():
+    assert [sampling.size_stratum(size) for size in [1, 2, 3, 7, 12, 13, 40]] == \
+           ['1-2', '1-2', '3-4', '5-7', '8-12', '13+', '13+']
+
+
+def test_draw_sample():
+    hpo_dict, genes = create_benchmark()
+
+    sample = sampling.draw_sample(hpo_dict, 10, seed=1, genes=genes)
+
+    assert sample.counts == {'1-2': 6, '5-7': 3, '13+': 1}
+    assert sample.populations == {'1-2': 60, '5-7': 30, '13+': 10}
+    assert sample.case_ids == sorted(sample.case_ids)
+    # Spread over the genes within each stratum.
+    assert sorted(genes[case_id] for case_id in sample.case_ids) == list('AABBCCDEFG')
+    assert sample.weight(sample.case_ids[0]) == 10
+    # Deterministic for a seed.
+    assert sampling.draw_sample(hpo_dict, 10, seed=1, genes=genes).case_ids == sample.case_ids
+
+
+def test_draw_sample_covers_each_stratum():
+    hpo_dict, genes = create_benchmark()
+
+    sample = sampling.draw_sample(hpo_dict, 4, seed=0)
+
+    # Proportionally 2.4, 1.2 & 0.4 cases.
+    assert sample.counts == {'1-2': 2, '5-7': 1, '13+': 1}
+
+
+def test_estimate_weighs_strata():
+    hpo_dict, genes = create_benchmark()
+    sample = sampling.draw_sample(hpo_dict, 20, seed=0, genes=genes)
+    # Found at rank 1 for the small cases only.
+    ranks = {case_id: 1.0 if len(hpo_dict[case_id]) == 1 else np.inf for case_id in sample.case_ids}
+
+    actual_output = sample.estimate(ranks, lambda values, weights: evaluation.metrics(values, [1], weights))
+
+    # The stratum of the small cases contains 60% of the cases, however often it is sampled.
+    assert actual_output[0] == pytest.approx([0.6, 0.6, 0.6])
+    assert actual_output[1] == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_weighted_metrics():
+    case_ranks = np.array([1, 3, np.inf, 10])
+
+    actual_output = evaluation.metrics(case_ranks, [1, 5], np.array([3, 1, 1, 1]))
+
+    assert actual_output == pytest.approx([0.5, 4 / 6, (3 + 3 + 10) / 5])
+    assert evaluation.metrics(case_ranks, [1, 5], np.ones(4)) == pytest.approx(evaluation.metrics(case_ranks, [1, 5]))
@@ -0,0 +1,67 @@
+#!/user/bin/env python3
+
+from os import chmod
+from os import listdir
+from os import makedirs
+from os.path import exists
+from socket import gethostname
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import CaseExecutor
+from biobesu.helper.execution import ExecutionListener
+from biobesu.helper.scratch import ScratchSpace
+
+# Stand-in for java: writes the JVM tmpdir option to the output file given as last argument.
+JAVA_STAND_IN = """#!/bin/sh
+echo "$1" > "$4"
+"""
+
+
+class OutputReader(ExecutionListener):
+    def __init__(self):
+        self.outputs = {}
+
+    def case_finished(self, result):
+        with open(result.case.output_file) as file_reader:
+            self.outputs[result.case.case_id] = file_reader.read()
+
+
+def test_stale_scratch_spaces_are_removed(tmp_path):
+    # A process ID above the default maximum (so it cannot be running) & a process that is running.
+    stale = tmp_path / f'{ScratchSpace.PREFIX}{gethostname()}_4194305_abc'
+    running = tmp_path / f'{ScratchSpace.PREFIX}{gethostname()}_1_abc'
+    other_host = tmp_path / f'{ScratchSpace.PREFIX}other-host_4194305_abc'
+    for directory in [stale, running, other_host]:
+        makedirs(directory / 'cases')
+
+    with ScratchSpace(str(tmp_path)) as scratch:
+        own_directory = scratch.directory
+        actual_output = sorted(listdir(tmp_path))
+
+    assert actual_output == sorted([running.name, other_host.name, own_directory.rstrip('/').split('/')[-1]])
+    assert not exists(own_directory)
+
+
+def test_executor_validates_output_in_scratch(tmp_path):
+    java = str(tmp_path / 'java')
+    with open(java, 'w') as file_writer:
+        file_writer.write(JAVA_STAND_IN)
+    chmod(java, 0o755)
+
+    reader = OutputReader()
+    with ScratchSpace(str(tmp_path / 'scratch')) as scratch:
+        area = scratch.area()
+        tmp_dir = scratch.directory + 'cases/01/'
+        output_files = [f'{area}{case_id}.tsv' for case_id in ['01', '02']]
+        executor = CaseExecutor(java, str(tmp_path) + '/', listeners=[reader], scratch=scratch,
+                                validator=lambda output_file: 'invalid' if output_file.endswith('02.tsv') else None)
+        results = executor.run([Case('01', 'tool.jar', output_files[0], output_files[0]),
+                                Case('02', 'tool.jar', output_files[1], output_files[1])])
+
+        # Private directories & output that was not moved are removed once the cases are finished.
+        assert listdir(scratch.directory + 'cases/') == []
+        assert listdir(area) == []
+
+    assert reader.outputs['01'] == f'-Djava.io.tmpdir={tmp_dir}\n'
+    assert [(result.failed, result.problem) for result in results] == [(False, None), (True, 'invalid')]
+    with open(tmp_path / '02.log') as file_reader:
+        assert file_reader.read().endswith('Invalid output: invalid\n')
@@ -0,0 +1,63 @@
+#!/user/bin/env python3
+
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from biobesu.helper.converters import Converter
+from biobesu.helper.shared_tables import SharedTable
+from biobesu.helper.shared_tables import share_converter
+
+MAPPING = {'HP:0000002': 'Abnormality of body height', 'HP:0000001': 'All', 'ß': 'unicode', '': 'empty key'}
+
+
+class DictConverter(Converter):
+    def __init__(self):
+        self.names_by_id = dict(MAPPING)
+        self.nested = {'a': {'1': 'one'}, 'b': {}}
+        self.version = '2021-01-01'
+
+    def id_to_name(self, ids, include_na=False):
+        return self.key_to_value(ids, self.names_by_id, include_na)
+
+
+def convert_in_worker(converter):
+    return converter.id_to_name(['HP:0000001', 'HP:9999999'], include_na=True)
+
+
+@pytest.fixture
+def table():
+    table = SharedTable.create(MAPPING)
+    yield table
+    table.close()
+
+
+def test_lookup(table):
+    assert (len(table), table['HP:0000001'], table['ß'], table[''], table.get('missing', 'NA'),
+            'HP:0000002' in table) == (4, 'All', 'unicode', 'empty key', 'NA', True)
+    assert sorted(table.items()) == sorted(MAPPING.items())
+
+
+def test_missing_key_raises_key_error(table):
+    with pytest.raises(KeyError):
+        table['HP:0000003']
+
+
+def test_attach_shares_content(table):
+    attached = SharedTable.attach(table.name)
+
+    assert attached['HP:0000002'] == 'Abnormality of body height'
+    attached.close()
+
+
+def test_shared_converter_in_worker():
+    converter = DictConverter()
+    tables = share_converter(converter)
+
+    try:
+        with ProcessPoolExecutor(1) as executor:
+            actual_output = executor.submit(convert_in_worker, converter).result()
+        assert (type(converter.names_by_id), type(converter.nested['a']), converter.version) == \
+            (SharedTable, SharedTable, '2021-01-01')
+        assert actual_output == (['All', 'NA'], {'HP:9999999'})
+    finally:
+        for table in tables:
+            table.close()
@@ -0,0 +1,148 @@
+#!/user/bin/env python3
+
+import pytest
+from itertools import product
+from math import log
+import numpy as np
+from biobesu.helper import similarity
+
+# HP:1 - HP:2 - HP:4
+#      \      /
+#       HP:3 - HP:5
+HPO_OBO = '''format-version: 1.2
+data-version: releases/2021-06-08
+
+[Term]
+id: HP:0000001
+name: All
+
+[Term]
+id: HP:0000002
+name: Two
+is_a: HP:0000001 ! All
+
+[Term]
+id: HP:0000003
+name: Three
+alt_id: HP:0000033
+is_a: HP:0000001 ! All
+
+[Term]
+id: HP:0000004
+name: Four
+is_a: HP:0000002 ! Two
+is_a: HP:0000003 ! Three
+
+[Term]
+id: HP:0000005
+name: Five
+is_a: HP:0000003 ! Three
+
+[Term]
+id: HP:0000006
+name: Obsolete
+is_obsolete: true
+
+[Typedef]
+id: part_of
+name: part of
+'''
+
+HPOA = '''#description: test annotations
+#DatabaseID\tDiseaseName\tQualifier\tHPO_ID\tReference\tEvidence\tOnset\tFrequency\tSex\tModifier\tAspect\tBiocuration
+OMIM:1\tONE\t\tHP:0000004\tOMIM:1\tTAS\t\t\t\t\tP\tHPO:test
+OMIM:2\tTWO\t\tHP:0000005\tOMIM:2\tTAS\t\t\t\t\tP\tHPO:test
+OMIM:3\tTHREE\t\tHP:0000002\tOMIM:3\tTAS\t\t\t\t\tP\tHPO:test
+OMIM:4\tFOUR\t\tHP:0000033\tOMIM:4\tTAS\t\t\t\t\tP\tHPO:test
+OMIM:4\tFOUR\tNOT\tHP:0000004\tOMIM:4\tTAS\t\t\t\t\tP\tHPO:test
+'''
+
+
+@pytest.fixture
+def ontology(tmp_path):
+    (tmp_path / 'hp.obo').write_text(HPO_OBO)
+    (tmp_path / 'phenotype.hpoa').write_text(HPOA)
+    parents, primary_ids = similarity.read_ontology(str(tmp_path / 'hp.obo'))
+    ancestors = similarity.ancestor_closure(parents)
+    annotations = similarity.read_annotations(str(tmp_path / 'phenotype.hpoa'), primary_ids)
+    return parents, primary_ids, ancestors, annotations, similarity.information_content(ancestors, annotations)
+
+
+def brute_force_bma(case_terms, terms, ancestors, ic):
+    def mica(term_a, term_b):
+        return max(ic[ancestor] for ancestor in ancestors[term_a] & ancestors[term_b])
+
+    def best_match_mean(terms_a, terms_b):
+        return sum(max(mica(terms[a], terms[b]) for b in terms_b) for a in terms_a) / len(terms_a)
+
+    return np.array([[(best_match_mean(a, b) + best_match_mean(b, a)) / 2 for b in case_terms] for a in case_terms])
+
+
+def test_read_ontology(ontology):
+    parents, primary_ids, ancestors, annotations, ic = ontology
+
+    assert parents['HP:0000004'] == ['HP:0000002', 'HP:0000003']
+    assert 'HP:0000006' not in parents
+    assert primary_ids['HP:0000033'] == 'HP:0000003'
+    assert ancestors['HP:0000004'] == {'HP:0000001', 'HP:0000002', 'HP:0000003', 'HP:0000004'}
+
+
+def test_information_content(ontology):
+    parents, primary_ids, ancestors, annotations, ic = ontology
+
+    # The NOT annotation is left out & the alternative ID is mapped.
+    assert annotations['OMIM:4'] == {'HP:0000003'}
+    assert ic['HP:0000001'] == 0
+    assert ic['HP:0000003'] == pytest.approx(-log(3 / 4))
+    assert ic['HP:0000004'] == pytest.approx(log(4))
+
+
+def test_mica_matrix(ontology):
+    parents, primary_ids, ancestors, annotations, ic = ontology
+    terms = ['HP:0000002', 'HP:0000004', 'HP:0000005']
+
+    expected_output = [[max(ic[ancestor] for ancestor in ancestors[a] & ancestors[b]) for b in terms] for a in terms]
+    actual_output = similarity.mica_matrix(terms, parents, ancestors, ic)
+
+    assert actual_output == pytest.approx(np.array(expected_output))
+    # HP:0000004 & HP:0000005 share HP:0000003.
+    assert actual_output[1, 2] == pytest.approx(ic['HP:0000003'])
+
+
+def test_resnik_bma(ontology, monkeypatch):
+    parents, primary_ids, ancestors, annotations, ic = ontology
+    terms = ['HP:0000002', 'HP:0000003', 'HP:0000004', 'HP:0000005']
+    case_terms = [[2], [0, 3], [2, 3, 1], [], [3, 0], [1]]
+    mica = similarity.mica_matrix(terms, parents, ancestors, ic)
+
+    # Small blocks, so that the blocked calculation is used.
+    monkeypatch.setattr(similarity, 'BLOCK_ELEMENTS', 8)
+    actual_output = similarity.resnik_bma(case_terms, mica)
+
+    expected_output = brute_force_bma([terms for terms in case_terms if terms], terms, ancestors, ic)
+    non_empty = [i for i, terms in enumerate(case_terms) if terms]
+    assert actual_output[np.ix_(non_empty, non_empty)] == pytest.approx(expected_output, abs=1e-6)
+    assert np.all(actual_output[3] == 0) and np.all(actual_output[:, 3] == 0)
+
+
+def test_nearest_neighbours_and_near_duplicates(ontology):
+    parents, primary_ids, ancestors, annotations, ic = ontology
+    terms = ['HP:0000002', 'HP:0000003', 'HP:0000004', 'HP:0000005']
+    mica = similarity.mica_matrix(terms, parents, ancestors, ic)
+    matrix = similarity.resnik_bma([[2, 3], [0], [3, 2], [1]], mica)
+
+    nearest, nearest_similarity, mean_similarity = similarity.nearest_neighbours(matrix)
+
+    assert list(nearest[[0, 2]]) == [2, 0]
+    assert nearest_similarity[0] == pytest.approx(1.0)
+    assert similarity.near_duplicates(matrix, 0.99) == [(0, 2, pytest.approx(1.0))]
+
+
+def test_mica_matrix_all_pairs(ontology):
+    parents, primary_ids, ancestors, annotations, ic = ontology
+    terms = sorted(parents)
+
+    actual_output = similarity.mica_matrix(terms, parents, ancestors, ic)
+
+    for (i, a), (j, b) in product(enumerate(terms), repeat=2):
+        assert actual_output[i, j] == pytest.approx(max(ic[ancestor] for ancestor in ancestors[a] & ancestors[b]))
@@ -0,0 +1,55 @@
+#!/user/bin/env python3
+
+from os import stat
+from os.path import exists
+from biobesu.helper import staging
+from biobesu.helper.staging import ResourceStager
+
+
+def create_resources(tmp_path):
+    hdt = tmp_path / 'data.hdt'
+    hdt.write_bytes(b'hdt' * 1000)
+    (tmp_path / 'data.hdt.index.v1-1').write_bytes(b'index')
+    data_dir = tmp_path / 'lirical_data'
+    (data_dir / 'sub').mkdir(parents=True)
+    (data_dir / 'hp.obo').write_text('obo')
+    (data_dir / 'sub' / 'extra.txt').write_text('extra')
+    return str(hdt), str(data_dir)
+
+
+def test_stage_copies_files_next_to_each_other_and_cleans_up(tmp_path):
+    hdt, data_dir = create_resources(tmp_path)
+
+    with ResourceStager(str(tmp_path / 'scratch')) as stager:
+        staged_hdt, staged_index, staged_dir = stager.stage([hdt, hdt + '.index.v1-1', data_dir])
+
+        assert staged_index == staged_hdt + '.index.v1-1'
+        assert open(staged_hdt, 'rb').read() == b'hdt' * 1000
+        assert open(staged_dir + 'sub/extra.txt').read() == 'extra'
+        assert stat(staged_hdt).st_ino != stat(hdt).st_ino
+        assert stager.staged_files == 4
+        staged_root = stager.directory
+
+    assert not exists(staged_root)
+    assert exists(hdt)
+
+
+def test_stage_link(tmp_path):
+    hdt, data_dir = create_resources(tmp_path)
+
+    with ResourceStager(str(tmp_path / 'scratch'), method='link') as stager:
+        staged_hdt, = stager.stage([hdt])
+
+        assert stat(staged_hdt).st_ino == stat(hdt).st_ino
+        assert stager.staged_bytes == 3000
+
+
+def test_stage_without_fadvise(tmp_path, monkeypatch):
+    # For example, macOS has no posix_fadvise.
+    monkeypatch.setattr(staging, 'posix_fadvise', None)
+    hdt, data_dir = create_resources(tmp_path)
+
+    with ResourceStager(str(tmp_path / 'scratch')) as stager:
+        staged_hdt, = stager.stage([hdt])
+
+        assert open(staged_hdt, 'rb').read() == b'hdt' * 1000
@@ -0,0 +1,30 @@
+#!/user/bin/env python3
+
+from biobesu.helper.stats import bootstrap_ci
+from biobesu.helper.stats import percentile
+from biobesu.helper.stats import summarize
+
+
+def test_percentile():
+    values = [5, 1, 4, 2, 3]
+
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 4.8
+    assert percentile([], 95) is None
+
+
+def test_bootstrap_ci_is_reproducible_and_contains_median():
+    values = [1.0, 1.2, 0.9, 1.1, 1.3, 1.0, 5.0]
+
+    lower, upper = bootstrap_ci(values, seed=1)
+
+    assert (lower, upper) == bootstrap_ci(values, seed=1)
+    assert lower <= 1.1 <= upper
+
+
+def test_summarize():
+    actual_output = summarize([1, 2, 3, 4, 5])
+
+    assert (actual_output['n'], actual_output['median'], actual_output['q1'], actual_output['q3'],
+            actual_output['iqr']) == (5, 3, 2, 4, 2)
+    assert summarize([])['median'] is None
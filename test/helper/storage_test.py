@@ -0,0 +1,87 @@
+#!/user/bin/env python3
+
+import pytest
+from os.path import exists
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import CaseResult
+from biobesu.helper.scratch import ScratchSpace
+from biobesu.helper.storage import OutputCollector
+from biobesu.helper.storage import create_output_store
+from biobesu.helper.storage import open_output_store
+
+
+def store_output(store, case_id, content, return_code=0):
+    output_file = store.staging_file(case_id)
+    with open(output_file, 'w') as file_writer:
+        file_writer.write(content)
+    OutputCollector(store).case_finished(CaseResult(Case(case_id, 'tool.jar', '', output_file), return_code, 1.0,
+                                                    f'{case_id}.log'))
+
+
+@pytest.mark.parametrize('storage', ['plain', 'gzip', 'archive'])
+def test_store_round_trip(tmp_path, storage):
+    store = create_output_store(str(tmp_path) + '/output/', storage)
+    store_output(store, '02', 'b\n')
+    store_output(store, '01', 'a1\na2\n')
+
+    reopened_store = open_output_store(str(tmp_path) + '/output')
+    with reopened_store.open('01') as file_reader:
+        actual_output = file_reader.readlines()
+
+    assert (type(reopened_store), reopened_store.ids(), reopened_store.contains('02'),
+            reopened_store.contains('03')) == (type(store), ['01', '02'], True, False)
+    assert actual_output == ['a1\n', 'a2\n']
+
+
+@pytest.mark.parametrize('storage', ['plain', 'gzip', 'archive'])
+def test_store_dotted_ids(tmp_path, storage):
+    store = create_output_store(str(tmp_path) + '/output/', storage)
+    store_output(store, 'X.1', 'a\n')
+    store_output(store, 'X.2', 'b\n')
+
+    reopened_store = open_output_store(str(tmp_path) + '/output')
+    with reopened_store.open('X.1') as file_reader:
+        actual_output = file_reader.read()
+
+    assert (reopened_store.ids(), reopened_store.contains('X.1'), reopened_store.contains('X')) == \
+           (['X.1', 'X.2'], True, False)
+    assert actual_output == 'a\n'
+
+
+def test_failed_output_is_not_collected(tmp_path):
+    store = create_output_store(str(tmp_path) + '/output/', 'gzip')
+    store_output(store, '01', 'partial', return_code=1)
+
+    assert store.ids() == []
+
+
+def test_archive_ignores_incomplete_append(tmp_path):
+    store = create_output_store(str(tmp_path) + '/output/', 'archive')
+    store_output(store, '01', 'a\n')
+    # Simulates an interrupted append: data without a complete index line.
+    with open(store.archive_file, 'ab') as archive_writer:
+        archive_writer.write(b'incomplete')
+    with open(store.index_file, 'a') as index_writer:
+        index_writer.write('02\t')
+
+    reopened_store = open_output_store(str(tmp_path) + '/output/')
+    store_output(reopened_store, '03', 'c\n')
+
+    # The next append is not glued onto the incomplete index line.
+    assert open_output_store(str(tmp_path) + '/output/').ids() == ['01', '03']
+
+
+@pytest.mark.parametrize('storage', ['plain', 'gzip', 'archive'])
+def test_scratch_output_is_published(tmp_path, storage):
+    store = create_output_store(str(tmp_path) + '/output/', storage)
+    with ScratchSpace(str(tmp_path) + '/scratch/') as scratch:
+        store.use_scratch(scratch)
+        staging_file = store.staging_file('01')
+        store_output(store, '01', 'a\n')
+        store_output(store, '02', 'partial', return_code=1)
+
+        assert staging_file.startswith(scratch.directory)
+        assert (store.ids(), exists(staging_file)) == (['01'], False)
+        assert not exists(str(tmp_path) + '/output/.incoming/')
+    with store.open('01') as file_reader:
+        assert file_reader.read() == 'a\n'
@@ -0,0 +1,56 @@
+#!/user/bin/env python3
+
+from biobesu.helper import synthetic
+from biobesu.helper.converters import GeneConverter
+from biobesu.helper.converters import PhenotypeConverter
+from biobesu.helper.readers import SeparatedValuesFileReader
+from biobesu.suite.hpo_generank.runner.lirical import __extract_fields_from_lirical_data
+
+
+def test_hpo_obo_readable_by_phenotype_converter(tmp_path):
+    file_path = str(tmp_path / 'hp.obo')
+    synthetic.write_hpo_obo(file_path, 50)
+
+    converter = PhenotypeConverter(file_path)
+
+    assert len(converter.names_by_id) == 50
+    assert converter.id_to_name('HP:0000012') == 'Synthetic phenotype 12'
+    assert converter.hpo_obo_version == '2021-06-08'
+
+
+def test_hpo_parents_form_dag():
+    for number in range(1, 200):
+        parents = synthetic.hpo_parents(number)
+        assert all(0 < parent < number for parent in parents)
+        assert (len(parents) == 0) == (number == 1)
+
+
+def test_gene_symbols_file_readable_by_gene_converter(tmp_path):
+    synthetic.write_gene_symbols_file(str(tmp_path / GeneConverter.file_name), 20)
+
+    converter = GeneConverter(str(tmp_path) + '/')
+
+    assert converter.id_to_symbol(['1', '20', '21']) == (['GENE1', 'GENE20'], {'21'})
+
+
+def test_benchmark_file_only_uses_known_terms(tmp_path):
+    file_path = str(tmp_path / 'benchmark_data.tsv')
+    synthetic.write_benchmark_file(file_path, 100, 30, 10)
+
+    cases = SeparatedValuesFileReader.key_value_reader(file_path, 0, 2, values_separator=',')
+
+    assert len(cases) == 100
+    known_ids = {synthetic.hpo_id(number) for number in range(2, 31)}
+    assert all(set(hpo_ids) <= known_ids for hpo_ids in cases.values())
+
+
+def test_lirical_output_extractable(tmp_path):
+    file_path = str(tmp_path / 'lirical.tsv')
+    synthetic.write_lirical_output_file(file_path, 70, 10, 100)
+
+    with open(file_path) as file_reader:
+        genes, omims = __extract_fields_from_lirical_data(file_reader)
+
+    assert len(omims) == 70
+    # Diseases with a number divisible by 7 lack a gene alias.
+    assert len(genes) == sum(1 for omim in omims if (int(omim) - 100000) % 7 != 0)
@@ -0,0 +1,45 @@
+#!/user/bin/env python3
+
+import os
+import pytest
+from argparse import Namespace
+from biobesu.helper.timing import CpuSetAllocator
+from biobesu.helper.timing import TimingMode
+from biobesu.helper.timing import create_timing_mode
+from biobesu.helper.timing import parse_cpu_list
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list('0-3,8,10-11') == [0, 1, 2, 3, 8, 10, 11]
+
+
+def test_cpu_set_allocator_hands_out_disjoint_sets():
+    allocator = CpuSetAllocator([0, 1, 2, 3, 4], 2)
+
+    first = allocator.acquire()
+    second = allocator.acquire()
+
+    assert (first, second, allocator.acquire(), allocator.available()) == ((0, 1), (2, 3), None, False)
+    allocator.release(first)
+    assert allocator.acquire() == (0, 1)
+
+
+def test_cpu_set_allocator_too_few_cpus():
+    with pytest.raises(ValueError):
+        CpuSetAllocator([0], 2)
+
+
+def test_timing_mode_jvm_options():
+    timing_mode = TimingMode(cpus_per_case=2, heap=1024, gc='ParallelGC', cpus=[0, 1])
+
+    assert timing_mode.jvm_options() == ['-XX:ActiveProcessorCount=2', '-Xms1024m', '-Xmx1024m',
+                                         '-XX:+UseParallelGC']
+
+
+def test_create_timing_mode_unsupported_platform(monkeypatch):
+    # For example, macOS has no sched_setaffinity.
+    monkeypatch.delattr(os, 'sched_setaffinity', raising=False)
+
+    with pytest.raises(OSError, match='--timing is not supported'):
+        create_timing_mode(Namespace(timing=True, case_memory=None, cpus_per_case=1, timing_gc='ParallelGC',
+                                     timing_cpus=None))
@@ -0,0 +1,86 @@
+#!/user/bin/env python3
+
+from argparse import ArgumentParser
+from biobesu.helper.execution import Case
+from biobesu.helper.execution import CaseResult
+from biobesu.helper.execution import TraceListener
+from biobesu.helper.execution import add_execution_arguments
+from biobesu.helper.execution import create_executor
+from biobesu.helper.trace import Tracer
+from biobesu.helper.trace import read_events
+from biobesu.helper.trace import summarize
+from biobesu.helper.trace import to_chrome_trace
+
+
+def case_event(phase, time, case_id, worker):
+    return {'time': time, 'phase': phase, 'name': case_id, 'category': 'case', 'process': 1, 'worker': worker,
+            'case_id': case_id, 'args': {'queued': time}}
+
+
+def test_tracer_and_listener_write_paired_events(tmp_path):
+    trace_file = str(tmp_path / 'trace.jsonl')
+    tracer = Tracer(trace_file)
+    listener = TraceListener(tracer)
+    cases = [Case('1', 'tool.jar', ''), Case('2', 'tool.jar', '')]
+
+    with tracer.span('run'):
+        for case in cases:
+            listener.case_started(case)
+        listener.case_finished(CaseResult(cases[0], 0, 0.1, ''))
+        listener.case_finished(CaseResult(cases[1], 1, 0.1, ''))
+
+    events = read_events(trace_file)
+    assert [(event['phase'], event['name'], event['worker']) for event in events] == [
+        ('process', events[0]['name'], 0), ('B', 'run', 0), ('B', '1', 1), ('B', '2', 2), ('E', '1', 1),
+        ('E', '2', 2), ('E', 'run', 0)]
+    assert events[-2]['args']['return_code'] == 1
+
+
+def test_executor_uses_tracer_of_runner(tmp_path):
+    trace_file = str(tmp_path / 'trace.jsonl')
+    parser = ArgumentParser()
+    add_execution_arguments(parser)
+    args = parser.parse_args(['--trace', trace_file])
+    tracer = Tracer(trace_file)
+
+    with tracer.span('run'):
+        create_executor(args, str(tmp_path) + '/', tracer=tracer).run([])
+
+    # The runner is only identified once.
+    assert [event['phase'] for event in read_events(trace_file)] == ['process', 'B', 'E']
+
+
+def test_disabled_tracer_writes_nothing(tmp_path):
+    tracer = Tracer()
+
+    with tracer.span('run'):
+        pass
+
+    assert not tracer.enabled
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_to_chrome_trace():
+    events = [{'time': 0, 'phase': 'process', 'name': 'runner', 'category': 'process', 'process': 1, 'worker': 0},
+              case_event('B', 1.5, 'a', 1), case_event('E', 2.0, 'a', 1)]
+
+    actual_output = to_chrome_trace(events)['traceEvents']
+
+    assert actual_output[0]['args']['name'] == 'runner (1)'
+    assert [(event['ph'], event['ts'], event['tid']) for event in actual_output[1:3]] == [('B', 1500000, 1),
+                                                                                         ('E', 2000000, 1)]
+    assert actual_output[3] == {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'worker 1'}}
+
+
+def test_summarize_utilization_and_idle_gaps():
+    events = [case_event('B', 0, 'a', 1), case_event('E', 4, 'a', 1), case_event('B', 6, 'b', 1),
+              case_event('E', 10, 'b', 1), case_event('B', 0, 'c', 2), case_event('E', 10, 'c', 2),
+              {'time': 10, 'phase': 'B', 'name': 'merge', 'category': 'stage', 'process': 1, 'worker': 0},
+              {'time': 11, 'phase': 'E', 'name': 'merge', 'category': 'stage', 'process': 1, 'worker': 0}]
+
+    summary = summarize(events)[0]
+
+    assert (summary['cases'], summary['workers'], summary['window'], summary['busy']) == (3, 2, 10, 18)
+    assert summary['utilization'] == 0.9
+    assert (summary['idle'], summary['idle_gaps'], summary['longest_idle_gap']) == (2, 1, 2)
+    assert summary['stages'] == [('merge', 1)]
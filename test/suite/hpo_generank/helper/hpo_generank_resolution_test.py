@@ -0,0 +1,50 @@
+#!/user/bin/env python3
+
+import gzip
+from biobesu.suite.hpo_generank.helper.resolution import GeneResolutionIndex
+
+
+def write_sources(tmp_path):
+    lirical_data = str(tmp_path) + '/lirical/'
+    runner_data = str(tmp_path) + '/runner/'
+    (tmp_path / 'lirical').mkdir()
+    (tmp_path / 'runner').mkdir()
+
+    with gzip.open(lirical_data + 'Homo_sapiens_gene_info.gz', 'wt') as file_writer:
+        file_writer.write('#tax_id\tGeneID\tSymbol\tLocusTag\tSynonyms\n'
+                          '9606\t1\tA1BG\t-\tA1B|ABG\n'
+                          '9606\t2\tA2M\t-\tA2MD\n')
+    with open(lirical_data + 'mim2gene_medgen', 'w') as file_writer:
+        file_writer.write('#MIM number\tGeneID\ttype\n'
+                          '100001\t2\tphenotype\n'
+                          '100002\t-\tphenotype\n'
+                          '100003\t3\tphenotype\n')
+    with open(runner_data + 'gene_ids_symbols.tsv', 'w') as file_writer:
+        file_writer.write('NCBI Gene ID\tApproved symbol\n1\tA1BG\n2\tA2M\n')
+
+    return runner_data, lirical_data
+
+
+def test_resolves_all_routes(tmp_path):
+    index = GeneResolutionIndex.load(*write_sources(tmp_path))
+
+    assert index.to_symbol(['ABG', 'A2MD', 'UNKNOWN'], GeneResolutionIndex.ALIAS) == (['A1BG', 'A2M'], {'UNKNOWN'})
+    assert index.to_symbol(['100001', '100002', '100003'], GeneResolutionIndex.OMIM) == (['A2M'],
+                                                                                          {'100002', '100003'})
+    assert index.to_gene_id('100003', GeneResolutionIndex.OMIM) == '3'
+    assert index.to_symbol('1', GeneResolutionIndex.GENE_ID) == 'A1BG'
+    assert index.route('100001', GeneResolutionIndex.OMIM) == 'mim2gene_medgen>hgnc'
+
+
+def test_stored_index_is_reused_till_sources_change(tmp_path):
+    runner_data, lirical_data = write_sources(tmp_path)
+    GeneResolutionIndex.load(runner_data, lirical_data)
+
+    assert GeneResolutionIndex.read(runner_data + GeneResolutionIndex.file_name).to_symbol(
+        'A1B', GeneResolutionIndex.ALIAS) == 'A1BG'
+
+    with open(runner_data + 'gene_ids_symbols.tsv', 'a') as file_writer:
+        file_writer.write('3\tA3GALT2\n')
+
+    assert GeneResolutionIndex.load(runner_data, lirical_data).to_symbol('100003', GeneResolutionIndex.OMIM) == \
+        'A3GALT2'
@@ -1,6 +1,11 @@
 #!/user/bin/env python3
 
+from biobesu.helper.storage import create_output_store
+from biobesu.suite.hpo_generank.runner.lirical import __convert_chunk
 from biobesu.suite.hpo_generank.runner.lirical import __extract_fields_from_lirical_data
+from biobesu.suite.hpo_generank.runner.lirical import __extract_results_from_lirical_data
+from biobesu.suite.hpo_generank.runner.lirical import __lirical_cases
+from biobesu.suite.hpo_generank.runner.lirical import __validate_lirical_output
 
 
 def test_extract_fields_from_lirical_data():
@@ -15,3 +20,49 @@ def test_extract_fields_from_lirical_data():
     actual_output = __extract_fields_from_lirical_data(input_string)
 
     assert actual_output == expected_output
+
+
+def test_extract_results_from_lirical_data_keeps_results_without_gene_alias():
+    input_string = ['rank\tdiseaseName\tdiseaseCurie\tpretestprob\tposttestprob\tcompositeLR\tentrezGeneId\tvariants\n',
+                    '10\tMYDISEASE 12; ABC1\tOMIM:123456\t1/7987\t2,00%\t111,897\tn/a\tn/a\n',
+                    '200\ta Syndrome\tOMIM:848484\t1/7987\t0,00%\t0,5\tn/a\tn/a\n']
+
+    expected_output = [('ABC1', '123456'), (None, '848484')]
+    actual_output = __extract_results_from_lirical_data(input_string)
+
+    assert actual_output == expected_output
+
+
+def test_convert_chunk():
+    lines = ['case1\tA,B,C\n', 'case2\t\n', 'case3\tC\n']
+
+    expected_output = [(['case1\tgene_a,gene_c\n', 'case2\t\n', 'case3\tgene_c\n'], {'B'}),
+                       (['case1\t1,2\n', 'case2\t\n', 'case3\t\n'], {'C'})]
+    actual_output = __convert_chunk([{'A': 'gene_a', 'C': 'gene_c'}, {'A': '1', 'B': '2'}], lines)
+
+    assert actual_output == expected_output
+
+
+def test_validate_lirical_output(tmp_path):
+    header = '! LIRICAL\nrank\tdiseaseName\tdiseaseCurie\n'
+    outputs = {'valid': header + '1\tdisease\tOMIM:1\n', 'empty': header, 'truncated': header + '1\tdisease\tOMI',
+               'columns': header + '1\tdisease\n', 'header': '! LIRICAL\n'}
+    for name, content in outputs.items():
+        (tmp_path / f'{name}.tsv').write_text(content)
+
+    actual_output = {name: __validate_lirical_output(str(tmp_path / f'{name}.tsv')) for name in outputs}
+
+    assert actual_output == {'valid': None, 'empty': None, 'truncated': 'incomplete last line',
+                             'columns': 'expected 3 columns on line 3', 'header': 'no header found'}
+
+
+def test_lirical_cases_keep_benchmark_ids(tmp_path):
+    store = create_output_store(str(tmp_path) + '/output/')
+
+    cases = __lirical_cases(['00002_wilson', '03_cas'], '/phenopackets/', store, 'LIRICAL.jar', '/data/')
+
+    # Ids ending in characters of ".json" (such as n & s) are not truncated.
+    assert [case.case_id for case in cases] == ['00002_wilson', '03_cas']
+    assert cases[0].arguments == f'phenopacket -p /phenopackets/00002_wilson.json -o {tmp_path}/output -x ' \
+                                 f'00002_wilson -d /data/ --tsv'
+    assert cases[0].output_file == f'{tmp_path}/output/00002_wilson.tsv'
@@ -0,0 +1,26 @@
+#!/user/bin/env python3
+
+from biobesu.suite.vibe_versions.helper import vibe
+
+
+def test_vibe_case():
+    actual_output = vibe.vibe_case('5.0.01', 'vibe.jar', 'vibe.hdt', 'hp.owl',
+                                   ['HP:0000001', 'HP:0000002'], 'out/01.tsv')
+
+    assert (actual_output.case_id, actual_output.jar, actual_output.arguments,
+            actual_output.output_file) == \
+        ('5.0.01', 'vibe.jar',
+         '-l -p HP:0000001 -p HP:0000002 -t vibe.hdt -o out/01.tsv -w hp.owl',
+         'out/01.tsv')
+
+
+def test_validate_vibe_output(tmp_path):
+    outputs = {'genes': '1,2,3', 'empty': '', 'lines': '1,2\n3\n', 'gene': '1,,3'}
+    for name, content in outputs.items():
+        (tmp_path / f'{name}.tsv').write_text(content)
+
+    actual_output = {name: vibe.validate_vibe_output(str(tmp_path / f'{name}.tsv')) for name in outputs}
+
+    assert actual_output == {'genes': None, 'empty': None, 'lines': 'expected a single line, found 2',
+                             'gene': 'empty gene in comma-separated list'}
+    assert vibe.validate_vibe_output(str(tmp_path / 'missing.tsv')) == 'no output file was written'